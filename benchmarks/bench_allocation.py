@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+技能点分配微基准测试
+
+比较逐次随机加1-5点的旧循环与SkillPointAllocator一次性分配的耗时，
+并输出各分配策略下的分配结果统计。
+
+用法:
+    python benchmarks/bench_allocation.py [--runs 20000]
+"""
+
+import os
+import sys
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.allocation import SkillPointAllocator, ALLOCATION_STRATEGIES
+from core.investigator import Investigator
+from core.simulation import create_generator
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (场景名称, 技能及当前值, 可分配点数)
+OCCUPATION_SKILLS = {
+    "会计": 5, "图书馆使用": 20, "侦查": 25, "说服": 10,
+    "语言（拉丁语）": 1, "科学（化学）": 1, "历史": 5, "心理学": 10
+}
+INTEREST_SKILLS = {"闪避": 30, "格斗（斗殴）": 25, "神秘学": 5}
+SCENARIOS = [
+    ("职业技能 EDU×4", OCCUPATION_SKILLS, 320),
+    ("职业技能 EDU×2", OCCUPATION_SKILLS, 160),
+    ("兴趣技能 INT×2", INTEREST_SKILLS, 140)
+]
+
+# 复用同一个调查员对象，每次分配前重置技能值，避免把对象创建计入耗时
+INVESTIGATOR = Investigator()
+
+def reset_investigator(skill_values):
+    """将调查员的技能重置为指定的当前值"""
+    INVESTIGATOR.skills = dict(skill_values)
+    INVESTIGATOR.skill_specializations = {}
+    return INVESTIGATOR
+
+def legacy_allocate(skill_values, points):
+    """旧实现：随机选择技能，每次加1-5点，技能满后从列表中移除"""
+    investigator = reset_investigator(skill_values)
+    skills = list(skill_values)
+    remaining = points
+    while remaining > 0 and skills:
+        skill = random.choice(skills)
+        if "（" in skill or "(" in skill:
+            main_skill = skill.split("（")[0].split("(")[0].strip()
+            current_value = investigator.get_skill(skill)
+            max_allocation = min(remaining, 75 - current_value)
+        else:
+            current_value = investigator.get_skill(skill)
+            max_allocation = min(remaining, 75 - current_value)
+        if max_allocation <= 0:
+            skills.remove(skill)
+            continue
+        points_to_add = random.randint(1, min(5, max_allocation))
+        if "（" in skill or "(" in skill:
+            investigator.add_skill(skill, current_value + points_to_add)
+        else:
+            investigator.skills[skill] = current_value + points_to_add
+        remaining -= points_to_add
+    return investigator
+
+def engine_allocate(generator, skill_values, points):
+    """新实现：通过生成器的分配引擎一次性分配"""
+    investigator = reset_investigator(skill_values)
+    generator._allocate_skill_points(investigator, list(skill_values), points)
+    return investigator
+
+def per_call_us(func, runs):
+    """测量单次调用的平均耗时（微秒），取三轮中的最好成绩"""
+    best = min(timeit.repeat(func, number=runs, repeat=3))
+    return best / runs * 1e6
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="技能点分配微基准测试")
+    parser.add_argument("--runs", type=int, default=20000, help="每项测试的分配次数")
+    args = parser.parse_args()
+
+    generator = create_generator(os.path.join(REPO_ROOT, "data"))
+
+    print(f"{'场景':<16}{'旧循环':>12}{'一次性分配':>14}{'加速比':>10}")
+    legacy_total = 0.0
+    engine_total = 0.0
+    for name, skill_values, points in SCENARIOS:
+        legacy = per_call_us(lambda: legacy_allocate(skill_values, points), args.runs)
+        engine = per_call_us(lambda: engine_allocate(generator, skill_values, points), args.runs)
+        print(f"{name:<16}{legacy:>10.1f}us{engine:>12.1f}us{legacy / engine:>9.1f}x")
+        legacy_total += legacy
+        engine_total += engine
+    print(f"{'合计':<16}{legacy_total:>10.1f}us{engine_total:>12.1f}us{legacy_total / engine_total:>9.1f}x")
+
+    print()
+    print(f"{'策略':<10}{'α':>6}{'最大份额均值':>14}{'满值技能数均值':>16}")
+    allocator = SkillPointAllocator()
+    values = list(OCCUPATION_SKILLS.values())
+    points = 160
+    capacities = [allocator.cap - value for value in values]
+    for strategy, alpha in ALLOCATION_STRATEGIES.items():
+        allocator.set_strategy(strategy)
+        max_share = 0.0
+        capped = 0
+        for _ in range(args.runs):
+            allocation = allocator.allocate(points, capacities)
+            max_share += max(allocation) / points
+            capped += sum(1 for share, room in zip(allocation, capacities) if share == room)
+        print(f"{strategy:<10}{alpha:>6.1f}{max_share / args.runs:>14.3f}{capped / args.runs:>16.2f}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+调查员列式归档基准测试
+
+把一批调查员写入列式归档，测量追加、按编号读取、按列全量扫描、全量解码（为字典和为调查员）和内存映射筛选的耗时，
+并与每名调查员一个JSON文件的大小进行比较。
+
+为节省生成时间，先生成 --unique 名不同的调查员，再重复写入直到 --count 条记录。
+
+用法:
+    python benchmarks/bench_archive.py [--count 100000] [--unique 1000]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.simulation import create_generator
+from utils.archive import InvestigatorArchive
+from utils.mapped_store import MappedInvestigatorStore
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="调查员列式归档基准测试")
+    parser.add_argument("--count", type=int, default=100000, help="归档中的记录数")
+    parser.add_argument("--unique", type=int, default=1000, help="实际生成的不同调查员数量")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    parser.add_argument("--skill", default="图书馆使用", help="全量扫描的技能")
+    args = parser.parse_args()
+
+    generator = create_generator(os.path.join(REPO_ROOT, "data"))
+    unique = [generator.generate_investigator(args.seed, i).to_dict() for i in range(args.unique)]
+    records = [unique[i % len(unique)] for i in range(args.count)]
+    json_size = sum(len(json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")) for data in unique)
+    json_size = json_size * args.count // len(unique)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "investigators.cocarch")
+        archive = InvestigatorArchive(path)
+
+        start = time.perf_counter()
+        archive.append(records)
+        append_time = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        archive = InvestigatorArchive(path)
+        open_time = time.perf_counter() - start
+
+        rng = random.Random(args.seed)
+        ids = [rng.randrange(len(archive)) for _ in range(1000)]
+        start = time.perf_counter()
+        for record_id in ids:
+            archive.get(record_id)
+        get_time = (time.perf_counter() - start) / len(ids)
+
+        start = time.perf_counter()
+        matched = 0
+        total = 0
+        for _, columns in archive.scan(args.skill):
+            column = columns[args.skill]
+            if column is None:
+                continue
+            matched += int((column >= 60).sum()) if hasattr(column, "sum") else sum(1 for value in column if value >= 60)
+            total += len(column)
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = sum(1 for _ in archive.iter_dicts())
+        decode_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        materialized = sum(1 for _ in archive.iter_investigators())
+        materialize_time = time.perf_counter() - start
+
+        with MappedInvestigatorStore(path) as store:
+            start = time.perf_counter()
+            ids = store.filter(skills={args.skill: (60, None)})
+            filter_time = time.perf_counter() - start
+            start = time.perf_counter()
+            names = [investigator.name for investigator in store.proxies(ids[:1000])]
+            proxy_time = (time.perf_counter() - start) / max(len(names), 1)
+            del ids
+
+    print(f"记录数:           {args.count}")
+    print(f"归档大小:         {size / 1e6:.1f} MB（JSON文件约 {json_size / 1e6:.1f} MB）")
+    print(f"追加:             {append_time:.2f} s（{args.count / append_time:,.0f} 条/秒）")
+    print(f"打开:             {open_time * 1000:.1f} ms")
+    print(f"按编号读取:       {get_time * 1e6:.0f} us/条")
+    print(f"全量扫描{args.skill}: {scan_time * 1000:.1f} ms（{matched}/{total} 条 ≥ 60）")
+    print(f"全量解码为字典:   {decode_time:.2f} s（{decoded / decode_time:,.0f} 条/秒）")
+    print(f"全量解码为调查员: {materialize_time:.2f} s（{materialized / materialize_time:,.0f} 条/秒）")
+    print(f"内存映射筛选:     {filter_time * 1000:.1f} ms")
+    print(f"代理读取姓名:     {proxy_time * 1e6:.0f} us/条")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据目录加载基准测试
+
+比较每次都直接解析技能、职业、背景数据与通过DataCatalogue在进程内共享数据的耗时。
+
+用法:
+    python benchmarks/bench_catalogue.py [--repeat 200]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.catalogue import DataCatalogue
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_FILES = ("skills.json", "occupations.json", "backgrounds.json")
+
+def load_json(data_dir):
+    """直接解析全部数据文件"""
+    result = []
+    for file_name in DATA_FILES:
+        with open(os.path.join(data_dir, file_name), "r", encoding="utf-8") as f:
+            result.append(json.load(f))
+    return result
+
+def load_catalogue(catalogue, data_dir):
+    """通过数据目录加载器加载全部数据文件"""
+    return [catalogue.load(os.path.join(data_dir, file_name)) for file_name in DATA_FILES]
+
+def timed(function, repeat):
+    """重复调用function，返回平均耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="数据目录加载基准测试")
+    parser.add_argument("--repeat", type=int, default=200, help="重复次数")
+    parser.add_argument("--data-dir", default=os.path.join(REPO_ROOT, "data"), help="数据目录")
+    args = parser.parse_args()
+
+    catalogue = DataCatalogue()
+    json_time = timed(lambda: load_json(args.data_dir), args.repeat)
+    first = load_catalogue(catalogue, args.data_dir)
+    shared_time = timed(lambda: load_catalogue(catalogue, args.data_dir), args.repeat)
+    assert all(a is b for a, b in zip(first, load_catalogue(catalogue, args.data_dir))), "同一进程内应共享同一份数据"
+    assert first == load_json(args.data_dir), "共享的数据与直接解析的结果不一致"
+
+    print(f"直接解析JSON:     {json_time * 1000:.3f} ms")
+    print(f"进程内共享:       {shared_time * 1000:.3f} ms")
+    print(f"加速比:           {json_time / shared_time:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+调查员二进制编码基准测试
+
+比较to_dict + JSON与InvestigatorCodec的编码、解码耗时和数据大小，
+以及安装编码器前后用进程池（spawn）传递一批调查员的耗时。
+编码、pickle和进程池往返后都检查调查员的全部实例属性（vars()）与原来相同。
+
+用法:
+    python benchmarks/bench_codec.py [--count 1000] [--workers 2]
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.simulation import create_generator
+from core.investigator import Investigator
+from core.codec import InvestigatorCodec, install_pickler, uninstall_pickler
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def timed(function, items):
+    """对每一项调用function，返回每项的平均耗时（秒）和结果列表"""
+    start = time.perf_counter()
+    results = [function(item) for item in items]
+    return (time.perf_counter() - start) / len(items), results
+
+def echo(investigator):
+    """工作进程：原样返回调查员"""
+    return investigator
+
+def pool_round_trip(investigators, workers, codec=None):
+    """用进程池把调查员传给工作进程再传回，返回耗时（秒）"""
+    context = multiprocessing.get_context("spawn")
+    if codec is None:
+        pool = context.Pool(workers)
+    else:
+        # 主进程和工作进程都要安装编码器
+        install_pickler(codec)
+        pool = context.Pool(workers, initializer=install_pickler, initargs=(codec,))
+    try:
+        with pool:
+            # 先让工作进程完成启动，不计入耗时
+            pool.map(echo, investigators[:workers], chunksize=1)
+            start = time.perf_counter()
+            results = pool.map(echo, investigators, chunksize=64)
+            elapsed = time.perf_counter() - start
+    finally:
+        uninstall_pickler()
+    assert [vars(item) for item in results] == [vars(item) for item in investigators], "进程池传回的调查员不一致"
+    return elapsed
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="调查员二进制编码基准测试")
+    parser.add_argument("--count", type=int, default=1000, help="调查员数量")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    parser.add_argument("--workers", type=int, default=2, help="进程池大小，为0时不测试进程池")
+    args = parser.parse_args()
+
+    generator = create_generator(os.path.join(REPO_ROOT, "data"))
+    codec = InvestigatorCodec.from_generator(generator)
+    investigators = [generator.generate_investigator(args.seed, i) for i in range(args.count)]
+
+    json_encode, texts = timed(lambda item: json.dumps(item.to_dict(), ensure_ascii=False).encode("utf-8"), investigators)
+    json_decode, _ = timed(lambda text: Investigator.from_dict(json.loads(text)), texts)
+    codec_encode, blobs = timed(codec.encode, investigators)
+    codec_decode, decoded = timed(codec.decode, blobs)
+    assert [vars(item) for item in decoded] == [vars(item) for item in investigators], "解码结果不一致"
+
+    json_size = sum(map(len, texts)) / args.count
+    codec_size = sum(map(len, blobs)) / args.count
+    pickle_size = len(pickle.dumps(investigators)) / args.count
+    install_pickler(codec)
+    pickled = pickle.dumps(investigators)
+    codec_pickle_size = len(pickled) / args.count
+    assert [vars(item) for item in pickle.loads(pickled)] == [vars(item) for item in investigators], "pickle还原的调查员不一致"
+    uninstall_pickler()
+
+    print(f"调查员数量:   {args.count}")
+    print(f"JSON:         编码 {json_encode * 1e6:.1f} us，解码 {json_decode * 1e6:.1f} us，{json_size:,.0f} 字节")
+    print(f"二进制编码:   编码 {codec_encode * 1e6:.1f} us，解码 {codec_decode * 1e6:.1f} us，{codec_size:,.0f} 字节")
+    print(f"往返加速比:   {(json_encode + json_decode) / (codec_encode + codec_decode):.1f}x，"
+          f"大小 {json_size / codec_size:.1f}x")
+    print(f"pickle大小:   默认 {pickle_size:,.0f} 字节/个，安装编码器后 {codec_pickle_size:,.0f} 字节/个")
+
+    if args.workers:
+        default_time = pool_round_trip(investigators, args.workers)
+        codec_time = pool_round_trip(investigators, args.workers, codec)
+        print(f"进程池往返:   默认 {default_time * 1000:.1f} ms，安装编码器后 {codec_time * 1000:.1f} ms"
+              f"（{codec_time / default_time:.1f}倍，编码器只减少数据量）")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+紧凑调查员内存基准测试
+
+比较Investigator与CompactInvestigator组成的调查员池每名调查员占用的内存，
+并按结果估算100万名调查员的内存占用。
+
+用法:
+    python benchmarks/bench_compact.py [--count 20000]
+"""
+
+import os
+import gc
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.simulation import create_generator
+from core.compact import CompactLayout
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def traced(function):
+    """调用function，返回(结果, 结果占用的内存字节数)"""
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="紧凑调查员内存基准测试")
+    parser.add_argument("--count", type=int, default=20000, help="调查员数量")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    args = parser.parse_args()
+
+    generator = create_generator(os.path.join(REPO_ROOT, "data"))
+    layout = CompactLayout.from_generator(generator)
+
+    investigators, full_size = traced(lambda: [generator.generate_investigator(args.seed, i) for i in range(args.count)])
+    start = time.perf_counter()
+    compact, compact_size = traced(lambda: layout.compact(investigators))
+    convert_time = time.perf_counter() - start
+    assert all(a.to_dict() == b.to_dict() for a, b in zip(investigators[:1000], compact)), "转换结果不一致"
+
+    full_per = full_size / args.count
+    compact_per = compact_size / args.count
+    print(f"调查员数量:     {args.count}")
+    print(f"Investigator:   {full_per:,.0f} 字节/名，100万名约 {full_per * 1e6 / 2 ** 20:,.0f} MB")
+    print(f"紧凑调查员:     {compact_per:,.0f} 字节/名，100万名约 {compact_per * 1e6 / 2 ** 20:,.0f} MB")
+    print(f"内存比:         {full_per / compact_per:.1f}x")
+    print(f"转换耗时:       {convert_time / args.count * 1e6:.1f} us/名")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+骰子掷骰微基准测试
+
+比较每次掷骰都重新解析表达式（旧实现）与使用已编译DiceExpression的单次掷骰耗时，
+并检查单个调查员与批量生成的行使用的随机流互不相同。
+
+用法:
+    python benchmarks/bench_dice.py [--rolls 200000]
+"""
+
+import os
+import re
+import sys
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.dice import DiceRoller
+from utils.rng import RandomSource, BATCH_ROW_NAMESPACE
+
+EXPRESSIONS = ["3D6", "2D6+6", "1D10", "D100"]
+
+def legacy_roll(dice_str):
+    """旧实现：每次掷骰都转换大小写并执行正则匹配"""
+    dice_str = dice_str.upper()
+    match = re.match(r"(\d+)?D(\d+)([+-]\d+)?", dice_str)
+    if not match:
+        raise ValueError(f"无效的骰子表达式: {dice_str}")
+    num_dice = int(match.group(1) or 1)
+    num_faces = int(match.group(2))
+    modifier = int(match.group(3) or 0) if match.group(3) else 0
+    return sum(random.randint(1, num_faces) for _ in range(num_dice)) + modifier
+
+def per_roll_ns(func, rolls):
+    """测量单次调用的平均耗时（纳秒），取三轮中的最好成绩"""
+    best = min(timeit.repeat(func, number=rolls, repeat=3))
+    return best / rolls * 1e9
+
+def check_streams(seed=12345, count=100):
+    """检查for_index()、批量行子流和普通子流对同一序号给出不同的随机流"""
+    root = RandomSource(seed)
+    for index in range(count):
+        streams = [
+            RandomSource.for_index(seed, index),
+            root.child(index, BATCH_ROW_NAMESPACE),
+            root.child(index)
+        ]
+        draws = [tuple(stream.random() for _ in range(4)) for stream in streams]
+        assert len(set(draws)) == len(draws), f"序号{index}的随机流重复"
+        assert RandomSource.for_index(seed, index).random() == draws[0][0], "同一(种子, 序号)应得到相同的随机流"
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="骰子掷骰微基准测试")
+    parser.add_argument("--rolls", type=int, default=200000, help="每项测试的掷骰次数")
+    args = parser.parse_args()
+
+    check_streams()
+
+    roller = DiceRoller()
+    print(f"{'表达式':<8}{'旧实现':>12}{'DiceRoller.roll':>18}{'DiceExpression.roll':>22}{'roll_many':>12}")
+    for expression in EXPRESSIONS:
+        compiled = DiceRoller.compile(expression)
+
+        legacy = per_roll_ns(lambda: legacy_roll(expression), args.rolls)
+        cached = per_roll_ns(lambda: roller.roll(expression), args.rolls)
+        direct = per_roll_ns(compiled.roll, args.rolls)
+        many = min(timeit.repeat(lambda: compiled.roll_many(args.rolls), number=1, repeat=3)) / args.rolls * 1e9
+
+        print(f"{expression:<8}{legacy:>10.0f}ns{cached:>16.0f}ns{direct:>20.0f}ns{many:>10.0f}ns")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
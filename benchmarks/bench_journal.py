@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+修改日志基准测试
+
+模拟一名被大量编辑的调查员（技能加点、属性重掷、增加装备行），比较：
+- 每次修改后用FileHandler.save_investigator保存完整快照
+- 每次修改后用InvestigatorJournal.record追加差异
+并输出每次保存的耗时、写入的字节数，以及从日志恢复的耗时。
+
+用法:
+    python benchmarks/bench_journal.py [--edits 2000] [--no-fsync]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.simulation import create_generator
+from utils.file_handler import FileHandler
+from utils.journal import InvestigatorJournal
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def edit(investigator, rng, step):
+    """对调查员做一次典型的界面修改"""
+    kind = rng.random()
+    if kind < 0.8:
+        skill = rng.choice(list(investigator.skills))
+        investigator.skills[skill] = min(investigator.skills[skill] + 1, 99)
+    elif kind < 0.95:
+        attr_name = rng.choice(list(investigator.attributes))
+        value = rng.randint(3, 18) * 5
+        investigator.attributes[attr_name] = value
+        investigator.attribute_half[attr_name] = value // 2
+        investigator.attribute_fifth[attr_name] = value // 5
+    else:
+        investigator.equipment.append({"name": f"装备{step}", "quantity": 1})
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="修改日志基准测试")
+    parser.add_argument("--edits", type=int, default=2000, help="修改次数")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    parser.add_argument("--no-fsync", action="store_true", help="日志追加后不刷新到磁盘")
+    args = parser.parse_args()
+
+    generator = create_generator(os.path.join(REPO_ROOT, "data"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        # 完整快照
+        investigator = generator.generate_investigator(args.seed, 0)
+        rng = random.Random(args.seed)
+        path = os.path.join(directory, "snapshot.json")
+        written = 0
+        start = time.perf_counter()
+        for step in range(args.edits):
+            edit(investigator, rng, step)
+            FileHandler.save_investigator(investigator, path)
+            written += os.path.getsize(path)
+        snapshot_time = (time.perf_counter() - start) / args.edits
+        snapshot_bytes = written / args.edits
+        expected = investigator.to_dict()
+
+        # 修改日志
+        investigator = generator.generate_investigator(args.seed, 0)
+        rng = random.Random(args.seed)
+        path = os.path.join(directory, "investigator.journal")
+        journal = InvestigatorJournal(path, fsync=not args.no_fsync)
+        journal.record(investigator)
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        for step in range(args.edits):
+            edit(investigator, rng, step)
+            journal.record(investigator)
+        journal_time = (time.perf_counter() - start) / args.edits
+        journal_bytes = (os.path.getsize(path) - size) / args.edits
+        journal_size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        recovered = InvestigatorJournal(path)
+        recover_time = time.perf_counter() - start
+        assert recovered.state == expected, "从日志恢复的数据与最终数据不一致"
+
+        start = time.perf_counter()
+        for _ in range(10):
+            recovered.undo()
+        undo_time = (time.perf_counter() - start) / 10
+
+    print(f"修改次数:     {args.edits}")
+    print(f"完整快照:     {snapshot_time * 1000:.2f} ms/次，{snapshot_bytes:,.0f} 字节/次")
+    print(f"修改日志:     {journal_time * 1000:.2f} ms/次，{journal_bytes:,.0f} 字节/次（含定期快照）")
+    print(f"加速比:       {snapshot_time / journal_time:.1f}x")
+    print(f"日志大小:     {journal_size / 1e6:.2f} MB")
+    print(f"从日志恢复:   {recover_time * 1000:.1f} ms")
+    print(f"撤销:         {undo_time * 1000:.2f} ms/次")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
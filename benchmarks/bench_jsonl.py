@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSONL流式导入导出基准测试
+
+用FileHandler.write_investigators/iter_investigators写入并读回一批调查员，
+输出各压缩方式和JSON实现下的文件大小与每秒记录数。
+
+为节省生成时间，先生成 --unique 名不同的调查员，再重复写入直到 --count 条记录。
+
+用法:
+    python benchmarks/bench_jsonl.py [--count 20000] [--unique 500]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.simulation import create_generator
+from utils.file_handler import FileHandler
+from utils.jsonl import orjson, zstandard
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="JSONL流式导入导出基准测试")
+    parser.add_argument("--count", type=int, default=20000, help="写入的记录数")
+    parser.add_argument("--unique", type=int, default=500, help="实际生成的不同调查员数量")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    args = parser.parse_args()
+
+    generator = create_generator(os.path.join(REPO_ROOT, "data"))
+    unique = [generator.generate_investigator(args.seed, i) for i in range(args.unique)]
+
+    def investigators():
+        for i in range(args.count):
+            yield unique[i % len(unique)]
+
+    extensions = [".jsonl", ".jsonl.gz"] + ([".jsonl.zst"] if zstandard is not None else [])
+    backends = ["json"] + (["orjson"] if orjson is not None else [])
+
+    print(f"{'文件':<14}{'JSON实现':<10}{'大小':>10}{'写入':>16}{'读取':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in extensions:
+            path = os.path.join(directory, "investigators" + extension)
+            for backend in backends:
+                start = time.perf_counter()
+                FileHandler.write_investigators(path, investigators(), json_backend=backend)
+                write_rate = args.count / (time.perf_counter() - start)
+
+                start = time.perf_counter()
+                count = sum(1 for _ in FileHandler.iter_investigators(path, json_backend=backend))
+                read_rate = count / (time.perf_counter() - start)
+
+                size = os.path.getsize(path) / 1e6
+                print(f"{extension:<14}{backend:<10}{size:>8.1f}MB{write_rate:>10,.0f} 条/秒{read_rate:>10,.0f} 条/秒")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
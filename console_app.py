@@ -138,7 +138,7 @@ def custom_investigator(investigator_generator):
             edu = investigator.attributes.get("教育", 0)
             occupation = investigator_generator.occupations.get_occupation(investigator.occupation)
             if occupation:
-                skill_points = investigator_generator.occupations.calculate_skill_points(investigator.occupation, edu)
+                skill_points = investigator_generator.occupations.calculate_skill_points(investigator.occupation, edu, investigator.attributes)
                 investigator.occupation_skill_points = skill_points
                 investigator.interest_skill_points = investigator.attributes.get("智力", 0) * 2
     
@@ -183,7 +183,7 @@ def custom_investigator(investigator_generator):
         
         # 随机分配兴趣技能点
         remaining_interest_points = investigator.interest_skill_points
-        all_skills = list(investigator_generator.skills.skills.keys())
+        all_skills = list(investigator_generator.skills.index.names)
         while remaining_interest_points > 0 and all_skills:
             # 随机选择一个技能
             skill_name = investigator_generator.dice_roller.random_choice(all_skills)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+技能点分配模块
+
+一次性把全部职业技能点或兴趣技能点分配到k个技能上，代替逐次随机加1-5点的循环。
+
+分配方法（Dirichlet分配 + 上限再分配）：
+1. 为每个技能抽取权重 w ~ Dirichlet(α, ..., α)（由k个Gamma(α, 1)变量归一化得到）
+2. 按权重把点数分给各技能，对权重前缀和取整，保证总和恰好等于可分配点数
+3. 超过上限（规则集的技能分配上限，标准规则为75%）的技能直接加满，多出的部分按其余技能的权重比例再分配
+
+输出分布：不触及上限时，分配结果为 点数 × Dirichlet(α) 的取整，每个技能的期望为 点数/k，
+方差为 点数² × (k-1) / (k² × (kα+1))；触及上限时，多出的点数按Dirichlet的聚合性质
+在未满的技能之间继续服从Dirichlet(α)分配。α由分配策略决定：
+- uniform（α=1）：所有分法等可能（单纯形上的均匀分布）
+- focused（α=0.3）：点数集中在少数几个技能上
+- spread（α=5）：点数较平均地分散到所有技能上
+
+所有技能的剩余空间之和不超过可分配点数时，直接把每个技能加到上限，剩余点数不再分配。
+每次分配只需k次随机数、一次排序和一次取整，复杂度为O(k log k)，与点数多少无关。
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+from math import log
+from itertools import accumulate
+
+from utils.rng import resolve_rng
+from core.rules import standard_ruleset
+
+# 分配策略及对应的Dirichlet参数α
+ALLOCATION_STRATEGIES = {
+    "uniform": 1.0,
+    "focused": 0.3,
+    "spread": 5.0
+}
+
+# 默认分配策略
+DEFAULT_STRATEGY = "uniform"
+
+INFINITY = float("inf")
+
+def round_shares(points, weights):
+    """按权重分配整数点数（累积取整）
+
+    对权重的前缀和取整后逐项相减，每项得到的点数为精确值向下或向上取整，
+    总和恰好等于points，只需一次遍历。
+
+    Args:
+        points: 总点数
+        weights: 各项权重（非负，总和大于0）
+
+    Returns:
+        整数列表，总和等于points
+    """
+    cumulative = list(accumulate(weights))
+    scale = points / cumulative[-1]
+    cuts = [int(value * scale) for value in cumulative]
+    cuts[-1] = points
+    return [cut - previous for cut, previous in zip(cuts, [0] + cuts)]
+
+class SkillPointAllocator:
+    """技能点分配器"""
+
+    def __init__(self, strategy=DEFAULT_STRATEGY, rules=None, rng=None):
+        """初始化分配器
+
+        Args:
+            strategy: 分配策略（uniform、focused、spread）
+            rules: 规则集（RuleSet），技能值上限取自其skill_cap，默认使用内置标准规则
+            rng: 随机数源，可选，默认使用全局random模块
+        """
+        self.set_strategy(strategy)
+        self.set_rules(rules)
+        self.rng = resolve_rng(rng)
+
+    def set_rules(self, rules):
+        """设置规则集
+
+        Args:
+            rules: 规则集（RuleSet），为None时使用内置标准规则
+        """
+        self.rules = rules or standard_ruleset()
+        self.cap = self.rules.skill_cap
+
+    def set_strategy(self, strategy):
+        """设置分配策略
+
+        Args:
+            strategy: 分配策略（uniform、focused、spread）
+        """
+        if strategy not in ALLOCATION_STRATEGIES:
+            raise ValueError(f"未知的分配策略: {strategy}")
+        self.strategy = strategy
+        self.alpha = ALLOCATION_STRATEGIES[strategy]
+
+    def allocate(self, points, capacities, rng=None):
+        """一次性分配点数
+
+        Args:
+            points: 可分配点数
+            capacities: 每个技能还能增加的点数（上限减当前值）
+            rng: 本次分配使用的随机数源，可选，默认使用分配器的随机数源
+
+        Returns:
+            各技能分得的点数列表，与capacities一一对应
+        """
+        rng = rng or self.rng
+        count = len(capacities)
+        if points <= 0 or not count:
+            return [0] * count
+        if min(capacities) > 0:
+            # 通常每个技能都还有空间，不必筛选
+            open_skills = range(count)
+            open_capacities = capacities
+        else:
+            open_skills = [i for i, capacity in enumerate(capacities) if capacity > 0]
+            if not open_skills:
+                return [0] * count
+            open_capacities = [capacities[i] for i in open_skills]
+        result = [0] * count
+
+        # 空间不足时全部加到上限
+        if sum(open_capacities) <= points:
+            for i, capacity in zip(open_skills, open_capacities):
+                result[i] = capacity
+            return result
+
+        alpha = self.alpha
+        if alpha == 1.0:
+            # Gamma(1, 1)即指数分布，与rng.expovariate(1.0)的取值相同，但不逐个调用
+            random = rng.random
+            weights = [-log(1.0 - random()) for _ in open_capacities]
+        else:
+            gamma = rng.gammavariate
+            weights = [gamma(alpha, 1.0) for _ in open_capacities]
+        if not any(weights):
+            # α很小时Gamma变量可能全部下溢为0，退回到平均分配
+            weights = [1.0] * len(weights)
+
+        # 按 空间/权重 从小到大检查：按比例分配会超过上限的技能直接加满，
+        # 多出的点数由其余技能按权重比例分担（与逐轮收回再分配的结果相同，但只需一轮）
+        ratios = [capacity / weight if weight else INFINITY for capacity, weight in zip(open_capacities, weights)]
+        order = sorted(range(len(weights)), key=ratios.__getitem__)
+        remaining = points
+        total = sum(weights)
+        position = 0
+        for j in order:
+            capacity = open_capacities[j]
+            if capacity * total > remaining * weights[j]:
+                break
+            result[open_skills[j]] = capacity
+            remaining -= capacity
+            total -= weights[j]
+            position += 1
+
+        rest = order[position:] if position else order
+        if not rest:
+            return result
+        rest_weights = [weights[j] for j in rest] if total > 0 else [1.0] * len(rest)
+
+        # 与round_shares相同的累积取整，直接写入结果；
+        # 取整可能使个别技能超出上限1点，超出的点数补给仍有空间的技能
+        cumulative = list(accumulate(rest_weights))
+        scale = remaining / cumulative[-1]
+        cuts = [int(value * scale) for value in cumulative]
+        cuts[-1] = remaining
+        previous = 0
+        leftover = 0
+        for j, cut in zip(rest, cuts):
+            share = cut - previous
+            previous = cut
+            capacity = open_capacities[j]
+            if share > capacity:
+                leftover += share - capacity
+                share = capacity
+            result[open_skills[j]] = share
+        if leftover:
+            for j in rest:
+                i = open_skills[j]
+                extra = min(leftover, open_capacities[j] - result[i])
+                result[i] += extra
+                leftover -= extra
+                if not leftover:
+                    break
+
+        return result
+
+    def allocate_to_skills(self, points, skill_values, rng=None):
+        """按技能名称分配点数
+
+        Args:
+            points: 可分配点数
+            skill_values: 技能名称到当前技能值的字典
+            rng: 本次分配使用的随机数源，可选
+
+        Returns:
+            技能名称到分得点数的字典（只包含分到点数的技能）
+        """
+        names = list(skill_values)
+        allocation = self.allocate(points, [self.cap - skill_values[name] for name in names], rng)
+        return {name: share for name, share in zip(names, allocation) if share > 0}
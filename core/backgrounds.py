@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import json
+from core.catalogue import get_catalogue
 
 class Background:
     """背景类"""
@@ -33,8 +33,7 @@ class Backgrounds:
             file_path: 背景数据文件路径
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.backgrounds = json.load(f)
+            self.backgrounds = get_catalogue().load(file_path)
             return True
         except Exception as e:
             print(f"加载背景数据失败: {e}")
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量调查员生成模块
+
+以列式（每个属性一列）的方式一次性生成大量调查员的属性阶段，包括：
+- 九项基础属性掷骰
+- 年龄段属性调整
+- 半值、五分之一值以及衍生属性（生命值、魔法值、理智值、伤害加值、体格、移动速度）
+
+安装了NumPy时整列使用数组运算，否则退回到纯Python逐行计算，两种方式输出格式相同。
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖
+    np = None
+
+from core.investigator import Investigator
+from core.derived import DERIVED_ENGINE, SANITY_STATS, DB_BUILD_BOUNDS, DB_TABLE, BUILD_TABLE, AGE_MOV_PENALTIES
+from utils.dice import DiceRoller
+from utils.rng import RandomSource
+
+# 属性顺序，与Investigator.attributes保持一致
+ATTRIBUTE_NAMES = ["力量", "体质", "体型", "敏捷", "外貌", "智力", "意志", "教育", "幸运"]
+
+# 年龄段对应的移动速度减值
+AGE_MOV_PENALTY = {f"{low}-{high}": penalty for low, high, penalty in AGE_MOV_PENALTIES}
+
+
+class InvestigatorBatch:
+    """列式批量调查员结果
+
+    每一列对应一个属性或衍生属性，第i行即第i名调查员。
+    列为NumPy数组（可用时）或Python列表。
+    """
+
+    def __init__(self, age_group, columns):
+        """初始化批量结果
+
+        Args:
+            age_group: 年龄段
+            columns: 列字典，键为属性名或 "age"、"hp"、"mp"、"san"、"db"、"build"、"mov"
+        """
+        self.age_group = age_group
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns["age"])
+
+    def column(self, name):
+        """获取指定列
+
+        Args:
+            name: 列名
+
+        Returns:
+            列数据（数组或列表）
+        """
+        return self.columns[name]
+
+    def to_investigator(self, index):
+        """将第index行转换为调查员对象
+
+        Args:
+            index: 行号
+
+        Returns:
+            调查员对象（只包含属性阶段的数据）
+        """
+        investigator = Investigator()
+        investigator.age = int(self.columns["age"][index])
+
+        for attr_name in ATTRIBUTE_NAMES:
+            value = int(self.columns[attr_name][index])
+            investigator.attributes[attr_name] = value
+            investigator.attribute_half[attr_name] = value // 2
+            investigator.attribute_fifth[attr_name] = value // 5
+
+        investigator.hp = int(self.columns["hp"][index])
+        investigator.mp = int(self.columns["mp"][index])
+        investigator.san = int(self.columns["san"][index])
+        investigator.initial_san = investigator.san
+        # 理智值上限为 99 - 克苏鲁神话（属性阶段还没有技能，即99）
+        DERIVED_ENGINE.compute(investigator, SANITY_STATS)
+        investigator.db = str(self.columns["db"][index])
+        investigator.build = int(self.columns["build"][index])
+        investigator.mov = int(self.columns["mov"][index])
+
+        return investigator
+
+    def to_investigators(self):
+        """将全部行转换为调查员对象列表"""
+        return [self.to_investigator(i) for i in range(len(self))]
+
+    def to_dict(self):
+        """转换为普通列表组成的字典，便于JSON序列化"""
+        return {
+            name: [value if isinstance(value, str) else int(value) for value in column]
+            for name, column in self.columns.items()
+        }
+
+
+def generate_attribute_columns(config, n, age_group="20-39", seed=None, rules=None):
+    """批量生成属性阶段的列数据
+
+    Args:
+        config: 配置对象（使用attributes，未指定rules时使用其rules）
+        n: 调查员数量
+        age_group: 年龄段
+        seed: 随机种子或RandomSource（可选），相同的(seed, n, age_group)得到相同的列数据
+        rules: 年龄范围和年龄段调整使用的规则集（RuleSet），为None时使用config.rules
+
+    Returns:
+        InvestigatorBatch对象
+    """
+    if n < 0:
+        raise ValueError(f"无效的生成数量: {n}")
+
+    source = seed if isinstance(seed, RandomSource) else RandomSource(seed)
+    if rules is None:
+        rules = config.rules
+    if np is not None:
+        columns = _generate_numpy(config, n, age_group, source.numpy(), rules)
+    else:
+        columns = _generate_python(config, n, age_group, source, rules)
+
+    return InvestigatorBatch(age_group, columns)
+
+
+def _generate_numpy(config, n, age_group, rng, rules):
+    """使用NumPy数组运算生成列数据"""
+    columns = {}
+
+    age_range = rules.age_range(age_group)
+    columns["age"] = rng.integers(age_range[0], age_range[1] + 1, size=n)
+
+    # 掷全部属性骰
+    for attr_name in ATTRIBUTE_NAMES:
+        attr_config = config.attributes[attr_name]
+        dice = DiceRoller.compile(attr_config["dice"])
+        rolls = rng.integers(1, dice.num_faces + 1, size=(n, dice.num_dice)).sum(axis=1) + dice.modifier
+        columns[attr_name] = rolls * attr_config["multiplier"]
+
+    # 根据年龄调整属性
+    age_config = rules.age_groups.get(age_group)
+    if age_config:
+        # 力量和体型减少
+        reduction = age_config["str_siz_reduction"]
+        if reduction > 0:
+            str_reduction = rng.integers(0, reduction + 1, size=n)
+            columns["力量"] = np.maximum(0, columns["力量"] - str_reduction)
+            columns["体型"] = np.maximum(0, columns["体型"] - (reduction - str_reduction))
+
+        # 教育减少
+        if age_config["edu_reduction"] > 0:
+            columns["教育"] = np.maximum(0, columns["教育"] - age_config["edu_reduction"])
+
+        # 力量、体质、敏捷合计减少：每一点等概率落在三项之一，超出部分转移到仍有余量的属性
+        reduction = age_config["str_con_dex_reduction"]
+        if reduction > 0:
+            values = np.stack([columns["力量"], columns["体质"], columns["敏捷"]], axis=1)
+            taken = np.minimum(rng.multinomial(reduction, [1 / 3] * 3, size=n), values)
+            for i in range(3):
+                spill = reduction - taken.sum(axis=1)
+                taken[:, i] += np.minimum(spill, values[:, i] - taken[:, i])
+            values = values - taken
+            columns["力量"], columns["体质"], columns["敏捷"] = values[:, 0], values[:, 1], values[:, 2]
+
+        # 外貌减少
+        if age_config["app_reduction"] > 0:
+            columns["外貌"] = np.maximum(0, columns["外貌"] - age_config["app_reduction"])
+
+        # 教育增强检定
+        for _ in range(age_config["edu_improvement_checks"]):
+            improved = rng.integers(1, 101, size=n) > columns["教育"]
+            increase = rng.integers(1, 11, size=n)
+            columns["教育"] = np.where(improved, np.minimum(99, columns["教育"] + increase), columns["教育"])
+
+        # 幸运值多次掷骰取较好的一次
+        if age_config["luck_rolls"] > 1:
+            luck = rng.integers(1, 7, size=(n, age_config["luck_rolls"], 3)).sum(axis=2) * 5
+            columns["幸运"] = luck.max(axis=1)
+
+    # 衍生属性（规则与core.derived中的声明相同，按列计算）
+    columns["hp"] = (columns["体质"] + columns["体型"]) // 10
+    columns["mp"] = columns["意志"] // 5
+    columns["san"] = columns["意志"].copy()
+
+    bracket = np.searchsorted(DB_BUILD_BOUNDS, columns["力量"] + columns["体型"], side="left")
+    columns["db"] = np.array(DB_TABLE)[bracket]
+    columns["build"] = np.array(BUILD_TABLE)[bracket]
+
+    dex_ge = columns["敏捷"] >= columns["体型"]
+    str_ge = columns["力量"] >= columns["体型"]
+    columns["mov"] = 7 + dex_ge.astype(np.int64) + str_ge.astype(np.int64) - AGE_MOV_PENALTY.get(age_group, 0)
+
+    return columns
+
+
+def _generate_python(config, n, age_group, rng, rules):
+    """NumPy不可用时的纯Python实现"""
+    columns = {name: [] for name in ["age"] + ATTRIBUTE_NAMES}
+
+    age_range = rules.age_range(age_group)
+    age_config = rules.age_groups.get(age_group)
+    dice_specs = [
+        (attr_name, DiceRoller.compile(config.attributes[attr_name]["dice"]), config.attributes[attr_name]["multiplier"])
+        for attr_name in ATTRIBUTE_NAMES
+    ]
+
+    for _ in range(n):
+        attributes = {}
+        for attr_name, dice, multiplier in dice_specs:
+            total = sum(rng.randint(1, dice.num_faces) for _ in range(dice.num_dice)) + dice.modifier
+            attributes[attr_name] = total * multiplier
+
+        if age_config:
+            reduction = age_config["str_siz_reduction"]
+            if reduction > 0:
+                str_reduction = rng.randint(0, reduction)
+                attributes["力量"] = max(0, attributes["力量"] - str_reduction)
+                attributes["体型"] = max(0, attributes["体型"] - (reduction - str_reduction))
+
+            if age_config["edu_reduction"] > 0:
+                attributes["教育"] = max(0, attributes["教育"] - age_config["edu_reduction"])
+
+            reduction = age_config["str_con_dex_reduction"]
+            attrs = ["力量", "体质", "敏捷"]
+            while reduction > 0 and any(attributes[attr] > 0 for attr in attrs):
+                attr = rng.choice(attrs)
+                if attributes[attr] > 0:
+                    attributes[attr] -= 1
+                    reduction -= 1
+
+            if age_config["app_reduction"] > 0:
+                attributes["外貌"] = max(0, attributes["外貌"] - age_config["app_reduction"])
+
+            for _ in range(age_config["edu_improvement_checks"]):
+                if rng.randint(1, 100) > attributes["教育"]:
+                    attributes["教育"] = min(99, attributes["教育"] + rng.randint(1, 10))
+
+            if age_config["luck_rolls"] > 1:
+                attributes["幸运"] = max(
+                    sum(rng.randint(1, 6) for _ in range(3)) * 5
+                    for _ in range(age_config["luck_rolls"])
+                )
+
+        columns["age"].append(rng.randint(age_range[0], age_range[1]))
+        for attr_name in ATTRIBUTE_NAMES:
+            columns[attr_name].append(attributes[attr_name])
+
+    # 衍生属性（规则与core.derived中的声明相同，按列计算）
+    columns["hp"] = [(con + siz) // 10 for con, siz in zip(columns["体质"], columns["体型"])]
+    columns["mp"] = [pow_ // 5 for pow_ in columns["意志"]]
+    columns["san"] = list(columns["意志"])
+
+    brackets = []
+    for str_, siz in zip(columns["力量"], columns["体型"]):
+        str_siz = str_ + siz
+        bracket = 0
+        while bracket < len(DB_BUILD_BOUNDS) and str_siz > DB_BUILD_BOUNDS[bracket]:
+            bracket += 1
+        brackets.append(bracket)
+    columns["db"] = [DB_TABLE[bracket] for bracket in brackets]
+    columns["build"] = [BUILD_TABLE[bracket] for bracket in brackets]
+
+    penalty = AGE_MOV_PENALTY.get(age_group, 0)
+    columns["mov"] = [
+        7 + (dex >= siz) + (str_ >= siz) - penalty
+        for str_, dex, siz in zip(columns["力量"], columns["敏捷"], columns["体型"])
+    ]
+
+    return columns
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+数据目录加载模块
+
+技能、职业、背景和规则数据文件在多处使用（生成器、技能查看器、语系图、界面等），
+本模块让同一进程内的同一数据文件只解析一次：Skills、SkillViewer和界面共用同一份数据。
+
+数据文件修改后（修改时间或大小变化）再次加载时重新解析。数据文件很小，
+直接解析JSON不到1毫秒，因此不在磁盘上保存缓存。
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import os
+import json
+import threading
+
+class DataCatalogue:
+    """数据文件加载器，同一进程内共享已解析的数据"""
+
+    def __init__(self):
+        """初始化数据目录加载器"""
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def load(self, file_path):
+        """加载数据文件
+
+        同一进程内文件未修改时直接返回已加载的同一个对象。
+
+        Args:
+            file_path: JSON数据文件路径
+
+        Returns:
+            解析后的数据（通常为字典）
+        """
+        file_path = os.path.abspath(file_path)
+        with self._lock:
+            stat = os.stat(file_path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            loaded = self._loaded.get(file_path)
+            if loaded is not None and loaded[0] == stamp:
+                return loaded[1]
+
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._loaded[file_path] = (stamp, data)
+            return data
+
+    def invalidate(self, file_path=None):
+        """丢弃进程内已加载的数据
+
+        Args:
+            file_path: 数据文件路径，为None时丢弃全部
+        """
+        with self._lock:
+            if file_path is None:
+                self._loaded.clear()
+            else:
+                self._loaded.pop(os.path.abspath(file_path), None)
+
+# 进程内共享的加载器
+_shared_catalogue = None
+_shared_lock = threading.Lock()
+
+def get_catalogue():
+    """获取进程内共享的数据目录加载器"""
+    global _shared_catalogue
+    with _shared_lock:
+        if _shared_catalogue is None:
+            _shared_catalogue = DataCatalogue()
+        return _shared_catalogue
@@ -0,0 +1,904 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+调查员二进制编码模块
+
+用于工作进程之间传递调查员和缓存，代替 to_dict + JSON：
+- 带版本号，按固定的字段表（schema）编码
+- 属性和技能名称编码为已加载目录中的整数编号，数值不超过255时按uint8保存，否则为int16
+- 固定布局：属性名称与字段表相同、技能以目录的基础技能开头、各专攻组以目录的专攻开头时，
+  这些名称不写入数据，只保存布局之后多出的名称的编号
+- 半值和五分之一值等于属性值整除2和5时不保存，解码时重新计算
+- 字符串字段按字段表中的常用字符串（职业、背景条目、城市等）编码为编号，不在表中的才保存UTF-8文本
+- 不在目录中的名称（如自定义技能）保存在形状的名称表中
+- 字段表（属性名称、技能名称、布局和常用字符串）的CRC32写入数据头，解码时用不同目录的编码器会被发现
+- 衍生属性引擎设置的理智值上限和初始理智值（SANITY_FIELDS）存在时按int32保存
+- 超出范围的数值、非字符串的文本字段、装备等列表字段和其他实例属性（如疯狂状态）以JSON保存在数据末尾，
+  保证解码后的实例属性与编码前相同
+
+生成器生成的调查员编码后约270字节，约为JSON的1/17（见benchmarks/bench_codec.py）。
+编码和解码是纯Python实现，生成器生成的调查员走_encode_common/_decode_common的直线路径，
+往返耗时约为 to_dict + JSON 的0.4倍，主要花在创建技能和专攻字典上，达不到10倍。
+它的用处是减少数据量（缓存、归档、跨进程传递的字节数），不是比pickle更快的进程间传递方式：
+pickle的默认方式由C实现，进程池中比安装编码器后更快。
+
+属性名称、技能名称、专攻的组成和职业技能列表合称"形状"。所有数值一次打包、一次解包，
+解码时调查员的字段一次写入，不逐个调用setattr。
+
+格式（小端序）：
+    数据头    b"COCB"、版本(uint8)、字段表校验值(uint32)、标志(uint16)、形状长度(uint32)
+    形状      属性数、技能数、专攻组数、专攻编号数、职业技能数（各uint16），
+              属性编号、技能编号、每组的主技能编号（使用专攻布局时省略）和专攻编号数、
+              专攻编号、职业技能编号（FLAG_BYTE_IDS时为uint8，否则为uint16），
+              名称表长度(uint32)和以\x1f分隔的UTF-8名称表
+    数值      INT_FIELDS 个 int32（FLAG_SANITY时之后为SANITY_FIELDS 个 int32），之后为属性值、半值、五分之一值、技能值、专攻值
+              （FLAG_BYTE_VALUES时为uint8，否则为int16）
+    字符串    STRING_FIELDS 个字符串编号（常用字符串不超过255个时为uint8，否则为uint16，0表示文本），
+              长度(uint32)和以\x1e分隔的UTF-8文本
+    额外字段  JSON（标志中有FLAG_EXTRA时）
+
+install_pickler(codec)之后，pickle（包括multiprocessing）传递Investigator时使用这种编码，
+发送方和接收方都需要安装同样的编码器（见install_pickler）。只在传递的数据量比耗时更重要时使用。
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import copyreg
+import json
+import struct
+import zlib
+from itertools import repeat
+from operator import attrgetter
+from collections.abc import Mapping
+
+from core.investigator import Investigator
+from core.derived import DB_TABLE
+
+CODEC_MAGIC = b"COCB"
+CODEC_VERSION = 3
+
+HEADER = struct.Struct("<4sBIHI")
+SHAPE_COUNTS = struct.Struct("<HHHHH")
+LENGTH = struct.Struct("<I")
+
+# 标志位
+FLAG_HALF = 1             # 数值中有半值
+FLAG_FIFTH = 2            # 数值中有五分之一值
+FLAG_EXTRA = 4            # 末尾有额外字段JSON
+FLAG_HALF_DERIVED = 8     # 半值等于属性值整除2，不保存
+FLAG_FIFTH_DERIVED = 16   # 五分之一值等于属性值整除5，不保存
+FLAG_ATTR_LAYOUT = 32     # 属性名称与字段表相同，不保存编号
+FLAG_SKILL_LAYOUT = 64    # 技能以技能布局开头，只保存其后的编号
+FLAG_SPEC_LAYOUT = 128    # 专攻组与专攻布局的主技能相同且以布局开头，只保存其后的编号
+FLAG_BYTE_IDS = 256       # 形状中的编号为uint8
+FLAG_BYTE_VALUES = 512    # 属性和技能数值为uint8
+FLAG_SANITY = 1024        # 数值中有SANITY_FIELDS
+
+# 影响形状解码的标志
+SHAPE_FLAGS = FLAG_ATTR_LAYOUT | FLAG_SKILL_LAYOUT | FLAG_SPEC_LAYOUT | FLAG_BYTE_IDS
+
+# 生成器生成的调查员的标志（见InvestigatorCodec._encode_common）
+COMMON_FLAGS = (FLAG_HALF_DERIVED | FLAG_FIFTH_DERIVED | FLAG_ATTR_LAYOUT | FLAG_SKILL_LAYOUT
+                | FLAG_SPEC_LAYOUT | FLAG_BYTE_IDS | FLAG_BYTE_VALUES)
+
+# 按int32保存的字段
+INT_FIELDS = (
+    "age", "hp", "mp", "san", "armor", "build", "mov", "cash",
+    "occupation_skill_points", "occupation_skill_points_allocated",
+    "interest_skill_points", "interest_skill_points_allocated"
+)
+
+# 衍生属性引擎设置的字段（Investigator()中没有），都存在且为整数时接在INT_FIELDS之后按int32保存
+SANITY_FIELDS = ("max_san", "initial_san")
+
+# 按字符串保存的字段
+STRING_FIELDS = (
+    "name", "player", "occupation", "gender", "residence", "birthplace", "db",
+    "personal_description", "ideology", "significant_people", "meaningful_locations",
+    "treasured_possessions", "traits", "injuries_scars", "phobias_manias",
+    "arcane_tomes_spells", "background_story", "assets", "spending_level"
+)
+
+# 字符串字段之间的分隔符
+FIELD_SEPARATOR = "\x1e"
+
+# 名称表中各项的分隔符
+LIST_SEPARATOR = "\x1f"
+
+# 默认值为空列表或空字符串、只在非空时写入额外字段的字段
+EXTRA_DEFAULTS = {
+    "file_path": "",
+    "equipment": [],
+    "items": [],
+    "weapons": []
+}
+EXTRA_DEFAULT_VALUES = tuple(EXTRA_DEFAULTS.values())
+
+# 按固定位置编码的字段，调查员的其他实例属性以JSON保存在额外字段中
+FIXED_FIELDS = frozenset(INT_FIELDS + STRING_FIELDS + tuple(EXTRA_DEFAULTS) + (
+    "attributes", "attribute_half", "attribute_fifth", "skills", "skill_specializations", "occupation_skills"
+))
+
+# 生成器和界面中常见的字符串取值
+COMMON_STRINGS = ("男", "女", "随机调查员", "玩家", "无特殊资产") + tuple(DB_TABLE)
+
+# 一次取出多个字段
+_get_ints = attrgetter(*INT_FIELDS)
+_get_strings = attrgetter(*STRING_FIELDS)
+_get_extras = attrgetter(*EXTRA_DEFAULTS)
+_get_sanity = attrgetter(*SANITY_FIELDS)
+
+INTS = struct.Struct(f"<{len(INT_FIELDS)}i")
+SANITY_INTS = struct.Struct(f"<{len(INT_FIELDS) + len(SANITY_FIELDS)}i")
+EMPTY_LENGTH = LENGTH.pack(0)
+
+# 各缓存的容量
+CACHE_SIZE = 256
+
+def _cache_put(cache, key, value):
+    """写入容量有限的缓存"""
+    if len(cache) >= CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+    return value
+
+def _fits(values, code):
+    """数值能否按给定的struct格式打包"""
+    try:
+        struct.pack(f"<{len(values)}{code}", *values)
+        return True
+    except struct.error:
+        return False
+
+def _other_fields(investigator):
+    """调查员中不按固定位置编码的实例属性（如max_san、疯狂状态）
+
+    Returns:
+        字段名称到取值的新字典
+    """
+    state = getattr(investigator, "__dict__", None)
+    if state is None:
+        # 用__slots__保存字段的调查员（CompactInvestigator）只有未设置时不存在的可选字段
+        from core.compact import OPTIONAL_FIELDS
+        return {field: getattr(investigator, field) for field in OPTIONAL_FIELDS if hasattr(investigator, field)}
+    if len(state) == len(FIXED_FIELDS):
+        return {}
+    return {field: value for field, value in state.items() if field not in FIXED_FIELDS}
+
+def _json_default(value):
+    """JSON编码额外字段时把字典视图（如CompactInvestigator的字段）转换为字典"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class InvestigatorCodec:
+    """调查员二进制编码器"""
+
+    def __init__(self, attribute_names, skill_names, skill_layout=(), spec_layout=(), strings=()):
+        """初始化编码器
+
+        Args:
+            attribute_names: 属性名称序列，顺序决定编号
+            skill_names: 技能名称序列（包括专攻技能的完整名称），顺序决定编号
+            skill_layout: 技能布局，调查员的技能通常以这些名称开头（如目录的基础技能）
+            spec_layout: 专攻布局，((主技能名称, 专攻名称序列), ...)，调查员的专攻通常以此开头
+            strings: 常用字符串序列，字符串字段取这些值时只保存编号
+        """
+        self.attribute_names = tuple(attribute_names)
+        self.skill_names = tuple(dict.fromkeys(skill_names))
+        self.skill_layout = tuple(skill_layout)
+        self.spec_layout = tuple((main_skill, tuple(fulls)) for main_skill, fulls in spec_layout)
+        self.strings = tuple(dict.fromkeys(string for string in strings if string))
+        self.attribute_ids = {name: i for i, name in enumerate(self.attribute_names)}
+        self.skill_ids = {name: i for i, name in enumerate(self.skill_names)}
+        # 编号0表示文本，空字符串固定为编号1
+        self.string_table = (None, "") + self.strings
+        self.string_ids = {string: i for i, string in enumerate(self.string_table) if i}
+        self._string_struct = struct.Struct(f"<{len(STRING_FIELDS)}{'B' if len(self.string_table) <= 256 else 'H'}")
+        schema = json.dumps([self.attribute_names, self.skill_names, self.skill_layout,
+                             self.spec_layout, self.strings], ensure_ascii=False)
+        self.fingerprint = zlib.crc32(schema.encode("utf-8"))
+        # 有技能布局和专攻布局时，常见的调查员按COMMON_FLAGS直接编码
+        self._spec_mains = tuple(main_skill for main_skill, _ in self.spec_layout)
+        self._common = bool(self.skill_layout and self.spec_layout)
+        # 形状字节串 -> 名称
+        self._decode_cache = {}
+        # (int32个数, 数值个数, 格式) -> 预编译的struct
+        self._value_structs = {}
+
+    @classmethod
+    def from_skill_index(cls, skill_index):
+        """由技能目录索引创建编码器
+
+        Args:
+            skill_index: 技能目录索引（Skills.index）
+
+        Returns:
+            InvestigatorCodec对象
+        """
+        attribute_names = tuple(Investigator().attributes)
+        skill_names = skill_index.names + tuple(name for _, name in skill_index.expanded)
+        return cls(attribute_names, skill_names, tuple(skill_index.base_value_map),
+                   tuple(skill_index.specialization_base_values.items()), COMMON_STRINGS)
+
+    @classmethod
+    def from_generator(cls, generator):
+        """由生成器使用的目录创建编码器
+
+        除技能目录外，还包括职业技能列表中的名称和语族中的全部语言，
+        生成的调查员的技能名称都在字段表中，形状不需要名称表。
+        常用字符串包括职业名称、背景条目、随机城市和常见取值。
+
+        Args:
+            generator: InvestigatorGenerator对象
+
+        Returns:
+            InvestigatorCodec对象
+        """
+        from core.generator import RANDOM_CITIES
+
+        index = generator.skills.index
+        skill_names = list(index.names)
+        skill_names.extend(name for _, name in index.expanded)
+        for occupation in generator.occupations.occupations.values():
+            skill_names.extend(name for name in occupation.get("skills", []) if isinstance(name, str))
+        for languages in index.language_families.values():
+            skill_names.extend(f"语言（{language}）" for language in languages)
+
+        backgrounds = generator.backgrounds
+        strings = list(COMMON_STRINGS)
+        strings.extend(generator.occupations.occupations)
+        strings.extend(RANDOM_CITIES)
+        for entries in (backgrounds.get_personal_descriptions(), backgrounds.get_ideology_beliefs(),
+                        backgrounds.get_meaningful_locations(), backgrounds.get_treasured_possessions(),
+                        backgrounds.get_traits()):
+            strings.extend(entries)
+        # 生成器的重要之人由"谁"和"为什么"以空格连接
+        strings.extend(f"{who} {why}" for who in backgrounds.get_significant_people_who()
+                       for why in backgrounds.get_significant_people_why())
+
+        return cls(tuple(Investigator().attributes), skill_names, tuple(index.base_value_map),
+                   tuple(index.specialization_base_values.items()), strings)
+
+    def __reduce__(self):
+        return (InvestigatorCodec, (self.attribute_names, self.skill_names, self.skill_layout,
+                                    self.spec_layout, self.strings))
+
+    def _value_struct(self, int_count, count, code):
+        """取得打包int_count个int32和count个数值的struct"""
+        key = (int_count, count, code)
+        values = self._value_structs.get(key)
+        if values is None:
+            values = self._value_structs[key] = struct.Struct(f"<{int_count}i{count}{code}")
+        return values
+
+    def _pack_shape(self, attr_names, skill_names, spec_groups, occupation_skills):
+        """编码形状
+
+        与固定布局相同的部分不保存编号；不在字段表中的名称（如自定义技能）保存在形状末尾的名称表中，
+        编号为字段表长度加上在名称表中的位置。
+
+        Returns:
+            (标志, 字节串)，名称中含有分隔符或数量超出uint16时返回None
+        """
+        flags = 0
+        if attr_names == self.attribute_names:
+            flags |= FLAG_ATTR_LAYOUT
+            attr_names = ()
+
+        layout = self.skill_layout
+        if layout and skill_names[:len(layout)] == layout:
+            flags |= FLAG_SKILL_LAYOUT
+            skill_names = skill_names[len(layout):]
+
+        spec_layout = self.spec_layout
+        if spec_layout and len(spec_groups) == len(spec_layout) and all(
+            main_skill == layout_main and fulls[:len(layout_fulls)] == layout_fulls
+            for (main_skill, fulls), (layout_main, layout_fulls) in zip(spec_groups, spec_layout)
+        ):
+            flags |= FLAG_SPEC_LAYOUT
+            spec_groups = [(None, fulls[len(layout_fulls):])
+                           for (_, fulls), (_, layout_fulls) in zip(spec_groups, spec_layout)]
+
+        attribute_ids = self.attribute_ids
+        skill_ids = self.skill_ids
+        main_skills = [main_skill for main_skill, _ in spec_groups if main_skill is not None]
+        sizes = [len(fulls) for _, fulls in spec_groups]
+        spec_names = [name for _, fulls in spec_groups for name in fulls]
+        local_names = {}
+        try:
+            ids = list(map(attribute_ids.__getitem__, attr_names))
+            ids.extend(map(skill_ids.__getitem__, skill_names))
+            heads = list(map(skill_ids.__getitem__, main_skills))
+            spec_ids = list(map(skill_ids.__getitem__, spec_names))
+            occupation_ids = list(map(skill_ids.__getitem__, occupation_skills))
+        except KeyError:
+            def ids_of(names, table):
+                ids = []
+                for name in names:
+                    name_id = table.get(name)
+                    if name_id is None:
+                        name_id = len(table) + local_names.setdefault(name, len(local_names))
+                    ids.append(name_id)
+                return ids
+
+            ids = ids_of(attr_names, attribute_ids)
+            ids.extend(ids_of(skill_names, skill_ids))
+            heads = ids_of(main_skills, skill_ids)
+            spec_ids = ids_of(spec_names, skill_ids)
+            occupation_ids = ids_of(occupation_skills, skill_ids)
+
+        # 每组为主技能编号和专攻数（使用专攻布局时只有专攻数），之后为全部专攻编号和职业技能编号
+        if heads:
+            ids.extend(value for pair in zip(heads, sizes) for value in pair)
+        else:
+            ids.extend(sizes)
+        ids.extend(spec_ids)
+        ids.extend(occupation_ids)
+
+        if any(LIST_SEPARATOR in name for name in local_names):
+            return None
+        local = LIST_SEPARATOR.join(local_names).encode("utf-8")
+        code = "B"
+        if ids and max(ids) > 255:
+            code = "H"
+        else:
+            flags |= FLAG_BYTE_IDS
+        try:
+            counts = SHAPE_COUNTS.pack(len(attr_names), len(skill_names), len(spec_groups), len(spec_ids),
+                                       len(occupation_skills))
+            return flags, b"".join([counts, struct.pack(f"<{len(ids)}{code}", *ids), LENGTH.pack(len(local)), local])
+        except struct.error:
+            return None
+
+    def _unpack_shape(self, data, offset, flags):
+        """解码形状
+
+        Returns:
+            (属性名称元组, 技能名称元组, 专攻的组成, 专攻数, 职业技能元组)
+        """
+        attr_count, skill_count, group_count, spec_ids, occupation_count = SHAPE_COUNTS.unpack_from(data, offset)
+        offset += SHAPE_COUNTS.size
+        spec_layout = flags & FLAG_SPEC_LAYOUT
+        id_count = attr_count + skill_count + (1 if spec_layout else 2) * group_count + spec_ids + occupation_count
+        width = 1 if flags & FLAG_BYTE_IDS else 2
+        end = offset + width * id_count
+        (length,) = LENGTH.unpack_from(data, end)
+
+        key = None
+        if length:
+            # 有名称表时编号的含义取决于名称表，不使用缓存
+            local_names = tuple(bytes(data[end + LENGTH.size:end + LENGTH.size + length]).decode("utf-8").split(LIST_SEPARATOR))
+        else:
+            key = (flags & SHAPE_FLAGS, bytes(data[offset - SHAPE_COUNTS.size:end]))
+            shape = self._decode_cache.get(key)
+            if shape is not None:
+                return shape
+            local_names = ()
+
+        ids = struct.unpack_from(f"<{id_count}{'B' if width == 1 else 'H'}", data, offset)
+        attribute_table = self.attribute_names + local_names
+        skill_table = self.skill_names + local_names
+        try:
+            if flags & FLAG_ATTR_LAYOUT:
+                attr_names = self.attribute_names
+            else:
+                attr_names = tuple(map(attribute_table.__getitem__, ids[:attr_count]))
+            position = attr_count
+            skill_names = tuple(map(skill_table.__getitem__, ids[position:position + skill_count]))
+            position += skill_count
+            if flags & FLAG_SKILL_LAYOUT:
+                skill_names = self.skill_layout + skill_names
+
+            if spec_layout:
+                if group_count != len(self.spec_layout):
+                    raise ValueError("专攻组数与专攻布局不一致")
+                heads = self.spec_layout
+                sizes = ids[position:position + group_count]
+                position += group_count
+            else:
+                heads = [(skill_table[ids[position + 2 * i]], ()) for i in range(group_count)]
+                sizes = ids[position + 1:position + 2 * group_count:2]
+                position += 2 * group_count
+            spec_groups = []
+            for (main_skill, layout_fulls), size in zip(heads, sizes):
+                tail = tuple(map(skill_table.__getitem__, ids[position:position + size]))
+                spec_groups.append((main_skill, layout_fulls + tail))
+                position += size
+            occupation_skills = tuple(map(skill_table.__getitem__, ids[position:position + occupation_count]))
+        except IndexError:
+            raise ValueError("名称编号超出范围")
+
+        spec_groups = tuple(spec_groups)
+        shape = (attr_names, skill_names, spec_groups, sum(len(fulls) for _, fulls in spec_groups), occupation_skills)
+        if key is not None:
+            _cache_put(self._decode_cache, key, shape)
+        return shape
+
+    def encode(self, investigator):
+        """编码调查员
+
+        Args:
+            investigator: Investigator对象
+
+        Returns:
+            bytes
+        """
+        if self._common:
+            try:
+                data = self._encode_common(investigator)
+            except (struct.error, TypeError, ValueError, KeyError, AttributeError):
+                data = None
+            if data is not None:
+                return data
+        try:
+            return self._encode(investigator, checked=False)
+        except (struct.error, TypeError):
+            # 有超出范围或不是整数的值：逐项检查，把不能打包的部分放到额外字段中
+            return self._encode(investigator, checked=True)
+
+    def _encode_common(self, investigator):
+        """按COMMON_FLAGS编码常见的调查员（生成器生成的调查员都是这种情况）
+
+        属性名称与字段表相同，技能和专攻以布局开头且名称都在字段表中，数值都在0-255之间，
+        半值和五分之一值可以由属性值算出，没有额外字段。与_encode的结果相同，但不逐项判断各种情况，
+        数值直接转换为bytes（超出范围时抛出ValueError）。
+
+        Args:
+            investigator: Investigator对象
+
+        Returns:
+            bytes，不是这种情况时返回None（名称不在字段表中等情况由调用方捕获异常）
+        """
+        state = investigator.__dict__
+        if len(state) == len(FIXED_FIELDS):
+            sanity = None
+        elif len(state) == len(FIXED_FIELDS) + len(SANITY_FIELDS):
+            sanity = _get_sanity(investigator)
+        else:
+            return None
+
+        attr_names = self.attribute_names
+        attributes = investigator.attributes
+        half = investigator.attribute_half
+        fifth = investigator.attribute_fifth
+        values = list(attributes.values())
+        if (tuple(attributes) != attr_names or tuple(half) != attr_names or tuple(fifth) != attr_names
+                or list(half.values()) != [value // 2 for value in values]
+                or list(fifth.values()) != [value // 5 for value in values]):
+            return None
+
+        skills = investigator.skills
+        skill_names = tuple(skills)
+        layout_size = len(self.skill_layout)
+        if skill_names[:layout_size] != self.skill_layout:
+            return None
+        skill_ids = self.skill_ids
+        ids = list(map(skill_ids.__getitem__, skill_names[layout_size:]))
+        values.extend(skills.values())
+
+        specializations = investigator.skill_specializations
+        if tuple(specializations) != self._spec_mains:
+            return None
+        spec_names = []
+        for (_, layout_fulls), group in zip(self.spec_layout, specializations.values()):
+            fulls = tuple(group)
+            if fulls[:len(layout_fulls)] != layout_fulls:
+                return None
+            ids.append(len(fulls) - len(layout_fulls))
+            spec_names.extend(fulls[len(layout_fulls):])
+            values.extend(group.values())
+        ids.extend(map(skill_ids.__getitem__, spec_names))
+
+        occupation_skills = investigator.occupation_skills
+        if type(occupation_skills) is not list:
+            return None
+        ids.extend(map(skill_ids.__getitem__, occupation_skills))
+
+        if _get_extras(investigator) != EXTRA_DEFAULT_VALUES:
+            return None
+        strings = _get_strings(investigator)
+        string_ids = list(map(self.string_ids.get, strings, repeat(0)))
+        text = b""
+        if 0 in string_ids:
+            texts = [value for value, string_id in zip(strings, string_ids) if not string_id]
+            if not all(type(value) is str and FIELD_SEPARATOR not in value for value in texts):
+                return None
+            text = FIELD_SEPARATOR.join(texts).encode("utf-8")
+
+        shape = b"".join((
+            SHAPE_COUNTS.pack(0, len(skill_names) - layout_size, len(self.spec_layout), len(spec_names),
+                              len(occupation_skills)),
+            bytes(ids),
+            EMPTY_LENGTH
+        ))
+        flags = COMMON_FLAGS
+        if sanity is None:
+            ints = INTS.pack(*_get_ints(investigator))
+        else:
+            flags |= FLAG_SANITY
+            ints = SANITY_INTS.pack(*_get_ints(investigator), *sanity)
+        return b"".join((
+            HEADER.pack(CODEC_MAGIC, CODEC_VERSION, self.fingerprint, flags, len(shape)),
+            shape,
+            ints,
+            bytes(values),
+            self._string_struct.pack(*string_ids),
+            LENGTH.pack(len(text)),
+            text
+        ))
+
+    def _encode(self, investigator, checked):
+        """编码调查员
+
+        Args:
+            investigator: Investigator对象
+            checked: 是否逐项检查数值能否打包（为False时由struct.pack抛出异常）
+        """
+        extra = _other_fields(investigator)
+        flags = 0
+
+        ints = list(_get_ints(investigator))
+        if checked and not _fits(ints, "i"):
+            extra.update(zip(INT_FIELDS, ints))
+            ints = [0] * len(INT_FIELDS)
+        if all(field in extra for field in SANITY_FIELDS):
+            sanity = [extra[field] for field in SANITY_FIELDS]
+            if not checked or _fits(sanity, "i"):
+                flags |= FLAG_SANITY
+                ints.extend(sanity)
+                for field in SANITY_FIELDS:
+                    del extra[field]
+
+        attributes = investigator.attributes
+        attr_names = tuple(attributes)
+        attr_values = list(attributes.values())
+        if checked and not _fits(attr_values, "h"):
+            attr_names = None
+
+        skills = investigator.skills
+        skill_names = tuple(skills)
+        if checked and not _fits(list(skills.values()), "h"):
+            skill_names = None
+
+        spec_groups = []
+        spec_values = []
+        for main_skill, specializations in investigator.skill_specializations.items():
+            if not isinstance(specializations, Mapping):
+                spec_groups = None
+                break
+            spec_groups.append((main_skill, tuple(specializations)))
+            spec_values.extend(specializations.values())
+        if spec_groups is not None:
+            spec_groups = tuple(spec_groups)
+            if checked and not _fits(spec_values, "h"):
+                spec_groups = None
+
+        occupation_skills = investigator.occupation_skills
+        if isinstance(occupation_skills, list) and all(type(skill) is str for skill in occupation_skills):
+            occupation_skills = tuple(occupation_skills)
+        else:
+            extra["occupation_skills"] = occupation_skills
+            occupation_skills = ()
+
+        # 半值和五分之一值通常可以由属性值算出，不保存；否则与属性的名称和顺序相同时只保存数值
+        half = investigator.attribute_half
+        half_values = list(half.values())
+        fifth = investigator.attribute_fifth
+        fifth_values = list(fifth.values())
+        if attr_names:
+            if tuple(half) == attr_names:
+                if checked and not all(type(value) is int for value in attr_values):
+                    pass
+                elif half_values == [value // 2 for value in attr_values]:
+                    flags |= FLAG_HALF_DERIVED
+                if not flags & FLAG_HALF_DERIVED and (not checked or _fits(half_values, "h")):
+                    flags |= FLAG_HALF
+            if tuple(fifth) == attr_names:
+                if checked and not all(type(value) is int for value in attr_values):
+                    pass
+                elif fifth_values == [value // 5 for value in attr_values]:
+                    flags |= FLAG_FIFTH_DERIVED
+                if not flags & FLAG_FIFTH_DERIVED and (not checked or _fits(fifth_values, "h")):
+                    flags |= FLAG_FIFTH
+
+        shape = None
+        if attr_names is not None and skill_names is not None and spec_groups is not None:
+            shape = self._pack_shape(attr_names, skill_names, spec_groups, occupation_skills)
+        if shape is None:
+            # 有不能打包的值或名称中含有分隔符：把这些部分放到额外字段中
+            if attr_names is None or self._pack_shape(attr_names, (), (), ()) is None:
+                attr_names = None
+                flags &= ~(FLAG_HALF | FLAG_FIFTH | FLAG_HALF_DERIVED | FLAG_FIFTH_DERIVED)
+            if skill_names is None or self._pack_shape((), skill_names, (), ()) is None:
+                skill_names = None
+            if spec_groups is None or self._pack_shape((), (), spec_groups, ()) is None:
+                spec_groups = None
+            if occupation_skills and self._pack_shape((), (), (), occupation_skills) is None:
+                extra["occupation_skills"] = list(occupation_skills)
+                occupation_skills = ()
+            shape = self._pack_shape(attr_names or (), skill_names or (), spec_groups or (), occupation_skills)
+        shape_flags, shape = shape
+        flags |= shape_flags
+
+        values = []
+        if attr_names is None:
+            extra["attributes"] = attributes
+        else:
+            values.extend(attr_values)
+        if flags & FLAG_HALF:
+            values.extend(half_values)
+        elif not flags & FLAG_HALF_DERIVED:
+            extra["attribute_half"] = half
+        if flags & FLAG_FIFTH:
+            values.extend(fifth_values)
+        elif not flags & FLAG_FIFTH_DERIVED:
+            extra["attribute_fifth"] = fifth
+        if skill_names is None:
+            extra["skills"] = skills
+        else:
+            values.extend(skills.values())
+        if spec_groups is None:
+            extra["skill_specializations"] = investigator.skill_specializations
+        else:
+            values.extend(spec_values)
+        code = "h"
+        if not values or (min(values) >= 0 and max(values) <= 255):
+            code = "B"
+            flags |= FLAG_BYTE_VALUES
+
+        strings = _get_strings(investigator)
+        string_ids = list(map(self.string_ids.get, strings, repeat(0))) if not checked else [
+            self.string_ids.get(value, 0) if type(value) is str else 0 for value in strings
+        ]
+        texts = []
+        if 0 in string_ids:
+            for field, string_id, value in zip(STRING_FIELDS, string_ids, strings):
+                if string_id:
+                    continue
+                if isinstance(value, str) and FIELD_SEPARATOR not in value:
+                    texts.append(value)
+                else:
+                    texts.append("")
+                    extra[field] = value
+        text = FIELD_SEPARATOR.join(texts).encode("utf-8")
+
+        extras = _get_extras(investigator)
+        if extras != EXTRA_DEFAULT_VALUES:
+            for field, value, default in zip(EXTRA_DEFAULTS, extras, EXTRA_DEFAULT_VALUES):
+                if value != default:
+                    extra[field] = value
+
+        if extra:
+            flags |= FLAG_EXTRA
+        ints.extend(values)
+        parts = [
+            HEADER.pack(CODEC_MAGIC, CODEC_VERSION, self.fingerprint, flags, len(shape)),
+            shape,
+            self._value_struct(len(ints) - len(values), len(values), code).pack(*ints),
+            self._string_struct.pack(*string_ids),
+            LENGTH.pack(len(text)),
+            text
+        ]
+        if extra:
+            parts.append(json.dumps(extra, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8"))
+        return b"".join(parts)
+
+    def decode(self, data):
+        """解码调查员
+
+        Args:
+            data: encode()得到的字节串
+
+        Returns:
+            Investigator对象
+
+        Raises:
+            ValueError: 数据格式、版本或字段表与编码器不一致，或数据不完整
+        """
+        try:
+            return self._decode(data)
+        except struct.error as e:
+            raise ValueError(f"调查员二进制数据不完整: {e}")
+
+    def _decode(self, data):
+        """解码调查员（数据不完整时由struct抛出异常）"""
+        magic, version, fingerprint, flags, shape_length = HEADER.unpack_from(data)
+        if magic != CODEC_MAGIC:
+            raise ValueError("不是调查员二进制数据")
+        if version != CODEC_VERSION:
+            raise ValueError(f"不支持的编码版本: {version}")
+        if fingerprint != self.fingerprint:
+            raise ValueError("编码时使用的技能目录与当前目录不一致")
+
+        if flags & ~FLAG_SANITY == COMMON_FLAGS:
+            investigator = self._decode_common(data, flags, shape_length)
+            if investigator is not None:
+                return investigator
+
+        offset = HEADER.size
+        attr_names, skill_names, spec_groups, spec_count, occupation_skills = self._unpack_shape(data, offset, flags)
+        offset += shape_length
+        attr_count = len(attr_names)
+        half_count = attr_count if flags & FLAG_HALF else 0
+        fifth_count = attr_count if flags & FLAG_FIFTH else 0
+        skill_count = len(skill_names)
+        int_fields = INT_FIELDS + SANITY_FIELDS if flags & FLAG_SANITY else INT_FIELDS
+        value_struct = self._value_struct(len(int_fields),
+                                          attr_count + half_count + fifth_count + skill_count + spec_count,
+                                          "B" if flags & FLAG_BYTE_VALUES else "h")
+        values = value_struct.unpack_from(data, offset)
+        offset += value_struct.size
+
+        investigator = Investigator.__new__(Investigator)
+        state = investigator.__dict__
+        state.update(zip(int_fields, values))
+        start = len(int_fields)
+        attr_values = values[start:start + attr_count]
+        state["attributes"] = dict(zip(attr_names, attr_values))
+        start += attr_count
+        if flags & FLAG_HALF_DERIVED:
+            state["attribute_half"] = {name: value // 2 for name, value in zip(attr_names, attr_values)}
+        else:
+            state["attribute_half"] = dict(zip(attr_names, values[start:start + half_count]))
+        start += half_count
+        if flags & FLAG_FIFTH_DERIVED:
+            state["attribute_fifth"] = {name: value // 5 for name, value in zip(attr_names, attr_values)}
+        else:
+            state["attribute_fifth"] = dict(zip(attr_names, values[start:start + fifth_count]))
+        start += fifth_count
+        state["skills"] = dict(zip(skill_names, values[start:start + skill_count]))
+        start += skill_count
+        specializations = {}
+        for main_skill, fulls in spec_groups:
+            specializations[main_skill] = dict(zip(fulls, values[start:start + len(fulls)]))
+            start += len(fulls)
+        state["skill_specializations"] = specializations
+        state["occupation_skills"] = list(occupation_skills)
+        offset = self._unpack_strings(data, offset, state)
+
+        if flags & FLAG_EXTRA:
+            for field, value in json.loads(bytes(data[offset:]).decode("utf-8")).items():
+                setattr(investigator, field, value)
+        return investigator
+
+    def _decode_common(self, data, flags, shape_length):
+        """解码标志为COMMON_FLAGS（可以带FLAG_SANITY）的数据
+
+        名称直接由uint8编号查表，数值直接取自字节串，不经过形状缓存和逐项的标志判断。
+
+        Returns:
+            Investigator对象，形状中有名称表时返回None（由_decode处理）
+        """
+        offset = HEADER.size
+        attr_count, skill_count, group_count, spec_count, occupation_count = SHAPE_COUNTS.unpack_from(data, offset)
+        offset += SHAPE_COUNTS.size + attr_count
+        end = offset + skill_count + group_count + spec_count + occupation_count
+        (length,) = LENGTH.unpack_from(data, end)
+        if length:
+            return None
+        if group_count != len(self.spec_layout):
+            raise ValueError("专攻组数与专攻布局不一致")
+
+        ids = data[offset:end]
+        name_of = self.skill_names.__getitem__
+        try:
+            skill_names = self.skill_layout + tuple(map(name_of, ids[:skill_count]))
+            position = skill_count + group_count
+            spec_groups = []
+            for (main_skill, layout_fulls), size in zip(self.spec_layout, ids[skill_count:position]):
+                spec_groups.append((main_skill, layout_fulls + tuple(map(name_of, ids[position:position + size]))))
+                position += size
+            occupation_skills = list(map(name_of, ids[position:position + occupation_count]))
+        except IndexError:
+            raise ValueError("名称编号超出范围")
+
+        offset = HEADER.size + shape_length
+        if flags & FLAG_SANITY:
+            int_fields = INT_FIELDS + SANITY_FIELDS
+            ints = SANITY_INTS.unpack_from(data, offset)
+            offset += SANITY_INTS.size
+        else:
+            int_fields = INT_FIELDS
+            ints = INTS.unpack_from(data, offset)
+            offset += INTS.size
+        attr_names = self.attribute_names
+        attr_count = len(attr_names)
+        start = attr_count + len(skill_names)
+        count = start + sum(len(fulls) for _, fulls in spec_groups)
+        values = data[offset:offset + count]
+        if len(values) != count:
+            raise ValueError("调查员二进制数据不完整")
+        offset += count
+
+        investigator = Investigator.__new__(Investigator)
+        state = investigator.__dict__
+        state.update(zip(int_fields, ints))
+        attr_values = values[:attr_count]
+        state["attributes"] = dict(zip(attr_names, attr_values))
+        state["attribute_half"] = {name: value // 2 for name, value in zip(attr_names, attr_values)}
+        state["attribute_fifth"] = {name: value // 5 for name, value in zip(attr_names, attr_values)}
+        state["skills"] = dict(zip(skill_names, values[attr_count:start]))
+        specializations = {}
+        for main_skill, fulls in spec_groups:
+            specializations[main_skill] = dict(zip(fulls, values[start:start + len(fulls)]))
+            start += len(fulls)
+        state["skill_specializations"] = specializations
+        state["occupation_skills"] = occupation_skills
+        self._unpack_strings(data, offset, state)
+        return investigator
+
+    def _unpack_strings(self, data, offset, state):
+        """解码字符串字段，并写入默认的列表字段
+
+        Args:
+            data: 数据
+            offset: 字符串编号的位置
+            state: 调查员的__dict__
+
+        Returns:
+            字符串之后的位置
+        """
+        string_ids = self._string_struct.unpack_from(data, offset)
+        offset += self._string_struct.size
+        (length,) = LENGTH.unpack_from(data, offset)
+        offset += LENGTH.size
+        try:
+            strings = list(map(self.string_table.__getitem__, string_ids))
+        except IndexError:
+            raise ValueError("字符串编号超出范围")
+        if None in strings:
+            # 文本只有一项且为空时（原值以JSON保存在额外字段中）长度为0
+            texts = iter(bytes(data[offset:offset + length]).decode("utf-8").split(FIELD_SEPARATOR))
+            strings = [next(texts, "") if string is None else string for string in strings]
+        state.update(zip(STRING_FIELDS, strings))
+
+        state["file_path"] = ""
+        state["equipment"] = []
+        state["items"] = []
+        state["weapons"] = []
+        return offset + length
+
+# 已安装的编码器（字段表校验值到编码器），pickle还原调查员时按数据头中的校验值查找
+_INSTALLED = {}
+
+# pickle保存调查员时使用的编码器（最后一次安装的编码器）
+_pickle_codec = None
+
+def _unpickle_investigator(data):
+    """pickle还原调查员"""
+    magic, version, fingerprint, flags, shape_length = HEADER.unpack_from(data)
+    codec = _INSTALLED.get(fingerprint)
+    if codec is None:
+        raise ValueError("当前进程没有安装与数据一致的调查员编码器，请先调用install_pickler()")
+    return codec.decode(data)
+
+def _reduce_investigator(investigator):
+    """pickle保存调查员"""
+    return (_unpickle_investigator, (_pickle_codec.encode(investigator),))
+
+def install_pickler(codec):
+    """让pickle（包括multiprocessing）用二进制编码传递Investigator
+
+    pickle的数据约为默认方式的1/4，但编码和解码是纯Python实现，进程池往返仍比默认方式慢（约1.3倍，见benchmarks/bench_codec.py），
+    只在传递的数据量比耗时更重要时使用（如通过管道或网络传递大量调查员）。
+    数据中只有字段表的校验值，接收方也必须安装同样的编码器。
+    使用进程池时可以把它作为初始化函数：
+        Pool(initializer=install_pickler, initargs=(codec,))
+    编码器本身可以pickle，会随initargs传递到工作进程中。
+
+    Args:
+        codec: InvestigatorCodec对象
+    """
+    global _pickle_codec
+    _INSTALLED[codec.fingerprint] = codec
+    _pickle_codec = codec
+    copyreg.pickle(Investigator, _reduce_investigator)
+
+def uninstall_pickler():
+    """恢复pickle传递Investigator的默认方式"""
+    global _pickle_codec
+    copyreg.dispatch_table.pop(Investigator, None)
+    _INSTALLED.clear()
+    _pickle_codec = None
@@ -0,0 +1,573 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+紧凑调查员模块
+
+Investigator的每个对象带有约40个实例属性和若干以中文名称为键的字典，
+在几十万、上百万名调查员的调查员池中，每个对象的固定开销远大于数据本身。
+CompactInvestigator用__slots__保存标量字段，全部整数数值放在一个int16数组中：
+
+    [属性 | 半值 | 五分之一值 | 技能 | 技能专攻]
+
+数组中各段的顺序由所有对象共享的CompactLayout决定，缺失的项记为MISSING。
+不在布局中的技能名称、超出int16范围或不是整数的数值放在按需创建的附加字典中。
+
+attributes、skills、skill_specializations等字段以字典视图的形式访问，
+读写都直接作用于数组，原有的 investigator.skills[name] = value 等写法不需要修改；
+计算衍生属性、添加技能等方法与Investigator共用同一份实现。
+
+视图按布局顺序遍历，与原字典的插入顺序可能不同；技能专攻按名称前缀
+（"格斗（斗殴）"属于"格斗"）分组，没有专攻的主技能视为不存在；
+整体赋值时不能这样表示的专攻字典（如含有空分组）原样保存。
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import sys
+import copy
+from array import array
+from collections.abc import MutableMapping
+from core.investigator import Investigator
+from core.codec import InvestigatorCodec
+
+# 数组中表示"没有该项"的值
+MISSING = -32768
+VALUE_MIN = -32767
+VALUE_MAX = 32767
+
+# 标量字段及其默认值（与Investigator.__init__一致）
+SCALAR_FIELDS = (
+    ("name", ""), ("player", ""), ("occupation", ""), ("age", 0),
+    ("gender", ""), ("residence", ""), ("birthplace", ""), ("file_path", ""),
+    ("hp", 0), ("mp", 0), ("san", 0), ("armor", 0), ("db", "0"), ("build", 0), ("mov", 0),
+    ("occupation_skill_points", 0), ("occupation_skill_points_allocated", 0),
+    ("interest_skill_points", 0), ("interest_skill_points_allocated", 0),
+    ("personal_description", ""), ("ideology", ""), ("significant_people", ""),
+    ("meaningful_locations", ""), ("treasured_possessions", ""), ("traits", ""),
+    ("injuries_scars", ""), ("phobias_manias", ""), ("arcane_tomes_spells", ""),
+    ("background_story", ""), ("cash", 0), ("assets", ""), ("spending_level", "")
+)
+
+# 取值来自少量固定选项的字符串字段，转换时驻留以便在对象之间共享
+SHARED_STRING_FIELDS = (
+    "player", "occupation", "gender", "residence", "birthplace", "db",
+    "personal_description", "ideology", "significant_people", "meaningful_locations",
+    "treasured_possessions", "traits", "assets", "spending_level"
+)
+
+# 列表字段，为空时不分配列表，首次访问时创建
+LIST_FIELDS = ("occupation_skills", "equipment", "items", "weapons")
+
+# 生成和疯狂规则中按需设置的字段，未设置时与Investigator一样访问会抛出AttributeError
+OPTIONAL_FIELDS = ("initial_san", "max_san", "status", "temporary_insanity", "indefinite_insanity")
+
+# 数组分段
+ATTRIBUTES = 0
+HALF = 1
+FIFTH = 2
+SKILLS = 3
+SPECIALIZATIONS = 4
+
+def _fits(value):
+    """数值能否保存在数组中"""
+    return type(value) is int and VALUE_MIN <= value <= VALUE_MAX
+
+def _main_skill(skill_name):
+    """专攻技能名称对应的主技能，如"格斗（斗殴）" -> "格斗"；不是专攻技能时返回None"""
+    position = skill_name.find("（")
+    return skill_name[:position] if position > 0 and skill_name.endswith("）") else None
+
+class CompactLayout:
+    """紧凑调查员共享的数组布局"""
+
+    def __init__(self, attribute_names, skill_names):
+        """初始化布局
+
+        Args:
+            attribute_names: 属性名称序列，顺序决定数组位置
+            skill_names: 技能名称序列（包括专攻技能的完整名称），顺序决定数组位置
+        """
+        self.attribute_names = tuple(attribute_names)
+        self.skill_names = tuple(dict.fromkeys(skill_names))
+        self.attribute_ids = {name: i for i, name in enumerate(self.attribute_names)}
+        self.skill_ids = {name: i for i, name in enumerate(self.skill_names)}
+
+        attribute_count = len(self.attribute_names)
+        skill_count = len(self.skill_names)
+        # 各分段：(名称元组, 名称到编号, 起始位置)
+        self.sections = (
+            (self.attribute_names, self.attribute_ids, 0),
+            (self.attribute_names, self.attribute_ids, attribute_count),
+            (self.attribute_names, self.attribute_ids, attribute_count * 2),
+            (self.skill_names, self.skill_ids, attribute_count * 3),
+            (self.skill_names, self.skill_ids, attribute_count * 3 + skill_count)
+        )
+        self.size = attribute_count * 3 + skill_count * 2
+        self.empty = array("h", [MISSING]) * self.size
+
+        # 主技能 -> 布局中属于该主技能的专攻编号
+        groups = {}
+        for i, name in enumerate(self.skill_names):
+            main_skill = _main_skill(name)
+            if main_skill is not None:
+                groups.setdefault(main_skill, []).append(i)
+        self.specialization_groups = {main_skill: tuple(ids) for main_skill, ids in groups.items()}
+
+    @classmethod
+    def from_skill_index(cls, skill_index):
+        """由技能目录索引创建布局
+
+        Args:
+            skill_index: 技能目录索引（Skills.index）
+
+        Returns:
+            CompactLayout对象
+        """
+        codec = InvestigatorCodec.from_skill_index(skill_index)
+        return cls(codec.attribute_names, codec.skill_names)
+
+    @classmethod
+    def from_generator(cls, generator):
+        """由生成器使用的目录创建布局（技能名称与InvestigatorCodec.from_generator相同）
+
+        Args:
+            generator: InvestigatorGenerator对象
+
+        Returns:
+            CompactLayout对象
+        """
+        codec = InvestigatorCodec.from_generator(generator)
+        return cls(codec.attribute_names, codec.skill_names)
+
+    def __reduce__(self):
+        return (CompactLayout, (self.attribute_names, self.skill_names))
+
+    def compact(self, investigators):
+        """把一批调查员转换为紧凑调查员
+
+        Args:
+            investigators: Investigator对象（或紧凑调查员）的可迭代对象
+
+        Returns:
+            CompactInvestigator列表
+        """
+        return [CompactInvestigator.from_investigator(investigator, self) for investigator in investigators]
+
+class _ValueView(MutableMapping):
+    """数组中一个分段的字典视图"""
+
+    __slots__ = ("_owner", "_section")
+
+    def __init__(self, owner, section):
+        self._owner = owner
+        self._section = section
+
+    def __getitem__(self, key):
+        owner = self._owner
+        extras = owner._extras
+        if extras is not None and key in extras.get(self._section, ()):
+            return extras[self._section][key]
+        _, ids, offset = owner.layout.sections[self._section]
+        i = ids.get(key)
+        if i is not None:
+            value = owner._values[offset + i]
+            if value != MISSING:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        self._owner._set_value(self._section, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._owner._set_value(self._section, key, None, delete=True)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        owner = self._owner
+        names, _, offset = owner.layout.sections[self._section]
+        values = owner._values
+        keys = [name for i, name in enumerate(names) if values[offset + i] != MISSING]
+        if owner._extras is not None:
+            keys.extend(owner._extras.get(self._section, ()))
+        return iter(keys)
+
+    def __len__(self):
+        owner = self._owner
+        names, _, offset = owner.layout.sections[self._section]
+        count = len(names) - owner._values[offset:offset + len(names)].count(MISSING)
+        if owner._extras is not None:
+            count += len(owner._extras.get(self._section, ()))
+        return count
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def copy(self):
+        """返回普通字典"""
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+class _SpecializationGroupView(_ValueView):
+    """技能专攻分段中属于一个主技能的部分"""
+
+    __slots__ = ("_main_skill",)
+
+    def __init__(self, owner, main_skill):
+        super().__init__(owner, SPECIALIZATIONS)
+        self._main_skill = main_skill
+
+    def _check(self, key):
+        if _main_skill(key) != self._main_skill:
+            raise KeyError(key)
+
+    def __getitem__(self, key):
+        self._check(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        if _main_skill(key) != self._main_skill:
+            # 不能按名称前缀分组的专攻：改为原样保存
+            specializations = self._owner._materialize_specializations()
+            specializations.setdefault(self._main_skill, {})[key] = value
+            return
+        super().__setitem__(key, value)
+
+    def __iter__(self):
+        owner = self._owner
+        _, _, offset = owner.layout.sections[SPECIALIZATIONS]
+        names = owner.layout.skill_names
+        values = owner._values
+        keys = [names[i] for i in owner.layout.specialization_groups.get(self._main_skill, ())
+                if values[offset + i] != MISSING]
+        if owner._extras is not None:
+            keys.extend(name for name in owner._extras.get(SPECIALIZATIONS, ()) if _main_skill(name) == self._main_skill)
+        return iter(keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+class _SpecializationView(MutableMapping):
+    """skill_specializations的字典视图：主技能 -> 专攻字典视图"""
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner):
+        self._owner = owner
+
+    def __getitem__(self, main_skill):
+        # 没有专攻的主技能也返回（空的）视图，以便 view[主技能][专攻] = 值 直接写入
+        return _SpecializationGroupView(self._owner, main_skill)
+
+    def __contains__(self, main_skill):
+        return len(_SpecializationGroupView(self._owner, main_skill)) > 0
+
+    def get(self, main_skill, default=None):
+        return self[main_skill] if main_skill in self else default
+
+    def __setitem__(self, main_skill, values):
+        values = dict(values)
+        if any(_main_skill(name) != main_skill for name in values):
+            self._owner._materialize_specializations()[main_skill] = values
+            return
+        for name in list(_SpecializationGroupView(self._owner, main_skill)):
+            self._owner._set_value(SPECIALIZATIONS, name, None, delete=True)
+        for name, value in values.items():
+            self._owner._set_value(SPECIALIZATIONS, name, value)
+
+    def __delitem__(self, main_skill):
+        if main_skill not in self:
+            raise KeyError(main_skill)
+        for name in list(self[main_skill]):
+            self._owner._set_value(SPECIALIZATIONS, name, None, delete=True)
+
+    def __iter__(self):
+        owner = self._owner
+        _, _, offset = owner.layout.sections[SPECIALIZATIONS]
+        values = owner._values
+        keys = [main_skill for main_skill, ids in owner.layout.specialization_groups.items()
+                if any(values[offset + i] != MISSING for i in ids)]
+        if owner._extras is not None:
+            for name in owner._extras.get(SPECIALIZATIONS, ()):
+                main_skill = _main_skill(name)
+                if main_skill not in keys:
+                    keys.append(main_skill)
+        return iter(keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr({main_skill: dict(group) for main_skill, group in self.items()})
+
+    def copy(self):
+        """返回普通字典（专攻字典也复制为普通字典）"""
+        return {main_skill: dict(group) for main_skill, group in self.items()}
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+class CompactInvestigator:
+    """紧凑调查员，字段和方法与Investigator相同"""
+
+    __slots__ = (
+        ("layout", "_values", "_extras", "_specializations", "__weakref__")
+        + tuple(field for field, _ in SCALAR_FIELDS)
+        + tuple("_" + field for field in LIST_FIELDS)
+        + OPTIONAL_FIELDS
+    )
+
+    def __init__(self, layout):
+        """初始化紧凑调查员（字段与Investigator()相同）
+
+        Args:
+            layout: CompactLayout对象
+        """
+        self.layout = layout
+        self._values = array("h", layout.empty)
+        self._extras = None
+        self._specializations = None
+        for field, default in SCALAR_FIELDS:
+            setattr(self, field, default)
+        for field in LIST_FIELDS:
+            setattr(self, "_" + field, None)
+        for name in layout.attribute_names:
+            self._set_value(ATTRIBUTES, name, 0)
+
+    def _set_value(self, section, key, value, delete=False):
+        """写入（或删除）一个分段中的一项"""
+        _, ids, offset = self.layout.sections[section]
+        i = ids.get(key)
+        extras = self._extras
+        if extras is not None and section in extras:
+            extras[section].pop(key, None)
+            if not extras[section]:
+                del extras[section]
+                if not extras:
+                    self._extras = None
+        if delete:
+            if i is not None:
+                self._values[offset + i] = MISSING
+        elif i is not None and _fits(value):
+            self._values[offset + i] = value
+        else:
+            if i is not None:
+                self._values[offset + i] = MISSING
+            if self._extras is None:
+                self._extras = {}
+            self._extras.setdefault(section, {})[key] = value
+
+    def _set_section(self, section, values):
+        """用字典整体替换一个分段"""
+        names, _, offset = self.layout.sections[section]
+        self._values[offset:offset + len(names)] = self.layout.empty[:len(names)]
+        if self._extras is not None:
+            self._extras.pop(section, None)
+            if not self._extras:
+                self._extras = None
+        for key, value in values.items():
+            self._set_value(section, key, value)
+
+    def _materialize_specializations(self):
+        """把技能专攻改为原样保存的普通字典，返回该字典"""
+        if self._specializations is None:
+            specializations = _SpecializationView(self).copy()
+            self._set_section(SPECIALIZATIONS, {})
+            self._specializations = specializations
+        return self._specializations
+
+    # 字典视图
+    @property
+    def attributes(self):
+        return _ValueView(self, ATTRIBUTES)
+
+    @attributes.setter
+    def attributes(self, values):
+        self._set_section(ATTRIBUTES, values)
+
+    @property
+    def attribute_half(self):
+        return _ValueView(self, HALF)
+
+    @attribute_half.setter
+    def attribute_half(self, values):
+        self._set_section(HALF, values)
+
+    @property
+    def attribute_fifth(self):
+        return _ValueView(self, FIFTH)
+
+    @attribute_fifth.setter
+    def attribute_fifth(self, values):
+        self._set_section(FIFTH, values)
+
+    @property
+    def skills(self):
+        return _ValueView(self, SKILLS)
+
+    @skills.setter
+    def skills(self, values):
+        self._set_section(SKILLS, values)
+
+    @property
+    def skill_specializations(self):
+        if self._specializations is not None:
+            return self._specializations
+        return _SpecializationView(self)
+
+    @skill_specializations.setter
+    def skill_specializations(self, values):
+        self._set_section(SPECIALIZATIONS, {})
+        self._specializations = None
+        grouped = all(
+            group and all(_main_skill(name) == main_skill for name in group)
+            for main_skill, group in values.items()
+        )
+        if not grouped:
+            self._specializations = {main_skill: dict(group) for main_skill, group in values.items()}
+            return
+        for group in values.values():
+            for name, value in group.items():
+                self._set_value(SPECIALIZATIONS, name, value)
+
+    # 列表字段：为空时不分配列表
+    def _get_list(field):
+        slot = "_" + field
+
+        def getter(self):
+            value = getattr(self, slot)
+            if value is None:
+                value = []
+                setattr(self, slot, value)
+            return value
+
+        def setter(self, value):
+            setattr(self, slot, value if value else None)
+
+        return property(getter, setter)
+
+    occupation_skills = _get_list("occupation_skills")
+    equipment = _get_list("equipment")
+    items = _get_list("items")
+    weapons = _get_list("weapons")
+    del _get_list
+
+    # 与Investigator共用的方法
+    ideology_beliefs = Investigator.ideology_beliefs
+    calculate_derived_attributes = Investigator.calculate_derived_attributes
+    calculate_half_fifth_values = Investigator.calculate_half_fifth_values
+    add_skill = Investigator.add_skill
+    get_skill = Investigator.get_skill
+    _apply_skill_transfer = Investigator._apply_skill_transfer
+    update_max_sanity = Investigator.update_max_sanity
+
+    @classmethod
+    def from_investigator(cls, investigator, layout):
+        """由Investigator（或另一个紧凑调查员）创建紧凑调查员
+
+        Args:
+            investigator: Investigator对象
+            layout: CompactLayout对象
+
+        Returns:
+            CompactInvestigator对象
+        """
+        compact = cls.__new__(cls)
+        compact.layout = layout
+        compact._values = array("h", layout.empty)
+        compact._extras = None
+        compact._specializations = None
+        compact._fill(lambda field, default: getattr(investigator, field, default), investigator.skill_specializations)
+        for field in OPTIONAL_FIELDS:
+            if hasattr(investigator, field):
+                setattr(compact, field, getattr(investigator, field))
+        return compact
+
+    @classmethod
+    def from_dict(cls, data, layout):
+        """从字典创建紧凑调查员（字段与Investigator.from_dict相同）
+
+        Args:
+            data: 调查员数据字典
+            layout: CompactLayout对象
+
+        Returns:
+            CompactInvestigator对象
+        """
+        compact = cls.__new__(cls)
+        compact.layout = layout
+        compact._values = array("h", layout.empty)
+        compact._extras = None
+        compact._specializations = None
+        compact._fill(lambda field, default: data.get(field, default), data.get("skill_specializations", {}))
+        return compact
+
+    def _fill(self, get, specializations):
+        """用get(字段, 默认值)读取全部字段"""
+        for field, default in SCALAR_FIELDS:
+            setattr(self, field, get(field, default))
+        for field in SHARED_STRING_FIELDS:
+            value = getattr(self, field)
+            if type(value) is str:
+                setattr(self, field, sys.intern(value))
+        for field in LIST_FIELDS:
+            setattr(self, field, get(field, None))
+        for section, field in ((ATTRIBUTES, "attributes"), (HALF, "attribute_half"),
+                               (FIFTH, "attribute_fifth"), (SKILLS, "skills")):
+            for key, value in get(field, {}).items():
+                self._set_value(section, key, value)
+        self.skill_specializations = specializations
+
+    def to_investigator(self):
+        """转换为Investigator对象"""
+        investigator = Investigator.from_dict(self.to_dict())
+        for field in OPTIONAL_FIELDS:
+            if hasattr(self, field):
+                setattr(investigator, field, getattr(self, field))
+        return investigator
+
+    def to_dict(self):
+        """将调查员转换为字典（字段与Investigator.to_dict相同）
+
+        Returns:
+            调查员数据字典
+        """
+        data = {field: getattr(self, field) for field, _ in SCALAR_FIELDS}
+        data["attributes"] = dict(self.attributes)
+        data["attribute_half"] = dict(self.attribute_half)
+        data["attribute_fifth"] = dict(self.attribute_fifth)
+        data["skills"] = dict(self.skills)
+        data["skill_specializations"] = self.skill_specializations.copy()
+        for field in LIST_FIELDS:
+            value = getattr(self, "_" + field)
+            data[field] = value if value is not None else []
+        return data
+
+    def __deepcopy__(self, memo):
+        duplicate = CompactInvestigator.from_investigator(self, self.layout)
+        for field in LIST_FIELDS:
+            setattr(duplicate, field, copy.deepcopy(getattr(self, "_" + field), memo))
+        if self._specializations is not None:
+            duplicate._specializations = copy.deepcopy(self._specializations, memo)
+        return duplicate
+
+    def __reduce__(self):
+        optional = {field: getattr(self, field) for field in OPTIONAL_FIELDS if hasattr(self, field)}
+        return (_restore, (self.layout, self.to_dict(), optional))
+
+def _restore(layout, data, optional):
+    """pickle还原紧凑调查员"""
+    compact = CompactInvestigator.from_dict(data, layout)
+    for field, value in optional.items():
+        setattr(compact, field, value)
+    return compact
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from core.rules import load_ruleset
+
 class AppConfig:
     """应用程序配置类"""
     
@@ -29,62 +31,30 @@ class AppConfig:
             "幸运": {"dice": "3D6", "multiplier": 5}
         }
         
-        # 年龄段配置
-        self.age_groups = {
-            "15-19": {
-                "str_siz_reduction": 5,
-                "edu_reduction": 5,
-                "luck_rolls": 2,
-                "edu_improvement_checks": 0,
-                "app_reduction": 0,
-                "str_con_dex_reduction": 0
-            },
-            "20-39": {
-                "str_siz_reduction": 0,
-                "edu_reduction": 0,
-                "luck_rolls": 1,
-                "edu_improvement_checks": 1,
-                "app_reduction": 0,
-                "str_con_dex_reduction": 0
-            },
-            "40-49": {
-                "str_siz_reduction": 0,
-                "edu_reduction": 0,
-                "luck_rolls": 1,
-                "edu_improvement_checks": 2,
-                "app_reduction": 5,
-                "str_con_dex_reduction": 5
-            },
-            "50-59": {
-                "str_siz_reduction": 0,
-                "edu_reduction": 0,
-                "luck_rolls": 1,
-                "edu_improvement_checks": 3,
-                "app_reduction": 10,
-                "str_con_dex_reduction": 10
-            },
-            "60-69": {
-                "str_siz_reduction": 0,
-                "edu_reduction": 0,
-                "luck_rolls": 1,
-                "edu_improvement_checks": 4,
-                "app_reduction": 15,
-                "str_con_dex_reduction": 20
-            },
-            "70-79": {
-                "str_siz_reduction": 0,
-                "edu_reduction": 0,
-                "luck_rolls": 1,
-                "edu_improvement_checks": 4,
-                "app_reduction": 20,
-                "str_con_dex_reduction": 40
-            },
-            "80-89": {
-                "str_siz_reduction": 0,
-                "edu_reduction": 0,
-                "luck_rolls": 1,
-                "edu_improvement_checks": 4,
-                "app_reduction": 25,
-                "str_con_dex_reduction": 80
-            }
-        } 
\ No newline at end of file
+        # 规则数据文件（为None时使用data/rules.json）和使用的规则变体（为None时使用文件中的默认变体），见core.rules
+        self.rules_path = None
+        self.rule_variant = None
+        self._rules = None
+        
+        # 随机分配技能点的策略（uniform、focused、spread，见core.allocation）
+        self.skill_allocation_strategy = "uniform"
+        
+        # 调查员库索引文件（见utils.library）
+        self.library_path = "data/library.sqlite"
+        
+        # 自动保存的防抖时间和持续修改时的最长写入间隔（秒）
+        self.autosave_delay = 0.5
+        self.autosave_max_delay = 5.0
+    
+    @property
+    def rules(self):
+        """当前规则变体编译后的规则集（RuleSet），修改rules_path或rule_variant后重新加载"""
+        key = (self.rules_path, self.rule_variant)
+        if self._rules is None or self._rules[0] != key:
+            self._rules = (key, load_ruleset(self.rules_path, self.rule_variant))
+        return self._rules[1]
+    
+    @property
+    def age_groups(self):
+        """年龄段配置（来自当前规则集）"""
+        return self.rules.age_groups
@@ -0,0 +1,342 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+衍生属性引擎模块
+
+把每个衍生值声明为其输入的函数：
+- 半值、五分之一值：对应属性
+- 生命值：体质、体型
+- 魔法值：意志
+- 理智值（及初始理智值）：意志
+- 伤害加值和体格：力量、体型
+- 移动速度：敏捷、力量、体型、年龄
+- 理智值上限：克苏鲁神话技能、理智值（理智值不超过上限）
+
+compute()无条件计算指定的衍生值，用于新生成的调查员；
+update()只重新计算输入自上次计算以来发生变化的衍生值，用于界面逐项编辑。
+一个衍生值的输出是另一个衍生值的输入时（如理智值与理智值上限），按依赖顺序计算。
+
+输入和输出用键表示：
+- "attribute:属性名"、"half:属性名"、"fifth:属性名"：属性、半值、五分之一值
+- "skill:技能名"：技能值，缺失时为0
+- 其他（如"age"、"hp"）：调查员的同名字段
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import weakref
+from bisect import bisect_left
+
+# 属性顺序，与Investigator.attributes保持一致
+ATTRIBUTE_NAMES = ("力量", "体质", "体型", "敏捷", "外貌", "智力", "意志", "教育", "幸运")
+
+# 力量+体型的分段上限，以及对应的伤害加值和体格
+DB_BUILD_BOUNDS = [64, 84, 124, 164, 204]
+DB_TABLE = ["-2", "-1", "0", "+1D4", "+1D6", "+2D6"]
+BUILD_TABLE = [-2, -1, 0, 1, 2, 3]
+
+# 年龄范围对应的移动速度减值
+AGE_MOV_PENALTIES = ((40, 49, 1), (50, 59, 2), (60, 69, 3), (70, 79, 4), (80, 89, 5))
+
+# 理智值上限的基数（99 - 克苏鲁神话）
+MAX_SANITY = 99
+
+# 带前缀的键对应的调查员字典字段
+KEY_SECTIONS = {
+    "attribute": "attributes",
+    "half": "attribute_half",
+    "fifth": "attribute_fifth",
+    "skill": "skills"
+}
+
+def value_reader(key):
+    """创建读取键对应值的函数 reader(investigator)，缺失时为0"""
+    section, separator, name = key.partition(":")
+    if separator:
+        field = KEY_SECTIONS[section]
+        return lambda investigator: getattr(investigator, field).get(name, 0)
+    return lambda investigator: getattr(investigator, key, 0)
+
+def value_writer(key):
+    """创建写入键对应值的函数 writer(investigator, value)"""
+    section, separator, name = key.partition(":")
+    if separator:
+        field = KEY_SECTIONS[section]
+
+        def write(investigator, value):
+            getattr(investigator, field)[name] = value
+        return write
+    return lambda investigator, value: setattr(investigator, key, value)
+
+def _read_expression(key):
+    """_compile生成的代码中读取键对应值的表达式"""
+    section, separator, name = key.partition(":")
+    if separator:
+        return f"{KEY_SECTIONS[section]}.get({name!r}, 0)"
+    return f"getattr(investigator, {key!r}, 0)"
+
+def _write_target(key):
+    """_compile生成的代码中键对应的赋值目标"""
+    section, separator, name = key.partition(":")
+    if separator:
+        return f"{KEY_SECTIONS[section]}[{name!r}]"
+    return f"investigator.{key}"
+
+def _compile(stats):
+    """把一组（已按依赖顺序排列的）衍生值编译为一个函数 run(investigator)
+
+    生成的函数逐个调用各衍生值的计算函数，直接读写调查员的字段，
+    省去逐项查找读写函数的开销，用于批量生成时的compute()。
+    """
+    namespace = {}
+    lines = ["def run(investigator):"]
+    fields = []
+    for stat in stats:
+        for key in stat.inputs + stat.outputs:
+            section, separator, _ = key.partition(":")
+            if separator and KEY_SECTIONS[section] not in fields:
+                fields.append(KEY_SECTIONS[section])
+    lines.extend(f"    {field} = investigator.{field}" for field in fields)
+    for i, stat in enumerate(stats):
+        namespace[f"function_{i}"] = stat.function
+        arguments = ", ".join(_read_expression(key) for key in stat.inputs)
+        targets = ", ".join(_write_target(key) for key in stat.outputs)
+        lines.append(f"    {targets} = function_{i}({arguments})")
+    lines.append("    return investigator")
+    exec(compile("\n".join(lines), "<derived stats>", "exec"), namespace)
+    return namespace["run"]
+
+def damage_bonus_and_build(strength, size):
+    """根据力量和体型计算伤害加值和体格
+
+    Returns:
+        (伤害加值, 体格)
+    """
+    bracket = bisect_left(DB_BUILD_BOUNDS, strength + size)
+    return DB_TABLE[bracket], BUILD_TABLE[bracket]
+
+def movement_rate(dexterity, strength, size, age):
+    """根据敏捷、力量、体型和年龄计算移动速度"""
+    mov = 7 + (dexterity >= size) + (strength >= size)
+    for low, high, penalty in AGE_MOV_PENALTIES:
+        if low <= age <= high:
+            return mov - penalty
+    return mov
+
+def sanity_limits(mythos, sanity):
+    """根据克苏鲁神话技能计算理智值上限，并把理智值限制在上限以内
+
+    Returns:
+        (理智值上限, 理智值)
+    """
+    max_san = MAX_SANITY - mythos
+    return max_san, min(sanity, max_san)
+
+class DerivedStat:
+    """一个衍生值的声明"""
+
+    __slots__ = ("name", "inputs", "outputs", "function", "reads_outputs", "readers", "output_readers", "writers")
+
+    def __init__(self, name, inputs, outputs, function):
+        """初始化衍生值声明
+
+        Args:
+            name: 名称
+            inputs: 输入键元组，按顺序作为function的参数
+            outputs: 输出键元组
+            function: 计算函数，只有一个输出时返回该值，否则返回与outputs对应的元组
+        """
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.function = function
+        # 输出同时也是输入时（如把理智值限制在上限以内），计算后需要重新读取输入
+        self.reads_outputs = bool(set(self.inputs) & set(self.outputs))
+        self.readers = tuple(value_reader(key) for key in self.inputs)
+        self.output_readers = tuple(value_reader(key) for key in self.outputs)
+        self.writers = tuple(value_writer(key) for key in self.outputs)
+
+    def read(self, investigator):
+        """读取输入值元组"""
+        return tuple([reader(investigator) for reader in self.readers])
+
+    def evaluate(self, values):
+        """由输入值计算输出值元组"""
+        result = self.function(*values)
+        return (result,) if len(self.outputs) == 1 else result
+
+def half_and_fifth(value):
+    """属性的半值和五分之一值"""
+    return value // 2, value // 5
+
+def _half_fifth_stats():
+    """各属性的半值和五分之一值"""
+    return [
+        DerivedStat(f"half_fifth:{name}", (f"attribute:{name}",), (f"half:{name}", f"fifth:{name}"), half_and_fifth)
+        for name in ATTRIBUTE_NAMES
+    ]
+
+# 全部衍生值
+DERIVED_STATS = tuple(_half_fifth_stats()) + (
+    DerivedStat("hp", ("attribute:体质", "attribute:体型"), ("hp",), lambda con, siz: (con + siz) // 10),
+    DerivedStat("mp", ("attribute:意志",), ("mp",), lambda pow_: pow_ // 5),
+    DerivedStat("san", ("attribute:意志",), ("san", "initial_san"), lambda pow_: (pow_, pow_)),
+    DerivedStat("db_build", ("attribute:力量", "attribute:体型"), ("db", "build"), damage_bonus_and_build),
+    DerivedStat("mov", ("attribute:敏捷", "attribute:力量", "attribute:体型", "age"), ("mov",), movement_rate),
+    DerivedStat("max_san", ("skill:克苏鲁神话", "san"), ("max_san", "san"), sanity_limits)
+)
+
+# Investigator中各计算方法对应的衍生值
+HALF_FIFTH_STATS = tuple(stat.name for stat in DERIVED_STATS if stat.name.startswith("half_fifth:"))
+DERIVED_ATTRIBUTE_STATS = ("hp", "mp", "san", "db_build", "mov")
+SANITY_STATS = ("max_san",)
+
+class DerivedStatEngine:
+    """衍生属性引擎"""
+
+    def __init__(self, stats=DERIVED_STATS):
+        """初始化引擎
+
+        Args:
+            stats: DerivedStat序列
+
+        Raises:
+            ValueError: 衍生值之间存在循环依赖
+        """
+        self.stats = self._order(stats)
+        self.names = frozenset(stat.name for stat in self.stats)
+        # 输入键 -> 直接依赖它的衍生值名称
+        self.dependents = {}
+        for stat in self.stats:
+            for key in stat.inputs:
+                self.dependents.setdefault(key, []).append(stat.name)
+        # 调查员 -> {衍生值名称: 上次计算时的输入值}
+        self._snapshots = weakref.WeakKeyDictionary()
+        # 衍生值名称元组 -> (按依赖顺序排列的DerivedStat元组, 编译后的函数)
+        self._selections = {}
+
+    @staticmethod
+    def _order(stats):
+        """按依赖关系排序：输出被其他衍生值读取的先计算"""
+        stats = list(stats)
+        producers = {}
+        for stat in stats:
+            for key in stat.outputs:
+                producers.setdefault(key, []).append(stat)
+        ordered = []
+        state = {}
+
+        def visit(stat):
+            if state.get(stat.name) == "done":
+                return
+            if state.get(stat.name) == "visiting":
+                raise ValueError(f"衍生值存在循环依赖: {stat.name}")
+            state[stat.name] = "visiting"
+            for key in stat.inputs:
+                for producer in producers.get(key, ()):
+                    if producer is not stat:
+                        visit(producer)
+            state[stat.name] = "done"
+            ordered.append(stat)
+
+        for stat in stats:
+            visit(stat)
+        return tuple(ordered)
+
+    def _snapshot(self, investigator, create):
+        """取得调查员的输入记录；没有记录且create为False时返回None"""
+        try:
+            snapshot = self._snapshots.get(investigator)
+            if snapshot is None and create:
+                snapshot = self._snapshots[investigator] = {}
+        except TypeError:
+            # 不支持弱引用的对象不记录输入，每次update都完整计算
+            return {} if create else None
+        return snapshot
+
+    def _select(self, names):
+        """取得names对应的衍生值（按依赖顺序）及编译后的函数"""
+        selection = self._selections.get(names)
+        if selection is None:
+            if names is None:
+                stats = self.stats
+            else:
+                unknown = set(names) - self.names
+                if unknown:
+                    raise ValueError(f"未知的衍生值: {', '.join(sorted(unknown))}")
+                stats = tuple(stat for stat in self.stats if stat.name in names)
+            selection = self._selections[names] = (stats, _compile(stats))
+        return selection
+
+    def _evaluate(self, stat, investigator, values, snapshot, changed):
+        """计算一个衍生值并写入输出"""
+        results = stat.evaluate(values)
+        if changed is not None:
+            for key, reader, value in zip(stat.outputs, stat.output_readers, results):
+                if reader(investigator) != value:
+                    changed.add(key)
+        for writer, value in zip(stat.writers, results):
+            writer(investigator, value)
+        if snapshot is not None:
+            snapshot[stat.name] = stat.read(investigator) if stat.reads_outputs else values
+
+    def compute(self, investigator, names=None):
+        """无条件计算衍生值
+
+        Args:
+            investigator: 调查员对象
+            names: 要计算的衍生值名称，默认为全部
+
+        Returns:
+            调查员对象
+        """
+        stats, run = self._select(names if names is None else tuple(names))
+        # 已经在跟踪的调查员逐项计算，同时更新输入记录
+        snapshot = self._snapshot(investigator, create=False) if self._snapshots else None
+        if snapshot is None:
+            return run(investigator)
+        for stat in stats:
+            self._evaluate(stat, investigator, stat.read(investigator), snapshot, None)
+        return investigator
+
+    def update(self, investigator):
+        """只重新计算输入发生变化的衍生值
+
+        第一次对某名调查员调用时计算全部衍生值，并开始跟踪其输入。
+
+        Args:
+            investigator: 调查员对象
+
+        Returns:
+            发生变化的输出键集合（如{"hp", "half:体质"}）
+        """
+        snapshot = self._snapshot(investigator, create=True)
+        changed = set()
+        for stat in self.stats:
+            values = stat.read(investigator)
+            if snapshot.get(stat.name) != values:
+                self._evaluate(stat, investigator, values, snapshot, changed)
+        return changed
+
+    def track(self, investigator):
+        """开始跟踪调查员的输入而不重新计算（当前的衍生值视为最新）
+
+        已经在跟踪时不做任何事。用于载入已有调查员后，让之后的update()
+        只重新计算被修改的部分，而不覆盖载入的衍生值（如游戏中降低的理智值）。
+        """
+        if self._snapshot(investigator, create=False) is not None:
+            return
+        snapshot = self._snapshot(investigator, create=True)
+        for stat in self.stats:
+            snapshot[stat.name] = stat.read(investigator)
+
+    def forget(self, investigator):
+        """停止跟踪调查员"""
+        try:
+            self._snapshots.pop(investigator, None)
+        except TypeError:
+            pass
+
+# 共享的衍生属性引擎
+DERIVED_ENGINE = DerivedStatEngine()
@@ -7,12 +7,26 @@ MIT License
 Copyright (c) 2025 COC Investigator Generator
 """
 
-import random
+from contextlib import contextmanager
 from utils.dice import DiceRoller
+from utils.rng import RandomSource, BATCH_ROW_NAMESPACE
 from core.investigator import Investigator
+from core.derived import DERIVED_ENGINE
+from core.language_graph import language_of, language_skill_name
+from core.skill_transfer import SKILL_TRANSFER
+from core.rules import load_ruleset
 from core.occupations import Occupations
 from core.skills import Skills
 from core.backgrounds import Backgrounds
+from core.batch import generate_attribute_columns
+from core.allocation import SkillPointAllocator
+
+# 随机调查员的居住地和出生地
+RANDOM_CITIES = ("阿卡姆", "波士顿", "纽约", "芝加哥", "伦敦", "巴黎", "柏林", "罗马", "开罗", "上海")
+
+# 生成器版本：同一(种子, 序号)的生成结果发生变化时（调整随机数的使用顺序、规则或数据）必须递增，
+# 旧版本保存的调查员配方将无法通过验证
+GENERATOR_VERSION = 4
 
 class InvestigatorGenerator:
     """调查员生成器类"""
@@ -32,6 +46,83 @@ class InvestigatorGenerator:
         self.occupations = occupations
         self.skills = skills
         self.backgrounds = backgrounds
+        self.allocator = SkillPointAllocator(config.skill_allocation_strategy)
+        self.set_rule_variant(config.rule_variant)
+        # 最近一次generate_skills中语言技能转移提升的同系语言（SkillTransferEvent）
+        self.transfer_events = []
+    
+    def set_rule_variant(self, variant):
+        """切换规则变体
+        
+        规则变体在规则数据文件中声明（见core.rules），切换后本生成器的技能分配上限、年龄段调整
+        和语言技能转移都使用新变体编译后的规则集。规则集只保存在生成器上并显式传给分配器和
+        技能转移，不修改共享的配置、技能数据或其他生成器。
+        
+        Args:
+            variant: 规则变体名称，为None时使用规则数据文件中的默认变体
+        """
+        self.rules = load_ruleset(self.config.rules_path, variant)
+        self.rule_variant = self.rules.name
+        self.allocator.set_rules(self.rules)
+    
+    def set_allocation_strategy(self, strategy):
+        """设置随机分配技能点的策略
+        
+        Args:
+            strategy: 分配策略（uniform、focused、spread）
+        """
+        self.allocator.set_strategy(strategy)
+    
+    @contextmanager
+    def using_settings(self, strategy=None, rule_variant=None):
+        """在with块内临时使用指定的技能分配策略和规则变体，离开with块后恢复
+        
+        Args:
+            strategy: 分配策略，为None时不切换
+            rule_variant: 规则变体名称，为None时不切换
+        """
+        previous_strategy = self.allocator.strategy
+        previous_rules = self.rules
+        previous_variant = self.rule_variant
+        try:
+            if strategy is not None:
+                self.set_allocation_strategy(strategy)
+            if rule_variant is not None:
+                self.set_rule_variant(rule_variant)
+            yield self
+        finally:
+            self.allocator.set_strategy(previous_strategy)
+            self.rules = previous_rules
+            self.rule_variant = previous_variant
+            self.allocator.set_rules(previous_rules)
+    
+    @property
+    def rng(self):
+        """当前随机数源（与骰子工具共用同一个随机流）"""
+        return self.dice_roller.rng
+    
+    @contextmanager
+    def using_rng(self, rng):
+        """在with块内临时使用指定的随机数源
+        
+        骰子工具和技能检定同时切换到该随机数源，离开with块后恢复。
+        
+        Args:
+            rng: 随机数源（RandomSource、random.Random或整数种子），为None时不切换
+        """
+        if rng is None:
+            yield self.rng
+            return
+        
+        previous_dice_rng = self.dice_roller.rng
+        previous_skills_rng = self.skills.rng
+        self.dice_roller.set_rng(rng)
+        self.skills.set_rng(self.dice_roller.rng)
+        try:
+            yield self.dice_roller.rng
+        finally:
+            self.dice_roller.set_rng(previous_dice_rng)
+            self.skills.set_rng(previous_skills_rng)
     
     def generate_attributes(self):
         """生成属性"""
@@ -44,7 +135,7 @@ class InvestigatorGenerator:
     
     def adjust_attributes_by_age(self, investigator, age_group):
         """根据年龄调整属性"""
-        age_config = self.config.age_groups.get(age_group)
+        age_config = self.rules.age_groups.get(age_group)
         
         if not age_config:
             return
@@ -53,7 +144,7 @@ class InvestigatorGenerator:
         if age_config["str_siz_reduction"] > 0:
             reduction = age_config["str_siz_reduction"]
             # 在力量和体型之间分配减少值
-            str_reduction = random.randint(0, reduction)
+            str_reduction = self.rng.randint(0, reduction)
             siz_reduction = reduction - str_reduction
             
             investigator.attributes["力量"] = max(0, investigator.attributes["力量"] - str_reduction)
@@ -69,7 +160,7 @@ class InvestigatorGenerator:
             # 在力量、体质、敏捷之间分配减少值
             attrs = ["力量", "体质", "敏捷"]
             while reduction > 0 and any(investigator.attributes[attr] > 0 for attr in attrs):
-                attr = random.choice(attrs)
+                attr = self.rng.choice(attrs)
                 if investigator.attributes[attr] > 0:
                     investigator.attributes[attr] -= 1
                     reduction -= 1
@@ -81,7 +172,7 @@ class InvestigatorGenerator:
         # 教育增强检定
         if age_config["edu_improvement_checks"] > 0:
             for _ in range(age_config["edu_improvement_checks"]):
-                roll = random.randint(1, 100)
+                roll = self.rng.randint(1, 100)
                 if roll > investigator.attributes["教育"]:
                     # 增加1D10点教育
                     edu_increase = self.dice_roller.roll("1D10")
@@ -94,36 +185,48 @@ class InvestigatorGenerator:
                 luck_rolls.append(self.dice_roller.roll_attribute("3D6"))
             investigator.attributes["幸运"] = max(luck_rolls)
     
-    def generate_random_investigator(self, age_group="20-39"):
+    def generate_investigator(self, seed, index=0, age_group="20-39"):
+        """生成可复现的随机调查员
+        
+        结果只由(seed, index, age_group)决定，与此前生成过多少调查员、
+        在哪个进程中生成无关。
+        
+        Args:
+            seed: 主随机种子
+            index: 调查员序号
+            age_group: 年龄段
+        
+        Returns:
+            调查员对象
+        """
+        return self.generate_random_investigator(age_group, rng=RandomSource.for_index(seed, index))
+    
+    def generate_random_investigator(self, age_group="20-39", rng=None):
         """生成随机调查员
         
         Args:
             age_group: 年龄段
+            rng: 本次生成使用的随机数源（可选），默认使用生成器当前的随机数源
         
         Returns:
             调查员对象
         """
+        with self.using_rng(rng):
+            return self._generate_random_investigator(age_group)
+    
+    def _generate_random_investigator(self, age_group):
+        """在当前随机数源下生成随机调查员"""
         # 创建调查员对象
         investigator = Investigator()
         
         # 生成基本信息
         investigator.name = "随机调查员"
         investigator.player = "玩家"
-        investigator.gender = random.choice(["男", "女"])
-        
-        # 根据年龄段设置年龄
-        age_ranges = {
-            "15-19": (15, 19),
-            "20-39": (20, 39),
-            "40-49": (40, 49),
-            "50-59": (50, 59),
-            "60-69": (60, 69),
-            "70-79": (70, 79),
-            "80-89": (80, 89)
-        }
-        
-        age_range = age_ranges.get(age_group, (20, 39))
-        investigator.age = random.randint(age_range[0], age_range[1])
+        investigator.gender = self.rng.choice(["男", "女"])
+        
+        # 根据年龄段设置年龄（年龄范围来自规则集）
+        age_range = self.rules.age_range(age_group)
+        investigator.age = self.rng.randint(age_range[0], age_range[1])
         
         # 生成属性
         attributes = self.generate_attributes()
@@ -132,97 +235,83 @@ class InvestigatorGenerator:
         # 根据年龄调整属性
         self.adjust_attributes_by_age(investigator, age_group)
         
-        # 计算属性的半值和五分之一值
-        for attr_name, attr_value in investigator.attributes.items():
-            investigator.attribute_half[attr_name] = attr_value // 2
-            investigator.attribute_fifth[attr_name] = attr_value // 5
-        
-        # 计算衍生属性
-        investigator.hp = (investigator.attributes["体质"] + investigator.attributes["体型"]) // 10
-        investigator.mp = investigator.attributes["意志"] // 5
-        
-        # 设置初始理智值和理智值上限
-        # 克苏鲁神话初始为0，所以理智值上限等于意志值
-        investigator.san = investigator.attributes["意志"]
-        investigator.initial_san = investigator.san
-        investigator.max_san = investigator.san
-        
-        # 计算伤害加值和体格
-        str_siz = investigator.attributes["力量"] + investigator.attributes["体型"]
-        if str_siz <= 64:
-            investigator.db = "-2"
-            investigator.build = -2
-        elif str_siz <= 84:
-            investigator.db = "-1"
-            investigator.build = -1
-        elif str_siz <= 124:
-            investigator.db = "0"
-            investigator.build = 0
-        elif str_siz <= 164:
-            investigator.db = "+1D4"
-            investigator.build = 1
-        elif str_siz <= 204:
-            investigator.db = "+1D6"
-            investigator.build = 2
-        else:
-            investigator.db = "+2D6"
-            investigator.build = 3
-        
-        # 计算移动速度
-        if investigator.attributes["敏捷"] < investigator.attributes["体型"] and investigator.attributes["力量"] < investigator.attributes["体型"]:
-            investigator.mov = 7
-        elif investigator.attributes["敏捷"] >= investigator.attributes["体型"] and investigator.attributes["力量"] >= investigator.attributes["体型"]:
-            investigator.mov = 9
-        else:
-            investigator.mov = 8
-        
-        # 根据年龄调整移动速度
-        if age_group == "40-49":
-            investigator.mov -= 1
-        elif age_group == "50-59":
-            investigator.mov -= 2
-        elif age_group == "60-69":
-            investigator.mov -= 3
-        elif age_group == "70-79":
-            investigator.mov -= 4
-        elif age_group == "80-89":
-            investigator.mov -= 5
+        # 计算半值、五分之一值和衍生属性（克苏鲁神话初始为0，所以理智值上限为99）
+        DERIVED_ENGINE.compute(investigator)
         
-        # 随机选择职业
-        occupation_name = random.choice(list(self.occupations.occupations.keys()))
-        occupation_data = self.occupations.get_occupation(occupation_name)
+        # 随机选择职业、背景并分配技能
+        self._populate_investigator(investigator)
+        
+        return investigator
+    
+    def _populate_investigator(self, investigator):
+        """为已完成属性阶段的调查员随机选择职业、背景并分配技能
         
+        Args:
+            investigator: 调查员对象
+        """
+        # 随机选择职业
+        occupation_name = self.rng.choice(list(self.occupations.occupations.keys()))
         investigator.occupation = occupation_name
         
         # 随机选择居住地和出生地
-        cities = ["阿卡姆", "波士顿", "纽约", "芝加哥", "伦敦", "巴黎", "柏林", "罗马", "开罗", "上海"]
-        investigator.residence = random.choice(cities)
-        investigator.birthplace = random.choice(cities)
+        investigator.residence = self.rng.choice(RANDOM_CITIES)
+        investigator.birthplace = self.rng.choice(RANDOM_CITIES)
         
         # 随机生成背景
-        investigator.personal_description = random.choice(self.backgrounds.get_personal_descriptions())
-        investigator.ideology = random.choice(self.backgrounds.get_ideology_beliefs())
-        investigator.significant_people = random.choice(self.backgrounds.get_significant_people_who()) + " " + random.choice(self.backgrounds.get_significant_people_why())
-        investigator.meaningful_locations = random.choice(self.backgrounds.get_meaningful_locations())
-        investigator.treasured_possessions = random.choice(self.backgrounds.get_treasured_possessions())
-        investigator.traits = random.choice(self.backgrounds.get_traits())
+        investigator.personal_description = self.rng.choice(self.backgrounds.get_personal_descriptions())
+        investigator.ideology = self.rng.choice(self.backgrounds.get_ideology_beliefs())
+        investigator.significant_people = self.rng.choice(self.backgrounds.get_significant_people_who()) + " " + self.rng.choice(self.backgrounds.get_significant_people_why())
+        investigator.meaningful_locations = self.rng.choice(self.backgrounds.get_meaningful_locations())
+        investigator.treasured_possessions = self.rng.choice(self.backgrounds.get_treasured_possessions())
+        investigator.traits = self.rng.choice(self.backgrounds.get_traits())
         
         # 生成并分配技能点
         self.generate_skills(investigator)
         
         # 如果没有克苏鲁神话技能，初始化为0
         if "克苏鲁神话" not in investigator.skills:
-            investigator.add_skill("克苏鲁神话", 0)
+            investigator.add_skill("克苏鲁神话", 0, self.rules)
         
         # 确保理智值上限正确
         investigator.update_max_sanity()
         
         # 设置初始现金和资产
-        credit_rating_range = occupation_data.get("credit_rating", (0, 0))
-        investigator.cash = random.randint(credit_rating_range[0], credit_rating_range[1])
+        credit_rating_range = self.occupations.get_credit_rating(occupation_name)
+        investigator.cash = self.rng.randint(credit_rating_range[0], credit_rating_range[1])
         investigator.assets = "无特殊资产"
+    
+    def generate_batch(self, n, age_group="20-39", seed=None, as_investigators=True):
+        """批量生成随机调查员
         
-        return investigator
+        属性阶段（属性掷骰、年龄调整、衍生属性）对全部调查员一次性以列式完成，
+        安装了NumPy时使用数组运算。
+        
+        Args:
+            n: 调查员数量
+            age_group: 年龄段
+            seed: 随机种子（可选），相同的(seed, n, age_group)得到相同的结果
+            as_investigators: 为True时返回完整的调查员对象列表（逐个补全职业、背景和技能），
+                为False时只返回列式的InvestigatorBatch结果
+        
+        Returns:
+            调查员对象列表或InvestigatorBatch对象
+        """
+        source = seed if isinstance(seed, RandomSource) else RandomSource(seed)
+        batch = generate_attribute_columns(self.config, n, age_group, source, self.rules)
+        
+        if not as_investigators:
+            return batch
+        
+        investigators = batch.to_investigators()
+        for index, investigator in enumerate(investigators):
+            # 每一行的职业、背景和技能使用独立的子随机流（与generate_investigator的随机流不同）
+            with self.using_rng(source.child(index, BATCH_ROW_NAMESPACE)) as rng:
+                investigator.name = "随机调查员"
+                investigator.player = "玩家"
+                investigator.gender = rng.choice(["男", "女"])
+                self._populate_investigator(investigator)
+        
+        return investigators
     
     def generate_custom_investigator(self, data):
         """生成自定义调查员"""
@@ -243,28 +332,18 @@ class InvestigatorGenerator:
         else:
             investigator.attributes = self.generate_attributes()
             
-            # 根据年龄调整属性
-            age_group = "20-39"  # 默认年龄段
-            for group in self.config.age_groups:
-                min_age, max_age = map(int, group.split("-"))
-                if min_age <= investigator.age <= max_age:
-                    age_group = group
-                    break
-            
-            self.adjust_attributes_by_age(investigator, age_group)
-        
-        # 计算属性的半值和五分之一值
-        investigator.calculate_half_fifth_values()
+            # 根据年龄调整属性（找不到对应年龄段时使用规则集的默认年龄段）
+            self.adjust_attributes_by_age(investigator, self.rules.age_group_of(investigator.age))
         
-        # 计算衍生属性
-        investigator.calculate_derived_attributes()
+        # 计算半值、五分之一值和衍生属性
+        DERIVED_ENGINE.compute(investigator)
         
         # 设置职业技能
         if investigator.occupation:
-            occupation = Occupations.get_occupation(investigator.occupation)
-            if occupation:
-                investigator.occupation_skills = occupation["skills"]
-                investigator.occupation_skill_points = Occupations.calculate_skill_points(occupation, investigator)
+            template = self.occupations.get_template(investigator.occupation)
+            if template:
+                investigator.occupation_skills = self.occupations.get_occupation(investigator.occupation)["skills"]
+                investigator.occupation_skill_points = template.skill_points(investigator.attributes)
         
         # 计算兴趣技能点
         investigator.interest_skill_points = investigator.attributes["智力"] * 2
@@ -310,16 +389,9 @@ class InvestigatorGenerator:
         # 初始化属性
         for attr_name in ["力量", "体质", "体型", "敏捷", "外貌", "智力", "意志", "教育", "幸运"]:
             investigator.attributes[attr_name] = 50
-            investigator.attribute_half[attr_name] = 25
-            investigator.attribute_fifth[attr_name] = 10
         
-        # 初始化衍生属性
-        investigator.hp = 10
-        investigator.mp = 10
-        investigator.san = 50
-        investigator.db = "0"
-        investigator.build = 0
-        investigator.mov = 8
+        # 计算半值、五分之一值和衍生属性
+        DERIVED_ENGINE.compute(investigator)
         
         # 初始化背景
         investigator.personal_description = "普通人"
@@ -341,36 +413,25 @@ class InvestigatorGenerator:
         Args:
             investigator: 调查员对象
         """
+        self.transfer_events = []
+        
         # 计算职业技能点
-        occupation = self.occupations.get_occupation(investigator.occupation)
-        if not occupation:
+        template = self.occupations.get_template(investigator.occupation)
+        if not template:
             print(f"警告: 未找到职业 '{investigator.occupation}'")
             return
         
-        # 初始化所有技能为基础值
-        for skill_name, skill_data in self.skills.skills.items():
-            base_value = skill_data.get("base_value", 0)
-            investigator.skills[skill_name] = base_value
-            
-            # 处理技能专攻
-            if "specializations" in skill_data:
-                investigator.skill_specializations[skill_name] = {}
-                for spec in skill_data["specializations"]:
-                    full_name = f"{skill_name}（{spec}）"
-                    # 特殊处理某些常用技能专攻的基础值
-                    if skill_name == "格斗" and spec == "斗殴":
-                        base_spec_value = 25  # 斗殴基础值25%
-                    elif skill_name == "射击" and spec == "手枪":
-                        base_spec_value = 20  # 手枪基础值20%
-                    elif skill_name == "驾驶" and spec == "汽车":
-                        base_spec_value = 20  # 汽车基础值20%
-                    elif skill_name == "语言" and spec == "母语":
-                        # 母语基础值EDU
-                        base_spec_value = investigator.attributes.get("教育", 0)
-                    else:
-                        base_spec_value = base_value
-                    
-                    investigator.skill_specializations[skill_name][full_name] = base_spec_value
+        # 初始化所有技能为基础值（基础值和专攻技能名称来自预先计算的技能目录索引）
+        index = self.skills.index
+        investigator.skills.update(index.base_value_map)
+        
+        # 处理技能专攻
+        for skill_name, spec_values in index.specialization_base_values.items():
+            investigator.skill_specializations[skill_name] = dict(spec_values)
+        
+        # 母语基础值EDU
+        if "语言（母语）" in investigator.skill_specializations.get("语言", {}):
+            investigator.skill_specializations["语言"]["语言（母语）"] = investigator.attributes.get("教育", 0)
         
         # 特殊处理闪避技能
         investigator.skills["闪避"] = investigator.attributes.get("敏捷", 0) // 2
@@ -381,92 +442,38 @@ class InvestigatorGenerator:
             self.generate_language_skills(investigator)
         
         # 分配职业技能点
-        edu = investigator.attributes.get("教育", 0)
-        investigator.occupation_skill_points = self.occupations.calculate_skill_points(investigator.occupation, edu)
+        investigator.occupation_skill_points = template.skill_points(investigator.attributes)
         
         # 分配兴趣技能点
         investigator.interest_skill_points = investigator.attributes.get("智力", 0) * 2
         
         # 如果有职业技能列表，随机分配职业技能点
-        if "skills" in occupation:
-            investigator.occupation_skills = occupation["skills"]
-            self._distribute_occupation_skill_points(investigator)
+        if template.skill_slots:
+            self._distribute_occupation_skill_points(investigator, template)
         
         # 随机分配兴趣技能点
         self._distribute_interest_skill_points(investigator)
         
         # 应用技能转移规则
-        self._apply_skill_transfer_rules(investigator)
+        self.transfer_events.extend(self._apply_skill_transfer_rules(investigator))
 
-    def _distribute_occupation_skill_points(self, investigator):
+    def _distribute_occupation_skill_points(self, investigator, template):
         """分配职业技能点
         
         Args:
             investigator: 调查员对象
+            template: 职业模板（OccupationTemplate）
         """
-        occupation_skills = []
-        
-        # 处理职业技能列表，展开"任一"和"自选"选项
-        for skill in investigator.occupation_skills:
-            if "任一" in skill:
-                # 例如"艺术与手艺（任一）"，随机选择一个专攻
-                main_skill = skill.split("（")[0].strip()
-                if main_skill in self.skills.skills and "specializations" in self.skills.skills[main_skill]:
-                    specs = self.skills.skills[main_skill]["specializations"]
-                    selected_spec = random.choice(specs)
-                    occupation_skills.append(f"{main_skill}（{selected_spec}）")
-                else:
-                    occupation_skills.append(skill)
-            elif "自选" in skill:
-                # 例如"自选一技能"，随机选择一个非职业技能
-                non_occupation_skills = [s for s in self.skills.skills.keys() 
-                                       if s not in investigator.occupation_skills and "自选" not in s]
-                if non_occupation_skills:
-                    selected_skill = random.choice(non_occupation_skills)
-                    occupation_skills.append(selected_skill)
-            else:
-                occupation_skills.append(skill)
+        # 展开多选一、任一专攻和自选技能
+        occupation_skills = template.expand_skills(self.rng, self.skills.index)
         
         # 更新调查员的职业技能列表
         investigator.occupation_skills = occupation_skills
         
-        # 剩余可分配点数
-        remaining_points = investigator.occupation_skill_points
-        
-        # 随机分配点数给职业技能
-        while remaining_points > 0 and occupation_skills:
-            # 随机选择一个技能
-            skill = random.choice(occupation_skills)
-            
-            # 确定可分配的最大点数（不超过提升上限和剩余点数）
-            if "（" in skill or "(" in skill:
-                # 专攻技能
-                main_skill = skill.split("（")[0].split("(")[0].strip()
-                current_value = investigator.get_skill(skill)
-                max_allocation = min(remaining_points, 75 - current_value)
-            else:
-                # 普通技能
-                current_value = investigator.get_skill(skill)
-                max_allocation = min(remaining_points, 75 - current_value)
-            
-            # 如果无法再分配，从列表中移除该技能
-            if max_allocation <= 0:
-                occupation_skills.remove(skill)
-                continue
-            
-            # 随机分配1-5点
-            points_to_add = random.randint(1, min(5, max_allocation))
-            
-            # 添加技能点
-            if "（" in skill or "(" in skill:
-                # 专攻技能
-                investigator.add_skill(skill, current_value + points_to_add)
-            else:
-                investigator.skills[skill] = current_value + points_to_add
-            
-            # 更新剩余点数
-            remaining_points -= points_to_add
-            investigator.occupation_skill_points_allocated += points_to_add
+        # 一次性分配全部职业技能点
+        investigator.occupation_skill_points_allocated += self._allocate_skill_points(
+            investigator, occupation_skills, investigator.occupation_skill_points
+        )
     
     def _distribute_interest_skill_points(self, investigator):
         """分配兴趣技能点
@@ -474,82 +481,66 @@ class InvestigatorGenerator:
         Args:
             investigator: 调查员对象
         """
-        # 剩余可分配点数
-        remaining_points = investigator.interest_skill_points
-        
         # 随机选择2-4个兴趣技能
-        num_interest_skills = random.randint(2, 4)
-        
-        # 排除已经是职业技能的技能
-        available_skills = []
-        for skill_name in self.skills.skills.keys():
-            if skill_name not in investigator.occupation_skills:
-                if "specializations" in self.skills.skills[skill_name]:
-                    # 对于有专攻的技能，添加专攻版本
-                    for spec in self.skills.skills[skill_name]["specializations"]:
-                        spec_skill = f"{skill_name}（{spec}）"
-                        if spec_skill not in investigator.occupation_skills:
-                            available_skills.append(spec_skill)
-                else:
-                    available_skills.append(skill_name)
+        num_interest_skills = self.rng.randint(2, 4)
+        
+        # 排除已经是职业技能的技能（有专攻的技能展开为各专攻）
+        available_skills = self.skills.index.interest_candidates(set(investigator.occupation_skills))
         
         if not available_skills:
             return
         
         # 随机选择兴趣技能
-        interest_skills = random.sample(available_skills, min(num_interest_skills, len(available_skills)))
+        interest_skills = self.rng.sample(available_skills, min(num_interest_skills, len(available_skills)))
         
-        # 随机分配点数给兴趣技能
-        while remaining_points > 0 and interest_skills:
-            # 随机选择一个技能
-            skill = random.choice(interest_skills)
-            
-            # 确定可分配的最大点数（不超过提升上限和剩余点数）
-            if "（" in skill or "(" in skill:
-                # 专攻技能
-                current_value = investigator.get_skill(skill)
-                max_allocation = min(remaining_points, 75 - current_value)
-            else:
-                # 普通技能
-                current_value = investigator.get_skill(skill)
-                max_allocation = min(remaining_points, 75 - current_value)
-            
-            # 如果无法再分配，从列表中移除该技能
-            if max_allocation <= 0:
-                interest_skills.remove(skill)
+        # 一次性分配全部兴趣技能点
+        investigator.interest_skill_points_allocated += self._allocate_skill_points(
+            investigator, interest_skills, investigator.interest_skill_points
+        )
+    
+    def _allocate_skill_points(self, investigator, skills, points):
+        """把点数一次性分配到若干技能上（不超过规则集的技能上限，标准规则为75%）
+        
+        Args:
+            investigator: 调查员对象
+            skills: 技能名称列表
+            points: 可分配点数
+        
+        Returns:
+            实际分配的点数
+        """
+        skill_values = investigator.skills
+        get = skill_values.get
+        current_values = {skill: get(skill, 0) for skill in skills}
+        cap = self.allocator.cap
+        allocation = self.allocator.allocate(points, [cap - value for value in current_values.values()], self.rng)
+        
+        for (skill, current_value), points_to_add in zip(current_values.items(), allocation):
+            if not points_to_add:
                 continue
-            
-            # 随机分配1-5点
-            points_to_add = random.randint(1, min(5, max_allocation))
-            
-            # 添加技能点
+            value = current_value + points_to_add
             if "（" in skill or "(" in skill:
-                # 专攻技能
-                investigator.add_skill(skill, current_value + points_to_add)
-            else:
-                investigator.skills[skill] = current_value + points_to_add
-            
-            # 更新剩余点数
-            remaining_points -= points_to_add
-            investigator.interest_skill_points_allocated += points_to_add
+                # 专攻技能；先前的语言技能转移可能已经提升了该技能，取较大值
+                value = max(get(skill, 0), value)
+                self.transfer_events.extend(investigator.add_skill(skill, value, self.rules))
+            elif get(skill, 0) < value:
+                skill_values[skill] = value
+        
+        return sum(allocation)
     
     def _apply_skill_transfer_rules(self, investigator):
         """应用技能转移规则
         
+        生成过程中经add_skill修改的语言技能已经即时传播了技能转移，
+        这里只对达到阈值的语言技能补齐被后续赋值覆盖的转移结果。
+        
         Args:
             investigator: 调查员对象
-        """
-        # 对每个有专攻的技能，检查并应用技能转移规则
-        for main_skill in investigator.skill_specializations.keys():
-            investigator._apply_skill_transfer(main_skill)
-        
-        # 特殊处理语言技能的转移规则
-        language_skills = [skill for skill in investigator.skills.keys() if skill.startswith("语言（") and skill.endswith("）")]
-        for lang_skill in language_skills:
-            # 增强的日志，帮助理解语言技能转移过程
-            investigator._apply_skill_transfer(lang_skill)
             
-        # 不再需要输出语言技能值的循环
+        Returns:
+            list: 被提升的同系语言（SkillTransferEvent）
+        """
+        return SKILL_TRANSFER.settle(investigator, self.rules)
 
     def _show_language_skills(self, investigator):
         """显示调查员的语言技能
@@ -562,23 +553,18 @@ class InvestigatorGenerator:
         """
         result = "语言技能:\n"
         
-        # 获取语言族群信息
-        language_families = self.skills.get_skill_info("语言").get("language_families", {})
+        # 获取语言语系图
+        graph = self.skills.index.language_graph
         
         # 按语言族群组织语言技能
         languages_by_family = {}
         
         for skill_name, skill_value in investigator.skills.items():
-            if skill_name.startswith("语言（") and skill_name.endswith("）"):
-                # 提取语言名称
-                language = skill_name[3:-1]  # 去掉"语言（"和"）"
-                
+            # 提取语言名称（去掉"语言（"和"）"）
+            language = language_of(skill_name)
+            if language is not None:
                 # 查找语言所属的族群
-                family = "其他"
-                for f_name, langs in language_families.items():
-                    if language in langs:
-                        family = f_name
-                        break
+                family = graph.family(language)
                 
                 # 添加到对应族群
                 if family not in languages_by_family:
@@ -655,35 +641,28 @@ class InvestigatorGenerator:
         
         # 设置母语
         mother_tongue_skill = f"语言（{mother_tongue_lang}）"
-        investigator.add_skill(mother_tongue_skill, investigator.attributes.get("教育", 0))
-        
-        # 获取所有语言及其语系
-        language_families = self.skills.get_skill_info("语言").get("language_families", {})
+        self.transfer_events.extend(
+            investigator.add_skill(mother_tongue_skill, investigator.attributes.get("教育", 0), self.rules)
+        )
         
-        # 找出母语所属的语系
-        same_family_languages = []
-        mother_family = None
-        for family, langs in language_families.items():
-            if mother_tongue_lang in langs:
-                same_family_languages = [lang for lang in langs if lang != mother_tongue_lang]
-                mother_family = family
-                break
+        # 找出与母语同系的语言
+        same_family_languages = self.skills.index.language_graph.same_family(mother_tongue_lang)
         
         # 为同系语言设置初始值
         if same_family_languages:
             for lang in same_family_languages:
-                lang_skill = f"语言（{lang}）"
+                lang_skill = language_skill_name(lang)
                 # 同系语言初始值为5-15%（根据教育值）
                 base_value = max(5, min(15, investigator.attributes.get("教育", 0) // 10))
-                investigator.add_skill(lang_skill, base_value)
+                self.transfer_events.extend(investigator.add_skill(lang_skill, base_value, self.rules))
         
         # 为其他常见语言设置基础值为1-5%
         # 优先添加国际通用语言
         common_languages = ["英语", "法语", "德语", "西班牙语", "拉丁语", "中文", "俄语", "阿拉伯语"]
         for lang in common_languages:
             if lang != mother_tongue_lang and lang not in same_family_languages:
-                lang_skill = f"语言（{lang}）"
+                lang_skill = language_skill_name(lang)
                 if lang_skill not in investigator.skills:
                     # 非同系常见语言初始值为1-5%
                     base_value = max(1, min(5, investigator.attributes.get("智力", 0) // 20))
-                    investigator.add_skill(lang_skill, base_value) 
\ No newline at end of file
+                    self.transfer_events.extend(investigator.add_skill(lang_skill, base_value, self.rules)) 
\ No newline at end of file
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import random
+from utils.rng import resolve_rng
 
 """
 疯狂系统模块
@@ -17,13 +17,22 @@ import random
 class InsanitySystem:
     """疯狂系统类"""
     
-    def __init__(self, dice_roller=None):
+    def __init__(self, dice_roller=None, rng=None):
         """初始化疯狂系统
         
         Args:
             dice_roller: 骰子工具对象，可选
+            rng: 没有骰子工具时使用的随机数源，可选，默认使用全局random模块
         """
         self.dice_roller = dice_roller
+        self._rng = resolve_rng(rng)
+    
+    @property
+    def rng(self):
+        """当前随机数源：有骰子工具时与骰子工具共用同一个随机流"""
+        if self.dice_roller:
+            return self.dice_roller.rng
+        return self._rng
     
     def set_dice_roller(self, dice_roller):
         """设置骰子工具
@@ -123,8 +132,8 @@ class InsanitySystem:
             # 使用骰子工具
             roll = self.dice_roller.roll("1D10") - 1  # 转换为0-9的索引
         else:
-            # 使用random模块
-            roll = random.randint(0, 9)
+            # 直接使用随机数源
+            roll = self.rng.randint(0, 9)
         
         selected = temp_insanity_table[roll]
         
@@ -205,8 +214,8 @@ class InsanitySystem:
             # 使用骰子工具
             roll = self.dice_roller.roll("1D10") - 1  # 转换为0-9的索引
         else:
-            # 使用random模块
-            roll = random.randint(0, 9)
+            # 直接使用随机数源
+            roll = self.rng.randint(0, 9)
         
         selected = indef_insanity_table[roll]
         
@@ -253,7 +262,7 @@ class InsanitySystem:
         ]
         
         # 随机选择一个恐惧症
-        selected = random.choice(phobias)
+        selected = self.rng.choice(phobias)
         
         return {
             "type": "phobia",
@@ -294,7 +303,7 @@ class InsanitySystem:
         ]
         
         # 随机选择一个狂躁症
-        selected = random.choice(manias)
+        selected = self.rng.choice(manias)
         
         return {
             "type": "mania",
@@ -387,7 +396,7 @@ class InsanitySystem:
                 pow_check = roll <= investigator.attributes.get("意志", 0)
             else:
                 # 没有骰子工具，假设有20%的恢复几率
-                pow_check = random.random() < 0.2
+                pow_check = self.rng.random() < 0.2
             
             if pow_check:
                 # 恢复成功
@@ -28,6 +28,9 @@ Copyright (c) 2025 COC Investigator Generator
 - 移动速度(MOV)：根据敏捷、力量和体型比较确定，并受年龄影响
 """
 
+from core.derived import DERIVED_ENGINE, DERIVED_ATTRIBUTE_STATS, HALF_FIFTH_STATS, SANITY_STATS
+from core.skill_transfer import SKILL_TRANSFER
+
 class Investigator:
     """调查员模型类"""
 
@@ -110,62 +113,15 @@ class Investigator:
         self.ideology = value
 
     def calculate_derived_attributes(self):
-        """计算衍生属性"""
-        # 计算生命值
-        self.hp = (self.attributes["体质"] + self.attributes["体型"]) // 10
-
-        # 计算魔法值
-        self.mp = self.attributes["意志"] // 5
-
-        # 计算理智值
-        self.san = self.attributes["意志"]
-
-        # 计算伤害加值和体格
-        str_siz = self.attributes["力量"] + self.attributes["体型"]
-        if str_siz <= 64:
-            self.db = "-2"
-            self.build = -2
-        elif str_siz <= 84:
-            self.db = "-1"
-            self.build = -1
-        elif str_siz <= 124:
-            self.db = "0"
-            self.build = 0
-        elif str_siz <= 164:
-            self.db = "+1D4"
-            self.build = 1
-        elif str_siz <= 204:
-            self.db = "+1D6"
-            self.build = 2
-        else:
-            self.db = "+2D6"
-            self.build = 3
-
-        # 计算移动速度
-        if self.attributes["敏捷"] < self.attributes["体型"] and self.attributes["力量"] < self.attributes["体型"]:
-            self.mov = 7
-        elif self.attributes["敏捷"] >= self.attributes["体型"] and self.attributes["力量"] >= self.attributes["体型"]:
-            self.mov = 9
-        else:
-            self.mov = 8
-
-        # 根据年龄调整移动速度
-        if 40 <= self.age <= 49:
-            self.mov -= 1
-        elif 50 <= self.age <= 59:
-            self.mov -= 2
-        elif 60 <= self.age <= 69:
-            self.mov -= 3
-        elif 70 <= self.age <= 79:
-            self.mov -= 4
-        elif 80 <= self.age <= 89:
-            self.mov -= 5
+        """计算衍生属性（生命值、魔法值、理智值、伤害加值、体格、移动速度）
+
+        计算规则在core.derived中声明，与生成器和界面使用同一份实现。
+        """
+        DERIVED_ENGINE.compute(self, DERIVED_ATTRIBUTE_STATS)
 
     def calculate_half_fifth_values(self):
         """计算属性的半值和五分之一值"""
-        for attr_name, attr_value in self.attributes.items():
-            self.attribute_half[attr_name] = attr_value // 2
-            self.attribute_fifth[attr_name] = attr_value // 5
+        DERIVED_ENGINE.compute(self, HALF_FIFTH_STATS)
 
     def to_dict(self):
         """将调查员对象转换为字典
@@ -278,12 +234,16 @@ class Investigator:
 
         return investigator
 
-    def add_skill(self, skill_name, value):
+    def add_skill(self, skill_name, value, rules=None):
         """添加或更新技能值
         
         Args:
             skill_name: 技能名称
             value: 技能值
+            rules: 技能转移使用的规则集（RuleSet），为None时使用默认规则集
+            
+        Returns:
+            list: 语言技能跨越50%或90%阈值时带动的同系语言变化（SkillTransferEvent），否则为空列表
         """
         # 检查是否是专攻技能
         is_specialization = "（" in skill_name and "）" in skill_name
@@ -291,16 +251,6 @@ class Investigator:
         # 获取当前技能值
         current_value = self.skills.get(skill_name, 0)
         
-        # 如果是语言技能，记录是否跨越了50%和90%的阈值
-        crossed_fifty = False
-        crossed_ninety = False
-        
-        if skill_name.startswith("语言（") and skill_name.endswith("）"):
-            if current_value < 50 and value >= 50:
-                crossed_fifty = True
-            if current_value < 90 and value >= 90:
-                crossed_ninety = True
-        
         # 更新技能值
         self.skills[skill_name] = value
         
@@ -312,8 +262,7 @@ class Investigator:
             self.skill_specializations[main_skill][skill_name] = value
         
         # 如果是语言技能并且跨越了阈值，应用技能转移规则
-        if (crossed_fifty or crossed_ninety) and skill_name.startswith("语言（"):
-            self._apply_skill_transfer(skill_name)
+        return SKILL_TRANSFER.propagate(self, skill_name, current_value, rules)
     
     def get_skill(self, skill_name):
         """获取技能值
@@ -326,87 +275,23 @@ class Investigator:
         """
         return self.skills.get(skill_name, 0)
     
-    def _apply_skill_transfer(self, skill_name):
+    def _apply_skill_transfer(self, skill_name, rules=None):
         """应用技能转移规则
         
         当一门语言技能达到50%或90%时，同系语言都会获得提升
         
         Args:
             skill_name: 技能名称
-        """
-        # 只处理语言技能
-        if not skill_name.startswith("语言（") or not skill_name.endswith("）"):
-            return
-        
-        # 获取当前技能值
-        current_value = self.skills.get(skill_name, 0)
-        
-        # 如果未达到阈值，不处理
-        if current_value < 50:
-            return
-        
-        # 从技能名称中提取语言名称
-        language = skill_name[skill_name.find("（")+1:skill_name.find("）")]
-        
-        # 获取语言族群信息
-        # 注意：这里需要从外部加载语言族群信息，这里简化处理
-        language_families = {
-            "日耳曼语族": ["英语", "德语", "荷兰语", "瑞典语", "挪威语", "丹麦语"],
-            "斯拉夫语族": ["俄语", "波兰语", "捷克语", "乌克兰语", "塞尔维亚语"],
-            "罗曼语族": ["法语", "西班牙语", "意大利语", "葡萄牙语", "罗马尼亚语"],
-            "汉藏语系": ["中文", "藏语"],
-            "阿尔泰语系": ["日语", "韩语", "蒙古语", "维吾尔语"],
-            "闪含语系": ["阿拉伯语", "希伯来语", "埃塞俄比亚语"],
-            "古典语言": ["拉丁语", "希腊语", "梵语", "古埃及语"]
-        }
-        
-        # 查找该语言属于哪个语系
-        target_family = None
-        related_languages = []
-        
-        for family, languages in language_families.items():
-            if language in languages:
-                target_family = family
-                related_languages = [lang for lang in languages if lang != language]
-                break
-        
-        if not target_family:
-            return
-        
-        # 确定提升值
-        boost_value = 0
-        if current_value >= 90:
-            boost_value = 20  # 90%阈值提升20%（包括50%阈值的10%）
-        elif current_value >= 50:
-            boost_value = 10  # 50%阈值提升10%
-        
-        if boost_value == 0:
-            return
-        
-        # 应用提升到相关语言
-        for related_lang in related_languages:
-            related_skill = f"语言（{related_lang}）"
-            related_value = self.skills.get(related_skill, 0)
+            rules: 技能转移使用的规则集（RuleSet），为None时使用默认规则集
             
-            # 如果相关语言技能值低于提升后的值，则提升
-            if related_value < boost_value:
-                self.skills[related_skill] = boost_value
-                
-                # 如果是专攻技能，也更新专攻字典
-                if "语言" in self.skill_specializations:
-                    self.skill_specializations["语言"][related_skill] = boost_value
+        Returns:
+            list: 被提升的同系语言（SkillTransferEvent）
+        """
+        return SKILL_TRANSFER.propagate(self, skill_name, 0, rules)
                     
     def update_max_sanity(self):
         """更新理智值上限
         
-        根据克苏鲁神话技能值计算理智值上限
+        根据克苏鲁神话技能值计算理智值上限，并确保理智值不超过上限
         """
-        # 获取克苏鲁神话技能值
-        cthulhu_mythos = self.skills.get("克苏鲁神话", 0)
-        
-        # 计算理智值上限
-        self.max_san = 99 - cthulhu_mythos
-        
-        # 确保理智值不超过上限
-        if hasattr(self, 'san') and self.san > self.max_san:
-            self.san = self.max_san
\ No newline at end of file
+        DERIVED_ENGINE.compute(self, SANITY_STATS)
\ No newline at end of file
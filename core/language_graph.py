@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+语言语系图模块
+
+由技能数据中"语言"条目的language_families一次性构建语系关系：
+- 语言到语系的对应表（O(1)查找）
+- 每门语言的同系语言列表（预先计算，不含该语言本身）
+- 按技能名称（如"语言（英语）"）索引的同一组信息，供技能转移规则直接使用
+
+语系图只读，带有由语系数据计算出的版本号，语系数据相同时共用同一个对象。
+技能转移、生成器、技能查看器和界面都通过本模块查询语系，不再各自遍历语系数据。
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import os
+import json
+import hashlib
+import threading
+from types import MappingProxyType
+
+from core.catalogue import get_catalogue
+
+# 语系图格式版本，修改语系图结构时递增
+LANGUAGE_GRAPH_VERSION = 1
+
+# 没有默认语系图时读取的技能数据文件
+DEFAULT_SKILLS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skills.json")
+
+# 不属于任何语系的语言显示的语系名称
+OTHER_FAMILY = "其他"
+
+def language_skill_name(language):
+    """拼接语言技能的完整名称，如"语言（英语）"""
+    return f"语言（{language}）"
+
+def language_of(skill_name):
+    """从语言技能名称中取出语言名称
+
+    Args:
+        skill_name: 技能名称，如"语言（英语）"
+
+    Returns:
+        语言名称，不是语言专攻技能时返回None
+    """
+    if skill_name.startswith("语言（") and skill_name.endswith("）"):
+        return skill_name[3:-1]
+    return None
+
+class LanguageGraph:
+    """只读的语言语系图"""
+
+    __slots__ = ("version", "families", "family_of", "siblings", "skill_family", "sibling_skills")
+
+    def __init__(self, families):
+        """由语系数据构建语系图
+
+        同一门语言出现在多个语系中时以第一个语系为准。
+
+        Args:
+            families: {语系名称: [语言, ...]}
+        """
+        set_attr = object.__setattr__
+        families = {family: tuple(members) for family, members in families.items()}
+        set_attr(self, "version", self.compute_version(families))
+        set_attr(self, "families", MappingProxyType(families))
+
+        family_of = {}
+        for family, members in families.items():
+            for language in members:
+                family_of.setdefault(language, family)
+        siblings = {
+            language: tuple(member for member in families[family] if member != language)
+            for language, family in family_of.items()
+        }
+        set_attr(self, "family_of", MappingProxyType(family_of))
+        set_attr(self, "siblings", MappingProxyType(siblings))
+        set_attr(self, "skill_family", MappingProxyType({
+            language_skill_name(language): family for language, family in family_of.items()
+        }))
+        set_attr(self, "sibling_skills", MappingProxyType({
+            language_skill_name(language): tuple(language_skill_name(member) for member in members)
+            for language, members in siblings.items()
+        }))
+
+    @staticmethod
+    def compute_version(families):
+        """由语系数据计算版本号（数据相同则版本号相同）"""
+        payload = json.dumps([LANGUAGE_GRAPH_VERSION, list(families.items())], ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+    @classmethod
+    def from_skills(cls, skills):
+        """由技能数据字典获取语系图，语系数据相同时返回同一个对象
+
+        Args:
+            skills: 技能数据字典（Skills.skills）
+
+        Returns:
+            LanguageGraph对象
+        """
+        language_info = skills.get("语言") or {}
+        families = {family: tuple(members) for family, members in language_info.get("language_families", {}).items()}
+        version = cls.compute_version(families)
+        with _graphs_lock:
+            graph = _graphs.get(version)
+            if graph is None:
+                graph = _graphs[version] = cls(families)
+            return graph
+
+    def __setattr__(self, name, value):
+        raise AttributeError("语言语系图是只读的")
+
+    def __reduce__(self):
+        return (LanguageGraph, (dict(self.families),))
+
+    def __len__(self):
+        return len(self.family_of)
+
+    def __contains__(self, language):
+        return language in self.family_of
+
+    def family(self, language, default=OTHER_FAMILY):
+        """获取语言所属的语系
+
+        Args:
+            language: 语言名称
+            default: 不属于任何语系时的返回值
+
+        Returns:
+            语系名称
+        """
+        return self.family_of.get(language, default)
+
+    def same_family(self, language):
+        """获取与指定语言同系的其他语言
+
+        Args:
+            language: 语言名称
+
+        Returns:
+            同系语言元组，不属于任何语系时为空元组
+        """
+        return self.siblings.get(language, ())
+
+# 按版本号共享的语系图
+_graphs = {}
+_graphs_lock = threading.Lock()
+
+# 调查员的技能转移规则使用的默认语系图
+_default_graph = None
+
+def set_default_language_graph(graph):
+    """设置默认语系图（Skills.load_skills加载技能数据后调用）"""
+    global _default_graph
+    _default_graph = graph
+
+def default_language_graph():
+    """获取默认语系图
+
+    尚未加载技能数据时由DEFAULT_SKILLS_FILE构建（通过共享的数据目录加载器读取）。
+    """
+    graph = _default_graph
+    if graph is None:
+        try:
+            skills = get_catalogue().load(DEFAULT_SKILLS_FILE)
+        except Exception as e:
+            # 加载失败时本次使用空语系图，下次调用时重试
+            print(f"加载语系数据失败: {e}")
+            return LanguageGraph({})
+        graph = LanguageGraph.from_skills(skills)
+        set_default_language_graph(graph)
+    return graph
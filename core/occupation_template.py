@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+职业模板模块
+
+加载职业数据时把每个职业编译为结构化的模板，生成调查员时只需对模板求值：
+- 技能点公式：支持 "EDU*2+DEX*2" 和 "教育×2+敏捷×2或力量×2" 两种写法，
+  按调查员的真实属性计算，"或"取其中较大的一项
+- 职业技能：固定技能、多选一（"历史或博物学"、"一种社交技能（取悦、话术、恐吓或说服）"）、
+  任一专攻（"艺术与手艺（任一）"）以及自选技能数量（"自选二技能"）
+- 信用评级范围：支持 "credit_rating": (最小, 最大) 和 credit_rating_min/credit_rating_max 两种写法
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import re
+
+# 公式中的属性名称（英文缩写或中文）到属性名称的映射
+ATTRIBUTE_ALIASES = {
+    "STR": "力量", "CON": "体质", "SIZ": "体型", "DEX": "敏捷", "APP": "外貌",
+    "INT": "智力", "POW": "意志", "EDU": "教育", "LUCK": "幸运"
+}
+ATTRIBUTE_ALIASES.update({name: name for name in ATTRIBUTE_ALIASES.values()})
+
+# 职业技能中的主技能名称与技能数据中名称不同的情况
+SKILL_ALIASES = {
+    "艺术与手艺": "艺术/手艺"
+}
+
+# 自选技能数量
+CHINESE_NUMERALS = {"一": 1, "二": 2, "两": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8}
+
+# 公式中的一项：属性×倍数
+FORMULA_TERM_PATTERN = re.compile(r"^([A-Z]+|[一-鿿]+)\*(\d+)$")
+
+# 自选技能，如"自选二技能"
+WILDCARD_PATTERN = re.compile(r"^自选([一二两三四五六七八]|\d+)(?:项|个)?技能$")
+
+# 多选一的技能组，如"一种社交技能（取悦、话术、恐吓或说服）"
+CHOICE_GROUP_PATTERN = re.compile(r"^[一二两三四五六七八\d]种.*?（(.+)）$")
+
+# 任一专攻，如"艺术与手艺（任一）"
+ANY_SPECIALIZATION_PATTERN = re.compile(r"^(.+?)（任一）$")
+
+# 默认技能点公式
+DEFAULT_FORMULA = "EDU*4"
+
+class SkillPointFormula:
+    """已解析的技能点公式"""
+
+    __slots__ = ("text", "terms")
+
+    def __init__(self, text, terms):
+        """初始化公式
+
+        Args:
+            text: 原始公式文本
+            terms: 各项的元组，每项为若干个可选的(属性名称, 倍数)，求值时取最大者
+        """
+        self.text = text
+        self.terms = terms
+
+    @classmethod
+    def parse(cls, text):
+        """解析技能点公式
+
+        Args:
+            text: 公式文本，如 "EDU*4"、"教育×2+敏捷×2或力量×2"
+
+        Returns:
+            SkillPointFormula对象
+
+        Raises:
+            ValueError: 无法解析公式
+        """
+        normalized = text.replace("×", "*").replace("＋", "+").replace(" ", "").upper()
+        if not normalized:
+            raise ValueError("技能点公式为空")
+
+        terms = []
+        for term in normalized.split("+"):
+            alternatives = []
+            for alternative in term.split("或"):
+                match = FORMULA_TERM_PATTERN.match(alternative)
+                if not match or match.group(1) not in ATTRIBUTE_ALIASES:
+                    raise ValueError(f"无法解析技能点公式 '{text}' 中的 '{alternative}'")
+                alternatives.append((ATTRIBUTE_ALIASES[match.group(1)], int(match.group(2))))
+            terms.append(tuple(alternatives))
+
+        return cls(text, tuple(terms))
+
+    def evaluate(self, attributes):
+        """按属性值计算技能点
+
+        Args:
+            attributes: 属性字典
+
+        Returns:
+            技能点数
+        """
+        return sum(
+            max(attributes.get(attr_name, 0) * multiplier for attr_name, multiplier in alternatives)
+            for alternatives in self.terms
+        )
+
+    @property
+    def attributes(self):
+        """公式用到的全部属性名称"""
+        return tuple(dict.fromkeys(attr_name for alternatives in self.terms for attr_name, _ in alternatives))
+
+    def __repr__(self):
+        return f"SkillPointFormula({self.text!r})"
+
+class OccupationTemplate:
+    """编译后的职业模板
+
+    skill_slots中的每一项为以下之一：
+    - ("skill", 技能名称)
+    - ("choice", (可选技能, ...))
+    - ("any", 主技能名称, 原始写法)
+    - ("wildcard", 数量)
+    """
+
+    __slots__ = ("name", "formula", "credit_rating", "skill_slots", "fixed_skills", "wildcard_count", "errors")
+
+    def __init__(self, name, formula, credit_rating, skill_slots, errors=()):
+        """初始化职业模板
+
+        Args:
+            name: 职业名称
+            formula: SkillPointFormula对象
+            credit_rating: 信用评级范围(最小, 最大)
+            skill_slots: 职业技能槽位元组
+            errors: 编译时发现的问题
+        """
+        self.name = name
+        self.formula = formula
+        self.credit_rating = credit_rating
+        self.skill_slots = skill_slots
+        self.fixed_skills = frozenset(slot[1] for slot in skill_slots if slot[0] == "skill")
+        self.wildcard_count = sum(slot[1] for slot in skill_slots if slot[0] == "wildcard")
+        self.errors = tuple(errors)
+
+    @classmethod
+    def compile(cls, name, data):
+        """把职业数据编译为模板
+
+        编译出错的部分使用默认值（技能点公式默认为EDU*4），错误记录在errors中。
+
+        Args:
+            name: 职业名称
+            data: 职业数据字典
+
+        Returns:
+            OccupationTemplate对象
+        """
+        errors = []
+
+        formula_text = data.get("skill_points_formula") or data.get("skill_points") or DEFAULT_FORMULA
+        try:
+            formula = SkillPointFormula.parse(formula_text)
+        except ValueError as e:
+            errors.append(str(e))
+            formula = SkillPointFormula.parse(DEFAULT_FORMULA)
+
+        if "credit_rating" in data:
+            credit_rating = tuple(data["credit_rating"])
+        else:
+            credit_rating = (data.get("credit_rating_min", 0), data.get("credit_rating_max", 0))
+        if len(credit_rating) != 2 or credit_rating[0] > credit_rating[1]:
+            errors.append(f"无效的信用评级范围: {credit_rating}")
+            credit_rating = (0, 0)
+
+        skill_slots = tuple(cls.parse_skill(entry) for entry in data.get("skills", []))
+
+        return cls(name, formula, credit_rating, skill_slots, errors)
+
+    @staticmethod
+    def parse_skill(entry):
+        """解析一项职业技能
+
+        Args:
+            entry: 职业技能文本
+
+        Returns:
+            技能槽位元组
+        """
+        match = WILDCARD_PATTERN.match(entry)
+        if match:
+            count = match.group(1)
+            return ("wildcard", int(count) if count.isdigit() else CHINESE_NUMERALS[count])
+
+        match = CHOICE_GROUP_PATTERN.match(entry)
+        if match:
+            options = re.split(r"、|或", match.group(1))
+            return ("choice", tuple(option.strip() for option in options if option.strip()))
+
+        match = ANY_SPECIALIZATION_PATTERN.match(entry)
+        if match:
+            main_skill = match.group(1).strip()
+            return ("any", SKILL_ALIASES.get(main_skill, main_skill), entry)
+
+        if "或" in entry and "（" not in entry:
+            return ("choice", tuple(option.strip() for option in entry.split("或") if option.strip()))
+
+        return ("skill", entry)
+
+    def skill_points(self, attributes):
+        """计算职业技能点
+
+        Args:
+            attributes: 属性字典
+
+        Returns:
+            技能点数
+        """
+        return self.formula.evaluate(attributes)
+
+    def expand_skills(self, rng, skill_index):
+        """随机展开职业技能列表
+
+        多选一的技能组选择其一，任一专攻随机选择一个专攻，自选技能从非职业技能中随机选择。
+
+        Args:
+            rng: 随机数源
+            skill_index: 技能目录索引（SkillCatalogueIndex）
+
+        Returns:
+            具体技能名称列表
+        """
+        skills = []
+        wildcards = 0
+        for slot in self.skill_slots:
+            kind = slot[0]
+            if kind == "skill":
+                skills.append(slot[1])
+            elif kind == "choice":
+                skills.append(rng.choice(slot[1]))
+            elif kind == "any":
+                specializations = skill_index.specializations.get(slot[1])
+                skills.append(rng.choice(specializations) if specializations else slot[2])
+            else:
+                wildcards += slot[1]
+
+        if wildcards:
+            chosen = set(skills)
+            candidates = [name for name in skill_index.names if name not in chosen]
+            skills.extend(rng.sample(candidates, min(wildcards, len(candidates))))
+
+        return skills
+
+    def __repr__(self):
+        return f"OccupationTemplate({self.name!r}, {self.formula.text!r})"
@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import json
+from core.occupation_template import OccupationTemplate
+from core.catalogue import get_catalogue
 
 class Occupations:
     """职业数据类"""
@@ -9,6 +10,8 @@ class Occupations:
     def __init__(self):
         """初始化职业数据"""
         self.occupations = {}
+        self._templates = {}
+        self._templates_source = None
     
     def load_occupations(self, file_path):
         """从文件加载职业数据
@@ -17,15 +20,51 @@ class Occupations:
             file_path: 职业数据文件路径
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.occupations = json.load(f)
+            self.occupations = get_catalogue().load(file_path)
+            self.compile_templates()
             return True
         except Exception as e:
             print(f"加载职业数据失败: {e}")
             # 使用默认职业数据
             self.occupations = self.get_all_occupations()
+            self.compile_templates()
             return False
     
+    def compile_templates(self):
+        """把全部职业编译为模板，编译中发现的问题只在此时报告一次
+        
+        Returns:
+            职业名称到OccupationTemplate的字典
+        """
+        templates = {}
+        for name, data in self.occupations.items():
+            template = OccupationTemplate.compile(name, data)
+            for error in template.errors:
+                print(f"职业模板 '{name}' 编译警告: {error}")
+            templates[name] = template
+        
+        self._templates = templates
+        self._templates_source = self.occupations
+        return templates
+    
+    @property
+    def templates(self):
+        """职业模板字典；occupations被整体替换后首次访问时重新编译"""
+        if self._templates_source is not self.occupations:
+            self.compile_templates()
+        return self._templates
+    
+    def get_template(self, occupation_name):
+        """获取指定职业的模板
+        
+        Args:
+            occupation_name: 职业名称
+        
+        Returns:
+            OccupationTemplate对象，不存在时返回None
+        """
+        return self.templates.get(occupation_name)
+    
     def get_occupation(self, occupation_name):
         """获取指定职业
         
@@ -37,40 +76,39 @@ class Occupations:
         """
         return self.occupations.get(occupation_name, None)
     
-    def calculate_skill_points(self, occupation_name, edu):
+    def calculate_skill_points(self, occupation_name, edu, attributes=None):
         """计算职业技能点
         
         Args:
             occupation_name: 职业名称
             edu: 教育值
+            attributes: 调查员属性字典（可选）；未提供时公式中的其它属性按教育值的一半估算
         
         Returns:
             技能点数
         """
-        occupation = self.get_occupation(occupation_name)
-        if not occupation:
+        template = self.get_template(occupation_name)
+        if not template:
             return 0
         
-        skill_points_formula = occupation.get("skill_points", "")
+        if attributes is None:
+            attributes = {attr_name: edu // 2 for attr_name in template.formula.attributes}
+        attributes = dict(attributes)
+        attributes["教育"] = edu
+        
+        return template.skill_points(attributes)
+    
+    def get_credit_rating(self, occupation_name):
+        """获取职业的信用评级范围
+        
+        Args:
+            occupation_name: 职业名称
         
-        # 解析技能点公式
-        if "教育×4" in skill_points_formula:
-            return edu * 4
-        elif "教育×2+敏捷×2" in skill_points_formula:
-            # 由于我们没有敏捷值，暂时使用教育值的一半作为敏捷值
-            dex = edu // 2
-            return edu * 2 + dex * 2
-        elif "教育×2+力量×2" in skill_points_formula:
-            # 由于我们没有力量值，暂时使用教育值的一半作为力量值
-            str_val = edu // 2
-            return edu * 2 + str_val * 2
-        elif "教育×2+外貌×2" in skill_points_formula:
-            # 由于我们没有外貌值，暂时使用教育值的一半作为外貌值
-            app = edu // 2
-            return edu * 2 + app * 2
-        else:
-            # 默认返回教育值的4倍
-            return edu * 4
+        Returns:
+            (最小, 最大)，职业不存在时为(0, 0)
+        """
+        template = self.get_template(occupation_name)
+        return template.credit_rating if template else (0, 0)
     
     @staticmethod
     def get_all_occupations():
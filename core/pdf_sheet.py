@@ -0,0 +1,411 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+PDF角色卡渲染模块
+
+不依赖Qt和打印对话框，直接生成PDF文件，可以在没有显示器的机器上批量导出：
+- 中文使用PDF阅读器内置的 STSong-Light 字体（Adobe-GB1字符集，UniGB-UCS2-H编码），
+  不需要嵌入字体文件，每张角色卡只有几KB
+- 字体对象在整个文档中只写入一次，所有页面共用
+- 角色卡中固定不变的部分（标题、栏目标题、属性名称等）在第一次渲染时生成一个表单对象（Form XObject），
+  每一页只引用它，不重复绘制
+- 文字的编码按字符串缓存，技能名称等重复出现的文字只编码一次
+- 内容过长时（技能很多、背景很长）自动续页
+
+用法:
+    with PdfSheetDocument("sheets.pdf") as document:
+        for investigator in investigators:
+            document.add_sheet(investigator)
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import io
+import zlib
+
+from core.batch import ATTRIBUTE_NAMES
+
+# A4纸张大小（点）
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN = 40
+
+# 字号和行高
+TITLE_SIZE = 18
+HEADING_SIZE = 12
+TEXT_SIZE = 10
+SMALL_SIZE = 9
+LINE_HEIGHT = 14
+SMALL_LINE_HEIGHT = 12
+
+# 栏宽
+COLUMN_WIDTH = (PAGE_WIDTH - 2 * MARGIN) / 3
+
+# 固定部分中各栏目的纵坐标
+BASIC_TOP = PAGE_HEIGHT - MARGIN - 40
+ATTRIBUTE_TOP = BASIC_TOP - 4 * LINE_HEIGHT - 24
+DERIVED_TOP = ATTRIBUTE_TOP - 4 * LINE_HEIGHT - 24
+SKILL_TOP = DERIVED_TOP - 2 * LINE_HEIGHT - 24
+
+# 基本信息：每行的(标签, 字段)
+BASIC_FIELDS = (
+    (("姓名", "name"), ("玩家", "player")),
+    (("性别", "gender"), ("年龄", "age")),
+    (("职业", "occupation"), ("居住地", "residence")),
+    (("出生地", "birthplace"), None)
+)
+
+# 衍生属性：(标签, 字段)
+DERIVED_FIELDS = (
+    ("生命值", "hp"), ("魔法值", "mp"), ("理智值", "san"),
+    ("伤害加值", "db"), ("体格", "build"), ("移动速度", "mov")
+)
+
+# 背景：(标签, 字段)
+BACKGROUND_FIELDS = (
+    ("个人描述", "personal_description"),
+    ("思想信念", "ideology"),
+    ("重要之人", "significant_people"),
+    ("意义非凡之地", "meaningful_locations"),
+    ("宝贵之物", "treasured_possessions"),
+    ("特质", "traits"),
+    ("伤口和疤痕", "injuries_scars"),
+    ("恐惧症和躁狂症", "phobias_manias"),
+    ("背景故事", "background_story")
+)
+
+# 字体资源（整个文档共用）
+FONT_RESOURCES = b"<< /Font << /F1 %d 0 R >> >>"
+
+def _text_width(text, size):
+    """文字宽度（点）：ASCII字符为半角，其他字符为全角"""
+    return sum(0.5 if ord(char) < 128 else 1.0 for char in text) * size
+
+class PdfWriter:
+    """最小的PDF对象写入器：逐个写入对象，最后写入交叉引用表"""
+
+    def __init__(self, stream):
+        """初始化写入器
+
+        Args:
+            stream: 以二进制方式打开的可写文件对象
+        """
+        self.stream = stream
+        self.offsets = {}
+        self.next_id = 1
+        self.position = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data):
+        self.stream.write(data)
+        self.position += len(data)
+
+    def reserve(self):
+        """预留一个对象编号"""
+        object_id = self.next_id
+        self.next_id += 1
+        return object_id
+
+    def write_object(self, body, object_id=None):
+        """写入一个对象
+
+        Args:
+            body: 对象内容
+            object_id: 预留的对象编号，为None时分配新编号
+
+        Returns:
+            int: 对象编号
+        """
+        if object_id is None:
+            object_id = self.reserve()
+        self.offsets[object_id] = self.position
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (object_id, body))
+        return object_id
+
+    def write_stream(self, dictionary, data, object_id=None):
+        """写入一个压缩的流对象"""
+        data = zlib.compress(data, 6)
+        body = b"<< %s /Filter /FlateDecode /Length %d >>\nstream\n%s\nendstream" % (dictionary, len(data), data)
+        return self.write_object(body, object_id)
+
+    def finish(self, root_id):
+        """写入交叉引用表和文件尾"""
+        xref = self.position
+        lines = [b"xref\n0 %d\n" % self.next_id, b"0000000000 65535 f \n"]
+        for object_id in range(1, self.next_id):
+            lines.append(b"%010d 00000 n \n" % self.offsets.get(object_id, 0))
+        lines.append(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self.next_id, root_id, xref))
+        self._write(b"".join(lines))
+
+class _Canvas:
+    """一页的内容流"""
+
+    def __init__(self, encode):
+        self.encode = encode
+        self.parts = []
+
+    def text(self, x, y, text, size=TEXT_SIZE):
+        """在(x, y)处写一行文字（y为基线，原点在左下角）"""
+        if text:
+            self.parts.append(b"BT /F1 %d Tf %.1f %.1f Td <%s> Tj ET\n" % (size, x, y, self.encode(text)))
+
+    def line(self, x1, y1, x2, y2):
+        """画一条细线"""
+        self.parts.append(b"%.1f %.1f m %.1f %.1f l S\n" % (x1, y1, x2, y2))
+
+    def data(self):
+        return b"".join(self.parts)
+
+class PdfSheetDocument:
+    """多页PDF角色卡文档"""
+
+    def __init__(self, file_path_or_stream):
+        """创建文档
+
+        Args:
+            file_path_or_stream: 文件路径，或以二进制方式打开的可写文件对象
+        """
+        if isinstance(file_path_or_stream, str):
+            self._stream = open(file_path_or_stream, "wb")
+            self._owns_stream = True
+        else:
+            self._stream = file_path_or_stream
+            self._owns_stream = False
+        self.writer = PdfWriter(self._stream)
+        self.pages = []
+        self._encoded = {}
+
+        writer = self.writer
+        self._pages_id = writer.reserve()
+        descriptor = writer.write_object(
+            b"<< /Type /FontDescriptor /FontName /STSong-Light /Flags 6 /FontBBox [-25 -254 1000 880] "
+            b"/ItalicAngle 0 /Ascent 880 /Descent -120 /CapHeight 880 /StemV 93 >>"
+        )
+        cid_font = writer.write_object(
+            b"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /STSong-Light "
+            b"/CIDSystemInfo << /Registry (Adobe) /Ordering (GB1) /Supplement 2 >> "
+            b"/FontDescriptor %d 0 R /DW 1000 /W [1 95 500] >>" % descriptor
+        )
+        self._font_id = writer.write_object(
+            b"<< /Type /Font /Subtype /Type0 /BaseFont /STSong-Light /Encoding /UniGB-UCS2-H "
+            b"/DescendantFonts [%d 0 R] >>" % cid_font
+        )
+        self._resources = FONT_RESOURCES % self._font_id
+        self._static_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _encode(self, text):
+        """把文字编码为UCS-2十六进制串（结果按字符串缓存）"""
+        encoded = self._encoded.get(text)
+        if encoded is None:
+            # UniGB-UCS2-H只能表示基本多文种平面中的字符
+            safe = "".join(char if ord(char) < 0x10000 else "?" for char in text)
+            encoded = safe.encode("utf-16-be").hex().encode("ascii")
+            if len(self._encoded) < 65536:
+                self._encoded[text] = encoded
+        return encoded
+
+    def _static_form(self):
+        """角色卡固定部分的表单对象，第一次使用时写入"""
+        if self._static_id is not None:
+            return self._static_id
+
+        canvas = _Canvas(self._encode)
+        title = "克苏鲁的呼唤 - 调查员角色卡"
+        canvas.text((PAGE_WIDTH - _text_width(title, TITLE_SIZE)) / 2, PAGE_HEIGHT - MARGIN - 10, title, TITLE_SIZE)
+
+        for heading, top in (("基本信息", BASIC_TOP), ("属性（值 / 半值 / 五分之一值）", ATTRIBUTE_TOP),
+                             ("衍生属性", DERIVED_TOP), ("技能", SKILL_TOP)):
+            canvas.text(MARGIN, top, heading, HEADING_SIZE)
+            canvas.line(MARGIN, top - 4, PAGE_WIDTH - MARGIN, top - 4)
+
+        for row, fields in enumerate(BASIC_FIELDS):
+            for column, field in enumerate(fields):
+                if field:
+                    canvas.text(MARGIN + column * 1.5 * COLUMN_WIDTH, BASIC_TOP - (row + 1) * LINE_HEIGHT - 4, field[0] + ":")
+        for i, attr_name in enumerate(ATTRIBUTE_NAMES):
+            canvas.text(MARGIN + (i % 3) * COLUMN_WIDTH, ATTRIBUTE_TOP - (i // 3 + 1) * LINE_HEIGHT - 4, attr_name)
+        for i, (label, _) in enumerate(DERIVED_FIELDS):
+            canvas.text(MARGIN + (i % 3) * COLUMN_WIDTH, DERIVED_TOP - (i // 3 + 1) * LINE_HEIGHT - 4, label + ":")
+
+        self._static_id = self.writer.write_stream(
+            b"/Type /XObject /Subtype /Form /BBox [0 0 %d %d] /Resources %s" % (PAGE_WIDTH, PAGE_HEIGHT, self._resources),
+            canvas.data()
+        )
+        return self._static_id
+
+    def _write_page(self, canvas, static):
+        """写入一页"""
+        data = canvas.data()
+        if static:
+            data = b"/Static Do\n" + data
+            resources = b"<< /Font << /F1 %d 0 R >> /XObject << /Static %d 0 R >> >>" % (self._font_id, self._static_form())
+        else:
+            resources = self._resources
+        content = self.writer.write_stream(b"", data)
+        self.pages.append(self.writer.write_object(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+            % (self._pages_id, PAGE_WIDTH, PAGE_HEIGHT, resources, content)
+        ))
+
+    def _wrap(self, text, width, size):
+        """按宽度折行"""
+        lines = []
+        for paragraph in str(text).splitlines() or [""]:
+            line = ""
+            line_width = 0.0
+            for char in paragraph:
+                char_width = (0.5 if ord(char) < 128 else 1.0) * size
+                if line and line_width + char_width > width:
+                    lines.append(line)
+                    line = ""
+                    line_width = 0.0
+                line += char
+                line_width += char_width
+            lines.append(line)
+        return lines
+
+    def add_sheet(self, investigator):
+        """添加一名调查员的角色卡（一页或多页）
+
+        Args:
+            investigator: Investigator对象
+        """
+        canvas = _Canvas(self._encode)
+        value_x = 0.5 * COLUMN_WIDTH
+
+        for row, fields in enumerate(BASIC_FIELDS):
+            for column, field in enumerate(fields):
+                if field:
+                    canvas.text(MARGIN + column * 1.5 * COLUMN_WIDTH + 50, BASIC_TOP - (row + 1) * LINE_HEIGHT - 4,
+                                str(getattr(investigator, field[1], "")))
+        attributes = investigator.attributes
+        for i, attr_name in enumerate(ATTRIBUTE_NAMES):
+            value = attributes.get(attr_name, 0)
+            canvas.text(MARGIN + (i % 3) * COLUMN_WIDTH + value_x, ATTRIBUTE_TOP - (i // 3 + 1) * LINE_HEIGHT - 4,
+                        f"{value} / {investigator.attribute_half.get(attr_name, 0)} / {investigator.attribute_fifth.get(attr_name, 0)}")
+        for i, (_, field) in enumerate(DERIVED_FIELDS):
+            canvas.text(MARGIN + (i % 3) * COLUMN_WIDTH + value_x, DERIVED_TOP - (i // 3 + 1) * LINE_HEIGHT - 4,
+                        str(getattr(investigator, field, "")))
+
+        pages = [(canvas, True)]
+        y = SKILL_TOP - 4
+
+        def need(height):
+            """剩余高度不足时换页，返回当前画布"""
+            nonlocal canvas, y
+            if y - height < MARGIN:
+                canvas = _Canvas(self._encode)
+                pages.append((canvas, False))
+                y = PAGE_HEIGHT - MARGIN
+            return canvas
+
+        # 技能分三栏，按名称排序
+        skills = sorted(investigator.skills.items())
+        rows = (len(skills) + 2) // 3
+        for row in range(rows):
+            need(SMALL_LINE_HEIGHT)
+            y -= SMALL_LINE_HEIGHT
+            for column in range(3):
+                index = column * rows + row
+                if index < len(skills):
+                    name, value = skills[index]
+                    canvas.text(MARGIN + column * COLUMN_WIDTH, y, name, SMALL_SIZE)
+                    canvas.text(MARGIN + (column + 1) * COLUMN_WIDTH - 30, y, str(value), SMALL_SIZE)
+
+        sections = []
+        if investigator.equipment:
+            sections.append(("装备", [
+                " ".join(str(part) for part in (
+                    equipment.get("name", ""), f"x{equipment.get('quantity', '')}",
+                    equipment.get("damage", ""), equipment.get("range", "")
+                ) if part)
+                for equipment in investigator.equipment
+            ]))
+        if investigator.weapons:
+            sections.append(("武器", [str(weapon) for weapon in investigator.weapons]))
+        if investigator.items:
+            sections.append(("物品", [str(item) for item in investigator.items]))
+        sections.append(("财产", [f"现金: {investigator.cash}", f"资产: {investigator.assets}"]))
+        background = []
+        for label, field in BACKGROUND_FIELDS:
+            value = getattr(investigator, field, "")
+            if value:
+                background.append(f"{label}: {value}")
+        if background:
+            sections.append(("背景", background))
+
+        for heading, paragraphs in sections:
+            need(LINE_HEIGHT * 2 + 8)
+            y -= LINE_HEIGHT + 8
+            canvas.text(MARGIN, y, heading, HEADING_SIZE)
+            canvas.line(MARGIN, y - 4, PAGE_WIDTH - MARGIN, y - 4)
+            y -= 4
+            for paragraph in paragraphs:
+                for line in self._wrap(paragraph, PAGE_WIDTH - 2 * MARGIN, TEXT_SIZE):
+                    need(LINE_HEIGHT)
+                    y -= LINE_HEIGHT
+                    canvas.text(MARGIN, y, line)
+
+        for page_canvas, static in pages:
+            self._write_page(page_canvas, static)
+
+    def close(self):
+        """写入页面树、目录和交叉引用表，并关闭文件"""
+        if self.writer is None:
+            return
+        writer = self.writer
+        kids = b" ".join(b"%d 0 R" % page for page in self.pages)
+        writer.write_object(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.pages)), self._pages_id)
+        root = writer.write_object(b"<< /Type /Catalog /Pages %d 0 R >>" % self._pages_id)
+        writer.finish(root)
+        self.writer = None
+        if self._owns_stream:
+            self._stream.close()
+
+class PdfSheetFormat:
+    """PDF角色卡格式，供core.sheets的批量导出使用（每名调查员一个PDF文件）"""
+
+    name = "pdf"
+    extension = ".pdf"
+    binary = True  # 只能渲染为字节串（render_bytes），没有文本形式
+
+    def render_bytes(self, investigator):
+        """渲染一名调查员的PDF角色卡
+
+        Args:
+            investigator: Investigator对象
+
+        Returns:
+            bytes
+        """
+        stream = io.BytesIO()
+        with PdfSheetDocument(stream) as document:
+            document.add_sheet(investigator)
+        return stream.getvalue()
+
+PDF_SHEET = PdfSheetFormat()
+
+def write_pdf(investigators, file_path, progress=None):
+    """把多名调查员的角色卡写入一个PDF文件
+
+    Args:
+        investigators: Investigator对象的可迭代对象
+        file_path: PDF文件路径
+        progress: 进度回调函数 progress(已完成数量)，可选
+
+    Returns:
+        int: 页数
+    """
+    with PdfSheetDocument(file_path) as document:
+        for count, investigator in enumerate(investigators, 1):
+            document.add_sheet(investigator)
+            if progress:
+                progress(count)
+        return len(document.pages)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+调查员配方模块
+
+随机调查员完全由(种子, 序号, 年龄段)决定，因此只需保存这些输入即可在加载时重新生成。
+配方（InvestigatorRecipe）保存：
+- 生成器版本（GENERATOR_VERSION），生成算法变化后旧配方不再可靠
+- 种子、序号和年龄段
+- 生成时的技能分配策略和规则变体（两者都会改变同一种子生成的结果）
+- 手动修改过的字段（与重新生成的结果逐字段比较得到；字典字段如技能只保存变化的项，
+  被删除的项记为None）
+- 完整数据的校验值，用于验证重新生成的结果与保存时一致
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import json
+import zlib
+
+from core.investigator import Investigator
+from core.generator import GENERATOR_VERSION
+from core.allocation import DEFAULT_STRATEGY
+
+# 不参与比较和校验的字段（保存位置与调查员内容无关）
+IGNORED_FIELDS = ("file_path",)
+
+def investigator_checksum(data):
+    """计算调查员数据的校验值
+
+    Args:
+        data: 调查员数据字典（Investigator.to_dict()的结果）
+
+    Returns:
+        8位十六进制CRC32字符串
+    """
+    content = {key: value for key, value in data.items() if key not in IGNORED_FIELDS}
+    text = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return f"{zlib.crc32(text.encode('utf-8')):08x}"
+
+def diff_field(generated, value):
+    """比较一个字段，字典字段只返回变化的项（被删除的项为None）"""
+    if isinstance(generated, dict) and isinstance(value, dict):
+        changes = {key: item for key, item in value.items() if generated.get(key) != item}
+        changes.update({key: None for key in generated if key not in value})
+        return changes
+    return value
+
+def apply_field(generated, override):
+    """将一个字段的手动修改应用到重新生成的值上"""
+    if isinstance(generated, dict) and isinstance(override, dict):
+        merged = dict(generated)
+        for key, item in override.items():
+            if item is None:
+                merged.pop(key, None)
+            else:
+                merged[key] = item
+        return merged
+    return override
+
+class InvestigatorRecipe:
+    """调查员配方：重新生成一名调查员所需的最少信息"""
+
+    def __init__(self, seed, index=0, age_group="20-39", overrides=None, version=GENERATOR_VERSION, checksum=None,
+                 strategy=DEFAULT_STRATEGY, rule_variant=None):
+        """初始化配方
+
+        Args:
+            seed: 主随机种子
+            index: 调查员序号
+            age_group: 年龄段
+            overrides: 手动修改过的字段字典（覆盖重新生成的同名字段）
+            version: 生成该调查员时的生成器版本
+            checksum: 完整数据的校验值，为None时不做内容校验
+            strategy: 生成时的技能分配策略，为None时使用重新生成时生成器的当前策略
+            rule_variant: 生成时的规则变体名称，为None时使用重新生成时生成器的当前变体
+        """
+        self.seed = seed
+        self.index = index
+        self.age_group = age_group
+        self.overrides = overrides or {}
+        self.version = version
+        self.checksum = checksum
+        self.strategy = strategy
+        self.rule_variant = rule_variant
+
+    @classmethod
+    def from_investigator(cls, generator, investigator, seed, index=0, age_group="20-39"):
+        """由调查员及其生成参数创建配方
+
+        重新生成一次调查员，与当前数据逐字段比较，不同的字段记为手动修改。
+        生成器当前的技能分配策略和规则变体一并记入配方，应与生成该调查员时相同。
+
+        Args:
+            generator: 调查员生成器
+            investigator: 调查员对象
+            seed: 生成该调查员使用的种子
+            index: 生成该调查员使用的序号
+            age_group: 生成该调查员使用的年龄段
+
+        Returns:
+            InvestigatorRecipe对象
+        """
+        data = investigator.to_dict()
+        generated = generator.generate_investigator(seed, index, age_group).to_dict()
+        overrides = {
+            key: diff_field(generated.get(key), value) for key, value in data.items()
+            if key not in IGNORED_FIELDS and generated.get(key) != value
+        }
+        return cls(seed, index, age_group, overrides, GENERATOR_VERSION, investigator_checksum(data),
+                   generator.allocator.strategy, generator.rule_variant)
+
+    def rehydrate(self, generator, verify=True):
+        """重新生成完整的调查员
+
+        重新生成时临时切换到配方记录的技能分配策略和规则变体，结束后恢复生成器原来的设置。
+
+        Args:
+            generator: 调查员生成器
+            verify: 是否验证生成器版本和校验值
+
+        Returns:
+            调查员对象
+
+        Raises:
+            ValueError: 验证失败（生成器版本不一致或重新生成的数据与保存时不同）
+        """
+        if verify and self.version != GENERATOR_VERSION:
+            raise ValueError(f"配方的生成器版本({self.version})与当前版本({GENERATOR_VERSION})不一致")
+
+        with generator.using_settings(self.strategy, self.rule_variant):
+            investigator = generator.generate_investigator(self.seed, self.index, self.age_group)
+        data = None
+        if self.overrides:
+            data = investigator.to_dict()
+            for key, override in self.overrides.items():
+                data[key] = apply_field(data.get(key), override)
+            investigator = Investigator.from_dict(data)
+
+        if verify and self.checksum is not None:
+            checksum = investigator_checksum(data if data is not None else investigator.to_dict())
+            if checksum != self.checksum:
+                raise ValueError(f"配方校验失败: 种子 {self.seed}, 序号 {self.index}")
+
+        return investigator
+
+    def to_dict(self):
+        """转换为字典"""
+        data = {
+            "version": self.version,
+            "seed": self.seed,
+            "index": self.index,
+            "age_group": self.age_group,
+            "checksum": self.checksum,
+            "strategy": self.strategy,
+            "rule_variant": self.rule_variant
+        }
+        if self.overrides:
+            data["overrides"] = self.overrides
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """从字典创建配方
+
+        Args:
+            data: 配方字典
+
+        Returns:
+            InvestigatorRecipe对象
+        """
+        return cls(
+            data["seed"],
+            data.get("index", 0),
+            data.get("age_group", "20-39"),
+            data.get("overrides"),
+            data.get("version", GENERATOR_VERSION),
+            data.get("checksum"),
+            data.get("strategy"),
+            data.get("rule_variant")
+        )
+
+    def to_row(self, strategy=DEFAULT_STRATEGY, rule_variant=None):
+        """转换为配方集合文件中的一行（列表，省略版本）
+
+        技能分配策略和规则变体与集合文件头中记录的相同时省略。
+
+        Args:
+            strategy: 集合文件头中记录的技能分配策略
+            rule_variant: 集合文件头中记录的规则变体
+        """
+        row = [self.seed, self.index, self.age_group, self.checksum]
+        if (self.strategy, self.rule_variant) != (strategy, rule_variant):
+            row.extend((self.overrides, self.strategy, self.rule_variant))
+        elif self.overrides:
+            row.append(self.overrides)
+        return row
+
+    @classmethod
+    def from_row(cls, row, version=GENERATOR_VERSION, strategy=DEFAULT_STRATEGY, rule_variant=None):
+        """从配方集合文件中的一行创建配方
+
+        Args:
+            row: to_row()得到的列表
+            version: 集合文件头中记录的生成器版本
+            strategy: 集合文件头中记录的技能分配策略
+            rule_variant: 集合文件头中记录的规则变体
+
+        Returns:
+            InvestigatorRecipe对象
+        """
+        overrides = row[4] if len(row) > 4 else None
+        if len(row) > 5:
+            strategy, rule_variant = row[5], row[6]
+        return cls(row[0], row[1], row[2], overrides, version, row[3], strategy, rule_variant)
+
+    def __repr__(self):
+        return f"InvestigatorRecipe(seed={self.seed}, index={self.index}, age_group={self.age_group!r})"
@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+规则集模块
+
+规则数值（技能分配上限、语言技能转移阈值、专攻技能转移加值、大成功/大失败范围、
+年龄段调整表）在规则数据文件（data/rules.json）中声明，同一文件可以包含多个规则变体：
+- 变体只需写出与标准规则不同的部分，也可以用extends继承另一个变体
+- 加载时把每个变体编译为只读的RuleSet：数值展开为常量，检定、转移和年龄段查找编译为函数，
+  调用时不再读取或解释配置
+- 生成器、技能检定和调查员的技能转移都通过显式传入的RuleSet取得规则，切换变体不需要修改代码，
+  也不影响同一进程中的其他生成器
+
+规则数据文件不存在或损坏时使用内置的标准规则（STANDARD_RULES）。
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import os
+import json
+import hashlib
+import threading
+from types import MappingProxyType
+from collections.abc import Mapping
+
+from core.catalogue import get_catalogue
+
+# 规则数据格式版本
+RULES_VERSION = 1
+
+# 默认的规则数据文件
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "rules.json")
+
+# 标准规则变体名称
+STANDARD_VARIANT = "标准规则"
+
+# 内置的标准规则（规则数据文件中的变体以此为基础补齐未写出的部分）
+STANDARD_RULES = {
+    "description": "第七版核心规则",
+    "skill_cap": 75,
+    "language_transfer": {"enabled": True, "thresholds": [[50, 10], [90, 20]]},
+    "specialization_transfer": {"enabled": True, "thresholds": [50, 90], "bonus": 10, "limit": 50},
+    "check": {
+        "critical_always": 1,
+        "critical_max_roll": 5,
+        "fumble_always": 100,
+        "fumble_min_roll": 96,
+        "fumble_skill_below": 50
+    },
+    "default_age_group": "20-39",
+    "age_groups": {
+        "15-19": {"str_siz_reduction": 5, "edu_reduction": 5, "luck_rolls": 2, "edu_improvement_checks": 0, "app_reduction": 0, "str_con_dex_reduction": 0},
+        "20-39": {"str_siz_reduction": 0, "edu_reduction": 0, "luck_rolls": 1, "edu_improvement_checks": 1, "app_reduction": 0, "str_con_dex_reduction": 0},
+        "40-49": {"str_siz_reduction": 0, "edu_reduction": 0, "luck_rolls": 1, "edu_improvement_checks": 2, "app_reduction": 5, "str_con_dex_reduction": 5},
+        "50-59": {"str_siz_reduction": 0, "edu_reduction": 0, "luck_rolls": 1, "edu_improvement_checks": 3, "app_reduction": 10, "str_con_dex_reduction": 10},
+        "60-69": {"str_siz_reduction": 0, "edu_reduction": 0, "luck_rolls": 1, "edu_improvement_checks": 4, "app_reduction": 15, "str_con_dex_reduction": 20},
+        "70-79": {"str_siz_reduction": 0, "edu_reduction": 0, "luck_rolls": 1, "edu_improvement_checks": 4, "app_reduction": 20, "str_con_dex_reduction": 40},
+        "80-89": {"str_siz_reduction": 0, "edu_reduction": 0, "luck_rolls": 1, "edu_improvement_checks": 4, "app_reduction": 25, "str_con_dex_reduction": 80}
+    }
+}
+
+# 年龄段调整表的字段
+AGE_GROUP_FIELDS = (
+    "str_siz_reduction", "edu_reduction", "luck_rolls",
+    "edu_improvement_checks", "app_reduction", "str_con_dex_reduction"
+)
+
+def merge_rules(base, override):
+    """把override中的规则合并到base上（字典逐层合并，其他值直接替换）
+
+    Returns:
+        新的规则字典
+    """
+    result = dict(base)
+    for key, value in override.items():
+        if isinstance(value, Mapping) and isinstance(result.get(key), Mapping):
+            result[key] = merge_rules(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+def _compile_transfer_boost(language_transfer):
+    """编译语言技能转移阈值
+
+    Returns:
+        (thresholds, lowest, transfer_boost)：thresholds为按阈值从高到低排列的((阈值, 提升下限), ...)，
+        lowest为最低阈值，transfer_boost(old_value, new_value)返回跨越阈值时同系语言的提升下限，未跨越时为0
+    """
+    thresholds = ()
+    if language_transfer.get("enabled", True):
+        thresholds = tuple(sorted(((int(t), int(f)) for t, f in language_transfer.get("thresholds", ())), reverse=True))
+    if not thresholds:
+        return (), None, lambda old_value, new_value: 0
+
+    def transfer_boost(old_value, new_value):
+        for threshold, boost in thresholds:
+            if new_value >= threshold:
+                return boost if old_value < threshold else 0
+        return 0
+
+    return thresholds, thresholds[-1][0], transfer_boost
+
+def _compile_specialization_transfer(specialization_transfer):
+    """编译专攻技能转移加值（可选规则）
+
+    Returns:
+        transfer_skill_bonus(specializations)函数，返回更新后的专攻技能字典
+    """
+    if not specialization_transfer.get("enabled", True):
+        return lambda specializations: specializations.copy()
+
+    thresholds = tuple(int(value) for value in specialization_transfer.get("thresholds", ()))
+    bonus = int(specialization_transfer.get("bonus", 0))
+    limit = int(specialization_transfer.get("limit", 0))
+
+    def transfer_skill_bonus(specializations):
+        result = specializations.copy()
+        values = specializations.values()
+        # 每个被任一专攻达到的阈值提供一次加值
+        total_bonus = bonus * sum(1 for threshold in thresholds if any(value >= threshold for value in values))
+        if not total_bonus:
+            return result
+        for spec_name, value in result.items():
+            # 应用加值，但不超过上限
+            if value < limit:
+                result[spec_name] = min(limit, value + total_bonus)
+        return result
+
+    return transfer_skill_bonus
+
+def _compile_classify_roll(check):
+    """编译大成功/大失败范围
+
+    Returns:
+        classify_roll(roll_result, skill_value, difficulty)函数，与core.skills.classify_roll用法相同
+    """
+    # 规则集在技能模块加载完成后才会编译，这里再导入以避免循环导入
+    from core.skills import DifficultyLevel, SkillCheckResult
+
+    critical_always = int(check["critical_always"])
+    critical_max_roll = int(check["critical_max_roll"])
+    fumble_always = int(check["fumble_always"])
+    fumble_min_roll = int(check["fumble_min_roll"])
+    fumble_skill_below = int(check["fumble_skill_below"])
+
+    REGULAR = DifficultyLevel.REGULAR
+    HARD = DifficultyLevel.HARD
+    EXTREME = DifficultyLevel.EXTREME
+    CRITICAL_SUCCESS = SkillCheckResult.CRITICAL_SUCCESS
+    EXTREME_SUCCESS = SkillCheckResult.EXTREME_SUCCESS
+    HARD_SUCCESS = SkillCheckResult.HARD_SUCCESS
+    SUCCESS = SkillCheckResult.SUCCESS
+    FAILURE = SkillCheckResult.FAILURE
+    CRITICAL_FAILURE = SkillCheckResult.CRITICAL_FAILURE
+
+    def classify_roll(roll_result, skill_value, difficulty=REGULAR):
+        # 根据难度等级确定目标值
+        if difficulty == HARD:
+            target = skill_value // 2
+        elif difficulty == EXTREME:
+            target = skill_value // 5
+        else:
+            target = skill_value
+
+        # 确定成功等级
+        if roll_result == critical_always or (roll_result <= critical_max_roll and roll_result <= skill_value):
+            return CRITICAL_SUCCESS
+        if roll_result <= target:
+            if roll_result <= skill_value // 5:
+                return EXTREME_SUCCESS
+            if roll_result <= skill_value // 2:
+                return HARD_SUCCESS
+            return SUCCESS
+        if roll_result >= fumble_min_roll and skill_value < fumble_skill_below or roll_result == fumble_always:
+            return CRITICAL_FAILURE
+        return FAILURE
+
+    return classify_roll
+
+def _compile_age_groups(age_groups, default_age_group):
+    """编译年龄段调整表
+
+    Returns:
+        (age_groups, age_ranges, age_group_of)：只读的年龄段调整表、由年龄段名称（如"20-39"）
+        得到的年龄范围表，以及按年龄查找年龄段的函数
+    """
+    groups = {}
+    ranges = {}
+    bounds = []
+    for name, adjustments in age_groups.items():
+        missing = [field for field in AGE_GROUP_FIELDS if field not in adjustments]
+        if missing:
+            raise ValueError(f"年龄段{name}缺少字段: {', '.join(missing)}")
+        groups[name] = MappingProxyType({field: int(value) for field, value in adjustments.items()})
+        low, high = map(int, name.split("-"))
+        ranges[name] = (low, high)
+        bounds.append((low, high, name))
+    bounds = tuple(bounds)
+
+    def age_group_of(age):
+        for low, high, name in bounds:
+            if low <= age <= high:
+                return name
+        return default_age_group
+
+    return MappingProxyType(groups), MappingProxyType(ranges), age_group_of
+
+class RuleSet:
+    """编译后的只读规则集"""
+
+    __slots__ = (
+        "name", "description", "version", "rules", "skill_cap",
+        "transfer_thresholds", "transfer_min_threshold", "transfer_boost",
+        "transfer_skill_bonus", "classify_roll",
+        "default_age_group", "age_groups", "age_ranges", "age_group_of", "odds_table"
+    )
+
+    def __init__(self, name, rules):
+        """编译规则
+
+        Args:
+            name: 变体名称
+            rules: 完整的规则字典（已与标准规则合并）
+
+        Raises:
+            ValueError: 规则数据不完整或数值无效
+        """
+        set_attr = object.__setattr__
+        try:
+            rules = json.loads(json.dumps(rules))
+            set_attr(self, "name", name)
+            set_attr(self, "description", rules.get("description", ""))
+            set_attr(self, "version", hashlib.sha1(
+                json.dumps([RULES_VERSION, rules], ensure_ascii=False, sort_keys=True).encode("utf-8")
+            ).hexdigest()[:12])
+            set_attr(self, "rules", rules)
+            set_attr(self, "skill_cap", int(rules["skill_cap"]))
+
+            thresholds, lowest, transfer_boost = _compile_transfer_boost(rules["language_transfer"])
+            set_attr(self, "transfer_thresholds", thresholds)
+            set_attr(self, "transfer_min_threshold", lowest)
+            set_attr(self, "transfer_boost", transfer_boost)
+            set_attr(self, "transfer_skill_bonus", _compile_specialization_transfer(rules["specialization_transfer"]))
+            set_attr(self, "classify_roll", _compile_classify_roll(rules["check"]))
+
+            default_age_group = rules["default_age_group"]
+            age_groups, age_ranges, age_group_of = _compile_age_groups(rules["age_groups"], default_age_group)
+            if default_age_group not in age_groups:
+                raise ValueError(f"默认年龄段{default_age_group}不在年龄段调整表中")
+            set_attr(self, "default_age_group", default_age_group)
+            set_attr(self, "age_groups", age_groups)
+            set_attr(self, "age_ranges", age_ranges)
+            set_attr(self, "age_group_of", age_group_of)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"规则变体{name}无效: {e}") from e
+        # 检定概率表（由core.skills.check_odds按需填充）
+        set_attr(self, "odds_table", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("规则集是只读的")
+
+    def __reduce__(self):
+        return (RuleSet, (self.name, self.rules))
+
+    def age_range(self, age_group):
+        """获取年龄段的年龄范围
+
+        Args:
+            age_group: 年龄段名称
+
+        Returns:
+            (最小年龄, 最大年龄)，未知的年龄段使用默认年龄段的范围
+        """
+        return self.age_ranges.get(age_group) or self.age_ranges[self.default_age_group]
+
+    def __repr__(self):
+        return f"RuleSet({self.name!r}, version={self.version!r})"
+
+class RuleBook:
+    """规则数据文件中的全部规则变体"""
+
+    def __init__(self, data=None):
+        """初始化规则书
+
+        Args:
+            data: 规则数据字典（rules.json的内容），为None时只包含内置的标准规则
+        """
+        if data is None:
+            data = {"version": RULES_VERSION, "default": STANDARD_VARIANT, "variants": {STANDARD_VARIANT: {}}}
+        if data.get("version", RULES_VERSION) != RULES_VERSION:
+            raise ValueError(f"不支持的规则数据版本: {data.get('version')}")
+        self.variants = {name: dict(rules) for name, rules in data.get("variants", {}).items()}
+        if not self.variants:
+            raise ValueError("规则数据中没有任何规则变体")
+        self.default = data.get("default") or next(iter(self.variants))
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def names(self):
+        """获取全部变体名称"""
+        return list(self.variants)
+
+    def resolve(self, name):
+        """展开变体的继承关系并与标准规则合并
+
+        Args:
+            name: 变体名称
+
+        Returns:
+            完整的规则字典
+
+        Raises:
+            ValueError: 变体不存在或继承关系有环
+        """
+        chain = []
+        while name is not None:
+            if name not in self.variants:
+                raise ValueError(f"未找到规则变体: {name}")
+            if name in chain:
+                raise ValueError(f"规则变体的继承关系存在循环: {' -> '.join(chain + [name])}")
+            chain.append(name)
+            name = self.variants[name].get("extends")
+
+        rules = STANDARD_RULES
+        for variant in reversed(chain):
+            rules = merge_rules(rules, {key: value for key, value in self.variants[variant].items() if key != "extends"})
+        return rules
+
+    def ruleset(self, name=None):
+        """获取编译后的规则集（每个变体只编译一次）
+
+        Args:
+            name: 变体名称，为None时使用默认变体
+
+        Returns:
+            RuleSet对象
+        """
+        name = name or self.default
+        with self._lock:
+            ruleset = self._compiled.get(name)
+            if ruleset is None:
+                ruleset = self._compiled[name] = RuleSet(name, self.resolve(name))
+            return ruleset
+
+# 按数据文件共享的规则书：{文件路径: (数据字典, RuleBook)}
+_rulebooks = {}
+_rulebooks_lock = threading.Lock()
+
+def load_rulebook(file_path=None):
+    """加载规则数据文件
+
+    数据通过共享的数据目录加载器读取，文件未修改时返回同一个RuleBook。
+    文件不存在或无效时打印提示并返回只包含标准规则的RuleBook。
+
+    Args:
+        file_path: 规则数据文件路径，为None时使用DEFAULT_RULES_FILE
+
+    Returns:
+        RuleBook对象
+    """
+    file_path = os.path.abspath(file_path or DEFAULT_RULES_FILE)
+    try:
+        data = get_catalogue().load(file_path)
+        with _rulebooks_lock:
+            cached = _rulebooks.get(file_path)
+            if cached is not None and cached[0] is data:
+                return cached[1]
+            rulebook = RuleBook(data)
+            _rulebooks[file_path] = (data, rulebook)
+            return rulebook
+    except Exception as e:
+        print(f"加载规则数据失败，使用标准规则: {e}")
+        return RuleBook()
+
+def load_ruleset(file_path=None, variant=None):
+    """加载并编译规则变体
+
+    Args:
+        file_path: 规则数据文件路径，为None时使用DEFAULT_RULES_FILE
+        variant: 变体名称，为None时使用文件中的默认变体
+
+    Returns:
+        RuleSet对象
+    """
+    return load_rulebook(file_path).ruleset(variant)
+
+# 内置标准规则的规则书（不读取规则数据文件）
+_standard_rulebook = RuleBook()
+
+def standard_ruleset():
+    """获取内置标准规则（STANDARD_RULES）编译后的规则集"""
+    return _standard_rulebook.ruleset()
+
+# 默认规则集（首次使用时加载）
+_default_ruleset = None
+
+def get_ruleset():
+    """获取默认规则集：默认规则数据文件中的默认变体
+
+    没有显式传入规则集的地方（如直接编辑调查员技能）使用该规则集。
+    生成器使用自己的规则集（InvestigatorGenerator.rules），并显式传给技能分配、
+    技能检定和技能转移，不会改变这里的结果。首次调用时加载，之后返回同一个规则集。
+    """
+    global _default_ruleset
+    ruleset = _default_ruleset
+    if ruleset is None:
+        ruleset = _default_ruleset = load_ruleset()
+    return ruleset
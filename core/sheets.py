@@ -0,0 +1,542 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+角色卡渲染与批量导出模块
+
+角色卡由预编译的模板渲染为文本或HTML（PDF见core.pdf_sheet），不依赖Qt：
+- 模板中的 {字段} 在加载时一次性转换为 % 格式串，渲染时只做一次C层面的格式化
+- 属性、技能、装备等重复的行由各自的行模板渲染后拼接
+- HTML格式中所有值都经过转义
+
+批量导出在进程池中渲染，主进程只负责写入目录或一个zip文件：
+- 随机生成的调查员只传递(主种子, 序号)，由工作进程自己生成，与core.simulation相同
+- 已有的调查员用InvestigatorCodec编码后传给工作进程
+- 进度回调和导出统计（数量、字节数、每秒张数）
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import os
+import re
+import html
+import time
+import string
+import zipfile
+from multiprocessing import Pool
+
+from core.codec import InvestigatorCodec
+from core.pdf_sheet import PDF_SHEET
+
+# 每个任务块渲染的角色卡数量
+DEFAULT_CHUNK_SIZE = 200
+
+# 属性顺序
+ATTRIBUTE_NAMES = ("力量", "体质", "体型", "敏捷", "外貌", "智力", "意志", "教育", "幸运")
+
+# 文件名中不允许的字符
+UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\s]+')
+
+class SheetTemplate:
+    """预编译的模板
+
+    模板语法为 {字段名}，{{ 和 }} 表示花括号本身。
+    """
+
+    def __init__(self, source):
+        """编译模板
+
+        Args:
+            source: 模板文本
+        """
+        parts = []
+        self.fields = []
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(source):
+            parts.append(literal.replace("%", "%%"))
+            if field_name is not None:
+                if format_spec or conversion:
+                    raise ValueError(f"模板字段不支持格式说明: {field_name}")
+                parts.append(f"%({field_name})s")
+                self.fields.append(field_name)
+        self.source = source
+        self.compiled = "".join(parts)
+
+    def render(self, context):
+        """渲染模板
+
+        Args:
+            context: 字段名到值的字典
+
+        Returns:
+            str
+        """
+        return self.compiled % context
+
+class SheetFormat:
+    """一种角色卡格式：页面模板、各行模板和转义方式"""
+
+    binary = False  # 文本格式，render()返回字符串
+
+    def __init__(self, name, extension, page, rows, escape=None, row_separator="\n"):
+        """初始化格式
+
+        Args:
+            name: 格式名称
+            extension: 导出文件的扩展名
+            page: 页面模板文本，{attribute_rows}等字段为对应的行拼接后的结果
+            rows: 行模板字典，如 {"attribute_rows": "..."}
+            escape: 值的转义函数，可选
+            row_separator: 行之间的分隔符
+        """
+        self.name = name
+        self.extension = extension
+        self.page = SheetTemplate(page)
+        self.rows = {section: SheetTemplate(source) for section, source in rows.items()}
+        self.escape = escape or str
+        self.row_separator = row_separator
+
+    def _rows(self, section, items):
+        """渲染一组行"""
+        template = self.rows[section]
+        escape = self.escape
+        return self.row_separator.join([
+            template.render({key: escape(value) for key, value in item.items()}) for item in items
+        ])
+
+    def render(self, investigator):
+        """渲染一名调查员的角色卡
+
+        Args:
+            investigator: Investigator对象
+
+        Returns:
+            str
+        """
+        escape = self.escape
+        context = {field: escape(getattr(investigator, field, "")) for field in self.page.fields
+                   if field not in self.rows}
+
+        attributes = investigator.attributes
+        attribute_names = [name for name in ATTRIBUTE_NAMES if name in attributes]
+        attribute_names.extend(name for name in attributes if name not in ATTRIBUTE_NAMES)
+        context["attribute_rows"] = self._rows("attribute_rows", [
+            {
+                "name": name,
+                "value": attributes.get(name, 0),
+                "half": investigator.attribute_half.get(name, 0),
+                "fifth": investigator.attribute_fifth.get(name, 0)
+            }
+            for name in attribute_names
+        ])
+        context["occupation_skill_rows"] = self._rows(
+            "occupation_skill_rows", [{"name": skill} for skill in investigator.occupation_skills]
+        )
+        context["skill_rows"] = self._rows("skill_rows", [
+            {"name": name, "value": value} for name, value in sorted(investigator.skills.items())
+        ])
+
+        weapons = []
+        gear = []
+        for equipment in investigator.equipment:
+            row = {
+                "name": equipment.get("name", ""),
+                "quantity": equipment.get("quantity", ""),
+                "damage": equipment.get("damage", ""),
+                "range": equipment.get("range", "")
+            }
+            (weapons if equipment.get("damage") else gear).append(row)
+        # 装备表中的武器之后是调查员单独记录的武器列表
+        context["weapon_rows"] = self.row_separator.join(filter(None, (
+            self._rows("weapon_rows", weapons),
+            self._rows("weapon_list_rows", [{"weapon": weapon} for weapon in investigator.weapons])
+        )))
+        context["equipment_rows"] = self._rows("equipment_rows", gear)
+        context["item_rows"] = self._rows("item_rows", [{"item": item} for item in investigator.items])
+        return self.page.render(context)
+
+    def render_bytes(self, investigator):
+        """渲染一名调查员的角色卡，返回UTF-8编码的文件内容"""
+        return self.render(investigator).encode("utf-8")
+
+TEXT_SHEET = SheetFormat(
+    "text", ".txt",
+    page="""=== 基本信息 ===
+姓名: {name}
+玩家: {player}
+职业: {occupation}
+年龄: {age}
+性别: {gender}
+居住地: {residence}
+出生地: {birthplace}
+
+=== 属性 ===
+{attribute_rows}
+
+=== 衍生属性 ===
+生命值: {hp}
+魔法值: {mp}
+理智值: {san}
+伤害加值: {db}
+体格: {build}
+移动速度: {mov}
+
+=== 技能 ===
+职业技能:
+{occupation_skill_rows}
+职业技能点: {occupation_skill_points}
+兴趣技能点: {interest_skill_points}
+
+已分配技能:
+{skill_rows}
+
+=== 背景 ===
+形象描述: {personal_description}
+思想/信念: {ideology}
+重要之人: {significant_people}
+意义非凡之地: {meaningful_locations}
+宝贵之物: {treasured_possessions}
+特质: {traits}
+
+=== 装备和资产 ===
+现金: {cash}
+资产: {assets}
+消费水平: {spending_level}
+武器:
+{weapon_rows}
+装备:
+{equipment_rows}
+物品:
+{item_rows}
+""",
+    rows={
+        "attribute_rows": "{name}: {value} (半值: {half}, 五分之一值: {fifth})",
+        "occupation_skill_rows": "- {name}",
+        "skill_rows": "{name}: {value}",
+        "weapon_rows": "- {name} x{quantity} (伤害: {damage}, 射程: {range})",
+        "weapon_list_rows": "- {weapon}",
+        "equipment_rows": "- {name} x{quantity}",
+        "item_rows": "- {item}"
+    }
+)
+
+HTML_SHEET = SheetFormat(
+    "html", ".html",
+    page="""<html>
+<head>
+    <meta charset="utf-8">
+    <style>
+        body {{ font-family: Arial, sans-serif; }}
+        h1 {{ text-align: center; }}
+        h2 {{ margin-top: 20px; border-bottom: 1px solid #ccc; }}
+        table {{ width: 100%; border-collapse: collapse; }}
+        th, td {{ border: 1px solid #ccc; padding: 5px; }}
+        th {{ background-color: #f0f0f0; }}
+    </style>
+</head>
+<body>
+    <h1>克苏鲁的呼唤 - 调查员角色卡</h1>
+
+    <h2>基本信息</h2>
+    <table>
+        <tr><th>姓名</th><td>{name}</td><th>玩家</th><td>{player}</td></tr>
+        <tr><th>性别</th><td>{gender}</td><th>年龄</th><td>{age}</td></tr>
+        <tr><th>职业</th><td>{occupation}</td><th>居住地</th><td>{residence}</td></tr>
+        <tr><th>出生地</th><td colspan="3">{birthplace}</td></tr>
+    </table>
+
+    <h2>属性</h2>
+    <table>
+        <tr><th>属性</th><th>值</th><th>半值</th><th>五分之一值</th></tr>
+{attribute_rows}
+    </table>
+
+    <h2>衍生属性</h2>
+    <table>
+        <tr><th>生命值</th><td>{hp}</td><th>魔法值</th><td>{mp}</td></tr>
+        <tr><th>理智值</th><td>{san}</td><th>伤害加值</th><td>{db}</td></tr>
+        <tr><th>体格</th><td>{build}</td><th>移动速度</th><td>{mov}</td></tr>
+    </table>
+
+    <h2>技能</h2>
+    <table>
+        <tr><th>技能名称</th><th>技能值</th></tr>
+{skill_rows}
+    </table>
+
+    <h2>武器</h2>
+    <table>
+        <tr><th>名称</th><th>数量</th><th>伤害/效果</th><th>射程/范围</th></tr>
+{weapon_rows}
+    </table>
+
+    <h2>装备</h2>
+    <table>
+        <tr><th>名称</th><th>数量</th><th>效果</th><th>范围</th></tr>
+{equipment_rows}
+    </table>
+
+    <h2>物品</h2>
+    <ul>
+{item_rows}
+    </ul>
+
+    <h2>财产</h2>
+    <p><strong>现金:</strong> {cash}</p>
+    <p><strong>资产:</strong> {assets}</p>
+
+    <h2>背景</h2>
+    <p><strong>个人描述:</strong> {personal_description}</p>
+    <p><strong>思想信念:</strong> {ideology}</p>
+    <p><strong>重要之人:</strong> {significant_people}</p>
+    <p><strong>意义非凡之地:</strong> {meaningful_locations}</p>
+    <p><strong>宝贵之物:</strong> {treasured_possessions}</p>
+    <p><strong>特质:</strong> {traits}</p>
+</body>
+</html>
+""",
+    rows={
+        "attribute_rows": "        <tr><th>{name}</th><td>{value}</td><td>{half}</td><td>{fifth}</td></tr>",
+        "occupation_skill_rows": "<li>{name}</li>",
+        "skill_rows": "        <tr><td>{name}</td><td>{value}</td></tr>",
+        "weapon_rows": "        <tr><td>{name}</td><td>{quantity}</td><td>{damage}</td><td>{range}</td></tr>",
+        "weapon_list_rows": "        <tr><td colspan=\"4\">{weapon}</td></tr>",
+        "equipment_rows": "        <tr><td>{name}</td><td>{quantity}</td><td>{damage}</td><td>{range}</td></tr>",
+        "item_rows": "        <li>{item}</li>"
+    },
+    escape=lambda value: html.escape(str(value))
+)
+
+# 可用的角色卡格式
+SHEET_FORMATS = {
+    TEXT_SHEET.name: TEXT_SHEET,
+    HTML_SHEET.name: HTML_SHEET,
+    PDF_SHEET.name: PDF_SHEET
+}
+
+def get_sheet_format(name):
+    """按名称获取角色卡格式
+
+    Args:
+        name: 格式名称（"text"、"html"或"pdf"）
+
+    Returns:
+        SheetFormat或PdfSheetFormat对象
+    """
+    if name not in SHEET_FORMATS:
+        raise ValueError(f"未知的角色卡格式: {name}")
+    return SHEET_FORMATS[name]
+
+def render_sheet(investigator, sheet_format="text"):
+    """渲染一名调查员的角色卡
+
+    Args:
+        investigator: Investigator对象
+        sheet_format: 格式名称（"text"或"html"）或SheetFormat对象
+
+    Returns:
+        str
+
+    Raises:
+        ValueError: 格式只能渲染为字节串（如"pdf"），应使用render_bytes()或write_pdf()
+    """
+    if isinstance(sheet_format, str):
+        sheet_format = get_sheet_format(sheet_format)
+    if sheet_format.binary:
+        raise ValueError(f"角色卡格式 {sheet_format.name} 不能渲染为文本，请使用render_bytes()")
+    return sheet_format.render(investigator)
+
+def sheet_file_name(index, investigator, sheet_format):
+    """批量导出时一张角色卡的文件名：序号_姓名.扩展名"""
+    name = UNSAFE_FILENAME.sub("_", str(investigator.name)).strip("._") or "investigator"
+    return f"{index:06d}_{name[:60]}{sheet_format.extension}"
+
+class ExportStats:
+    """批量导出统计"""
+
+    def __init__(self, output):
+        """初始化统计
+
+        Args:
+            output: 输出路径
+        """
+        self.output = output
+        self.sheets = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+
+    @property
+    def sheets_per_second(self):
+        return self.sheets / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self):
+        """转换为可JSON序列化的字典"""
+        return {
+            "output": self.output,
+            "sheets": self.sheets,
+            "bytes": self.bytes,
+            "elapsed_seconds": self.elapsed,
+            "sheets_per_second": self.sheets_per_second
+        }
+
+    def to_text(self):
+        """生成文本摘要"""
+        return (f"已导出 {self.sheets} 张角色卡到 {self.output}，共 {self.bytes / 1e6:.2f} MB，"
+                f"耗时 {self.elapsed:.2f}秒 ({self.sheets_per_second:.0f}张/秒)")
+
+class _SheetWriter:
+    """把渲染好的角色卡写入目录或zip文件"""
+
+    def __init__(self, output):
+        """打开输出
+
+        Args:
+            output: 以.zip结尾时写入一个zip文件，否则写入该目录
+        """
+        self.output = output
+        self.archive = None
+        if output.lower().endswith(".zip"):
+            directory = os.path.dirname(output)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.archive = zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED)
+        else:
+            os.makedirs(output, exist_ok=True)
+
+    def write(self, file_name, data):
+        """写入一张角色卡"""
+        if self.archive is not None:
+            self.archive.writestr(file_name, data)
+        else:
+            with open(os.path.join(self.output, file_name), "wb") as f:
+                f.write(data)
+
+    def close(self):
+        """关闭输出"""
+        if self.archive is not None:
+            self.archive.close()
+
+# 工作进程内复用的生成器和编码器
+_worker_generator = None
+_worker_codec = None
+
+def _init_worker(data_dir, codec):
+    """工作进程初始化"""
+    global _worker_generator, _worker_codec
+    _worker_codec = codec
+    if data_dir is not None:
+        from core.simulation import create_generator
+        _worker_generator = create_generator(data_dir)
+
+def _render_chunk(task):
+    """在工作进程中渲染一个任务块
+
+    Args:
+        task: ("generate", 起始序号, 数量, 年龄段, 主种子, 格式名称)
+              或 ("encoded", 起始序号, 编码后的调查员列表, 格式名称)
+
+    Returns:
+        list: [(文件名, 文件内容), ...]
+    """
+    if task[0] == "generate":
+        _, start, count, age_group, seed, format_name = task
+        investigators = (_worker_generator.generate_investigator(seed, index, age_group)
+                         for index in range(start, start + count))
+    else:
+        _, start, blobs, format_name = task
+        investigators = (_worker_codec.decode(blob) for blob in blobs)
+
+    sheet_format = get_sheet_format(format_name)
+    return [
+        (sheet_file_name(index, investigator, sheet_format), sheet_format.render_bytes(investigator))
+        for index, investigator in enumerate(investigators, start)
+    ]
+
+def _run_export(tasks, total, output, workers, data_dir, codec, progress):
+    """执行任务块并写入结果"""
+    stats = ExportStats(output)
+    start_time = time.perf_counter()
+    writer = _SheetWriter(output)
+    try:
+        if workers == 1:
+            _init_worker(data_dir, codec)
+            results = map(_render_chunk, tasks)
+            pool = None
+        else:
+            pool = Pool(processes=workers, initializer=_init_worker, initargs=(data_dir, codec))
+            results = pool.imap(_render_chunk, tasks)
+        try:
+            for sheets in results:
+                for file_name, data in sheets:
+                    writer.write(file_name, data)
+                    stats.bytes += len(data)
+                stats.sheets += len(sheets)
+                if progress:
+                    progress(stats.sheets, total)
+        finally:
+            if pool is not None:
+                pool.terminate()
+    finally:
+        writer.close()
+    stats.elapsed = time.perf_counter() - start_time
+    return stats
+
+def export_sheets(investigators, output, sheet_format="html", codec=None, workers=None,
+                  chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """批量导出已有调查员的角色卡
+
+    Args:
+        investigators: Investigator对象列表
+        output: 输出目录，或以.zip结尾的zip文件路径
+        sheet_format: 格式名称（"text"、"html"或"pdf"）
+        codec: 传给工作进程时使用的InvestigatorCodec，默认由调查员的属性和技能名称创建
+        workers: 工作进程数，默认为CPU核心数；为1时在当前进程中渲染
+        chunk_size: 每个任务块的角色卡数量
+        progress: 进度回调函数 progress(已完成数量, 总数)，可选
+
+    Returns:
+        ExportStats对象
+    """
+    get_sheet_format(sheet_format)
+    investigators = list(investigators)
+    if codec is None:
+        attribute_names = dict.fromkeys(name for investigator in investigators for name in investigator.attributes)
+        skill_names = dict.fromkeys(name for investigator in investigators for name in investigator.skills)
+        codec = InvestigatorCodec(attribute_names, skill_names)
+
+    def tasks():
+        # 按块编码，主进程不会同时持有全部编码结果
+        for start in range(0, len(investigators), chunk_size):
+            chunk = investigators[start:start + chunk_size]
+            yield ("encoded", start, [codec.encode(investigator) for investigator in chunk], sheet_format)
+
+    return _run_export(tasks(), len(investigators), output, workers, None, codec, progress)
+
+def export_generated_sheets(n, output, sheet_format="html", age_group="20-39", seed=0, workers=None,
+                            chunk_size=DEFAULT_CHUNK_SIZE, data_dir="data", progress=None):
+    """批量生成调查员并导出角色卡
+
+    第i张角色卡的调查员与generate_investigator(seed, i, age_group)相同。
+
+    Args:
+        n: 角色卡数量
+        output: 输出目录，或以.zip结尾的zip文件路径
+        sheet_format: 格式名称（"text"、"html"或"pdf"）
+        age_group: 年龄段
+        seed: 主随机种子
+        workers: 工作进程数，默认为CPU核心数；为1时在当前进程中渲染
+        chunk_size: 每个任务块的角色卡数量
+        data_dir: 数据目录
+        progress: 进度回调函数 progress(已完成数量, 总数)，可选
+
+    Returns:
+        ExportStats对象
+    """
+    if n < 0:
+        raise ValueError(f"无效的导出数量: {n}")
+    get_sheet_format(sheet_format)
+
+    tasks = [
+        ("generate", start, min(chunk_size, n - start), age_group, seed, sheet_format)
+        for start in range(0, n, chunk_size)
+    ]
+    return _run_export(tasks, n, output, workers, data_dir, None, progress)
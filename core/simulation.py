@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+蒙特卡洛模拟模块
+
+在进程池中大量调用InvestigatorGenerator.generate_random_investigator，
+统计生成结果的分布，用于调整房规。统计包括：
+- 技能点与技能值总和
+- 触及职业技能上限（标准规则为75%）的技能数量
+- 语言技能转移（语言技能跨越转移阈值，标准规则为50%和90%）提升的同系语言数
+- 职业分布
+
+每名调查员使用只由(主种子, 序号)决定的独立随机流，统计量以直方图形式流式累积并在主进程合并，
+不在内存中保留任何调查员对象。
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+import os
+import json
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from core.config import AppConfig
+from utils.dice import DiceRoller
+from core.occupations import Occupations
+from core.skills import Skills
+from core.backgrounds import Backgrounds
+from core.generator import InvestigatorGenerator
+from core.rules import get_ruleset
+
+# 每个任务块生成的调查员数量
+DEFAULT_CHUNK_SIZE = 5000
+
+# 报告中输出的分位数
+REPORT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+class StreamingHistogram:
+    """整数值的流式直方图
+
+    只保存每个取值出现的次数，可合并，分位数由计数精确求得。
+    """
+
+    def __init__(self):
+        """初始化直方图"""
+        self.counts = Counter()
+        self.count = 0
+        self.total = 0
+
+    def add(self, value):
+        """记录一个取值
+
+        Args:
+            value: 整数取值
+        """
+        self.counts[value] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, other):
+        """合并另一个直方图
+
+        Args:
+            other: StreamingHistogram对象
+        """
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self):
+        """平均值"""
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """分位数
+
+        Args:
+            q: 分位（0-1）
+
+        Returns:
+            使累计比例不小于q的最小取值
+        """
+        if not self.count:
+            return None
+        threshold = q * self.count
+        running = 0
+        for value in sorted(self.counts):
+            running += self.counts[value]
+            if running >= threshold:
+                return value
+        return max(self.counts)
+
+    def to_dict(self):
+        """转换为可JSON序列化的字典"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": min(self.counts) if self.counts else None,
+            "max": max(self.counts) if self.counts else None,
+            "quantiles": {str(q): self.quantile(q) for q in REPORT_QUANTILES},
+            "histogram": {str(value): self.counts[value] for value in sorted(self.counts)}
+        }
+
+class SimulationStats:
+    """模拟统计结果"""
+
+    METRICS = {
+        "skill_points_allocated": "已分配技能点",
+        "skill_value_total": "技能值总和",
+        "capped_skills": "达到上限的技能数",
+        "language_transfers": "语言技能转移提升的同系语言数",
+        "occupation_skill_points": "职业技能点",
+        "interest_skill_points": "兴趣技能点"
+    }
+
+    def __init__(self):
+        """初始化统计结果"""
+        self.histograms = {name: StreamingHistogram() for name in self.METRICS}
+        self.occupations = Counter()
+        self.investigators = 0
+        self.elapsed = 0.0
+
+    def record(self, investigator, rules=None, transfer_events=()):
+        """记录一名调查员
+
+        Args:
+            investigator: 调查员对象
+            rules: 生成时使用的规则集（技能上限），默认为默认规则集
+            transfer_events: 生成时语言技能转移提升的同系语言（生成器的transfer_events）
+        """
+        if rules is None:
+            rules = get_ruleset()
+        skill_cap = rules.skill_cap
+
+        skills = investigator.skills
+        capped = sum(1 for skill_name, value in skills.items()
+                     if value >= skill_cap and not skill_name.startswith("语言（"))
+
+        histograms = self.histograms
+        histograms["skill_points_allocated"].add(
+            investigator.occupation_skill_points_allocated + investigator.interest_skill_points_allocated
+        )
+        histograms["skill_value_total"].add(sum(skills.values()))
+        histograms["capped_skills"].add(capped)
+        histograms["language_transfers"].add(len(transfer_events))
+        histograms["occupation_skill_points"].add(investigator.occupation_skill_points)
+        histograms["interest_skill_points"].add(investigator.interest_skill_points)
+
+        self.occupations[investigator.occupation] += 1
+        self.investigators += 1
+
+    def merge(self, other):
+        """合并另一份统计结果
+
+        Args:
+            other: SimulationStats对象
+        """
+        for name, histogram in self.histograms.items():
+            histogram.merge(other.histograms[name])
+        self.occupations.update(other.occupations)
+        self.investigators += other.investigators
+
+    def to_dict(self):
+        """转换为可JSON序列化的字典"""
+        return {
+            "investigators": self.investigators,
+            "elapsed_seconds": self.elapsed,
+            "investigators_per_second": self.investigators / self.elapsed if self.elapsed else None,
+            "metrics": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            "occupations": dict(self.occupations.most_common())
+        }
+
+    def to_text(self):
+        """生成文本摘要"""
+        lines = ["=== 模拟统计 ===", f"调查员数量: {self.investigators}"]
+        if self.elapsed:
+            lines.append(f"耗时: {self.elapsed:.2f}秒 ({self.investigators / self.elapsed:.0f}个/秒)")
+        lines.append("")
+
+        for name, label in self.METRICS.items():
+            histogram = self.histograms[name]
+            quantiles = ", ".join(f"P{int(q * 100)}={histogram.quantile(q)}" for q in REPORT_QUANTILES)
+            lines.append(f"{label}: 平均 {histogram.mean:.2f}; {quantiles}")
+        lines.append("")
+
+        lines.append("=== 职业分布 ===")
+        for occupation, count in self.occupations.most_common():
+            lines.append(f"{occupation}: {count} ({count / self.investigators:.2%})")
+
+        return "\n".join(lines)
+
+def create_generator(data_dir="data", rule_variant=None):
+    """创建调查员生成器
+
+    Args:
+        data_dir: 数据目录
+        rule_variant: 规则变体名称（数据目录下rules.json中声明），为None时使用默认变体
+
+    Returns:
+        InvestigatorGenerator对象
+    """
+    occupations = Occupations()
+    occupations.load_occupations(os.path.join(data_dir, "occupations.json"))
+
+    skills = Skills()
+    skills.load_skills(os.path.join(data_dir, "skills.json"))
+
+    backgrounds = Backgrounds()
+    backgrounds.load_backgrounds(os.path.join(data_dir, "backgrounds.json"))
+
+    config = AppConfig()
+    config.rules_path = os.path.join(data_dir, "rules.json")
+    config.rule_variant = rule_variant
+
+    return InvestigatorGenerator(config, DiceRoller(), occupations, skills, backgrounds)
+
+# 工作进程内复用的生成器
+_worker_generator = None
+
+def _init_worker(data_dir, rule_variant=None):
+    """工作进程初始化：每个进程只加载一次数据"""
+    global _worker_generator
+    _worker_generator = create_generator(data_dir, rule_variant)
+
+def _simulate_chunk(task):
+    """在工作进程中模拟一个任务块
+
+    Args:
+        task: (起始序号, 数量, 年龄段, 主种子)
+
+    Returns:
+        SimulationStats对象
+    """
+    start, count, age_group, seed = task
+
+    # 第i名调查员只由(seed, i)决定，结果与块大小和块被分配到哪个进程无关，
+    # 也可以用generate_investigator(seed, i)单独复现
+    stats = SimulationStats()
+    rules = _worker_generator.rules
+    for index in range(start, start + count):
+        investigator = _worker_generator.generate_investigator(seed, index, age_group)
+        stats.record(investigator, rules, _worker_generator.transfer_events)
+    return stats
+
+def run_simulation(n, age_group="20-39", seed=0, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                   data_dir="data", progress=None, rule_variant=None):
+    """运行蒙特卡洛模拟
+
+    Args:
+        n: 生成的调查员总数
+        age_group: 年龄段
+        seed: 主随机种子，相同的种子和数量得到相同的统计结果
+        workers: 工作进程数，默认为CPU核心数；为1时在当前进程中运行
+        chunk_size: 每个任务块的调查员数量
+        data_dir: 数据目录
+        progress: 进度回调函数 progress(已完成数量, 总数)，可选
+        rule_variant: 规则变体名称，为None时使用默认变体
+
+    Returns:
+        SimulationStats对象
+
+    Raises:
+        ValueError: 生成数量为负数或任务块大小不是正数
+    """
+    if n < 0:
+        raise ValueError(f"无效的生成数量: {n}")
+    if chunk_size <= 0:
+        raise ValueError(f"无效的任务块大小: {chunk_size}")
+
+    tasks = []
+    for start in range(0, n, chunk_size):
+        tasks.append((start, min(chunk_size, n - start), age_group, seed))
+
+    stats = SimulationStats()
+    start_time = time.perf_counter()
+
+    if workers == 1:
+        _init_worker(data_dir, rule_variant)
+        results = map(_simulate_chunk, tasks)
+        for chunk_stats in results:
+            stats.merge(chunk_stats)
+            if progress:
+                progress(stats.investigators, n)
+    else:
+        with Pool(processes=workers, initializer=_init_worker, initargs=(data_dir, rule_variant)) as pool:
+            for chunk_stats in pool.imap_unordered(_simulate_chunk, tasks):
+                stats.merge(chunk_stats)
+                if progress:
+                    progress(stats.investigators, n)
+
+    stats.elapsed = time.perf_counter() - start_time
+    return stats
+
+def write_report(stats, file_path):
+    """写入模拟报告
+
+    扩展名为 .json 时写入完整的JSON统计（含直方图），否则写入文本摘要。
+
+    Args:
+        stats: SimulationStats对象
+        file_path: 报告文件路径
+
+    Returns:
+        bool: 是否写入成功
+    """
+    try:
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(file_path, 'w', encoding='utf-8') as f:
+            if file_path.endswith(".json"):
+                json.dump(stats.to_dict(), f, ensure_ascii=False, indent=4)
+            else:
+                f.write(stats.to_text())
+        return True
+    except Exception as e:
+        print(f"写入模拟报告失败: {e}")
+        return False
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+技能目录索引模块
+
+在加载技能数据时一次性预先计算生成调查员和界面显示需要反复使用的信息：
+- 技能名称与编号的对应关系
+- 基础值向量
+- 展开后的专攻技能名称（如"格斗（斗殴）"）及其基础值
+- 按分类分组的技能名称
+- 语言技能成员及语系（LanguageGraph）
+
+索引只读，生成器和界面直接读取，不再为每名调查员重复遍历技能数据和格式化字符串。
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+from types import MappingProxyType
+
+from core.language_graph import LanguageGraph
+
+# 常用专攻技能的基础值（与主技能的基础值不同）
+SPECIALIZATION_BASE_VALUES = {
+    "格斗（斗殴）": 25,
+    "射击（手枪）": 20,
+    "驾驶（汽车）": 20
+}
+
+def specialization_name(skill_name, specialization):
+    """拼接专攻技能的完整名称
+
+    Args:
+        skill_name: 主技能名称
+        specialization: 专攻名称
+
+    Returns:
+        完整名称，如"格斗（斗殴）"
+    """
+    return f"{skill_name}（{specialization}）"
+
+class SkillCatalogueIndex:
+    """只读的技能目录索引"""
+
+    __slots__ = (
+        "source", "names", "ids", "base_values", "base_value_map",
+        "specializations", "specialization_base_values", "expanded",
+        "categories", "sorted_names", "languages", "language_skills",
+        "language_families", "language_family_of", "language_graph"
+    )
+
+    def __init__(self, skills):
+        """由技能数据字典构建索引
+
+        Args:
+            skills: 技能数据字典（Skills.skills）
+        """
+        set_attr = object.__setattr__
+        set_attr(self, "source", skills)
+
+        names = tuple(skills)
+        set_attr(self, "names", names)
+        set_attr(self, "ids", MappingProxyType({name: i for i, name in enumerate(names)}))
+        base_values = tuple(skills[name].get("base_value", 0) for name in names)
+        set_attr(self, "base_values", base_values)
+        set_attr(self, "base_value_map", MappingProxyType(dict(zip(names, base_values))))
+        set_attr(self, "sorted_names", tuple(sorted(names)))
+
+        # 专攻技能
+        specializations = {}
+        specialization_base_values = {}
+        expanded = []
+        for name, base_value in zip(names, base_values):
+            specs = skills[name].get("specializations")
+            if specs is None:
+                expanded.append((name, name))
+                continue
+            full_names = tuple(specialization_name(name, spec) for spec in specs)
+            specializations[name] = full_names
+            specialization_base_values[name] = MappingProxyType({
+                full_name: SPECIALIZATION_BASE_VALUES.get(full_name, base_value) for full_name in full_names
+            })
+            expanded.extend((name, full_name) for full_name in full_names)
+        set_attr(self, "specializations", MappingProxyType(specializations))
+        set_attr(self, "specialization_base_values", MappingProxyType(specialization_base_values))
+        set_attr(self, "expanded", tuple(expanded))
+
+        # 分类
+        categories = {}
+        for name in names:
+            categories.setdefault(skills[name].get("category", "未分类"), []).append(name)
+        set_attr(self, "categories", MappingProxyType({category: tuple(members) for category, members in categories.items()}))
+
+        # 语言
+        language_info = skills.get("语言", {})
+        set_attr(self, "languages", tuple(language_info.get("specializations", ())))
+        set_attr(self, "language_skills", specializations.get("语言", ()))
+        graph = LanguageGraph.from_skills(skills)
+        set_attr(self, "language_graph", graph)
+        set_attr(self, "language_families", graph.families)
+        set_attr(self, "language_family_of", graph.family_of)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("技能目录索引是只读的")
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, skill_name):
+        return skill_name in self.ids
+
+    def is_current(self, skills):
+        """检查索引是否仍对应给定的技能数据字典"""
+        return self.source is skills
+
+    def base_value(self, skill_name, default=0):
+        """获取技能的基础值
+
+        Args:
+            skill_name: 技能名称（主技能或专攻技能）
+            default: 找不到时的默认值
+
+        Returns:
+            基础值
+        """
+        if skill_name in self.base_value_map:
+            return self.base_value_map[skill_name]
+        main_skill = skill_name.split("（")[0]
+        if main_skill in self.specialization_base_values:
+            return self.specialization_base_values[main_skill].get(skill_name, default)
+        return default
+
+    def interest_candidates(self, excluded):
+        """获取可作为兴趣技能的技能名称（有专攻的技能展开为各专攻）
+
+        Args:
+            excluded: 需要排除的技能名称集合（通常为职业技能）
+
+        Returns:
+            技能名称列表，顺序与技能数据一致
+        """
+        return [name for main_skill, name in self.expanded if main_skill not in excluded and name not in excluded]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+技能转移模块
+
+实现语言技能转移规则：一门语言技能跨越阈值（标准规则为50%和90%，见core.rules）时，
+同系语言提升到对应的下限值。
+- 只在技能值跨越阈值时触发，其他修改不做任何处理
+- 同系语言由语言语系图预先计算，不遍历语系数据
+- 每次传播返回受影响技能的结构化列表（SkillTransferEvent），界面直接据此高亮显示
+- 幂等：同一次转移重复应用不会再改变任何技能，返回空列表
+
+MIT License
+Copyright (c) 2025 COC Investigator Generator
+"""
+
+from collections import namedtuple
+
+from core.language_graph import default_language_graph
+from core.rules import get_ruleset
+
+# 一项技能转移：skill被source带动，从old_value提升到new_value
+SkillTransferEvent = namedtuple("SkillTransferEvent", ("skill", "old_value", "new_value", "source"))
+
+class SkillTransferPropagator:
+    """语言技能转移传播器"""
+
+    def __init__(self, graph=None, rules=None):
+        """初始化传播器
+
+        Args:
+            graph: 语言语系图，为None时使用默认语系图（随加载的技能数据变化）
+            rules: 规则集（RuleSet），为None时使用默认规则集；传播时可以逐次传入规则集
+        """
+        self._graph = graph
+        self._rules = rules
+
+    @property
+    def graph(self):
+        """使用的语言语系图"""
+        return self._graph if self._graph is not None else default_language_graph()
+
+    @property
+    def rules(self):
+        """使用的规则集"""
+        return self._rules if self._rules is not None else get_ruleset()
+
+    def boost_for(self, old_value, new_value, rules=None):
+        """计算技能值从old_value变为new_value时同系语言的提升下限
+
+        Args:
+            old_value: 变化前的技能值
+            new_value: 变化后的技能值
+            rules: 使用的规则集（RuleSet），为None时使用self.rules
+
+        Returns:
+            提升下限，没有跨越阈值时为0
+        """
+        return (rules or self.rules).transfer_boost(old_value, new_value)
+
+    def propagate(self, investigator, skill_name, old_value=0, rules=None):
+        """技能值变化后传播技能转移
+
+        Args:
+            investigator: 调查员对象（技能值已经更新）
+            skill_name: 变化的技能名称
+            old_value: 变化前的技能值，默认为0（即按首次达到当前值处理）
+            rules: 使用的规则集（RuleSet），为None时使用self.rules
+
+        Returns:
+            SkillTransferEvent列表，没有跨越阈值或同系语言都不需要提升时为空列表
+        """
+        skills = investigator.skills
+        boost = (rules or self.rules).transfer_boost(old_value, skills.get(skill_name, 0))
+        if not boost:
+            return []
+        related_skills = self.graph.sibling_skills.get(skill_name)
+        if related_skills is None:
+            return []
+
+        language_specializations = None
+        if "语言" in investigator.skill_specializations:
+            language_specializations = investigator.skill_specializations["语言"]
+
+        events = []
+        for related_skill in related_skills:
+            related_value = skills.get(related_skill, 0)
+            # 只提升低于下限的同系语言
+            if related_value < boost:
+                skills[related_skill] = boost
+                # 如果是专攻技能，也更新专攻字典
+                if language_specializations is not None:
+                    language_specializations[related_skill] = boost
+                events.append(SkillTransferEvent(related_skill, related_value, boost, skill_name))
+        return events
+
+    def settle(self, investigator, rules=None):
+        """对已达到阈值的全部语言技能应用技能转移
+
+        用于直接写入技能值（不经过add_skill）之后统一补齐转移结果，
+        只检查达到最低阈值的语言技能。
+
+        Args:
+            investigator: 调查员对象
+            rules: 使用的规则集（RuleSet），为None时使用self.rules
+
+        Returns:
+            SkillTransferEvent列表
+        """
+        rules = rules or self.rules
+        lowest_threshold = rules.transfer_min_threshold
+        if lowest_threshold is None:
+            return []
+        skills = investigator.skills
+        sibling_skills = self.graph.sibling_skills
+        sources = [name for name, value in skills.items() if value >= lowest_threshold and name in sibling_skills]
+        events = []
+        for skill_name in sources:
+            events.extend(self.propagate(investigator, skill_name, 0, rules))
+        return events
+
+# 调查员共用的技能转移传播器
+SKILL_TRANSFER = SkillTransferPropagator()
@@ -12,10 +12,17 @@ from core.skills import Skills
 class SkillViewer:
     """技能查看器类，用于显示技能详情和语言族群信息"""
     
-    def __init__(self):
-        """初始化技能查看器"""
-        self.skills = Skills()
-        self.skills.load_skills("data/skills.json")
+    def __init__(self, skills=None):
+        """初始化技能查看器
+        
+        Args:
+            skills: 已加载的Skills对象，可选；不指定时加载data/skills.json
+                （数据由共享的数据目录加载器读取，不会重复解析）
+        """
+        if skills is None:
+            skills = Skills()
+            skills.load_skills("data/skills.json")
+        self.skills = skills
 
     def get_skill_description(self, skill_name):
         """获取技能描述
@@ -43,9 +50,8 @@ class SkillViewer:
             
             # 如果是语言技能，添加语言族群信息
             if main_skill == "语言":
-                language_families = skill_info.get("language_families", {})
-                result["language_family"] = self._get_language_family(specialization, language_families)
-                result["same_family_languages"] = self._get_same_family_languages(specialization, language_families)
+                result["language_family"] = self._get_language_family(specialization)
+                result["same_family_languages"] = self._get_same_family_languages(specialization)
             
             return result
         
@@ -77,8 +83,7 @@ class SkillViewer:
         Returns:
             dict: 语言族群字典
         """
-        language_info = self.skills.get_skill_info("语言")
-        return language_info.get("language_families", {})
+        return self.language_graph.families
     
     def get_language_family_info(self, family_name):
         """获取特定语言族群的信息
@@ -89,38 +94,34 @@ class SkillViewer:
         Returns:
             list: 该族群包含的语言列表
         """
-        language_families = self.get_language_families()
-        return language_families.get(family_name, [])
+        return list(self.language_graph.families.get(family_name, ()))
+    
+    @property
+    def language_graph(self):
+        """语言语系图（由技能目录索引构建）"""
+        return self.skills.index.language_graph
     
-    def _get_language_family(self, language, language_families):
+    def _get_language_family(self, language):
         """获取语言所属的语言族群
         
         Args:
             language: 语言名称
-            language_families: 语言族群字典
             
         Returns:
             str: 语言族群名称，如果不存在则返回"其他"
         """
-        for family, langs in language_families.items():
-            if language in langs:
-                return family
-        return "其他"
+        return self.language_graph.family(language)
     
-    def _get_same_family_languages(self, language, language_families):
+    def _get_same_family_languages(self, language):
         """获取与指定语言同族的其他语言
         
         Args:
             language: 语言名称
-            language_families: 语言族群字典
             
         Returns:
             list: 同族语言列表
         """
-        for family, langs in language_families.items():
-            if language in langs:
-                return [lang for lang in langs if lang != language]
-        return []
+        return list(self.language_graph.same_family(language))
     
     def list_skills_by_category(self, category=None):
         """按类别列出技能
@@ -1,9 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import json
-import random
 from enum import Enum
+from fractions import Fraction
+from utils.rng import resolve_rng
+from core.skill_index import SkillCatalogueIndex
+from core.catalogue import get_catalogue
+from core.language_graph import set_default_language_graph
+from core.rules import get_ruleset, standard_ruleset
 
 """
 技能管理模块
@@ -27,6 +31,10 @@ from enum import Enum
 - 常规难度：检定值需小于等于技能值
 - 困难难度：检定值需小于等于技能值的一半
 - 极难难度：检定值需小于等于技能值的五分之一
+
+奖励骰/惩罚骰:
+- 按第七版规则只掷一颗个位骰，额外掷若干颗十位骰，奖励骰取结果最小的十位骰，惩罚骰取最大的
+- 十位骰00与个位骰0的组合为100
 """
 
 class DifficultyLevel(Enum):
@@ -42,31 +50,203 @@ class SkillCheckResult(Enum):
     SUCCESS = 3           # 成功
     FAILURE = 4           # 失败
     CRITICAL_FAILURE = 5  # 大失败
+    EXTREME_SUCCESS = 6   # 极难成功
+
+# 成功等级从高到低的排名（对抗检定按此比较，不依赖枚举值）
+RESULT_RANK = {
+    SkillCheckResult.CRITICAL_SUCCESS: 0,
+    SkillCheckResult.EXTREME_SUCCESS: 1,
+    SkillCheckResult.HARD_SUCCESS: 2,
+    SkillCheckResult.SUCCESS: 3,
+    SkillCheckResult.FAILURE: 4,
+    SkillCheckResult.CRITICAL_FAILURE: 5
+}
+
+# 成功类检定结果
+SUCCESS_RESULTS = (
+    SkillCheckResult.CRITICAL_SUCCESS,
+    SkillCheckResult.EXTREME_SUCCESS,
+    SkillCheckResult.HARD_SUCCESS,
+    SkillCheckResult.SUCCESS
+)
+
+# 检定概率表覆盖的范围：技能值0-100，净奖励/惩罚骰-2到+2
+ODDS_TABLE_MAX_SKILL = 100
+ODDS_TABLE_MAX_DICE = 2
+
+_roll_distribution_cache = {}
+
+def roll_distribution(net_dice=0):
+    """计算百分骰结果的精确分布
+
+    按第七版规则：个位骰只掷一次，十位骰掷 1+|net_dice| 颗，
+    奖励骰（net_dice > 0）取结果最小者，惩罚骰（net_dice < 0）取结果最大者。
+
+    Args:
+        net_dice: 净奖励骰数量（奖励骰 - 惩罚骰）
+
+    Returns:
+        长度为100的元组，第i项为掷出 i+1 的概率（Fraction）
+    """
+    if net_dice in _roll_distribution_cache:
+        return _roll_distribution_cache[net_dice]
+
+    tens_count = 1 + abs(net_dice)
+    probabilities = [Fraction(0)] * 100
+
+    for units in range(10):
+        # 该个位骰下十位骰各面对应的结果，00+0 为 100
+        outcomes = sorted((tens * 10 + units) or 100 for tens in range(10))
+        if net_dice < 0:
+            outcomes.reverse()
+        # outcomes按"越靠前越会被选中"排序，第i个结果被选中的概率为
+        # P(全部十位骰都不优于第i个) - P(全部十位骰都不优于第i+1个)
+        for i, outcome in enumerate(outcomes):
+            keep = Fraction(10 - i, 10) ** tens_count - Fraction(9 - i, 10) ** tens_count
+            probabilities[outcome - 1] += keep / 10
+
+    result = tuple(probabilities)
+    _roll_distribution_cache[net_dice] = result
+    return result
+
+def _float_roll_distribution(net_dice):
+    """roll_distribution的浮点版本，供概率表使用"""
+    key = ("float", net_dice)
+    if key not in _roll_distribution_cache:
+        _roll_distribution_cache[key] = tuple(float(p) for p in roll_distribution(net_dice))
+    return _roll_distribution_cache[key]
+
+def classify_roll(roll_result, skill_value, difficulty=DifficultyLevel.REGULAR):
+    """根据掷骰结果确定检定结果（标准规则；其他规则变体使用RuleSet.classify_roll）
+
+    Args:
+        roll_result: 百分骰结果（1-100）
+        skill_value: 技能值
+        difficulty: 难度等级
+
+    Returns:
+        检定结果枚举
+    """
+    return standard_ruleset().classify_roll(roll_result, skill_value, difficulty)
+
+def _compute_check_odds(skill_value, difficulty, net_dice, classify):
+    """精确计算各检定结果的概率"""
+    odds = dict.fromkeys(SkillCheckResult, 0.0)
+    for roll_result, probability in enumerate(_float_roll_distribution(net_dice), 1):
+        if probability:
+            odds[classify(roll_result, skill_value, difficulty)] += probability
+    return odds
+
+def _build_odds_table(table, classify):
+    """预先计算 技能值×难度×奖励/惩罚骰 的检定概率表"""
+    for net_dice in range(-ODDS_TABLE_MAX_DICE, ODDS_TABLE_MAX_DICE + 1):
+        for difficulty in DifficultyLevel:
+            for skill_value in range(ODDS_TABLE_MAX_SKILL + 1):
+                table[(skill_value, difficulty, net_dice)] = _compute_check_odds(skill_value, difficulty, net_dice, classify)
+
+def check_odds(skill_value, difficulty=DifficultyLevel.REGULAR, bonus_dice=0, penalty_dice=0, rules=None):
+    """获取一次技能检定各结果的精确概率
+
+    首次调用时预先计算完整的概率表，之后在表内的查询为O(1)；
+    超出表范围的技能值或骰子数量会即时计算。
+
+    Args:
+        skill_value: 技能值
+        difficulty: 难度等级
+        bonus_dice: 奖励骰数量
+        penalty_dice: 惩罚骰数量
+        rules: 规则集（RuleSet），为None时使用标准规则；每个规则集有自己的概率表
+
+    Returns:
+        {SkillCheckResult: 概率} 字典（请勿修改返回的字典）
+    """
+    if rules is None:
+        rules = standard_ruleset()
+    table, classify = rules.odds_table, rules.classify_roll
+    if not table:
+        _build_odds_table(table, classify)
+
+    key = (skill_value, difficulty, bonus_dice - penalty_dice)
+    odds = table.get(key)
+    if odds is None:
+        odds = _compute_check_odds(*key, classify)
+        table[key] = odds
+    return odds
 
 class Skills:
     """技能数据类"""
 
-    def __init__(self):
-        """初始化技能数据"""
+    def __init__(self, rng=None, rules=None):
+        """初始化技能数据
+
+        Args:
+            rng: 技能检定使用的随机数源（RandomSource、random.Random或整数种子），默认使用全局random模块
+            rules: 技能检定使用的规则集（RuleSet），默认使用默认规则集（core.rules.get_ruleset）
+        """
         self.skills = {}
         self.skill_categories = ["知识", "社交", "战斗", "感知", "身体", "技能"]
+        self.rng = resolve_rng(rng)
+        self._rules = rules
+        self._index = None
+
+    @property
+    def rules(self):
+        """技能检定使用的规则集"""
+        return self._rules if self._rules is not None else get_ruleset()
+
+    def set_rules(self, rules):
+        """设置技能检定使用的规则集
+
+        Args:
+            rules: RuleSet对象，为None时使用默认规则集
+        """
+        self._rules = rules
+
+    def set_rng(self, rng):
+        """设置技能检定使用的随机数源
+
+        Args:
+            rng: 随机数源，为None时恢复为全局random模块
+        """
+        self.rng = resolve_rng(rng)
 
     def load_skills(self, file_path):
         """从文件加载技能数据
 
+        数据通过进程内共享的数据目录加载器读取，同一文件只解析一次。
+        加载成功后其语系图成为调查员技能转移使用的默认语系图。
+
         Args:
             file_path: 技能数据文件路径
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.skills = json.load(f)
+            self.skills = get_catalogue().load(file_path)
+            self._index = SkillCatalogueIndex(self.skills)
+            set_default_language_graph(self._index.language_graph)
             return True
         except Exception as e:
             print(f"加载技能数据失败: {e}")
             # 使用默认技能数据
             self.skills = self.get_all_skills()
+            self._index = SkillCatalogueIndex(self.skills)
             return False
 
+    @property
+    def index(self):
+        """技能目录索引（只读）
+
+        在load_skills时构建；如果skills被整体替换，首次访问时自动重建。
+        原地修改skills字典后需要调用rebuild_index()。
+        """
+        if self._index is None or not self._index.is_current(self.skills):
+            self._index = SkillCatalogueIndex(self.skills)
+        return self._index
+
+    def rebuild_index(self):
+        """重建技能目录索引"""
+        self._index = SkillCatalogueIndex(self.skills)
+        return self._index
+
     def get_skill_categories(self):
         """获取所有技能分类"""
         return self.skill_categories
@@ -110,13 +290,9 @@ class Skills:
         Returns:
             技能字典列表
         """
-        result = {}
-        for name, skill in self.skills.items():
-            if skill.get("category") == category:
-                result[name] = skill
-        return result
+        return {name: self.skills[name] for name in self.index.categories.get(category, ())}
 
-    def check_skill(self, skill_value, difficulty=DifficultyLevel.REGULAR, bonus_dice=0, penalty_dice=0):
+    def check_skill(self, skill_value, difficulty=DifficultyLevel.REGULAR, bonus_dice=0, penalty_dice=0, rules=None):
         """进行技能检定
 
         Args:
@@ -124,6 +300,7 @@ class Skills:
             difficulty: 难度等级
             bonus_dice: 奖励骰数量
             penalty_dice: 惩罚骰数量
+            rules: 本次检定使用的规则集（RuleSet），为None时使用self.rules
 
         Returns:
             (roll_result, check_result): 骰子结果和检定结果枚举
@@ -131,47 +308,50 @@ class Skills:
         # 计算有效骰子数量（奖励骰-惩罚骰）
         effective_dice = bonus_dice - penalty_dice
 
-        # 进行掷骰
-        if effective_dice == 0:
-            # 常规掷骰
-            roll_result = random.randint(1, 100)
-        else:
-            # 有奖励骰或惩罚骰的情况
-            rolls = [random.randint(1, 100)]
-            for _ in range(abs(effective_dice)):
-                rolls.append(random.randint(1, 100))
-
-            # 奖励骰取最低值，惩罚骰取最高值
-            if effective_dice > 0:
-                roll_result = min(rolls)
-            else:
-                roll_result = max(rolls)
-
-        # 根据难度等级确定目标值
-        if difficulty == DifficultyLevel.REGULAR:
-            target = skill_value
-        elif difficulty == DifficultyLevel.HARD:
-            target = skill_value // 2
-        elif difficulty == DifficultyLevel.EXTREME:
-            target = skill_value // 5
-        else:
-            target = skill_value
-
-        # 确定成功等级
-        if roll_result == 1 or (roll_result <= 5 and roll_result <= skill_value):
-            return roll_result, SkillCheckResult.CRITICAL_SUCCESS
-        elif roll_result <= target:
-            if roll_result <= skill_value // 5:
-                return roll_result, SkillCheckResult.EXTREME_SUCCESS
-            elif roll_result <= skill_value // 2:
-                return roll_result, SkillCheckResult.HARD_SUCCESS
-            else:
-                return roll_result, SkillCheckResult.SUCCESS
+        # 进行掷骰：个位骰只掷一次，每颗奖励骰/惩罚骰额外掷一颗十位骰
+        randint = self.rng.randint
+        units = randint(0, 9)
+        tens_rolls = [randint(0, 9) for _ in range(1 + abs(effective_dice))]
+        rolls = [(tens * 10 + units) or 100 for tens in tens_rolls]
+
+        # 奖励骰取最低值，惩罚骰取最高值
+        if effective_dice >= 0:
+            roll_result = min(rolls)
         else:
-            if roll_result >= 96 and skill_value < 50 or roll_result == 100:
-                return roll_result, SkillCheckResult.CRITICAL_FAILURE
-            else:
-                return roll_result, SkillCheckResult.FAILURE
+            roll_result = max(rolls)
+
+        return roll_result, (rules or self.rules).classify_roll(roll_result, skill_value, difficulty)
+
+    def check_odds(self, skill_value, difficulty=DifficultyLevel.REGULAR, bonus_dice=0, penalty_dice=0, rules=None):
+        """获取技能检定各结果的精确概率（不掷骰）
+
+        Args:
+            skill_value: 技能值
+            difficulty: 难度等级
+            bonus_dice: 奖励骰数量
+            penalty_dice: 惩罚骰数量
+            rules: 使用的规则集（RuleSet），为None时使用self.rules
+
+        Returns:
+            {SkillCheckResult: 概率} 字典
+        """
+        return check_odds(skill_value, difficulty, bonus_dice, penalty_dice, rules or self.rules)
+
+    def success_chance(self, skill_value, difficulty=DifficultyLevel.REGULAR, bonus_dice=0, penalty_dice=0, rules=None):
+        """获取技能检定成功（含大成功）的概率
+
+        Args:
+            skill_value: 技能值
+            difficulty: 难度等级
+            bonus_dice: 奖励骰数量
+            penalty_dice: 惩罚骰数量
+            rules: 使用的规则集（RuleSet），为None时使用self.rules
+
+        Returns:
+            成功概率（0-1）
+        """
+        odds = check_odds(skill_value, difficulty, bonus_dice, penalty_dice, rules or self.rules)
+        return sum(odds[result] for result in SUCCESS_RESULTS)
 
     def opposed_check(self, skill_value1, skill_value2):
         """进行对抗技能检定
@@ -189,9 +369,11 @@ class Skills:
 
         # 判断胜者
         # 首先比较成功等级
-        if result1.value < result2.value:
+        rank1 = RESULT_RANK[result1]
+        rank2 = RESULT_RANK[result2]
+        if rank1 < rank2:
             winner = 1
-        elif result2.value < result1.value:
+        elif rank2 < rank1:
             winner = 2
         else:
             # 成功等级相同，比较技能值
@@ -221,9 +403,7 @@ class Skills:
         for skill in skill_values:
             roll, result = self.check_skill(skill)
             results.append((roll, result))
-            if result in [SkillCheckResult.CRITICAL_SUCCESS,
-                         SkillCheckResult.HARD_SUCCESS,
-                         SkillCheckResult.SUCCESS]:
+            if result in SUCCESS_RESULTS:
                 successes += 1
 
         # 判断整体成功与否
@@ -254,40 +434,20 @@ class Skills:
         else:
             return normal_roll, normal_result, None, None
 
-    def transfer_skill_bonus(self, specializations):
+    def transfer_skill_bonus(self, specializations, rules=None):
         """处理技能专攻间的转移加值
 
-        这是可选规则：当一项专攻技能达到50%或90%时，
-        相关专攻技能都可以获得10%的提升（上限为50%）
+        这是可选规则：当一项专攻技能达到规则集中的阈值（标准规则为50%和90%）时，
+        相关专攻技能都可以获得加值（标准规则为每个阈值10%，上限为50%）
 
         Args:
             specializations: 专攻技能字典，格式为{专攻名: 技能值}
+            rules: 使用的规则集（RuleSet），为None时使用self.rules
 
         Returns:
             更新后的专攻技能字典
         """
-        result = specializations.copy()
-
-        # 检查是否有专攻达到50%或90%
-        has_fifty = any(value >= 50 for value in specializations.values())
-        has_ninety = any(value >= 90 for value in specializations.values())
-
-        if not has_fifty and not has_ninety:
-            return result
-
-        # 应用转移规则
-        for spec_name, value in result.items():
-            bonus = 0
-            if has_fifty:
-                bonus += 10
-            if has_ninety:
-                bonus += 10
-
-            # 应用加值，但不超过50%
-            if value < 50:
-                result[spec_name] = min(50, value + bonus)
-
-        return result
+        return (rules or self.rules).transfer_skill_bonus(specializations)
 
     @staticmethod
     def get_all_skills():
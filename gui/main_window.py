@@ -6,7 +6,7 @@ from PyQt6.QtWidgets import (
     QLabel, QPushButton, QTabWidget, QMessageBox,
     QFileDialog
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
 from gui.tabs.attribute_tab import AttributeTab
@@ -17,12 +17,16 @@ from gui.tabs.equipment_tab import EquipmentTab
 from gui.tabs.summary_tab import SummaryTab
 
 from core.generator import InvestigatorGenerator
-from utils.file_handler import FileHandler
+from utils.file_handler import FileHandler, JOURNAL_SUFFIX
+from utils.autosave import AutosaveEngine
 
 class MainWindow(QMainWindow):
     """主窗口"""
     
-    def __init__(self, config, investigator_generator, occupations, skills, backgrounds, file_handler):
+    # 自动保存写入失败（可能从后台线程发出，在界面线程中处理）
+    autosave_failed = pyqtSignal(str)
+    
+    def __init__(self, config, investigator_generator, occupations, skills, backgrounds, file_handler, library=None):
         """初始化主窗口"""
         super().__init__()
         
@@ -32,8 +36,14 @@ class MainWindow(QMainWindow):
         self.skills = skills
         self.backgrounds = backgrounds
         self.file_handler = file_handler
+        self.library = library  # 调查员库索引，保存时增量更新
+        
+        # 后台自动保存
+        self.autosave_failed.connect(self.on_autosave_failed)
+        self.autosave = AutosaveEngine(config.autosave_delay, config.autosave_max_delay, library, self.autosave_failed.emit)
         
         self.current_investigator = None
+        self.journal = None  # 当前调查员文件的修改日志，每次修改追加一条差异记录
         
         self.init_ui()
     
@@ -118,6 +128,7 @@ class MainWindow(QMainWindow):
         """创建新的调查员"""
         # 创建一个空的调查员
         self.current_investigator = self.investigator_generator.create_empty_investigator()
+        self.journal = None
         
         # 更新所有标签页
         self.update_all_tabs()
@@ -129,6 +140,7 @@ class MainWindow(QMainWindow):
         """随机生成调查员"""
         # 生成随机调查员
         self.current_investigator = self.investigator_generator.generate_random_investigator()
+        self.journal = None
         
         # 更新所有标签页
         self.update_all_tabs()
@@ -156,11 +168,15 @@ class MainWindow(QMainWindow):
         if not file_path:
             return
         
+        # 丢弃尚未写入的自动保存，避免较旧的内容覆盖本次保存
+        self.autosave.cancel(file_path)
+        
         # 保存调查员，并记录文件路径
-        success = self.file_handler.save_investigator(self.current_investigator, file_path)
+        success = self.file_handler.save_investigator(self.current_investigator, file_path, self.library)
         
         if success:
             self.current_investigator.file_path = file_path
+            self.checkpoint_journal()
             self.show_message(f"调查员已保存到: {file_path}")
         else:
             self.show_message("保存调查员失败")
@@ -175,13 +191,14 @@ class MainWindow(QMainWindow):
         if not file_path:
             return
         
-        # 加载调查员
-        investigator = self.file_handler.load_investigator(file_path)
+        # 加载调查员，上次的修改没有保存就退出时从修改日志恢复
+        investigator = self.file_handler.recover_investigator(file_path)
         
         if investigator:
             self.current_investigator = investigator
             # 保存文件路径到调查员对象
             self.current_investigator.file_path = file_path
+            self.open_journal()
             self.update_all_tabs()
             self.tab_widget.setCurrentIndex(5)  # 切换到摘要标签页
             self.show_message(f"调查员已加载: {file_path}")
@@ -222,6 +239,52 @@ class MainWindow(QMainWindow):
         
         # 保存调查员数据
         self.update_investigator_from_tabs()
+        self.record_journal()
+    
+    def schedule_autosave(self, fields=None):
+        """记录当前调查员被修改的字段，写入修改日志并由后台自动保存（只有保存过的调查员才会自动保存）
+        
+        Returns:
+            bool: 是否已安排自动保存（调查员还没有保存路径时为False）
+        """
+        if self.current_investigator and self.current_investigator.file_path:
+            self.record_journal()
+            self.autosave.mark_dirty(self.current_investigator, self.current_investigator.file_path, fields)
+            return True
+        return False
+    
+    def open_journal(self):
+        """打开当前调查员文件的修改日志，并记录当前状态"""
+        self.journal = self.file_handler.open_journal(self.current_investigator.file_path)
+        self.record_journal()
+    
+    def record_journal(self):
+        """把当前调查员的修改追加到修改日志（只记录变化的字段，没有变化时不写入）"""
+        if self.journal is None:
+            return
+        try:
+            self.journal.record(self.current_investigator)
+        except Exception as e:
+            # 日志只用于崩溃恢复，写入失败时停用日志，不影响正常保存
+            print(f"写入修改日志失败: {e}")
+            self.journal = None
+    
+    def checkpoint_journal(self):
+        """保存调查员文件后把修改日志压缩为一个快照，日志不再随编辑次数增长"""
+        if self.journal is None or self.journal.file_path != self.current_investigator.file_path + JOURNAL_SUFFIX:
+            self.open_journal()
+        else:
+            self.record_journal()
+        if self.journal is None:
+            return
+        try:
+            self.journal.compact()
+        except Exception as e:
+            print(f"压缩修改日志失败: {e}")
+    
+    def on_autosave_failed(self, file_path):
+        """自动保存写入失败时提示用户（修改仍会在稍后重试）"""
+        QMessageBox.warning(self, "自动保存失败", f"无法写入 {file_path}，修改尚未保存，将稍后重试。")
     
     def update_investigator_from_tabs(self):
         """从标签页更新调查员数据"""
@@ -282,7 +345,12 @@ class MainWindow(QMainWindow):
             
             # 如果文件名已经存在，直接保存
             if hasattr(self.current_investigator, 'file_path') and self.current_investigator.file_path:
-                self.file_handler.save_investigator(self.current_investigator, self.current_investigator.file_path)
+                self.autosave.cancel(self.current_investigator.file_path)
+                if self.file_handler.save_investigator(self.current_investigator, self.current_investigator.file_path, self.library):
+                    self.checkpoint_journal()
+                elif not self.confirm_discard(f"无法保存调查员到 {self.current_investigator.file_path}。"):
+                    event.ignore()
+                    return
             else:
                 # 询问用户是否保存
                 reply = QMessageBox.question(
@@ -298,7 +366,10 @@ class MainWindow(QMainWindow):
                     )
                     
                     if file_path:
-                        self.file_handler.save_investigator(self.current_investigator, file_path)
+                        if not self.file_handler.save_investigator(self.current_investigator, file_path, self.library):
+                            if not self.confirm_discard(f"无法保存调查员到 {file_path}。"):
+                                event.ignore()
+                                return
                     else:
                         # 用户取消保存，但允许关闭窗口
                         pass
@@ -307,9 +378,30 @@ class MainWindow(QMainWindow):
                     event.ignore()
                     return
         
+        # 写入其他尚未保存的修改并结束自动保存线程
+        if not self.autosave.close():
+            failed = "\n".join(sorted(self.autosave.failed_paths()))
+            if not self.confirm_discard(f"以下文件的自动保存写入失败：\n{failed}"):
+                event.ignore()
+                return
+            self.autosave.close(flush=False)
+        
         # 接受关闭事件
         event.accept()
     
+    def confirm_discard(self, reason):
+        """保存失败时询问用户是否放弃未保存的修改并退出
+        
+        Returns:
+            bool: 用户确认放弃修改时为True
+        """
+        reply = QMessageBox.question(
+            self, '保存失败',
+            f'{reason}\n放弃未保存的修改并退出?',
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        return reply == QMessageBox.StandardButton.Yes
+    
     def show_message(self, message):
         """显示消息"""
         QMessageBox.information(self, "提示", message) 
\ No newline at end of file
@@ -8,6 +8,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from core.derived import DERIVED_ENGINE
 
 class AttributeTab(QWidget):
     """属性标签页"""
@@ -164,6 +165,9 @@ class AttributeTab(QWidget):
         
         investigator = self.parent.current_investigator
         
+        # 跟踪显示中的调查员，之后的修改只重新计算受影响的衍生属性
+        DERIVED_ENGINE.track(investigator)
+        
         # 更新基本信息
         self.name_edit.setText(investigator.name)
         self.player_edit.setText(investigator.player)
@@ -230,11 +234,8 @@ class AttributeTab(QWidget):
         # 更新属性值
         investigator.attributes[attr_name] = value
         
-        # 重新计算属性的半值和五分之一值
-        investigator.calculate_half_fifth_values()
-        
-        # 重新计算衍生属性
-        investigator.calculate_derived_attributes()
+        # 只重新计算依赖该属性的半值、五分之一值和衍生属性
+        DERIVED_ENGINE.update(investigator)
         
         # 更新UI
         self.update_ui()
@@ -247,8 +248,8 @@ class AttributeTab(QWidget):
         investigator = self.parent.current_investigator
         investigator.age = age
         
-        # 重新计算衍生属性
-        investigator.calculate_derived_attributes()
+        # 只重新计算依赖年龄的衍生属性（移动速度）
+        DERIVED_ENGINE.update(investigator)
         
         # 更新UI
         self.update_ui() 
\ No newline at end of file
@@ -170,12 +170,13 @@ class OccupationTab(QWidget):
         
         # 更新职业详情
         self.occupation_name.setText(occupation_name)
-        self.credit_rating.setText(f"{occupation.get('credit_rating_min', 0)}-{occupation.get('credit_rating_max', 0)}")
+        credit_min, credit_max = self.parent.occupations.get_credit_rating(occupation_name)
+        self.credit_rating.setText(f"{credit_min}-{credit_max}")
         
         # 计算技能点
         if self.parent.current_investigator:
-            edu = self.parent.current_investigator.attributes.get("教育", 0)
-            skill_points = self.parent.occupations.calculate_skill_points(occupation_name, edu)
+            attributes = self.parent.current_investigator.attributes
+            skill_points = self.parent.occupations.calculate_skill_points(occupation_name, attributes.get("教育", 0), attributes)
             self.skill_points.setText(str(skill_points))
         else:
             self.skill_points.setText("需要先设置教育属性")
@@ -204,7 +205,7 @@ class OccupationTab(QWidget):
         
         # 计算技能点
         edu = investigator.attributes.get("教育", 0)
-        skill_points = self.parent.occupations.calculate_skill_points(occupation_name, edu)
+        skill_points = self.parent.occupations.calculate_skill_points(occupation_name, edu, investigator.attributes)
         investigator.occupation_skill_points = skill_points
         investigator.occupation_skill_points_allocated = 0
         
@@ -224,7 +225,8 @@ class OccupationTab(QWidget):
         if investigator.occupation:
             occupation = self.parent.occupations.get_occupation(investigator.occupation)
             if occupation:
-                self.current_credit_rating.setText(f"{occupation.get('credit_rating_min', 0)}-{occupation.get('credit_rating_max', 0)}")
+                credit_min, credit_max = self.parent.occupations.get_credit_rating(investigator.occupation)
+                self.current_credit_rating.setText(f"{credit_min}-{credit_max}")
         else:
             self.current_credit_rating.setText("")
         
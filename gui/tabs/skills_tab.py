@@ -11,6 +11,11 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QColor
 
+from core.skills import DifficultyLevel
+
+# 技能加点会修改的调查员字段
+SKILL_FIELDS = ["skills", "skill_specializations", "occupation_skill_points_allocated", "interest_skill_points_allocated"]
+
 class SkillsTab(QWidget):
     """技能标签页"""
     
@@ -145,23 +150,29 @@ class SkillsTab(QWidget):
             # 如果是特定语言，显示语系信息
             if skill_name.startswith("语言（") and "）" in skill_name:
                 language = skill_name[skill_name.find("（")+1:skill_name.find("）")]
-                language_info = self.parent.skills.get_skill_info("语言")
+                graph = self.parent.skills.index.language_graph
                 
-                if language_info and "language_families" in language_info:
-                    # 查找该语言属于哪个语系
-                    for family, languages in language_info["language_families"].items():
-                        if language in languages:
-                            tooltip += f"<div style='margin-top:5px;'><b>语系：</b>{family}</div>"
-                            tooltip += f"<div><b>同族语言：</b>{', '.join([lang for lang in languages if lang != language])}</div>"
-                            
-                            # 添加技能转移规则提示
-                            tooltip += "<div style='margin-top:5px; color:#008800;'><b>技能转移规则：</b></div>"
-                            tooltip += "<div style='color:#008800;'>当提升到50%时，同族语言提升至10%</div>"
-                            tooltip += "<div style='color:#008800;'>当提升到90%时，同族语言再提升10%</div>"
-                            break
+                # 查找该语言属于哪个语系
+                if language in graph:
+                    tooltip += f"<div style='margin-top:5px;'><b>语系：</b>{graph.family(language)}</div>"
+                    tooltip += f"<div><b>同族语言：</b>{', '.join(graph.same_family(language))}</div>"
+                    
+                    # 添加技能转移规则提示
+                    tooltip += "<div style='margin-top:5px; color:#008800;'><b>技能转移规则：</b></div>"
+                    tooltip += "<div style='color:#008800;'>当提升到50%时，同族语言提升至10%</div>"
+                    tooltip += "<div style='color:#008800;'>当提升到90%时，同族语言再提升10%</div>"
         
         return tooltip
         
+    def create_odds_tooltip(self, skill_value):
+        """创建技能检定成功率提示内容"""
+        rules = self.parent.investigator_generator.rules
+        regular = self.parent.skills.success_chance(skill_value, DifficultyLevel.REGULAR, rules=rules)
+        hard = self.parent.skills.success_chance(skill_value, DifficultyLevel.HARD, rules=rules)
+        extreme = self.parent.skills.success_chance(skill_value, DifficultyLevel.EXTREME, rules=rules)
+        return (f"<div style='margin-top:5px;'><b>成功率：</b>常规 {regular:.0%} / "
+                f"困难 {hard:.0%} / 极难 {extreme:.0%}</div>")
+        
     def load_skills(self):
         """加载技能列表"""
         if not self.parent.skills or not self.parent.current_investigator:
@@ -181,7 +192,9 @@ class SkillsTab(QWidget):
         
         # 添加技能到表格
         row = 0
-        for skill_name, skill in sorted(self.parent.skills.skills.items()):
+        skills = self.parent.skills.skills
+        for skill_name in self.parent.skills.index.sorted_names:
+            skill = skills[skill_name]
             # 检查过滤条件
             filter_text = self.filter_combo.currentText()
             if filter_text == "职业技能" and skill_name not in occupation_skills:
@@ -238,7 +251,7 @@ class SkillsTab(QWidget):
             final_value = investigator.skills.get(skill_name, base_value)
             final_item = QTableWidgetItem(str(final_value))
             final_item.setFlags(final_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            final_item.setToolTip(skill_tooltip)  # 同样添加工具提示
+            final_item.setToolTip(skill_tooltip + self.create_odds_tooltip(final_value))
             self.skills_table.setItem(row, 4, final_item)
             
             # 操作按钮
@@ -300,16 +313,8 @@ class SkillsTab(QWidget):
         # 更新技能值
         new_value = base_value + value
         
-        # 记录更新前所有语言技能的值
-        pre_update_language_skills = {}
-        if skill_name.startswith("语言（") or skill_name == "语言":
-            # 获取所有语言技能当前值
-            for s_name, s_value in investigator.skills.items():
-                if s_name.startswith("语言（") or s_name == "语言":
-                    pre_update_language_skills[s_name] = s_value
-        
-        # 使用add_skill方法而不是直接设置，以触发技能转移规则
-        investigator.add_skill(skill_name, new_value)
+        # 使用add_skill方法而不是直接设置，以触发技能转移规则（返回被带动的同系语言）
+        transfers = investigator.add_skill(skill_name, new_value, self.parent.investigator_generator.rules)
         
         # 更新已分配技能点
         if is_occupation_skill:
@@ -317,19 +322,6 @@ class SkillsTab(QWidget):
         else:
             investigator.interest_skill_points_allocated += diff
         
-        # 检查语言技能是否发生了转移
-        affected_languages = []
-        if pre_update_language_skills and (skill_name.startswith("语言（") or skill_name == "语言"):
-            for s_name, old_val in pre_update_language_skills.items():
-                # 跳过当前正在修改的技能
-                if s_name == skill_name:
-                    continue
-                
-                # 检查值是否有变化
-                new_val = investigator.skills.get(s_name, old_val)
-                if new_val > old_val:
-                    affected_languages.append((s_name, old_val, new_val))
-        
         # 更新UI
         self.update_ui()
         
@@ -340,19 +332,19 @@ class SkillsTab(QWidget):
         self.skills_table.setItem(row, 4, final_item)
         
         # 显示语言技能转移通知
-        if affected_languages:
+        if transfers:
             notification = f"由于{skill_name}达到了{new_value}%，以下相关语言也得到了提升：\n"
-            for lang, old_val, new_val in affected_languages:
-                notification += f"• {lang}: {old_val}% → {new_val}%\n"
+            for transfer in transfers:
+                notification += f"• {transfer.skill}: {transfer.old_value}% → {transfer.new_value}%\n"
                 
                 # 高亮显示受影响的技能行
-                self.highlight_affected_skill(lang, old_val, new_val)
+                self.highlight_affected_skill(transfer.skill, transfer.old_value, transfer.new_value)
                 
             self.parent.show_message(notification)
             
-        # 如果开启了自动保存，调用主窗口的update_investigator_from_tabs方法更新调查员
+        # 如果开启了自动保存，只记录修改的字段，由后台防抖写入
         if self.autosave_checkbox.isChecked():
-            self.parent.update_investigator_from_tabs()
+            self.parent.schedule_autosave(SKILL_FIELDS)
     
     def highlight_affected_skill(self, skill_name, old_value, new_value):
         """高亮显示受影响的技能"""
@@ -402,9 +394,9 @@ class SkillsTab(QWidget):
         investigator = self.parent.current_investigator
         
         # 重置技能
-        for skill_name, skill in self.parent.skills.skills.items():
+        for skill_name, base_value in self.parent.skills.index.base_value_map.items():
             if skill_name in investigator.skills:
-                investigator.skills[skill_name] = skill.get("base_value", 0)
+                investigator.skills[skill_name] = base_value
         
         # 重置已分配技能点
         investigator.occupation_skill_points_allocated = 0
@@ -414,9 +406,8 @@ class SkillsTab(QWidget):
         self.update_ui()
         
         # 如果开启了自动保存，更新调查员数据
-        if self.autosave_checkbox.isChecked():
-            self.parent.update_investigator_from_tabs()
-            self.parent.show_message("技能点已重置并保存")
+        if self.autosave_checkbox.isChecked() and self.parent.schedule_autosave(SKILL_FIELDS):
+            self.parent.show_message("技能点已重置，修改将自动保存")
         else:
             self.parent.show_message("技能点已重置")
     
@@ -461,7 +452,7 @@ class SkillsTab(QWidget):
         
         # 随机分配兴趣技能点
         remaining_interest_points = investigator.interest_skill_points
-        all_skills = list(self.parent.skills.skills.keys())
+        all_skills = list(self.parent.skills.index.names)
         while remaining_interest_points > 0 and all_skills:
             # 随机选择一个技能
             skill_name = self.parent.investigator_generator.dice_roller.random_choice(all_skills)
@@ -496,9 +487,8 @@ class SkillsTab(QWidget):
         self.update_ui()
         
         # 如果开启了自动保存，更新调查员数据
-        if self.autosave_checkbox.isChecked():
-            self.parent.update_investigator_from_tabs()
-            self.parent.show_message("技能点已随机分配并保存")
+        if self.autosave_checkbox.isChecked() and self.parent.schedule_autosave(SKILL_FIELDS):
+            self.parent.show_message("技能点已随机分配，修改将自动保存")
         else:
             self.parent.show_message("技能点已随机分配")
     
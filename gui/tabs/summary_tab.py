@@ -11,6 +11,8 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QPainter, QTextDocument, QPageSize
 from PyQt6.QtPrintSupport import QPrinter
 
+from core.sheets import render_sheet
+
 class SummaryTab(QWidget):
     """摘要标签页"""
     
@@ -393,182 +395,8 @@ class SummaryTab(QWidget):
         # 创建文档
         document = QTextDocument()
         
-        # 构建HTML内容
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                h1 {{ text-align: center; }}
-                h2 {{ margin-top: 20px; border-bottom: 1px solid #ccc; }}
-                table {{ width: 100%; border-collapse: collapse; }}
-                th, td {{ border: 1px solid #ccc; padding: 5px; }}
-                th {{ background-color: #f0f0f0; }}
-            </style>
-        </head>
-        <body>
-            <h1>克苏鲁的呼唤 - 调查员角色卡</h1>
-            
-            <h2>基本信息</h2>
-            <table>
-                <tr>
-                    <th>姓名</th>
-                    <td>{investigator.name}</td>
-                    <th>玩家</th>
-                    <td>{investigator.player}</td>
-                </tr>
-                <tr>
-                    <th>性别</th>
-                    <td>{investigator.gender}</td>
-                    <th>年龄</th>
-                    <td>{investigator.age}</td>
-                </tr>
-                <tr>
-                    <th>职业</th>
-                    <td>{investigator.occupation}</td>
-                    <th>居住地</th>
-                    <td>{investigator.residence}</td>
-                </tr>
-                <tr>
-                    <th>出生地</th>
-                    <td colspan="3">{investigator.birthplace}</td>
-                </tr>
-            </table>
-            
-            <h2>属性</h2>
-            <table>
-                <tr>
-                    <th>属性</th>
-                    <th>值</th>
-                    <th>半值</th>
-                    <th>五分之一值</th>
-                </tr>
-        """
-        
-        # 添加属性
-        for attr_name in ["力量", "体质", "体型", "敏捷", "外貌", "智力", "意志", "教育", "幸运"]:
-            value = investigator.attributes.get(attr_name, 0)
-            half_value = investigator.attribute_half.get(attr_name, 0)
-            fifth_value = investigator.attribute_fifth.get(attr_name, 0)
-            
-            html += f"""
-                <tr>
-                    <th>{attr_name}</th>
-                    <td>{value}</td>
-                    <td>{half_value}</td>
-                    <td>{fifth_value}</td>
-                </tr>
-            """
-        
-        html += f"""
-            </table>
-            
-            <h2>衍生属性</h2>
-            <table>
-                <tr>
-                    <th>生命值</th>
-                    <td>{investigator.hp}</td>
-                    <th>魔法值</th>
-                    <td>{investigator.mp}</td>
-                </tr>
-                <tr>
-                    <th>理智值</th>
-                    <td>{investigator.san}</td>
-                    <th>伤害加值</th>
-                    <td>{investigator.db}</td>
-                </tr>
-                <tr>
-                    <th>体格</th>
-                    <td>{investigator.build}</td>
-                    <th>移动速度</th>
-                    <td>{investigator.mov}</td>
-                </tr>
-            </table>
-            
-            <h2>技能</h2>
-            <table>
-                <tr>
-                    <th>技能名称</th>
-                    <th>技能值</th>
-                </tr>
-        """
-        
-        # 添加技能
-        for skill_name, skill_value in sorted(investigator.skills.items()):
-            html += f"""
-                <tr>
-                    <td>{skill_name}</td>
-                    <td>{skill_value}</td>
-                </tr>
-            """
-        
-        html += f"""
-            </table>
-            
-            <h2>武器</h2>
-            <table>
-                <tr>
-                    <th>名称</th>
-                    <th>数量</th>
-                    <th>伤害/效果</th>
-                    <th>射程/范围</th>
-                </tr>
-        """
-        
-        # 添加武器
-        for equipment in investigator.equipment:
-            if equipment.get("damage"):
-                html += f"""
-                    <tr>
-                        <td>{equipment['name']}</td>
-                        <td>{equipment['quantity']}</td>
-                        <td>{equipment['damage']}</td>
-                        <td>{equipment['range']}</td>
-                    </tr>
-                """
-        
-        html += f"""
-            </table>
-            
-            <h2>装备</h2>
-            <table>
-                <tr>
-                    <th>名称</th>
-                    <th>数量</th>
-                    <th>效果</th>
-                    <th>范围</th>
-                </tr>
-        """
-        
-        # 添加装备
-        for equipment in investigator.equipment:
-            if not equipment.get("damage"):
-                html += f"""
-                    <tr>
-                        <td>{equipment['name']}</td>
-                        <td>{equipment['quantity']}</td>
-                        <td>{equipment['damage']}</td>
-                        <td>{equipment['range']}</td>
-                    </tr>
-                """
-        
-        html += f"""
-            </table>
-            
-            <h2>财产</h2>
-            <p><strong>现金:</strong> {investigator.cash}</p>
-            <p><strong>资产:</strong> {investigator.assets}</p>
-            
-            <h2>背景</h2>
-            <p><strong>个人描述:</strong> {investigator.personal_description}</p>
-            <p><strong>思想信念:</strong> {investigator.ideology}</p>
-            <p><strong>重要之人:</strong> {investigator.significant_people}</p>
-            <p><strong>意义非凡之地:</strong> {investigator.meaningful_locations}</p>
-            <p><strong>宝贵之物:</strong> {investigator.treasured_possessions}</p>
-            <p><strong>特质:</strong> {investigator.traits}</p>
-        </body>
-        </html>
-        """
+        # 构建HTML内容（与批量导出使用同一模板）
+        html = render_sheet(investigator, "html")
         
         # 设置HTML内容
         document.setHtml(html)
@@ -14,12 +14,16 @@ from core.skill_viewer import SkillViewer
 from core.skills import Skills
 from core.investigator import Investigator
 
-def show_language_skill_info():
-    """显示语言技能信息"""
+def show_language_skill_info(skills):
+    """显示语言技能信息
+    
+    Args:
+        skills: 已加载的Skills对象
+    """
     print("\n===== 语言技能系统信息 =====\n")
     
     # 创建技能查看器
-    skill_viewer = SkillViewer()
+    skill_viewer = SkillViewer(skills=skills)
     
     # 获取语言技能信息
     language_info = skill_viewer.get_skill_description("语言")
@@ -58,13 +62,15 @@ def show_language_skill_info():
     print("- 50%：可以进行流畅的交流。")
     print("- 75%：可以将这门语言说得像是本地人一样。")
 
-def test_language_skill_transfer():
-    """测试语言技能转移规则"""
+def test_language_skill_transfer(skills):
+    """测试语言技能转移规则
+    
+    Args:
+        skills: 已加载的Skills对象（加载后其语系图用于技能转移）
+    """
     print("\n===== 语言技能转移规则测试 =====\n")
     
-    # 创建技能查看器和调查员
-    skills = Skills()
-    skills.load_skills("data/skills.json")
+    # 创建调查员
     investigator = Investigator()
     
     # 设置初始语言技能
@@ -128,10 +134,14 @@ def main():
     # 解析参数
     args = parser.parse_args()
     
+    # 技能数据由共享的数据目录加载器读取，两个功能共用同一个Skills对象
+    skills = Skills()
+    skills.load_skills("data/skills.json")
+    
     if args.action == "info":
-        show_language_skill_info()
+        show_language_skill_info(skills)
     elif args.action == "test":
-        test_language_skill_transfer()
+        test_language_skill_transfer(skills)
     else:
         parser.print_help()
 
@@ -27,6 +27,7 @@ from core.generator import InvestigatorGenerator
 
 # 导入工具
 from utils.file_handler import FileHandler
+from utils.library import InvestigatorLibrary
 
 # 导入GUI组件
 from gui.main_window import MainWindow
@@ -109,10 +110,19 @@ def main():
         print("创建文件处理器...")
         file_handler = FileHandler()
         
+        # 打开调查员库索引
+        print("打开调查员库索引...")
+        library = None
+        try:
+            library = InvestigatorLibrary(config.library_path)
+            print(f"调查员库中有 {len(library)} 名调查员")
+        except Exception as e:
+            print(f"打开调查员库索引失败: {e}")
+        
         # 创建主窗口
         print("创建主窗口...")
         try:
-            window = MainWindow(config, investigator_generator, occupations, skills, backgrounds, file_handler)
+            window = MainWindow(config, investigator_generator, occupations, skills, backgrounds, file_handler, library)
             print("主窗口创建成功，准备显示...")
             window.show()
             
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+角色卡批量导出工具
+
+一个命令行工具，把调查员文件（.json、.jsonl、.jsonl.gz、.cocarch）或随机生成的调查员
+批量导出为文本、HTML或PDF角色卡，写入一个目录或一个zip文件；
+PDF格式且输出文件以.pdf结尾时，所有角色卡写入同一个多页PDF。
+"""
+
+import sys
+import argparse
+import time
+from core.sheets import SHEET_FORMATS, DEFAULT_CHUNK_SIZE, export_sheets, export_generated_sheets
+from core.pdf_sheet import write_pdf
+from core.simulation import create_generator
+from utils.file_handler import FileHandler
+
+def load_investigators(paths):
+    """读取命令行中给出的调查员文件"""
+    investigators = []
+    for path in paths:
+        if path.endswith(".json"):
+            investigator = FileHandler.load_investigator(path)
+            if investigator is None:
+                raise ValueError(f"无法读取调查员文件: {path}")
+            investigators.append(investigator)
+        elif path.endswith(".cocarch"):
+            loaded = FileHandler.load_from_archive(path)
+            if loaded is None:
+                raise ValueError(f"无法读取归档文件: {path}")
+            investigators.extend(loaded)
+        else:
+            investigators.extend(FileHandler.iter_investigators(path))
+    return investigators
+
+def export_single_pdf(args, progress):
+    """把所有角色卡写入同一个PDF文件，返回(角色卡数量, 页数, 耗时)"""
+    if args.inputs:
+        investigators = load_investigators(args.inputs)
+    else:
+        generator = create_generator(args.data_dir)
+        investigators = [generator.generate_investigator(args.seed, i, args.age_group) for i in range(args.count)]
+    start = time.perf_counter()
+    pages = write_pdf(investigators, args.output, progress=lambda done: progress(done, len(investigators)))
+    return len(investigators), pages, time.perf_counter() - start
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="角色卡批量导出工具")
+    parser.add_argument("inputs", nargs="*", help="调查员文件；不指定时随机生成调查员")
+    parser.add_argument("-o", "--output", required=True, help="输出目录，以.zip结尾时写入一个zip文件，PDF格式以.pdf结尾时写入一个PDF文件")
+    parser.add_argument("-f", "--format", choices=sorted(SHEET_FORMATS), default="html", help="角色卡格式")
+    parser.add_argument("-n", "--count", type=int, default=1000, help="随机生成的调查员数量")
+    parser.add_argument("--age-group", default="20-39", help="随机生成的年龄段，如 20-39")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--workers", type=int, default=None, help="工作进程数（默认为CPU核心数）")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="每个任务块的角色卡数量")
+    parser.add_argument("--data-dir", default="data", help="数据目录")
+
+    # 解析参数
+    args = parser.parse_args()
+
+    def show_progress(done, total):
+        print(f"\r已导出 {done}/{total}", end="", flush=True)
+
+    if args.format == "pdf" and args.output.lower().endswith(".pdf"):
+        try:
+            count, pages, elapsed = export_single_pdf(args, show_progress)
+        except Exception as e:
+            print(f"\n导出角色卡失败: {e}")
+            return 1
+        print()
+        print(f"角色卡: {count}，页数: {pages}，耗时: {elapsed:.2f} 秒，{pages / max(elapsed, 1e-9):,.0f} 页/秒")
+        return 0
+
+    try:
+        if args.inputs:
+            investigators = load_investigators(args.inputs)
+            stats = export_sheets(
+                investigators, args.output,
+                sheet_format=args.format,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                progress=show_progress
+            )
+        else:
+            stats = export_generated_sheets(
+                args.count, args.output,
+                sheet_format=args.format,
+                age_group=args.age_group,
+                seed=args.seed,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                data_dir=args.data_dir,
+                progress=show_progress
+            )
+    except Exception as e:
+        print(f"\n导出角色卡失败: {e}")
+        return 1
+    print()
+
+    # 输出结果
+    print(stats.to_text())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
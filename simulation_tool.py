@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+生成统计模拟工具
+
+一个命令行工具，批量生成随机调查员并输出统计报告，用于调整房规。
+"""
+
+import sys
+import argparse
+from core.simulation import run_simulation, write_report
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="调查员生成统计模拟工具")
+    parser.add_argument("-n", "--count", type=int, default=100000, help="生成的调查员数量")
+    parser.add_argument("--age-group", default="20-39", help="年龄段，如 20-39")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--workers", type=int, default=None, help="工作进程数（默认为CPU核心数）")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="每个任务块的调查员数量")
+    parser.add_argument("--data-dir", default="data", help="数据目录")
+    parser.add_argument("--rules", default=None, help="规则变体名称（见数据目录下的rules.json，默认使用其中的默认变体）")
+    parser.add_argument("-o", "--output", help="报告输出路径（.json为完整统计，其它为文本摘要）")
+
+    # 解析参数
+    args = parser.parse_args()
+
+    def show_progress(done, total):
+        print(f"\r已完成 {done}/{total}", end="", flush=True)
+
+    # 运行模拟
+    stats = run_simulation(
+        args.count,
+        age_group=args.age_group,
+        seed=args.seed,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        data_dir=args.data_dir,
+        progress=show_progress,
+        rule_variant=args.rules
+    )
+    print()
+
+    # 输出结果
+    print(stats.to_text())
+
+    if args.output:
+        if write_report(stats, args.output):
+            print(f"\n报告已写入: {args.output}")
+        else:
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
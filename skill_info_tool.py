@@ -10,6 +10,7 @@
 import sys
 import argparse
 from core.skill_viewer import SkillViewer
+from core.skills import Skills
 
 def main():
     """主函数"""
@@ -34,8 +35,10 @@ def main():
     # 解析参数
     args = parser.parse_args()
     
-    # 创建技能查看器
-    skill_viewer = SkillViewer()
+    # 创建技能查看器（技能数据由共享的数据目录加载器读取）
+    skills = Skills()
+    skills.load_skills("data/skills.json")
+    skill_viewer = SkillViewer(skills=skills)
     
     # 处理命令
     if args.command == "skill":
@@ -0,0 +1,983 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+调查员列式归档模块
+
+把大量调查员保存在一个文件中，按列存储，代替每名调查员一个缩进JSON文件。
+
+文件结构（小端序）：
+- 文件头（16字节）：魔数 b"COCARCH\\0"、格式版本(uint32)、保留(uint32)
+- 若干数据块，每次追加写入一个或多个数据块：
+  - 块头（16字节）：b"CBLK"、块描述长度(uint32)、块数据长度(uint64)
+  - 块描述：UTF-8 JSON，记录数量、列名和各段偏移，补齐到8字节
+  - 块数据，各段均按8字节对齐：
+    - 整数字段：每个字段一列int32
+    - 属性：每个属性一列int16
+    - 技能：每个技能（以及技能专攻）一列int16，缺失为-32768
+    - 技能形状：每行一个uint32形状编号，形状表（uint32偏移数组和uint16列号）记录
+      该行技能在块中的列和顺序，解码时整块按列取值，不必逐行查找缺失值
+    - 字符串字段：每个字段一列uint32，为字符串表中的编号
+    - 字符串表：uint32偏移数组和UTF-8数据，块内相同的字符串只保存一次
+
+无法按列保存的字段（类型不符、数值越界、手动修改过的半值/五分之一值、物品列表等）
+以JSON保存在额外字段中，读取时覆盖列中的值，因此任何调查员都能原样读回。
+
+记录编号按追加顺序从0开始连续编号。打开文件时只读取各块的块头，
+按编号读取时只解码所在的数据块（最近使用的块会被缓存）。
+"""
+
+import os
+import json
+import struct
+from array import array
+from itertools import chain, repeat
+from operator import itemgetter, floordiv
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖
+    np = None
+
+from core.investigator import Investigator
+
+# 文件头
+ARCHIVE_MAGIC = b"COCARCH\0"
+ARCHIVE_VERSION = 1
+FILE_HEADER = struct.Struct("<8sII")
+
+# 块头
+BLOCK_MAGIC = b"CBLK"
+BLOCK_HEADER = struct.Struct("<4sIQ")
+
+# 每个数据块最多包含的记录数
+DEFAULT_BLOCK_SIZE = 4096
+
+# int16列中表示缺失的值
+MISSING = -32768
+
+# 技能专攻列名中主技能与专攻名称的分隔符
+SPECIALIZATION_SEPARATOR = "\x1f"
+
+# 列表型字符串字段中各项的分隔符
+LIST_SEPARATOR = "\x1f"
+
+# 按int32列保存的字段
+INT_FIELDS = (
+    "age", "hp", "mp", "san", "armor", "build", "mov", "cash",
+    "occupation_skill_points", "occupation_skill_points_allocated",
+    "interest_skill_points", "interest_skill_points_allocated"
+)
+
+# 按字符串表保存的字段
+STRING_FIELDS = (
+    "name", "player", "occupation", "gender", "residence", "birthplace", "db",
+    "personal_description", "ideology", "significant_people", "meaningful_locations",
+    "treasured_possessions", "traits", "injuries_scars", "phobias_manias",
+    "arcane_tomes_spells", "background_story", "assets", "spending_level"
+)
+
+# 按分隔符拼接后保存在字符串表中的列表字段
+LIST_FIELDS = ("occupation_skills",)
+
+# 额外字段（JSON）在字符串字段中的名称
+EXTRA_FIELD = "_extra"
+
+# 不在列中保存、为空时也不写入额外字段的字段及其默认值
+EXTRA_DEFAULTS = {
+    "file_path": "",
+    "equipment": [],
+    "items": [],
+    "weapons": []
+}
+
+# 单个值的解包格式
+VALUE_FORMATS = {"h": struct.Struct("<h"), "H": struct.Struct("<H"), "i": struct.Struct("<i"), "I": struct.Struct("<I")}
+
+INT32_RANGE = (-2 ** 31, 2 ** 31 - 1)
+INT16_RANGE = (MISSING + 1, 2 ** 15 - 1)
+
+# 按列保存时允许的值类型（不含bool等子类）
+INT_TYPES = {int}
+STR_TYPES = {str}
+
+# Investigator的实例属性（与to_dict()的键相同）
+RECORD_FIELDS = frozenset(Investigator().to_dict())
+
+def _to_investigator(data):
+    """由记录字典创建调查员，字典直接作为实例属性（额外字段中的其他键与from_dict一样被忽略）"""
+    investigator = Investigator.__new__(Investigator)
+    if len(data) != len(RECORD_FIELDS):
+        data = {field: value for field, value in data.items() if field in RECORD_FIELDS}
+    investigator.__dict__.update(data)
+    return investigator
+
+def _is_int(value, value_range):
+    """判断是否为指定范围内的整数（不含bool）"""
+    return type(value) is int and value_range[0] <= value <= value_range[1]
+
+def _align(size):
+    """补齐到8字节"""
+    return (size + 7) & ~7
+
+def _int_column(typecode, values):
+    """把整数列表打包为小端字节串"""
+    column = array(typecode, values)
+    if struct.pack("=h", 1) != struct.pack("<h", 1):
+        column.byteswap()
+    return column.tobytes()
+
+def _read_column(buffer, offset, typecode, count):
+    """从缓冲区读取一列整数（有NumPy时返回零拷贝数组）"""
+    if np is not None:
+        dtype = {"h": "<i2", "H": "<u2", "i": "<i4", "I": "<u4"}[typecode]
+        return np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+    column = array(typecode)
+    column.frombytes(bytes(buffer[offset:offset + count * column.itemsize]))
+    if struct.pack("=h", 1) != struct.pack("<h", 1):
+        column.byteswap()
+    return column
+
+def _read_array(buffer, offset, typecode, size):
+    """一次读取size个整数为array（按列连续排列）"""
+    section = array(typecode)
+    section.frombytes(bytes(buffer[offset:offset + size * section.itemsize]))
+    if struct.pack("=h", 1) != struct.pack("<h", 1):
+        section.byteswap()
+    return section
+
+def _read_section(buffer, offset, typecode, columns, count):
+    """一次读取一段中连续的columns列，返回各列的Python整数列表"""
+    values = _read_array(buffer, offset, typecode, columns * count).tolist()
+    return [values[i * count:(i + 1) * count] for i in range(columns)]
+
+def _fits_int16(values):
+    """是否全部为int16范围内的整数（不含bool和表示缺失的MISSING），与逐项_is_int判断的结果相同"""
+    try:
+        array("h", values)
+    except (TypeError, OverflowError):
+        return False
+    return MISSING not in values and set(map(type, values)) <= INT_TYPES
+
+def _fits_int32(values):
+    """是否全部为int32范围内的整数（不含bool）"""
+    try:
+        array("i", values)
+    except (TypeError, OverflowError):
+        return False
+    return set(map(type, values)) <= INT_TYPES
+
+def _getter(indices):
+    """按位置取出多项并总是返回元组的函数（itemgetter只取一项时返回单个值）"""
+    if not indices:
+        return lambda values: ()
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda values: (values[index],)
+    return itemgetter(*indices)
+
+def _flatten_specializations(specializations, column_names):
+    """把技能专攻字典展开为列名和数值；无法按列保存时返回None
+
+    参数:
+        specializations (dict): 技能专攻字典
+        column_names (dict): (主技能, 专攻名称元组)到列名元组的缓存，同一块内共用
+
+    返回:
+        tuple: (列名元组, 数值列表)
+    """
+    if not isinstance(specializations, dict):
+        return None
+    names = ()
+    values = []
+    for main_skill, group in specializations.items():
+        if not isinstance(group, dict) or not group:
+            return None
+        key = (main_skill, tuple(group))
+        group_names = column_names.get(key)
+        if group_names is None:
+            group_names = column_names[key] = tuple(
+                f"{main_skill}{SPECIALIZATION_SEPARATOR}{full_name}" for full_name in key[1]
+            )
+        names += group_names
+        values.extend(group.values())
+    if not _fits_int16(values):
+        return None
+    return names, values
+
+def encode_block(records):
+    """把一组调查员数据字典编码为一个数据块
+
+    每行记录所含技能列的顺序（形状）保存在形状表中，每行保存形状编号，
+    解码时按形状直接取出该行的技能，不必逐列判断缺失值。
+
+    Args:
+        records: Investigator.to_dict()得到的字典列表
+
+    Returns:
+        bytes: 完整的数据块（含块头）
+    """
+    count = len(records)
+    attribute_names = {}
+    shapes = {}
+    column_names = {}
+    rows = []
+
+    for data in records:
+        extra = {}
+
+        attributes = data.get("attributes", {})
+        if isinstance(attributes, dict) and _fits_int16(list(attributes.values())):
+            attribute_names.update(dict.fromkeys(attributes))
+            # 半值和五分之一值与属性值一致时不保存
+            if data.get("attribute_half") != {k: v // 2 for k, v in attributes.items()}:
+                extra["attribute_half"] = data.get("attribute_half", {})
+            if data.get("attribute_fifth") != {k: v // 5 for k, v in attributes.items()}:
+                extra["attribute_fifth"] = data.get("attribute_fifth", {})
+        else:
+            extra["attributes"] = attributes
+            extra["attribute_half"] = data.get("attribute_half", {})
+            extra["attribute_fifth"] = data.get("attribute_fifth", {})
+            attributes = {}
+
+        skills = data.get("skills", {})
+        if isinstance(skills, dict) and _fits_int16(list(skills.values())):
+            shape = tuple(skills)
+            skill_values = list(skills.values())
+        else:
+            extra["skills"] = skills
+            shape = ()
+            skill_values = []
+
+        specializations = _flatten_specializations(data.get("skill_specializations", {}), column_names)
+        if specializations is None:
+            extra["skill_specializations"] = data.get("skill_specializations", {})
+        else:
+            shape += specializations[0]
+            skill_values.extend(specializations[1])
+        # 末尾的MISSING供形状中没有的列取值
+        skill_values.append(MISSING)
+
+        ints = [data.get(field, 0) for field in INT_FIELDS]
+        if not _fits_int32(ints):
+            for i, field in enumerate(INT_FIELDS):
+                if not _is_int(ints[i], INT32_RANGE):
+                    extra[field] = ints[i]
+                    ints[i] = 0
+
+        strings = [data.get(field, "") for field in STRING_FIELDS]
+        if not set(map(type, strings)) <= STR_TYPES:
+            for i, field in enumerate(STRING_FIELDS):
+                if not isinstance(strings[i], str):
+                    extra[field] = strings[i]
+                    strings[i] = ""
+
+        for field in LIST_FIELDS:
+            value = data.get(field, [])
+            # [""]拼接后与空列表相同，放入额外字段
+            if isinstance(value, list) and value != [""] \
+                    and all(isinstance(item, str) and LIST_SEPARATOR not in item for item in value):
+                strings.append(LIST_SEPARATOR.join(value))
+            else:
+                strings.append("")
+                extra[field] = value
+
+        for field, default in EXTRA_DEFAULTS.items():
+            value = data.get(field, default)
+            if value != default:
+                extra[field] = value
+
+        strings.append(json.dumps(extra, ensure_ascii=False, separators=(",", ":")) if extra else "")
+        rows.append((attributes, shapes.setdefault(shape, len(shapes)), skill_values, ints, strings))
+
+    attribute_names = list(attribute_names)
+    skill_names = {}
+    for shape in shapes:
+        skill_names.update(dict.fromkeys(shape))
+    skill_names = list(skill_names)
+    string_fields = list(STRING_FIELDS) + list(LIST_FIELDS) + [EXTRA_FIELD]
+
+    # 每种形状把该行的技能值按块的列顺序排好（没有的列取末尾的MISSING），整块再转置为列
+    skill_rows = []
+    if skill_names:
+        spreaders = []
+        for shape in shapes:
+            positions = {name: i for i, name in enumerate(shape)}
+            spreaders.append(_getter([positions.get(name, len(shape)) for name in skill_names]))
+        skill_rows = [spreaders[shape_id](skill_values) for _, shape_id, skill_values, _, _ in rows]
+    column_index = {name: i for i, name in enumerate(skill_names)}
+    shape_columns = [[column_index[name] for name in shape] for shape in shapes]
+
+    attribute_key = tuple(attribute_names)
+    attribute_rows = [
+        tuple(attributes.values()) if tuple(attributes) == attribute_key
+        else tuple(attributes.get(name, MISSING) for name in attribute_names)
+        for attributes, _, _, _, _ in rows
+    ]
+
+    # 字符串表（块内去重，按行、按字段的出现顺序编号）
+    table = dict.fromkeys(chain(("",), *(row[4] for row in rows)))
+    string_index = {value: i for i, value in enumerate(table)}
+    string_ids = [list(map(string_index.__getitem__, column)) for column in zip(*(row[4] for row in rows))] \
+        if rows else [[] for _ in string_fields]
+
+    encoded_strings = [value.encode("utf-8") for value in table]
+    table_offsets = [0]
+    for encoded in encoded_strings:
+        table_offsets.append(table_offsets[-1] + len(encoded))
+    shape_offsets = [0]
+    for columns in shape_columns:
+        shape_offsets.append(shape_offsets[-1] + len(columns))
+
+    sections = []
+    offset = 0
+
+    def add_section(payload):
+        nonlocal offset
+        start = offset
+        padded = _align(len(payload))
+        sections.append(payload + b"\0" * (padded - len(payload)))
+        offset += padded
+        return start
+
+    layout = {
+        "ints": add_section(b"".join(_int_column("i", column) for column in zip(*(row[3] for row in rows)))),
+        "attributes": add_section(b"".join(_int_column("h", column) for column in zip(*attribute_rows))),
+        "skills": add_section(b"".join(_int_column("h", column) for column in zip(*skill_rows))),
+        "strings": add_section(b"".join(_int_column("I", ids) for ids in string_ids)),
+        "table_offsets": add_section(_int_column("I", table_offsets)),
+        "table_data": add_section(b"".join(encoded_strings)),
+        "shapes": add_section(_int_column("I", [row[1] for row in rows])),
+        "shape_offsets": add_section(_int_column("I", shape_offsets)),
+        "shape_columns": add_section(_int_column("H", chain.from_iterable(shape_columns)))
+    }
+
+    description = json.dumps({
+        "count": count,
+        "int_fields": list(INT_FIELDS),
+        "attributes": attribute_names,
+        "skills": skill_names,
+        "string_fields": string_fields,
+        "table_size": len(table),
+        "shape_count": len(shapes),
+        "layout": layout
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    description += b" " * (_align(len(description)) - len(description))
+
+    body = b"".join(sections)
+    return BLOCK_HEADER.pack(BLOCK_MAGIC, len(description), len(body)) + description + body
+
+class _RowValues:
+    """数据块中某一行的技能值，按列号逐个读取，供形状的取值函数使用"""
+
+    __slots__ = ("_block", "_row")
+
+    def __init__(self, block, row):
+        self._block = block
+        self._row = row
+
+    def __getitem__(self, index):
+        return self._block._value("skills", index, "h", self._row)
+
+class ArchiveBlock:
+    """已解码的数据块，按列访问"""
+
+    def __init__(self, description, body, start_id):
+        """初始化数据块
+
+        参数:
+            description (dict): 块描述
+            body (bytes|memoryview): 块数据
+            start_id (int): 块中第一条记录的编号
+        """
+        self.description = description
+        self.body = body
+        self.start_id = start_id
+        self.count = description["count"]
+        self.attribute_names = description["attributes"]
+        self.skill_names = description["skills"]
+        self._attribute_index = {name: i for i, name in enumerate(self.attribute_names)}
+        self._skill_index = {name: i for i, name in enumerate(self.skill_names)}
+        self._int_index = {name: i for i, name in enumerate(description["int_fields"])}
+        self._string_index = {name: i for i, name in enumerate(description["string_fields"])}
+        # 旧版本写入的数据块没有形状表
+        self.shape_count = description.get("shape_count")
+        self._offsets = None
+        self._shape_offsets = None
+        self._layouts = {}
+
+    def __len__(self):
+        return self.count
+
+    def _column(self, section, index, typecode):
+        """读取某一段中的第index列"""
+        itemsize = 2 if typecode == "h" else 4
+        offset = self.description["layout"][section] + index * self.count * itemsize
+        return _read_column(self.body, offset, typecode, self.count)
+
+    def _value(self, section, index, typecode, row):
+        """读取某一段中第index列第row行的单个值"""
+        value_format = VALUE_FORMATS[typecode]
+        offset = self.description["layout"][section] + (index * self.count + row) * value_format.size
+        return value_format.unpack_from(self.body, offset)[0]
+
+    def int_column(self, field):
+        """整数字段列（如"age"、"hp"）"""
+        return self._column("ints", self._int_index[field], "i")
+
+    def attribute_column(self, name):
+        """属性列，块中没有该属性时返回None"""
+        index = self._attribute_index.get(name)
+        return None if index is None else self._column("attributes", index, "h")
+
+    def skill_column(self, name):
+        """技能列（缺失为MISSING），块中没有该技能时返回None"""
+        index = self._skill_index.get(name)
+        return None if index is None else self._column("skills", index, "h")
+
+    def _table_offsets(self):
+        """字符串表的偏移数组"""
+        if self._offsets is None:
+            size = self.description["table_size"]
+            self._offsets = _read_column(self.body, self.description["layout"]["table_offsets"], "I", size + 1)
+        return self._offsets
+
+    def string(self, string_id):
+        """按编号读取字符串表中的字符串"""
+        offsets = self._table_offsets()
+        start = self.description["layout"]["table_data"]
+        return bytes(self.body[start + int(offsets[string_id]):start + int(offsets[string_id + 1])]).decode("utf-8")
+
+    def string_column(self, field):
+        """字符串字段列（字符串列表）"""
+        decoded = {}
+        column = []
+        for string_id in self._column("strings", self._string_index[field], "I"):
+            string_id = int(string_id)
+            value = decoded.get(string_id)
+            if value is None:
+                value = decoded[string_id] = self.string(string_id)
+            column.append(value)
+        return column
+
+    def row_string(self, row, field):
+        """读取第row行的字符串字段（列表字段返回列表）"""
+        value = self.string(self._value("strings", self._string_index[field], "I", row))
+        if field in LIST_FIELDS:
+            return value.split(LIST_SEPARATOR) if value else []
+        return value
+
+    def row_int(self, row, field):
+        """读取第row行的整数字段"""
+        return self._value("ints", self._int_index[field], "i", row)
+
+    def row_attributes(self, row):
+        """读取第row行的属性字典"""
+        attributes = {}
+        for index, name in enumerate(self.attribute_names):
+            value = self._value("attributes", index, "h", row)
+            if value != MISSING:
+                attributes[name] = value
+        return attributes
+
+    def row_skills(self, row):
+        """读取第row行的技能
+
+        返回:
+            tuple: (技能字典, 技能专攻字典)
+        """
+        if self.shape_count is not None:
+            names, getter, groups = self._shape(self._value("shapes", 0, "I", row))
+            values = _RowValues(self, row)
+            return (dict(zip(names, getter(values))),
+                    {main_skill: dict(zip(fulls, group_getter(values))) for main_skill, fulls, group_getter in groups})
+
+        skills = {}
+        specializations = {}
+        for index, name in enumerate(self.skill_names):
+            value = self._value("skills", index, "h", row)
+            if value == MISSING:
+                continue
+            if SPECIALIZATION_SEPARATOR in name:
+                main_skill, full_name = name.split(SPECIALIZATION_SEPARATOR, 1)
+                specializations.setdefault(main_skill, {})[full_name] = value
+            else:
+                skills[name] = value
+        return skills, specializations
+
+    def row_extra(self, row):
+        """读取第row行的额外字段（不能按列保存的字段）"""
+        extra = self.row_string(row, EXTRA_FIELD)
+        return json.loads(extra) if extra else {}
+
+    def record(self, row):
+        """解码块内第row条记录为调查员数据字典
+
+        参数:
+            row (int): 块内行号
+
+        返回:
+            dict: 与Investigator.to_dict()格式相同的字典
+        """
+        data = {}
+        for field in self._string_index:
+            if field != EXTRA_FIELD:
+                data[field] = self.row_string(row, field)
+        for field in self._int_index:
+            data[field] = self.row_int(row, field)
+
+        attributes = self.row_attributes(row)
+        data["attributes"] = attributes
+        data["attribute_half"] = {name: value // 2 for name, value in attributes.items()}
+        data["attribute_fifth"] = {name: value // 5 for name, value in attributes.items()}
+        data["skills"], data["skill_specializations"] = self.row_skills(row)
+
+        for field, default in EXTRA_DEFAULTS.items():
+            data[field] = list(default) if isinstance(default, list) else default
+
+        data.update(self.row_extra(row))
+        return data
+
+    def _section(self, section, columns, typecode):
+        """一次解码某一段的全部列"""
+        return _read_section(self.body, self.description["layout"][section], typecode, columns, self.count)
+
+    def strings(self):
+        """一次解码字符串表中的全部字符串"""
+        offsets = _read_section(self.body, self.description["layout"]["table_offsets"], "I",
+                                1, self.description["table_size"] + 1)[0]
+        start = self.description["layout"]["table_data"]
+        data = bytes(self.body[start:start + offsets[-1]])
+        return [data[begin:end].decode("utf-8") for begin, end in zip(offsets, offsets[1:])]
+
+    def _shape_table(self):
+        """形状表的偏移数组"""
+        if self._shape_offsets is None:
+            self._shape_offsets = _read_section(self.body, self.description["layout"]["shape_offsets"], "I",
+                                                1, self.shape_count + 1)[0]
+        return self._shape_offsets
+
+    def _shape(self, shape_id):
+        """一种形状的解码方式（见_shape_layouts），只读取该形状的列号"""
+        layout = self._layouts.get(shape_id)
+        if layout is None:
+            offsets = self._shape_table()
+            begin = offsets[shape_id]
+            columns = _read_section(self.body, self.description["layout"]["shape_columns"] + begin * 2, "H",
+                                    1, offsets[shape_id + 1] - begin)[0]
+            layout = self._layouts[shape_id] = self._shape_layout(columns)
+        return layout
+
+    def _shape_layouts(self):
+        """全部形状的解码方式
+
+        返回:
+            list: 每种形状为(技能名称元组, 取值函数, ((主技能, 专攻名称元组, 取值函数), ...))，
+                取值函数从该行按列排列的技能值中取出对应的值
+        """
+        if len(self._layouts) < self.shape_count:
+            offsets = self._shape_table()
+            columns = _read_section(self.body, self.description["layout"]["shape_columns"], "H", 1, offsets[-1])[0]
+            for shape_id, (begin, end) in enumerate(zip(offsets, offsets[1:])):
+                if shape_id not in self._layouts:
+                    self._layouts[shape_id] = self._shape_layout(columns[begin:end])
+        return [self._layouts[shape_id] for shape_id in range(self.shape_count)]
+
+    def _shape_layout(self, columns):
+        """由一种形状的列号得到其解码方式（见_shape_layouts）"""
+        plain = []
+        groups = {}
+        for index in columns:
+            name = self.skill_names[index]
+            if SPECIALIZATION_SEPARATOR in name:
+                main_skill, full_name = name.split(SPECIALIZATION_SEPARATOR, 1)
+                groups.setdefault(main_skill, []).append((index, full_name))
+            else:
+                plain.append(index)
+        return (
+            tuple(self.skill_names[index] for index in plain),
+            _getter(plain),
+            tuple((main_skill, tuple(name for _, name in items), _getter([index for index, _ in items]))
+                  for main_skill, items in groups.items())
+        )
+
+    def records(self):
+        """按顺序解码块内全部记录
+
+        每一列只解码一次（每段一次array.frombytes），再按行组合为字典，
+        与逐条调用record()的结果相同。
+        """
+        if self.shape_count is not None:
+            return self._decode_rows(dict)
+        return self._unshaped_records()
+
+    def investigators(self):
+        """按顺序解码块内全部调查员
+
+        与records()一样按列解码，每行的字段直接写入新调查员的实例属性，不经过数据字典和from_dict。
+        """
+        if self.shape_count is not None:
+            return self._decode_rows(None)
+        return [_to_investigator(data) for data in self._unshaped_records()]
+
+    def _decode_rows(self, record_type):
+        """按列解码有形状表的数据块
+
+        参数:
+            record_type: 为dict时返回数据字典，为None时返回Investigator对象
+        """
+        count = self.count
+        if not count:
+            return []
+
+        int_fields = list(self._int_index)
+        string_fields = [field for field in self._string_index if field != EXTRA_FIELD]
+        string_ids = self._section("strings", len(self._string_index), "I")
+        table = self.strings()
+
+        # 字符串、整数和默认的标量字段合成一行，每行一次写入
+        fields = list(string_fields)
+        columns = []
+        for field in string_fields:
+            column = list(map(table.__getitem__, string_ids[self._string_index[field]]))
+            if field in LIST_FIELDS:
+                column = [value.split(LIST_SEPARATOR) if value else [] for value in column]
+            columns.append(column)
+        fields.extend(int_fields)
+        columns.extend(self._section("ints", len(int_fields), "i"))
+        list_defaults = []
+        for field, default in EXTRA_DEFAULTS.items():
+            if isinstance(default, list):
+                list_defaults.append(field)
+            else:
+                fields.append(field)
+                columns.append(repeat(default, count))
+        extras = list(map(table.__getitem__, string_ids[self._string_index[EXTRA_FIELD]]))
+
+        attribute_names = self.attribute_names
+        attributes = self._section("attributes", len(attribute_names), "h")
+        attributes_dense = all(MISSING not in column for column in attributes)
+        if attributes and attributes_dense:
+            # 半值和五分之一值按列计算
+            attribute_rows = zip(*attributes)
+            half_rows = zip(*[list(map(floordiv, column, repeat(2))) for column in attributes])
+            fifth_rows = zip(*[list(map(floordiv, column, repeat(5))) for column in attributes])
+        else:
+            attribute_rows = zip(*attributes) if attributes else [()] * count
+            half_rows = repeat(None, count)
+            fifth_rows = repeat(None, count)
+
+        # 技能列多、每行只用到其中一部分：按步长切片直接得到每行的array，不转换整段再转置
+        skills = _read_array(self.body, self.description["layout"]["skills"], "h", len(self.skill_names) * count)
+        skill_rows = [skills[row::count] for row in range(count)]
+        layouts = self._shape_layouts()
+        shapes = self._section("shapes", 1, "I")[0]
+
+        results = []
+        for row, attribute_row, half_row, fifth_row, skill_row, shape, extra in zip(
+                zip(*columns), attribute_rows, half_rows, fifth_rows, skill_rows, shapes, extras):
+            if record_type is None:
+                investigator = Investigator.__new__(Investigator)
+                data = investigator.__dict__
+                results.append(investigator)
+            else:
+                data = record_type()
+                results.append(data)
+            data.update(zip(fields, row))
+            for field in list_defaults:
+                data[field] = []
+
+            if half_row is not None:
+                data["attributes"] = dict(zip(attribute_names, attribute_row))
+                data["attribute_half"] = dict(zip(attribute_names, half_row))
+                data["attribute_fifth"] = dict(zip(attribute_names, fifth_row))
+            else:
+                row_attributes = {name: value for name, value in zip(attribute_names, attribute_row) if value != MISSING}
+                data["attributes"] = row_attributes
+                data["attribute_half"] = {name: value // 2 for name, value in row_attributes.items()}
+                data["attribute_fifth"] = {name: value // 5 for name, value in row_attributes.items()}
+
+            names, getter, groups = layouts[shape]
+            data["skills"] = dict(zip(names, getter(skill_row)))
+            data["skill_specializations"] = {
+                main_skill: dict(zip(fulls, group_getter(skill_row))) for main_skill, fulls, group_getter in groups
+            }
+
+            if extra:
+                extra = json.loads(extra)
+                if record_type is None and not extra.keys() <= RECORD_FIELDS:
+                    extra = {field: value for field, value in extra.items() if field in RECORD_FIELDS}
+                data.update(extra)
+        return results
+
+    def _unshaped_records(self):
+        """按列解码旧版本写入的、没有形状表的数据块（技能按块的列顺序排列）"""
+        count = self.count
+        if not count:
+            return []
+
+        int_fields = list(self._int_index)
+        string_fields = [field for field in self._string_index if field != EXTRA_FIELD]
+        list_fields = {field for field in string_fields if field in LIST_FIELDS}
+        extra_index = self._string_index[EXTRA_FIELD]
+        attribute_names = self.attribute_names
+
+        ints = self._section("ints", len(int_fields), "i")
+        attributes = self._section("attributes", len(attribute_names), "h")
+        skills = self._section("skills", len(self.skill_names), "h")
+        string_ids = self._section("strings", len(self._string_index), "I")
+        table = self.strings()
+
+        # 技能列分组：普通技能和各主技能的专攻；块内没有缺失值的列直接按位置组成字典，
+        # 有缺失值的列逐项过滤
+        groups = {}
+        for index, name in enumerate(self.skill_names):
+            main_skill, _, full_name = name.rpartition(SPECIALIZATION_SEPARATOR)
+            groups.setdefault(main_skill, []).append((index, full_name))
+        skill_groups = []
+        for main_skill, columns in groups.items():
+            dense = [(index, name) for index, name in columns if MISSING not in skills[index]]
+            sparse = [(index, name) for index, name in columns if MISSING in skills[index]]
+            skill_groups.append((
+                main_skill,
+                tuple(name for _, name in dense),
+                itemgetter(*[index for index, _ in dense]) if len(dense) > 1 else None,
+                dense[0][0] if len(dense) == 1 else None,
+                sparse
+            ))
+
+        # 字符串列：编号换成字符串（列表字段拆分为列表）
+        string_columns = []
+        for field in string_fields:
+            column = [table[string_id] for string_id in string_ids[self._string_index[field]]]
+            if field in list_fields:
+                column = [value.split(LIST_SEPARATOR) if value else [] for value in column]
+            string_columns.append(column)
+        extras = [table[string_id] for string_id in string_ids[extra_index]]
+
+        int_rows = zip(*ints) if ints else [()] * count
+        attribute_rows = zip(*attributes) if attributes else [()] * count
+        skill_rows = zip(*skills) if skills else [()] * count
+        string_rows = zip(*string_columns) if string_columns else [()] * count
+        attributes_dense = all(MISSING not in column for column in attributes)
+        list_defaults = [field for field, default in EXTRA_DEFAULTS.items() if isinstance(default, list)]
+        scalar_defaults = {field: default for field, default in EXTRA_DEFAULTS.items() if not isinstance(default, list)}
+
+        records = []
+        for int_row, attribute_row, skill_row, string_row, extra in zip(
+                int_rows, attribute_rows, skill_rows, string_rows, extras):
+            data = dict(zip(string_fields, string_row))
+            data.update(zip(int_fields, int_row))
+
+            if attributes_dense:
+                row_attributes = dict(zip(attribute_names, attribute_row))
+            else:
+                row_attributes = {name: value for name, value in zip(attribute_names, attribute_row) if value != MISSING}
+            data["attributes"] = row_attributes
+            data["attribute_half"] = {name: value // 2 for name, value in row_attributes.items()}
+            data["attribute_fifth"] = {name: value // 5 for name, value in row_attributes.items()}
+
+            row_skills = None
+            specializations = {}
+            for main_skill, dense_names, dense_getter, dense_index, sparse in skill_groups:
+                if dense_getter is not None:
+                    values = dict(zip(dense_names, dense_getter(skill_row)))
+                elif dense_index is not None:
+                    values = {dense_names[0]: skill_row[dense_index]}
+                else:
+                    values = {}
+                for index, name in sparse:
+                    value = skill_row[index]
+                    if value != MISSING:
+                        values[name] = value
+                if not main_skill:
+                    row_skills = values
+                elif values:
+                    specializations[main_skill] = values
+            data["skills"] = row_skills if row_skills is not None else {}
+            data["skill_specializations"] = specializations
+
+            data.update(scalar_defaults)
+            for field in list_defaults:
+                data[field] = []
+
+            if extra:
+                data.update(json.loads(extra))
+            records.append(data)
+        return records
+
+class InvestigatorArchive:
+    """调查员列式归档文件"""
+
+    def __init__(self, file_path, block_size=DEFAULT_BLOCK_SIZE, cache_blocks=4):
+        """打开归档文件（不存在时在首次追加时创建）
+
+        参数:
+            file_path (str): 文件路径
+            block_size (int): 追加时每个数据块最多包含的记录数
+            cache_blocks (int): 缓存的已解码数据块数量
+        """
+        self.file_path = file_path
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self._blocks = []      # (起始编号, 记录数, 块描述, 块数据偏移, 块数据长度)
+        self._starts = []
+        self._count = 0
+        self._end = FILE_HEADER.size
+        self._cache = {}
+        self._read_index()
+
+    def _read_index(self):
+        """读取文件头和全部块头，建立块索引；忽略末尾未写完的块"""
+        if not os.path.exists(self.file_path):
+            return
+
+        with open(self.file_path, "rb") as f:
+            header = f.read(FILE_HEADER.size)
+            if len(header) < FILE_HEADER.size:
+                raise ValueError(f"不是调查员归档文件: {self.file_path}")
+            magic, version, _ = FILE_HEADER.unpack(header)
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError(f"不是调查员归档文件: {self.file_path}")
+            if version > ARCHIVE_VERSION:
+                raise ValueError(f"不支持的归档版本: {version}")
+
+            file_size = os.fstat(f.fileno()).st_size
+            position = FILE_HEADER.size
+            while position + BLOCK_HEADER.size <= file_size:
+                f.seek(position)
+                magic, description_size, body_size = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+                body_offset = position + BLOCK_HEADER.size + description_size
+                if magic != BLOCK_MAGIC or body_offset + body_size > file_size:
+                    break
+                description = json.loads(f.read(description_size).decode("utf-8"))
+                self._starts.append(self._count)
+                self._blocks.append((self._count, description["count"], description, body_offset, body_size))
+                self._count += description["count"]
+                position = body_offset + body_size
+
+        self._end = position
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def block_count(self):
+        """数据块数量"""
+        return len(self._blocks)
+
+    @property
+    def block_entries(self):
+        """各数据块的位置
+
+        返回:
+            list: [(起始编号, 块描述, 块数据偏移, 块数据长度), ...]
+        """
+        return [(start_id, description, body_offset, body_size)
+                for start_id, _, description, body_offset, body_size in self._blocks]
+
+    def append(self, investigators):
+        """追加调查员
+
+        参数:
+            investigators (iterable): Investigator对象或数据字典
+
+        返回:
+            range: 新追加记录的编号
+        """
+        records = [item.to_dict() if isinstance(item, Investigator) else item for item in investigators]
+        first_id = self._count
+
+        exists = os.path.exists(self.file_path)
+        with open(self.file_path, "r+b" if exists else "wb") as f:
+            if not exists:
+                f.write(FILE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0))
+            # 截掉上次未写完的块
+            f.truncate(self._end)
+            f.seek(self._end)
+
+            for start in range(0, len(records), self.block_size):
+                block = encode_block(records[start:start + self.block_size])
+                f.write(block)
+                magic, description_size, body_size = BLOCK_HEADER.unpack_from(block)
+                description = json.loads(block[BLOCK_HEADER.size:BLOCK_HEADER.size + description_size].decode("utf-8"))
+                self._starts.append(self._count)
+                self._blocks.append((self._count, description["count"], description,
+                                     self._end + BLOCK_HEADER.size + description_size, body_size))
+                self._count += description["count"]
+                self._end += len(block)
+
+        return range(first_id, self._count)
+
+    def _load_block(self, block_index):
+        """读取并缓存一个数据块"""
+        block = self._cache.get(block_index)
+        if block is not None:
+            return block
+
+        start_id, _, description, body_offset, body_size = self._blocks[block_index]
+        with open(self.file_path, "rb") as f:
+            f.seek(body_offset)
+            body = f.read(body_size)
+        block = ArchiveBlock(description, body, start_id)
+
+        if len(self._cache) >= self.cache_blocks:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[block_index] = block
+        return block
+
+    def _locate(self, record_id):
+        """由记录编号得到(块序号, 块内行号)"""
+        if not 0 <= record_id < self._count:
+            raise IndexError(f"记录编号超出范围: {record_id}")
+        block_index = bisect_right(self._starts, record_id) - 1
+        return block_index, record_id - self._starts[block_index]
+
+    def get_dict(self, record_id):
+        """按编号读取调查员数据字典"""
+        block_index, row = self._locate(record_id)
+        return self._load_block(block_index).record(row)
+
+    def get(self, record_id):
+        """按编号读取调查员
+
+        参数:
+            record_id (int): 记录编号
+
+        返回:
+            Investigator: 调查员对象
+        """
+        return _to_investigator(self.get_dict(record_id))
+
+    def blocks(self):
+        """按顺序遍历全部数据块（ArchiveBlock），用于按列的全量扫描"""
+        if not self._blocks:
+            # 文件不存在（或还没有数据块）时不打开文件
+            return
+        with open(self.file_path, "rb") as f:
+            for start_id, _, description, body_offset, body_size in self._blocks:
+                f.seek(body_offset)
+                yield ArchiveBlock(description, f.read(body_size), start_id)
+
+    def scan(self, *skill_names):
+        """全量扫描指定技能列
+
+        参数:
+            *skill_names (str): 技能名称
+
+        返回:
+            迭代器，每个数据块产生(起始编号, {技能名称: 列})，块中没有的技能列为None
+        """
+        for block in self.blocks():
+            yield block.start_id, {name: block.skill_column(name) for name in skill_names}
+
+    def iter_dicts(self):
+        """按编号顺序遍历全部调查员数据字典"""
+        for block in self.blocks():
+            yield from block.records()
+
+    def iter_investigators(self):
+        """按编号顺序遍历全部调查员（逐块按列解码，不经过数据字典）"""
+        for block in self.blocks():
+            yield from block.investigators()
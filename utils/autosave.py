@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自动保存模块
+
+在后台线程中保存正在编辑的调查员，界面线程只需记录哪些字段被修改：
+- 防抖：连续修改时，最后一次修改后等待delay秒才写入；持续修改超过max_delay秒时强制写入一次
+- 脏字段跟踪：每次修改只复制被修改的字段到保存快照中，不在界面线程中序列化整个调查员
+- 原子写入：先写入同目录下的临时文件再替换原文件（见FileHandler.write_json_atomic），
+  崩溃时文件要么是旧内容要么是新内容，不会只写了一半
+- 写入失败时保留待保存的快照，等待delay秒后重试，并通过on_error回调通知界面；
+  flush()和close()在仍有修改没有写入时返回False
+- 统计：写入次数、被合并的修改次数、保存耗时等，见metrics()
+
+用法:
+    autosave = AutosaveEngine(delay=0.5)
+    autosave.mark_dirty(investigator, file_path, ["skills", "interest_skill_points_allocated"])
+    ...
+    if not autosave.close():  # 写入尚未保存的修改并结束后台线程
+        ...  # 有修改没能写入，后台线程仍在运行
+"""
+
+import copy
+import time
+import threading
+
+from utils.file_handler import FileHandler
+
+# 默认防抖时间（秒）
+DEFAULT_DELAY = 0.5
+
+# 持续修改时两次写入之间的最长间隔（秒）
+DEFAULT_MAX_DELAY = 5.0
+
+class _PendingSave:
+    """一个文件的待保存状态"""
+
+    __slots__ = ("snapshot", "first_edit", "last_edit", "edits", "fields", "retry_at")
+
+    def __init__(self, snapshot, now):
+        self.snapshot = snapshot
+        self.first_edit = now
+        self.last_edit = now
+        self.edits = 0
+        self.fields = set()
+        # 写入失败后，在此时间之前不再重试
+        self.retry_at = 0.0
+
+class AutosaveEngine:
+    """防抖的后台自动保存"""
+
+    def __init__(self, delay=DEFAULT_DELAY, max_delay=DEFAULT_MAX_DELAY, library=None, on_error=None):
+        """初始化并启动后台保存线程
+
+        参数:
+            delay (float): 最后一次修改后等待多久写入（秒），写入失败后也等待这么久再重试
+            max_delay (float): 持续修改时最长多久写入一次（秒）
+            library (InvestigatorLibrary): 调查员库索引，可选，写入后更新其中的条目
+            on_error (callable): 写入失败时调用on_error(file_path)，可选；
+                可能在后台线程中调用，同一文件连续失败只通知一次
+        """
+        self.delay = delay
+        self.max_delay = max_delay
+        self.library = library
+        self.on_error = on_error
+
+        self._condition = threading.Condition()
+        # 写入锁保证同一时间只有一次写入，并且按取出快照的先后顺序写入
+        self._write_lock = threading.Lock()
+        self._pending = {}
+        self._snapshots = {}
+        self._failed = set()
+        self._closed = False
+
+        self._edits = 0
+        self._writes = 0
+        self._failures = 0
+        self._coalesced = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._last_latency = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self, investigator, file_path, fields=None):
+        """记录一次修改
+
+        只复制被修改的字段，开销与修改的字段大小成正比，可以在每次输入时调用。
+
+        参数:
+            investigator (Investigator): 被修改的调查员
+            file_path (str): 保存路径
+            fields (iterable): 被修改的字段（Investigator.to_dict()中的键），为None时表示全部字段
+        """
+        now = time.monotonic()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("自动保存已关闭")
+
+            source, snapshot = self._snapshots.get(file_path, (None, None))
+            if source is not investigator or fields is None:
+                # 第一次保存该调查员或全部字段都被修改：复制完整的快照
+                snapshot = copy.deepcopy(investigator.to_dict())
+                fields = snapshot.keys()
+            else:
+                # 快照可能正被后台线程写入，修改副本而不是原快照
+                snapshot = dict(snapshot)
+                for field in fields:
+                    snapshot[field] = copy.deepcopy(getattr(investigator, field))
+            self._snapshots[file_path] = (investigator, snapshot)
+
+            pending = self._pending.get(file_path)
+            if pending is None:
+                pending = self._pending[file_path] = _PendingSave(snapshot, now)
+            pending.snapshot = snapshot
+            pending.last_edit = now
+            pending.edits += 1
+            pending.fields.update(fields)
+            self._edits += 1
+            self._condition.notify()
+
+    def is_dirty(self, file_path=None):
+        """是否有尚未写入的修改"""
+        with self._condition:
+            return bool(self._pending) if file_path is None else file_path in self._pending
+
+    def failed_paths(self):
+        """最近一次写入失败、修改仍未保存的文件"""
+        with self._condition:
+            return set(self._failed)
+
+    def dirty_fields(self, file_path):
+        """尚未写入的字段"""
+        with self._condition:
+            pending = self._pending.get(file_path)
+            return set(pending.fields) if pending else set()
+
+    def _due(self, now):
+        """返回(已到期的文件路径, 距下一次到期的秒数)"""
+        due = []
+        wait = None
+        for file_path, pending in self._pending.items():
+            deadline = max(min(pending.last_edit + self.delay, pending.first_edit + self.max_delay), pending.retry_at)
+            if deadline <= now:
+                due.append(file_path)
+            else:
+                wait = deadline - now if wait is None else min(wait, deadline - now)
+        return due, wait
+
+    def _run(self):
+        """后台线程：等待修改到期后写入"""
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    due, wait = self._due(time.monotonic())
+                    if due:
+                        break
+                    self._condition.wait(wait)
+            for file_path in due:
+                self._write(file_path)
+
+    def _write(self, file_path):
+        """写入一个文件的待保存快照
+
+        写入失败时把快照放回待保存队列（写入期间又有新的修改时与之合并），delay秒后重试。
+
+        返回:
+            bool: 是否写入成功（没有待保存的修改时返回True）
+        """
+        with self._write_lock:
+            with self._condition:
+                pending = self._pending.pop(file_path, None)
+            if pending is None:
+                return True
+
+            start = time.perf_counter()
+            success = FileHandler.write_json_atomic(pending.snapshot, file_path)
+            latency = time.perf_counter() - start
+
+            notify = False
+            with self._condition:
+                if success:
+                    self._writes += 1
+                    self._coalesced += pending.edits - 1
+                    self._total_latency += latency
+                    self._max_latency = max(self._max_latency, latency)
+                    self._last_latency = latency
+                    self._failed.discard(file_path)
+                else:
+                    self._failures += 1
+                    notify = file_path not in self._failed
+                    self._failed.add(file_path)
+                    # 放回待保存队列；写入期间有新的修改时，新快照已包含这次的全部字段
+                    newer = self._pending.get(file_path)
+                    if newer is None:
+                        self._pending[file_path] = pending
+                    else:
+                        newer.first_edit = min(newer.first_edit, pending.first_edit)
+                        newer.edits += pending.edits
+                        newer.fields.update(pending.fields)
+                        pending = newer
+                    pending.retry_at = time.monotonic() + self.delay
+                    self._condition.notify()
+
+            if notify and self.on_error is not None:
+                try:
+                    self.on_error(file_path)
+                except Exception as e:
+                    print(f"自动保存失败通知出错: {e}")
+
+            if success and self.library is not None:
+                try:
+                    self.library.update(pending.snapshot, file_path)
+                except Exception as e:
+                    print(f"更新调查员库索引失败: {e}")
+            return success
+
+    def flush(self, file_path=None):
+        """立即写入尚未保存的修改（在调用线程中写入）
+
+        参数:
+            file_path (str): 只写入该文件，为None时写入全部
+
+        返回:
+            bool: 是否全部写入成功
+        """
+        with self._condition:
+            paths = [file_path] if file_path is not None else list(self._pending)
+        return all([self._write(path) for path in paths])
+
+    def cancel(self, file_path):
+        """丢弃一个文件尚未写入的修改，并等待正在进行的写入完成
+
+        手动保存前调用，避免较旧的自动保存覆盖手动保存的内容。
+        """
+        with self._write_lock, self._condition:
+            self._pending.pop(file_path, None)
+            self._snapshots.pop(file_path, None)
+            self._failed.discard(file_path)
+
+    def close(self, flush=True):
+        """结束后台线程
+
+        先写入尚未保存的修改；有修改写入失败时不结束后台线程（修改仍会重试），返回False，
+        由调用方决定重试、另存或调用close(flush=False)放弃这些修改。
+
+        参数:
+            flush (bool): 是否先写入尚未保存的修改，为False时直接丢弃
+
+        返回:
+            bool: 是否已结束（全部修改都已写入或被丢弃）
+        """
+        if flush and not self.flush():
+            return False
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify()
+        self._thread.join()
+        return True
+
+    def metrics(self):
+        """自动保存统计
+
+        返回:
+            dict: edits（修改次数）、writes（写入次数）、coalesced（被合并到其他写入中的修改次数）、
+                  failures（写入失败次数）、pending（待写入的文件数）、
+                  mean_latency/max_latency/last_latency（保存耗时，秒）
+        """
+        with self._condition:
+            return {
+                "edits": self._edits,
+                "writes": self._writes,
+                "coalesced": self._coalesced,
+                "failures": self._failures,
+                "pending": len(self._pending),
+                "mean_latency": self._total_latency / self._writes if self._writes else 0.0,
+                "max_latency": self._max_latency,
+                "last_latency": self._last_latency
+            }
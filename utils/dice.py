@@ -3,43 +3,192 @@
 
 import re
 import random
+from functools import lru_cache
+from utils.rng import resolve_rng
 
-class DiceRoller:
-    """骰子工具类，用于模拟掷骰子"""
+# 骰子表达式格式，如 "3D6"、"2D6+6"、"D100"
+DICE_PATTERN = re.compile(r"(\d+)?D(\d+)([+-]\d+)?")
+
+# 已编译骰子表达式缓存的容量
+DICE_CACHE_SIZE = 256
+
+class DiceExpression:
+    """已编译的骰子表达式
+    
+    表达式只解析一次，之后每次掷骰不再进行字符串处理。
+    """
+    
+    __slots__ = ("expression", "num_dice", "num_faces", "modifier")
+    
+    def __init__(self, expression, num_dice, num_faces, modifier=0):
+        """
+        初始化骰子表达式
+        
+        参数:
+            expression (str): 原始表达式
+            num_dice (int): 骰子数量
+            num_faces (int): 骰子面数
+            modifier (int): 修正值
+        """
+        self.expression = expression
+        self.num_dice = num_dice
+        self.num_faces = num_faces
+        self.modifier = modifier
     
     @staticmethod
-    def roll(dice_str):
+    def parse(dice_str):
         """
-        根据骰子表达式掷骰子
+        解析骰子表达式（不经过缓存）
         
         参数:
-            dice_str (str): 骰子表达式，如 "3D6", "2D6+6", "D100"
+            dice_str (str): 骰子表达式
             
         返回:
-            int: 骰子结果
+            DiceExpression: 编译后的表达式
         """
-        # 将表达式转换为小写
-        dice_str = dice_str.upper()
-        
-        # 匹配骰子表达式
-        pattern = r"(\d+)?D(\d+)([+-]\d+)?"
-        match = re.match(pattern, dice_str)
+        match = DICE_PATTERN.match(dice_str.upper())
         
         if not match:
             raise ValueError(f"无效的骰子表达式: {dice_str}")
         
-        # 解析骰子数量、面数和修正值
-        num_dice = int(match.group(1) or 1)
-        num_faces = int(match.group(2))
-        modifier = int(match.group(3) or 0) if match.group(3) else 0
+        return DiceExpression(
+            dice_str,
+            int(match.group(1) or 1),
+            int(match.group(2)),
+            int(match.group(3) or 0)
+        )
+    
+    def roll(self, rng=None):
+        """
+        掷一次骰子
+        
+        参数:
+            rng: 随机数源（RandomSource或random.Random），默认使用全局random模块
+            
+        返回:
+            int: 骰子结果
+        """
+        randint = (rng or random).randint
+        faces = self.num_faces
+        total = self.modifier
+        for _ in range(self.num_dice):
+            total += randint(1, faces)
+        return total
+    
+    def roll_many(self, times, rng=None):
+        """
+        连续掷多次骰子
+        
+        参数:
+            times (int): 掷骰子次数
+            rng: 随机数源，默认使用全局random模块
+            
+        返回:
+            list: 骰子结果列表
+        """
+        randint = (rng or random).randint
+        faces = self.num_faces
+        modifier = self.modifier
+        dice = range(self.num_dice)
+        results = []
+        for _ in range(times):
+            total = modifier
+            for _ in dice:
+                total += randint(1, faces)
+            results.append(total)
+        return results
+    
+    def distribution(self):
+        """
+        计算表达式结果的精确概率分布
+        
+        返回:
+            DiceDistribution: 精确分布
+        """
+        from utils.dice_distribution import DiceDistribution
+        return DiceDistribution.from_expression(self)
+    
+    def __repr__(self):
+        return f"DiceExpression({self.expression!r})"
+
+@lru_cache(maxsize=DICE_CACHE_SIZE)
+def compile_dice(dice_str):
+    """
+    编译骰子表达式，结果保存在有界LRU缓存中
+    
+    参数:
+        dice_str (str): 骰子表达式
+        
+    返回:
+        DiceExpression: 编译后的表达式
+    """
+    return DiceExpression.parse(dice_str)
+
+class DiceRoller:
+    """骰子工具类，用于模拟掷骰子"""
+    
+    def __init__(self, rng=None):
+        """
+        初始化骰子工具
+        
+        参数:
+            rng: 随机数源（RandomSource、random.Random或整数种子），默认使用全局random模块
+        """
+        self.rng = resolve_rng(rng)
+    
+    def set_rng(self, rng):
+        """
+        设置随机数源
+        
+        参数:
+            rng: 随机数源，为None时恢复为全局random模块
+        """
+        self.rng = resolve_rng(rng)
+    
+    @staticmethod
+    def compile(dice_str):
+        """
+        获取编译后的骰子表达式
         
-        # 掷骰子
-        result = sum(random.randint(1, num_faces) for _ in range(num_dice)) + modifier
+        参数:
+            dice_str (str): 骰子表达式
+            
+        返回:
+            DiceExpression: 编译后的表达式，可反复调用roll()
+        """
+        return compile_dice(dice_str)
+    
+    def roll(self, dice_str):
+        """
+        根据骰子表达式掷骰子
         
-        return result
+        参数:
+            dice_str (str|DiceExpression): 骰子表达式，如 "3D6", "2D6+6", "D100"，或已编译的表达式
+            
+        返回:
+            int: 骰子结果
+        """
+        if isinstance(dice_str, DiceExpression):
+            return dice_str.roll(self.rng)
+        return compile_dice(dice_str).roll(self.rng)
     
     @staticmethod
-    def roll_multiple(dice_str, times=1):
+    def distribution(dice_str, multiplier=1):
+        """
+        计算骰子表达式的精确概率分布（不掷骰）
+        
+        参数:
+            dice_str (str|DiceExpression): 骰子表达式
+            multiplier (int): 乘数，用于属性值如 "3D6"×5
+            
+        返回:
+            DiceDistribution: 精确分布，提供cdf、mean、variance、percentile等
+        """
+        from utils.dice_distribution import DiceDistribution
+        dist = DiceDistribution.from_expression(dice_str)
+        return dist.scale(multiplier) if multiplier != 1 else dist
+    
+    def roll_multiple(self, dice_str, times=1):
         """
         多次掷骰子
         
@@ -50,10 +199,11 @@ class DiceRoller:
         返回:
             list: 骰子结果列表
         """
-        return [DiceRoller.roll(dice_str) for _ in range(times)]
+        if not isinstance(dice_str, DiceExpression):
+            dice_str = compile_dice(dice_str)
+        return dice_str.roll_many(times, self.rng)
     
-    @staticmethod
-    def roll_attribute(dice_str, multiplier=5):
+    def roll_attribute(self, dice_str, multiplier=5):
         """
         掷属性骰子
         
@@ -64,21 +214,33 @@ class DiceRoller:
         返回:
             int: 属性值
         """
-        result = DiceRoller.roll(dice_str)
+        result = self.roll(dice_str)
         return result * multiplier
     
-    @staticmethod
-    def roll_d100():
+    def roll_dice(self, num_dice, num_faces):
+        """
+        掷若干颗相同面数的骰子并求和
+        
+        参数:
+            num_dice (int): 骰子数量
+            num_faces (int): 骰子面数
+            
+        返回:
+            int: 点数和
+        """
+        randint = self.rng.randint
+        return sum(randint(1, num_faces) for _ in range(num_dice))
+    
+    def roll_d100(self):
         """
         掷百分骰（D100）
         
         返回:
             int: 1-100之间的随机数
         """
-        return random.randint(1, 100)
+        return self.rng.randint(1, 100)
     
-    @staticmethod
-    def roll_between(min_value, max_value):
+    def roll_between(self, min_value, max_value):
         """
         在指定范围内掷骰子
         
@@ -89,10 +251,9 @@ class DiceRoller:
         返回:
             int: 范围内的随机数
         """
-        return random.randint(min_value, max_value)
+        return self.rng.randint(min_value, max_value)
     
-    @staticmethod
-    def random_choice(items):
+    def random_choice(self, items):
         """
         从列表中随机选择一项
         
@@ -102,4 +263,4 @@ class DiceRoller:
         返回:
             任意类型: 随机选择的项
         """
-        return random.choice(items) 
\ No newline at end of file
+        return self.rng.choice(items)
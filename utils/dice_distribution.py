@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+骰子概率分布模块
+
+对DiceRoller可接受的任意骰子表达式计算精确的概率分布，不需要蒙特卡洛模拟。
+分布以整数计数（每个结果出现的组合数）保存，总数为 面数^骰子数，因此所有概率都是精确的。
+单颗骰子以及n颗骰子之和的计数通过卷积得到并做了缓存。
+
+示例:
+    >>> dist = DiceDistribution.from_expression("3D6").scale(5)
+    >>> dist.prob_at_least(70)      # 力量 ≥ 70 的概率
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+
+from utils.dice import DiceExpression, compile_dice
+
+@lru_cache(maxsize=None)
+def _die_counts(num_faces):
+    """
+    单颗骰子的结果计数
+
+    参数:
+        num_faces (int): 骰子面数
+
+    返回:
+        tuple: 结果1..num_faces各出现一次
+    """
+    return (1,) * num_faces
+
+@lru_cache(maxsize=256)
+def _sum_counts(num_dice, num_faces):
+    """
+    num_dice颗num_faces面骰子之和的结果计数（从num_dice开始）
+
+    每加一颗骰子做一次与单颗骰子的卷积。单颗骰子各面计数相同，卷积后的每一项
+    等于上一轮计数中连续num_faces项之和，用滑动窗口求和，每颗骰子只需一次遍历。
+
+    参数:
+        num_dice (int): 骰子数量
+        num_faces (int): 骰子面数
+
+    返回:
+        tuple: 第i项为点数和等于 num_dice + i 的组合数
+    """
+    if num_dice <= 0:
+        return (1,)
+
+    counts = list(_die_counts(num_faces))
+    for _ in range(num_dice - 1):
+        result = []
+        window = 0
+        for i in range(len(counts) + num_faces - 1):
+            if i < len(counts):
+                window += counts[i]
+            if i >= num_faces:
+                window -= counts[i - num_faces]
+            result.append(window)
+        counts = result
+    return tuple(counts)
+
+class DiceDistribution:
+    """离散整数随机变量的精确分布"""
+
+    __slots__ = ("minimum", "step", "counts", "total", "_cumulative")
+
+    def __init__(self, minimum, counts, step=1):
+        """
+        初始化分布
+
+        参数:
+            minimum (int): 最小结果
+            counts (tuple): 各结果的组合数，第i项对应结果 minimum + i*step
+            step (int): 相邻结果的间隔（乘数缩放后大于1）
+        """
+        self.minimum = minimum
+        self.step = step
+        self.counts = tuple(counts)
+        self.total = sum(self.counts)
+
+        cumulative = []
+        running = 0
+        for count in self.counts:
+            running += count
+            cumulative.append(running)
+        self._cumulative = tuple(cumulative)
+
+    @staticmethod
+    def from_expression(dice_str):
+        """
+        计算骰子表达式的分布
+
+        参数:
+            dice_str (str|DiceExpression): 骰子表达式，如 "3D6", "2D6+6", "D100"
+
+        返回:
+            DiceDistribution: 精确分布
+        """
+        expression = dice_str if isinstance(dice_str, DiceExpression) else compile_dice(dice_str)
+        if expression.num_dice < 1 or expression.num_faces < 1:
+            raise ValueError(f"无效的骰子表达式: {expression.expression}")
+        return _expression_distribution(expression.num_dice, expression.num_faces, expression.modifier)
+
+    @staticmethod
+    def from_attribute(attr_config):
+        """
+        计算AppConfig.attributes中一项属性配置的分布
+
+        参数:
+            attr_config (dict): 属性配置，如 {"dice": "3D6", "multiplier": 5}
+
+        返回:
+            DiceDistribution: 属性值的精确分布
+        """
+        dist = DiceDistribution.from_expression(attr_config["dice"])
+        return dist.scale(attr_config.get("multiplier", 1))
+
+    @property
+    def maximum(self):
+        """最大结果"""
+        return self.minimum + (len(self.counts) - 1) * self.step
+
+    def values(self):
+        """
+        所有可能的结果
+
+        返回:
+            list: 从小到大的结果列表
+        """
+        return [self.minimum + i * self.step for i in range(len(self.counts))]
+
+    def items(self):
+        """
+        结果及其概率
+
+        返回:
+            list: (结果, 概率) 列表
+        """
+        return [(self.minimum + i * self.step, count / self.total) for i, count in enumerate(self.counts)]
+
+    def scale(self, multiplier):
+        """
+        乘以常数后的分布
+
+        参数:
+            multiplier (int): 正整数乘数
+
+        返回:
+            DiceDistribution: 新分布
+        """
+        if multiplier <= 0:
+            raise ValueError(f"无效的乘数: {multiplier}")
+        return DiceDistribution(self.minimum * multiplier, self.counts, self.step * multiplier)
+
+    def shift(self, offset):
+        """
+        加上常数后的分布
+
+        参数:
+            offset (int): 修正值
+
+        返回:
+            DiceDistribution: 新分布
+        """
+        return DiceDistribution(self.minimum + offset, self.counts, self.step)
+
+    def _count_le(self, value):
+        """结果小于等于value的组合数"""
+        if value < self.minimum:
+            return 0
+        index = (value - self.minimum) // self.step
+        if index >= len(self.counts):
+            return self.total
+        return self._cumulative[index]
+
+    def pmf(self, value):
+        """
+        P(X = value)
+
+        参数:
+            value (int): 结果
+
+        返回:
+            float: 概率
+        """
+        offset = value - self.minimum
+        if offset < 0 or offset % self.step:
+            return 0.0
+        index = offset // self.step
+        if index >= len(self.counts):
+            return 0.0
+        return self.counts[index] / self.total
+
+    def cdf(self, value):
+        """
+        P(X ≤ value)
+
+        参数:
+            value (int): 结果
+
+        返回:
+            float: 概率
+        """
+        return self._count_le(value) / self.total
+
+    def prob_at_least(self, value):
+        """
+        P(X ≥ value)
+
+        参数:
+            value (int): 结果
+
+        返回:
+            float: 概率
+        """
+        return (self.total - self._count_le(value - 1)) / self.total
+
+    def exact_cdf(self, value):
+        """
+        P(X ≤ value)，以分数形式返回
+
+        参数:
+            value (int): 结果
+
+        返回:
+            Fraction: 精确概率
+        """
+        return Fraction(self._count_le(value), self.total)
+
+    @property
+    def mean(self):
+        """期望值"""
+        weighted = sum(i * count for i, count in enumerate(self.counts))
+        return self.minimum + self.step * weighted / self.total
+
+    @property
+    def variance(self):
+        """方差"""
+        mean_index = sum(i * count for i, count in enumerate(self.counts)) / self.total
+        spread = sum((i - mean_index) ** 2 * count for i, count in enumerate(self.counts)) / self.total
+        return spread * self.step * self.step
+
+    @property
+    def std(self):
+        """标准差"""
+        return self.variance ** 0.5
+
+    def percentile(self, q):
+        """
+        百分位数：使 P(X ≤ x) ≥ q/100 的最小结果x
+
+        参数:
+            q (float): 百分位，0-100
+
+        返回:
+            int: 结果
+        """
+        if not 0 <= q <= 100:
+            raise ValueError(f"无效的百分位: {q}")
+        threshold = q / 100 * self.total
+        for index, cumulative in enumerate(self._cumulative):
+            if cumulative >= threshold:
+                return self.minimum + index * self.step
+        return self.maximum
+
+    def __repr__(self):
+        return f"DiceDistribution(min={self.minimum}, max={self.maximum}, mean={self.mean:.3f})"
+
+@lru_cache(maxsize=256)
+def _expression_distribution(num_dice, num_faces, modifier):
+    """按(骰子数量, 面数, 修正值)缓存的分布"""
+    return DiceDistribution(num_dice + modifier, _sum_counts(num_dice, num_faces))
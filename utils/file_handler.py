@@ -3,19 +3,34 @@
 
 import os
 import json
+import itertools
+import tempfile
 from core.investigator import Investigator
+from core.recipe import InvestigatorRecipe
+from core.sheets import render_sheet
+from core.generator import GENERATOR_VERSION
+from utils.archive import InvestigatorArchive
+from utils.jsonl import iter_lines, write_lines
+from utils.journal import InvestigatorJournal
+
+# 配方集合文件的格式标识
+RECIPE_COLLECTION_FORMAT = "coc-investigator-recipes"
+
+# 修改日志文件的扩展名（附加在调查员文件路径之后）
+JOURNAL_SUFFIX = ".journal"
 
 class FileHandler:
     """文件处理工具类"""
     
     @staticmethod
-    def save_investigator(investigator, file_path):
+    def save_investigator(investigator, file_path, library=None):
         """
         保存调查员数据到文件
         
         参数:
             investigator (Investigator): 调查员对象
             file_path (str): 文件路径
+            library (InvestigatorLibrary): 调查员库索引，可选，保存成功后更新其中的条目
             
         返回:
             bool: 是否保存成功
@@ -28,12 +43,51 @@ class FileHandler:
             data = investigator.to_dict()
             
             # 将字典保存为JSON文件
-            with open(file_path, 'w', encoding='utf-8') as f:
+            if not FileHandler.write_json_atomic(data, file_path):
+                return False
+        except Exception as e:
+            print(f"保存调查员数据失败: {e}")
+            return False
+        
+        # 文件已经保存，索引更新失败不影响保存结果
+        if library is not None:
+            try:
+                library.update(data, file_path)
+            except Exception as e:
+                print(f"更新调查员库索引失败: {e}")
+        
+        return True
+    
+    @staticmethod
+    def write_json_atomic(data, file_path):
+        """
+        以原子方式写入JSON文件
+        
+        先写入同目录下的临时文件并刷新到磁盘，再替换目标文件，
+        写入过程中崩溃时目标文件保持原来的内容。
+        
+        参数:
+            data (dict): 要写入的数据
+            file_path (str): 文件路径
+            
+        返回:
+            bool: 是否写入成功
+        """
+        directory = os.path.dirname(os.path.abspath(file_path))
+        temp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=4)
-                
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
             return True
         except Exception as e:
-            print(f"保存调查员数据失败: {e}")
+            print(f"写入文件失败: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
             return False
     
     @staticmethod
@@ -107,84 +161,316 @@ class FileHandler:
             # 确保目录存在
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
-            # 生成文本内容
-            content = []
-            
-            # 基本信息
-            content.append("=== 基本信息 ===")
-            content.append(f"姓名: {investigator.name}")
-            content.append(f"玩家: {investigator.player}")
-            content.append(f"职业: {investigator.occupation}")
-            content.append(f"年龄: {investigator.age}")
-            content.append(f"性别: {investigator.gender}")
-            content.append(f"居住地: {investigator.residence}")
-            content.append(f"出生地: {investigator.birthplace}")
-            content.append("")
-            
-            # 属性
-            content.append("=== 属性 ===")
-            for attr_name, attr_value in investigator.attributes.items():
-                half_value = investigator.attribute_half.get(attr_name, 0)
-                fifth_value = investigator.attribute_fifth.get(attr_name, 0)
-                content.append(f"{attr_name}: {attr_value} (半值: {half_value}, 五分之一值: {fifth_value})")
-            content.append("")
-            
-            # 衍生属性
-            content.append("=== 衍生属性 ===")
-            content.append(f"生命值: {investigator.hp}")
-            content.append(f"魔法值: {investigator.mp}")
-            content.append(f"理智值: {investigator.san}")
-            content.append(f"伤害加值: {investigator.db}")
-            content.append(f"体格: {investigator.build}")
-            content.append(f"移动速度: {investigator.mov}")
-            content.append("")
-            
-            # 技能
-            content.append("=== 技能 ===")
-            content.append("职业技能:")
-            for skill in investigator.occupation_skills:
-                content.append(f"- {skill}")
-            content.append(f"职业技能点: {investigator.occupation_skill_points}")
-            content.append(f"兴趣技能点: {investigator.interest_skill_points}")
-            content.append("")
-            
-            if investigator.skills:
-                content.append("已分配技能:")
-                for skill_name, skill_value in investigator.skills.items():
-                    content.append(f"{skill_name}: {skill_value}")
-                content.append("")
-            
-            # 背景
-            content.append("=== 背景 ===")
-            content.append(f"形象描述: {investigator.personal_description}")
-            content.append(f"思想/信念: {investigator.ideology_beliefs}")
-            content.append(f"重要之人: {investigator.significant_people}")
-            content.append(f"意义非凡之地: {investigator.meaningful_locations}")
-            content.append(f"宝贵之物: {investigator.treasured_possessions}")
-            content.append(f"特质: {investigator.traits}")
-            content.append("")
-            
-            # 装备和资产
-            content.append("=== 装备和资产 ===")
-            content.append(f"现金: {investigator.cash}")
-            content.append(f"资产: {investigator.assets}")
-            content.append(f"消费水平: {investigator.spending_level}")
-            
-            if investigator.items:
-                content.append("物品:")
-                for item in investigator.items:
-                    content.append(f"- {item}")
-            
-            if investigator.weapons:
-                content.append("武器:")
-                for weapon in investigator.weapons:
-                    content.append(f"- {weapon}")
+            # 生成文本内容（与批量导出使用同一模板）
+            content = render_sheet(investigator, "text")
             
             # 将内容写入文件
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(content))
+                f.write(content)
                 
             return True
         except Exception as e:
             print(f"导出调查员数据失败: {e}")
-            return False 
\ No newline at end of file
+            return False 
+    
+    @staticmethod
+    def save_investigator_recipe(recipe, file_path):
+        """
+        保存调查员配方（只包含生成器版本、种子、序号、年龄段、分配策略、规则变体和手动修改）
+        
+        参数:
+            recipe (InvestigatorRecipe): 调查员配方
+            file_path (str): 文件路径
+            
+        返回:
+            bool: 是否保存成功
+        """
+        try:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(recipe.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+                
+            return True
+        except Exception as e:
+            print(f"保存调查员配方失败: {e}")
+            return False
+    
+    @staticmethod
+    def load_investigator_recipe(file_path, generator, verify=True):
+        """
+        从配方文件重新生成调查员
+        
+        参数:
+            file_path (str): 文件路径
+            generator (InvestigatorGenerator): 调查员生成器
+            verify (bool): 是否验证生成器版本和校验值
+            
+        返回:
+            Investigator: 调查员对象，如果加载或验证失败则返回None
+        """
+        try:
+            if not os.path.exists(file_path):
+                print(f"文件不存在: {file_path}")
+                return None
+            
+            with open(file_path, 'r', encoding='utf-8') as f:
+                recipe = InvestigatorRecipe.from_dict(json.load(f))
+            
+            investigator = recipe.rehydrate(generator, verify)
+            investigator.file_path = file_path
+            
+            return investigator
+        except Exception as e:
+            print(f"加载调查员配方失败: {e}")
+            return None
+    
+    @staticmethod
+    def save_recipe_collection(recipes, file_path):
+        """
+        将大量调查员配方保存到一个紧凑的集合文件
+        
+        文件第一行为文件头（格式标识、生成器版本，以及第一个配方的技能分配策略和规则变体），
+        之后每行一个配方：[种子, 序号, 年龄段, 校验值(, 手动修改(, 分配策略, 规则变体))]，
+        分配策略和规则变体与文件头相同时省略
+        
+        参数:
+            recipes (iterable): InvestigatorRecipe对象序列
+            file_path (str): 文件路径
+            
+        返回:
+            bool: 是否保存成功
+        """
+        try:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            recipes = iter(recipes)
+            first = next(recipes, None)
+            strategy = first.strategy if first is not None else None
+            rule_variant = first.rule_variant if first is not None else None
+            header = {
+                "format": RECIPE_COLLECTION_FORMAT, "version": GENERATOR_VERSION,
+                "strategy": strategy, "rule_variant": rule_variant
+            }
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header, ensure_ascii=False, separators=(",", ":")) + "\n")
+                for recipe in itertools.chain((first,) if first is not None else (), recipes):
+                    if recipe.version != GENERATOR_VERSION:
+                        raise ValueError(f"配方的生成器版本({recipe.version})与当前版本不一致: {recipe}")
+                    row = recipe.to_row(strategy, rule_variant)
+                    f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+                
+            return True
+        except Exception as e:
+            print(f"保存配方集合失败: {e}")
+            return False
+    
+    @staticmethod
+    def load_recipe_collection(file_path):
+        """
+        读取配方集合文件
+        
+        参数:
+            file_path (str): 文件路径
+            
+        返回:
+            list: InvestigatorRecipe对象列表，如果加载失败则返回None
+        """
+        try:
+            if not os.path.exists(file_path):
+                print(f"文件不存在: {file_path}")
+                return None
+            
+            with open(file_path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                if header.get("format") != RECIPE_COLLECTION_FORMAT:
+                    raise ValueError("不是调查员配方集合文件")
+                
+                version = header.get("version")
+                strategy = header.get("strategy")
+                rule_variant = header.get("rule_variant")
+                return [
+                    InvestigatorRecipe.from_row(json.loads(line), version, strategy, rule_variant)
+                    for line in f if line.strip()
+                ]
+        except Exception as e:
+            print(f"加载配方集合失败: {e}")
+            return None
+    
+    @staticmethod
+    def verify_recipe_collection(file_path, generator):
+        """
+        验证配方集合中的每个配方都能重新生成与保存时一致的调查员
+        
+        参数:
+            file_path (str): 文件路径
+            generator (InvestigatorGenerator): 调查员生成器
+            
+        返回:
+            list: 验证失败的配方列表；文件无法读取时返回None
+        """
+        recipes = FileHandler.load_recipe_collection(file_path)
+        if recipes is None:
+            return None
+        
+        failures = []
+        for recipe in recipes:
+            try:
+                recipe.rehydrate(generator, verify=True)
+            except ValueError:
+                failures.append(recipe)
+        
+        return failures
+    
+    @staticmethod
+    def append_to_archive(investigators, file_path):
+        """
+        将调查员追加到列式归档文件（文件不存在时创建）
+        
+        参数:
+            investigators (iterable): Investigator对象序列
+            file_path (str): 归档文件路径
+            
+        返回:
+            range: 新追加记录的编号，如果保存失败则返回None
+        """
+        try:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            return InvestigatorArchive(file_path).append(investigators)
+        except Exception as e:
+            print(f"追加到归档失败: {e}")
+            return None
+    
+    @staticmethod
+    def load_from_archive(file_path, record_id=None):
+        """
+        从列式归档文件读取调查员
+        
+        参数:
+            file_path (str): 归档文件路径
+            record_id (int): 记录编号，为None时读取全部调查员
+            
+        返回:
+            Investigator|list: 调查员对象或调查员对象列表，如果加载失败则返回None
+        """
+        try:
+            if not os.path.exists(file_path):
+                print(f"文件不存在: {file_path}")
+                return None
+            
+            archive = InvestigatorArchive(file_path)
+            if record_id is None:
+                return list(archive.iter_investigators())
+            return archive.get(record_id)
+        except Exception as e:
+            print(f"从归档加载失败: {e}")
+            return None
+    
+    @staticmethod
+    def iter_investigators(file_path, compression=None, json_backend=None):
+        """
+        逐个读取JSONL文件中的调查员（每行一名调查员），内存占用与文件大小无关
+        
+        .gz和.zst/.zstd文件会自动解压；安装了orjson时默认使用orjson解码。
+        
+        参数:
+            file_path (str): 文件路径
+            compression (str): 压缩方式（gzip、zstd、none），为None时根据扩展名判断
+            json_backend (str): JSON实现（json、orjson），为None时自动选择
+            
+        返回:
+            迭代器，依次产生Investigator对象；某行无法解析时抛出ValueError
+        """
+        for data in iter_lines(file_path, compression, json_backend):
+            yield Investigator.from_dict(data)
+    
+    @staticmethod
+    def write_investigators(file_path, investigators, compression=None, json_backend=None):
+        """
+        将调查员逐个写入JSONL文件（每行一名调查员，不缩进）
+        
+        按扩展名自动压缩（.gz、.zst/.zstd）；本地文件路径不会写入文件。
+        
+        参数:
+            file_path (str): 文件路径
+            investigators (iterable): Investigator对象或数据字典序列，可以是生成器
+            compression (str): 压缩方式（gzip、zstd、none），为None时根据扩展名判断
+            json_backend (str): JSON实现（json、orjson），为None时自动选择
+            
+        返回:
+            int: 写入的调查员数量，如果保存失败则返回None
+        """
+        def records():
+            for investigator in investigators:
+                data = investigator.to_dict() if isinstance(investigator, Investigator) else dict(investigator)
+                data.pop("file_path", None)
+                yield data
+        
+        try:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            return write_lines(file_path, records(), compression, json_backend)
+        except Exception as e:
+            print(f"写入调查员集合失败: {e}")
+            return None
+    
+    @staticmethod
+    def open_journal(file_path, **options):
+        """
+        打开调查员文件对应的修改日志（文件路径加上.journal）
+        
+        之后每次修改调用journal.record(investigator)，只追加变化的字段。
+        
+        参数:
+            file_path (str): 调查员文件路径
+            **options: 传给InvestigatorJournal的参数（snapshot_interval、max_undo、fsync）
+            
+        返回:
+            InvestigatorJournal: 修改日志，如果打开失败则返回None
+        """
+        try:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            return InvestigatorJournal(file_path + JOURNAL_SUFFIX, **options)
+        except Exception as e:
+            print(f"打开修改日志失败: {e}")
+            return None
+    
+    @staticmethod
+    def recover_investigator(file_path):
+        """
+        加载调查员，优先使用修改日志中的最新状态
+        
+        日志比调查员文件新时（例如上次编辑后没有保存就崩溃了）从日志恢复，否则读取调查员文件。
+        
+        参数:
+            file_path (str): 调查员文件路径
+            
+        返回:
+            Investigator: 调查员对象，如果加载失败则返回None
+        """
+        journal_path = file_path + JOURNAL_SUFFIX
+        try:
+            if os.path.exists(journal_path) and (
+                not os.path.exists(file_path) or os.path.getmtime(journal_path) >= os.path.getmtime(file_path)
+            ):
+                journal = InvestigatorJournal(journal_path)
+                if journal.state is not None:
+                    investigator = Investigator.from_dict(journal.state)
+                    investigator.file_path = file_path
+                    return investigator
+        except Exception as e:
+            print(f"从修改日志恢复失败: {e}")
+        
+        return FileHandler.load_investigator(file_path)
\ No newline at end of file
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+调查员修改日志模块
+
+把对一名调查员的每次修改追加为一条很小的差异记录，代替每次都重写完整的JSON文件。
+
+日志为JSONL文件，每行一条记录：
+- snapshot：完整数据，以及当时的撤销/重做栈
+- edit：一次修改，记录改变的字段（字典字段如技能只记录变化的项，被删除的项为None）
+  和撤销这次修改所需的反向差异
+- undo / redo：撤销或重做一次修改（差异从撤销/重做栈中取得，记录本身不含数据）
+
+- 保存只追加一行，开销与修改的大小成正比
+- 每snapshot_interval条记录追加一次快照，恢复时只需从最后一个快照开始重放
+- 崩溃时写了一半的最后一行会被忽略并在下次追加前截掉
+- compact()把日志原子地重写为一个快照
+- history()/state_at()可以浏览全部历史
+"""
+
+import os
+import copy
+import json
+import time
+import tempfile
+
+from core.recipe import diff_field, apply_field
+
+# 每隔多少条记录追加一次快照
+DEFAULT_SNAPSHOT_INTERVAL = 50
+
+# 撤销栈的最大深度
+DEFAULT_MAX_UNDO = 100
+
+# 快照记录行的开头
+SNAPSHOT_PREFIX = b'{"op":"snapshot"'
+
+def _dumps(record):
+    """把一条记录编码为一行"""
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+def diff_state(old, new):
+    """比较两份调查员数据
+
+    参数:
+        old (dict): 修改前的数据
+        new (dict): 修改后的数据
+
+    返回:
+        tuple: (正向差异, 反向差异)，没有变化时都为空字典
+    """
+    forward = {}
+    backward = {}
+    for key in new.keys() | old.keys():
+        old_value = old.get(key)
+        new_value = new.get(key)
+        if old_value != new_value:
+            forward[key] = diff_field(old_value, new_value)
+            backward[key] = diff_field(new_value, old_value)
+    return forward, backward
+
+def apply_diff(state, diff):
+    """把差异应用到数据上（原地修改）"""
+    for key, value in diff.items():
+        state[key] = apply_field(state.get(key), copy.deepcopy(value))
+    return state
+
+class JournalState:
+    """重放日志记录得到的状态"""
+
+    def __init__(self, max_undo=DEFAULT_MAX_UNDO):
+        """初始化空状态
+
+        参数:
+            max_undo (int): 撤销栈的最大深度
+        """
+        self.max_undo = max_undo
+        self.data = None
+        self.seq = 0
+        self.undo_stack = []
+        self.redo_stack = []
+        self.since_snapshot = 0
+
+    def replay(self, record):
+        """重放一条记录"""
+        op = record["op"]
+        self.seq = record["seq"]
+        if op == "snapshot":
+            self.data = copy.deepcopy(record["data"])
+            self.undo_stack = [tuple(entry) for entry in record.get("undo", [])]
+            self.redo_stack = [tuple(entry) for entry in record.get("redo", [])]
+            self.since_snapshot = 0
+            return
+
+        self.since_snapshot += 1
+        if op == "edit":
+            apply_diff(self.data, record["set"])
+            self.undo_stack.append((record["set"], record["undo"]))
+            del self.undo_stack[:-self.max_undo]
+            self.redo_stack = []
+        elif op == "undo":
+            forward, backward = self.undo_stack.pop()
+            apply_diff(self.data, backward)
+            self.redo_stack.append((forward, backward))
+        elif op == "redo":
+            forward, backward = self.redo_stack.pop()
+            apply_diff(self.data, forward)
+            self.undo_stack.append((forward, backward))
+
+    def snapshot_record(self, seq):
+        """当前状态的快照记录"""
+        return {
+            "op": "snapshot",
+            "seq": seq,
+            "time": round(time.time(), 3),
+            "data": self.data,
+            "undo": [list(entry) for entry in self.undo_stack],
+            "redo": [list(entry) for entry in self.redo_stack]
+        }
+
+class InvestigatorJournal:
+    """一名调查员的修改日志"""
+
+    def __init__(self, file_path, snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL, max_undo=DEFAULT_MAX_UNDO, fsync=True):
+        """打开日志并恢复最新状态
+
+        参数:
+            file_path (str): 日志文件路径
+            snapshot_interval (int): 每隔多少条记录追加一次快照
+            max_undo (int): 撤销栈的最大深度
+            fsync (bool): 每次追加后是否刷新到磁盘
+        """
+        self.file_path = file_path
+        self.snapshot_interval = snapshot_interval
+        self.max_undo = max_undo
+        self.fsync = fsync
+
+        records, self._end = self._read_records(file_path, tail_only=True)
+        self._current = self._replay_until(records, None)
+
+    @property
+    def state(self):
+        """最新的调查员数据（尚未记录任何状态时为None），不要直接修改"""
+        return self._current.data
+
+    @property
+    def seq(self):
+        """最后一条记录的序号"""
+        return self._current.seq
+
+    @property
+    def can_undo(self):
+        return bool(self._current.undo_stack)
+
+    @property
+    def can_redo(self):
+        return bool(self._current.redo_stack)
+
+    @staticmethod
+    def _read_records(file_path, tail_only=False):
+        """读取日志中所有完整的记录
+
+        参数:
+            file_path (str): 日志文件路径
+            tail_only (bool): 只解码最后一个快照及之后的记录
+
+        返回:
+            tuple: (记录列表, 最后一条完整记录之后的偏移)
+        """
+        if not os.path.exists(file_path):
+            return [], 0
+
+        with open(file_path, "rb") as f:
+            lines = f.readlines()
+
+        start = 0
+        if tail_only:
+            # 快照记录总以op字段开头，不解码就能找到最后一个快照
+            for i in range(len(lines) - 1, -1, -1):
+                if lines[i].startswith(SNAPSHOT_PREFIX) and lines[i].endswith(b"\n"):
+                    start = i
+                    break
+
+        records = []
+        end = sum(len(line) for line in lines[:start])
+        for line in lines[start:]:
+            # 没有换行符或无法解析的行是崩溃时写了一半的记录，忽略它及之后的内容
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            end += len(line)
+
+        if tail_only and start and not records:
+            # 最后一个快照已损坏，从头重放
+            return InvestigatorJournal._read_records(file_path)
+        return records, end
+
+    def _replay_until(self, records, seq):
+        """从seq之前（为None时为全部记录中）的最后一个快照开始重放到seq"""
+        if seq is not None:
+            records = [record for record in records if record["seq"] <= seq]
+        state = JournalState(self.max_undo)
+        start = None
+        for i in range(len(records) - 1, -1, -1):
+            if records[i]["op"] == "snapshot":
+                start = i
+                break
+        if start is not None:
+            for record in records[start:]:
+                state.replay(record)
+        return state
+
+    def _write(self, record):
+        """追加一条记录并更新内存中的状态"""
+        exists = os.path.exists(self.file_path)
+        with open(self.file_path, "r+b" if exists else "wb") as f:
+            # 截掉崩溃时写了一半的记录
+            f.truncate(self._end)
+            f.seek(self._end)
+            f.write(_dumps(record))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self._end = f.tell()
+        self._current.replay(record)
+
+    def _append(self, op, **fields):
+        """追加一条修改记录，必要时再追加一个快照"""
+        self._write(dict(op=op, seq=self.seq + 1, time=round(time.time(), 3), **fields))
+        if self._current.since_snapshot >= self.snapshot_interval:
+            self.snapshot()
+
+    def record(self, investigator):
+        """记录调查员的当前状态
+
+        第一次记录时写入快照，之后只追加与上一次状态的差异。
+
+        参数:
+            investigator (Investigator|dict): 调查员对象或数据字典
+
+        返回:
+            int: 新记录的序号，没有变化时返回None
+        """
+        data = investigator if isinstance(investigator, dict) else investigator.to_dict()
+        if self.state is None:
+            self._current.data = data
+            self._write(self._current.snapshot_record(self.seq + 1))
+            return self.seq
+
+        forward, backward = diff_state(self.state, data)
+        if not forward:
+            return None
+        self._append("edit", set=forward, undo=backward)
+        return self.seq
+
+    def snapshot(self):
+        """追加当前状态的快照"""
+        if self.state is not None:
+            self._write(self._current.snapshot_record(self.seq + 1))
+
+    def undo(self):
+        """撤销最近一次修改
+
+        返回:
+            dict: 撤销后的数据（副本），没有可撤销的修改时返回None
+        """
+        if not self.can_undo:
+            return None
+        self._append("undo")
+        return copy.deepcopy(self.state)
+
+    def redo(self):
+        """重做最近一次撤销的修改
+
+        返回:
+            dict: 重做后的数据（副本），没有可重做的修改时返回None
+        """
+        if not self.can_redo:
+            return None
+        self._append("redo")
+        return copy.deepcopy(self.state)
+
+    def compact(self):
+        """把日志原子地重写为一个快照（保留撤销/重做栈，丢弃更早的历史）"""
+        if self.state is None:
+            return
+        record = _dumps(self._current.snapshot_record(self.seq + 1))
+
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.file_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._end = len(record)
+        self._current.replay(json.loads(record))
+
+    def history(self):
+        """浏览日志中的全部记录
+
+        返回:
+            list: [(序号, 时间, 操作, 修改的字段), ...]，快照的修改字段为空元组
+        """
+        records, _ = self._read_records(self.file_path)
+        return [(record["seq"], record["time"], record["op"], tuple(record.get("set", ()))) for record in records]
+
+    def state_at(self, seq):
+        """取得某条记录之后的数据
+
+        参数:
+            seq (int): 记录序号
+
+        返回:
+            dict: 当时的数据，日志中没有该序号之前的快照时返回None
+        """
+        records, _ = self._read_records(self.file_path)
+        return self._replay_until(records, seq).data
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSONL流读写模块
+
+逐行读写换行分隔的JSON（JSONL），供调查员集合的导入导出使用：
+- 按扩展名自动选择压缩方式：.gz为gzip，.zst/.zstd为zstd（需要安装zstandard）
+- 安装了orjson时使用orjson编解码，否则使用标准库json
+- 一次只处理一行，内存占用与文件大小无关
+"""
+
+import io
+import gzip
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard为可选依赖
+    zstandard = None
+
+# 压缩方式对应的扩展名
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+    ".zstd": "zstd"
+}
+
+# gzip压缩级别（默认的9级比6级慢很多，文件只小一点）
+GZIP_LEVEL = 6
+
+def detect_compression(file_path):
+    """根据扩展名判断压缩方式
+
+    参数:
+        file_path (str): 文件路径
+
+    返回:
+        str: "gzip"、"zstd"或"none"
+    """
+    for extension, compression in COMPRESSION_EXTENSIONS.items():
+        if str(file_path).lower().endswith(extension):
+            return compression
+    return "none"
+
+def json_backend(name=None):
+    """选择JSON编解码实现
+
+    参数:
+        name (str): "json"、"orjson"，为None时有orjson则使用orjson
+
+    返回:
+        str: 实际使用的实现名称
+    """
+    if name is None:
+        return "orjson" if orjson is not None else "json"
+    if name == "orjson" and orjson is None:
+        raise ImportError("未安装orjson")
+    if name not in ("json", "orjson"):
+        raise ValueError(f"未知的JSON实现: {name}")
+    return name
+
+def open_stream(file_path, mode, compression=None):
+    """以二进制方式打开（可能压缩的）文件
+
+    参数:
+        file_path (str): 文件路径
+        mode (str): "rb"或"wb"
+        compression (str): "gzip"、"zstd"、"none"，为None时根据扩展名判断
+
+    返回:
+        二进制文件对象
+    """
+    compression = compression or detect_compression(file_path)
+    if compression == "gzip":
+        return gzip.open(file_path, mode, compresslevel=GZIP_LEVEL)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("读写zstd压缩文件需要安装zstandard")
+        raw = open(file_path, mode)
+        if mode == "rb":
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+    if compression != "none":
+        raise ValueError(f"未知的压缩方式: {compression}")
+    return open(file_path, mode)
+
+def iter_lines(file_path, compression=None, backend=None):
+    """逐行解码JSONL文件
+
+    参数:
+        file_path (str): 文件路径
+        compression (str): 压缩方式，为None时根据扩展名判断
+        backend (str): JSON实现，为None时自动选择
+
+    返回:
+        迭代器，依次产生每行解码后的对象（跳过空行）
+    """
+    loads = orjson.loads if json_backend(backend) == "orjson" else json.loads
+    with open_stream(file_path, "rb", compression) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError as e:
+                raise ValueError(f"{file_path} 第{line_number}行不是有效的JSON: {e}") from e
+
+def write_lines(file_path, items, compression=None, backend=None):
+    """逐行写入JSONL文件
+
+    参数:
+        file_path (str): 文件路径
+        items (iterable): 要写入的对象
+        compression (str): 压缩方式，为None时根据扩展名判断
+        backend (str): JSON实现，为None时自动选择
+
+    返回:
+        int: 写入的行数
+    """
+    if json_backend(backend) == "orjson":
+        def encode(item):
+            return orjson.dumps(item) + b"\n"
+    else:
+        def encode(item):
+            return (json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+    count = 0
+    with open_stream(file_path, "wb", compression) as f:
+        for item in items:
+            f.write(encode(item))
+            count += 1
+    return count
@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+调查员库索引模块
+
+在本地SQLite数据库中为已保存的调查员文件建立元数据目录：
+姓名、职业、年龄、主要属性、衍生属性、各技能值、最高技能，以及文件路径和修改时间。
+
+- 保存调查员时由FileHandler.save_investigator增量更新对应条目
+- refresh(directory)只重新读取修改时间发生变化的文件，并删除已不存在的文件的条目
+- query()直接在索引上筛选和排序，不需要打开任何JSON文件
+
+用法:
+    library = InvestigatorLibrary("data/library.sqlite")
+    library.refresh("investigators")
+    for entry in library.query(occupation="古文物学家", min_age=70, order_by="age", descending=True):
+        print(entry["name"], entry["age"], entry["path"])
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+# 属性名称到索引列名的映射
+ATTRIBUTE_COLUMNS = {
+    "力量": "attr_str",
+    "体质": "attr_con",
+    "体型": "attr_siz",
+    "敏捷": "attr_dex",
+    "外貌": "attr_app",
+    "智力": "attr_int",
+    "意志": "attr_pow",
+    "教育": "attr_edu",
+    "幸运": "attr_luck"
+}
+
+# 可以直接排序的列
+SORT_COLUMNS = ("name", "player", "occupation", "gender", "age", "hp", "mp", "san",
+                "best_skill_value", "mtime", "path")
+
+# 基本信息列
+INFO_COLUMNS = ("path", "mtime", "name", "player", "occupation", "gender", "age", "hp", "mp", "san",
+                "best_skill", "best_skill_value")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS investigators (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    name TEXT,
+    player TEXT,
+    occupation TEXT,
+    gender TEXT,
+    age INTEGER,
+    hp INTEGER,
+    mp INTEGER,
+    san INTEGER,
+    best_skill TEXT,
+    best_skill_value INTEGER,
+    {", ".join(f"{column} INTEGER" for column in ATTRIBUTE_COLUMNS.values())}
+);
+CREATE TABLE IF NOT EXISTS skills (
+    path TEXT NOT NULL REFERENCES investigators(path) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (path, skill)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS investigators_occupation ON investigators(occupation);
+CREATE INDEX IF NOT EXISTS investigators_age ON investigators(age);
+CREATE INDEX IF NOT EXISTS skills_skill_value ON skills(skill, value);
+"""
+
+def _int_or_none(value):
+    """整数原样返回，其他值返回None"""
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+class InvestigatorLibrary:
+    """调查员库索引"""
+
+    def __init__(self, index_path):
+        """打开（或创建）索引数据库
+
+        参数:
+            index_path (str): SQLite数据库文件路径，":memory:"表示只在内存中
+        """
+        if index_path != ":memory:":
+            directory = os.path.dirname(index_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        self.index_path = index_path
+        self._lock = threading.RLock()
+        # 自动保存可能在后台线程中更新索引，由锁保证同一时间只有一个线程使用连接
+        self.connection = sqlite3.connect(index_path, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM investigators").fetchone()[0]
+
+    def close(self):
+        """关闭数据库"""
+        with self._lock:
+            self.connection.close()
+
+    @staticmethod
+    def normalize_path(file_path):
+        """统一文件路径的写法，作为索引的主键"""
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def _write_entry(self, path, mtime, data):
+        """写入一个条目（调用方负责事务）"""
+        attributes = data.get("attributes") or {}
+        skills = {name: value for name, value in (data.get("skills") or {}).items() if _int_or_none(value) is not None}
+        best_skill = max(skills, key=skills.get) if skills else None
+
+        row = {
+            "path": path,
+            "mtime": mtime,
+            "name": data.get("name", ""),
+            "player": data.get("player", ""),
+            "occupation": data.get("occupation", ""),
+            "gender": data.get("gender", ""),
+            "age": _int_or_none(data.get("age")),
+            "hp": _int_or_none(data.get("hp")),
+            "mp": _int_or_none(data.get("mp")),
+            "san": _int_or_none(data.get("san")),
+            "best_skill": best_skill,
+            "best_skill_value": skills.get(best_skill)
+        }
+        for attr_name, column in ATTRIBUTE_COLUMNS.items():
+            row[column] = _int_or_none(attributes.get(attr_name))
+
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{column}" for column in row)
+        self.connection.execute("DELETE FROM investigators WHERE path = ?", (path,))
+        self.connection.execute(f"INSERT INTO investigators ({columns}) VALUES ({placeholders})", row)
+        self.connection.executemany(
+            "INSERT INTO skills (path, skill, value) VALUES (?, ?, ?)",
+            [(path, name, value) for name, value in skills.items()]
+        )
+
+    def update(self, investigator, file_path):
+        """更新一名刚保存的调查员的条目
+
+        参数:
+            investigator (Investigator): 调查员对象（或数据字典）
+            file_path (str): 已保存的文件路径
+        """
+        data = investigator if isinstance(investigator, dict) else investigator.to_dict()
+        with self._lock, self.connection:
+            self._write_entry(self.normalize_path(file_path), os.path.getmtime(file_path), data)
+
+    def remove(self, file_path):
+        """删除文件对应的条目"""
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM investigators WHERE path = ?", (self.normalize_path(file_path),))
+
+    def refresh(self, directory):
+        """增量同步一个目录中的调查员文件
+
+        只重新读取修改时间与索引中不同的文件；无法解析的文件会被跳过并从索引中删除。
+
+        参数:
+            directory (str): 目录路径
+
+        返回:
+            dict: 新增、更新、删除、未变化和失败的文件数量
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "failed": 0}
+        directory = self.normalize_path(directory)
+
+        files = {}
+        if os.path.isdir(directory):
+            for file_name in os.listdir(directory):
+                if file_name.endswith(".json"):
+                    path = self.normalize_path(os.path.join(directory, file_name))
+                    files[path] = os.path.getmtime(path)
+
+        with self._lock, self.connection:
+            indexed = {
+                path: mtime for path, mtime in self.connection.execute("SELECT path, mtime FROM investigators")
+                if os.path.dirname(path) == directory
+            }
+
+            for path in indexed.keys() - files.keys():
+                self.connection.execute("DELETE FROM investigators WHERE path = ?", (path,))
+                stats["removed"] += 1
+
+            for path, mtime in files.items():
+                if indexed.get(path) == mtime:
+                    stats["unchanged"] += 1
+                    continue
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if not isinstance(data, dict):
+                        raise ValueError("不是调查员数据")
+                except Exception as e:
+                    print(f"索引调查员文件失败: {path}: {e}")
+                    self.connection.execute("DELETE FROM investigators WHERE path = ?", (path,))
+                    stats["failed"] += 1
+                    continue
+                self._write_entry(path, mtime, data)
+                stats["updated" if path in indexed else "added"] += 1
+
+        return stats
+
+    def query(self, name=None, occupation=None, min_age=None, max_age=None,
+              attributes=None, skills=None, order_by="name", descending=False, limit=None):
+        """按条件查询调查员
+
+        数值条件为 名称: (最小值, 最大值)，两端都包含在内，None表示不限。
+
+        参数:
+            name (str): 姓名中包含的文字
+            occupation (str): 职业
+            min_age (int): 最小年龄
+            max_age (int): 最大年龄
+            attributes (dict): 属性条件，如 {"教育": (70, None)}
+            skills (dict): 技能条件，如 {"图书馆使用": (60, None)}
+            order_by (str): 排序依据：基本信息列（name、age、san、best_skill_value等）、属性名称或技能名称
+            descending (bool): 是否降序
+            limit (int): 最多返回的条目数
+
+        返回:
+            list: 条目字典列表，包含基本信息、"attributes"属性字典和最高技能
+        """
+        conditions = []
+        params = []
+
+        if name:
+            conditions.append("name LIKE ?")
+            params.append(f"%{name}%")
+        if occupation is not None:
+            conditions.append("occupation = ?")
+            params.append(occupation)
+        if min_age is not None:
+            conditions.append("age >= ?")
+            params.append(min_age)
+        if max_age is not None:
+            conditions.append("age <= ?")
+            params.append(max_age)
+
+        for attr_name, (minimum, maximum) in (attributes or {}).items():
+            if attr_name not in ATTRIBUTE_COLUMNS:
+                raise ValueError(f"未知的属性: {attr_name}")
+            column = ATTRIBUTE_COLUMNS[attr_name]
+            if minimum is not None:
+                conditions.append(f"{column} >= ?")
+                params.append(minimum)
+            if maximum is not None:
+                conditions.append(f"{column} <= ?")
+                params.append(maximum)
+
+        for skill_name, (minimum, maximum) in (skills or {}).items():
+            condition = "EXISTS (SELECT 1 FROM skills s WHERE s.path = i.path AND s.skill = ?"
+            params.append(skill_name)
+            if minimum is not None:
+                condition += " AND s.value >= ?"
+                params.append(minimum)
+            if maximum is not None:
+                condition += " AND s.value <= ?"
+                params.append(maximum)
+            conditions.append(condition + ")")
+
+        order_params = []
+        if order_by in SORT_COLUMNS:
+            order = order_by
+        elif order_by in ATTRIBUTE_COLUMNS:
+            order = ATTRIBUTE_COLUMNS[order_by]
+        else:
+            order = "(SELECT s.value FROM skills s WHERE s.path = i.path AND s.skill = ?)"
+            order_params.append(order_by)
+
+        sql = f"SELECT {', '.join(INFO_COLUMNS + tuple(ATTRIBUTE_COLUMNS.values()))} FROM investigators i"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order} {'DESC' if descending else 'ASC'}, path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            order_params.append(limit)
+
+        with self._lock:
+            rows = self.connection.execute(sql, params + order_params).fetchall()
+
+        entries = []
+        for row in rows:
+            entry = dict(zip(INFO_COLUMNS, row))
+            entry["attributes"] = {
+                attr_name: value
+                for attr_name, value in zip(ATTRIBUTE_COLUMNS, row[len(INFO_COLUMNS):])
+                if value is not None
+            }
+            entries.append(entry)
+        return entries
+
+    def skills_of(self, file_path):
+        """获取索引中一名调查员的全部技能值
+
+        参数:
+            file_path (str): 文件路径
+
+        返回:
+            dict: 技能名称到技能值的字典
+        """
+        with self._lock:
+            return dict(self.connection.execute(
+                "SELECT skill, value FROM skills WHERE path = ?", (self.normalize_path(file_path),)
+            ))
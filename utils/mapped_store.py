@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+内存映射的只读调查员库
+
+以只读方式把列式归档文件（见utils/archive.py）映射到内存，用于对大量历史调查员做统计分析：
+- 属性、技能和整数字段的列是映射文件上的零拷贝视图（需要NumPy），不把调查员读入内存
+- 按编号取得的是轻量的调查员代理，只在访问某个字段时才解码该字段
+- 筛选（如"图书馆使用 ≥ 60 的全部调查员"）在映射的列上做向量化比较
+
+用法:
+    with MappedInvestigatorStore("investigators.cocarch") as store:
+        ids = store.filter(skills={"图书馆使用": (60, None)})
+        for investigator in store.proxies(ids):
+            print(investigator.name, investigator.skills["图书馆使用"])
+"""
+
+import mmap
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖，没有时列为复制出的array
+    np = None
+
+from bisect import bisect_right
+
+from core.investigator import Investigator
+from utils.archive import (
+    InvestigatorArchive, ArchiveBlock, MISSING,
+    INT_FIELDS, STRING_FIELDS, LIST_FIELDS, EXTRA_DEFAULTS
+)
+
+class InvestigatorProxy:
+    """只读的调查员代理，访问字段时才从映射文件中解码"""
+
+    __slots__ = ("record_id", "_block", "_row", "_values", "_investigator")
+
+    def __init__(self, block, row):
+        """初始化代理
+
+        参数:
+            block (ArchiveBlock): 所在数据块
+            row (int): 块内行号
+        """
+        set_attr = object.__setattr__
+        set_attr(self, "record_id", block.start_id + row)
+        set_attr(self, "_block", block)
+        set_attr(self, "_row", row)
+        set_attr(self, "_values", {})
+        set_attr(self, "_investigator", None)
+
+    def __getattr__(self, name):
+        values = self._values
+        if name in values:
+            return values[name]
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        block = self._block
+        row = self._row
+        extra = values.get("_extra")
+        if extra is None:
+            extra = values["_extra"] = block.row_extra(row)
+
+        if name in extra:
+            value = extra[name]
+        elif name in INT_FIELDS:
+            value = block.row_int(row, name)
+        elif name in STRING_FIELDS or name in LIST_FIELDS:
+            value = block.row_string(row, name)
+        elif name == "attributes":
+            value = block.row_attributes(row)
+        elif name == "attribute_half":
+            value = {attr_name: attr_value // 2 for attr_name, attr_value in self.attributes.items()}
+        elif name == "attribute_fifth":
+            value = {attr_name: attr_value // 5 for attr_name, attr_value in self.attributes.items()}
+        elif name in ("skills", "skill_specializations"):
+            skills, specializations = block.row_skills(row)
+            values.setdefault("skills", extra.get("skills", skills))
+            values.setdefault("skill_specializations", extra.get("skill_specializations", specializations))
+            return values[name]
+        elif name in EXTRA_DEFAULTS:
+            default = EXTRA_DEFAULTS[name]
+            value = list(default) if isinstance(default, list) else default
+        else:
+            # 方法和其他属性由完整的调查员对象提供
+            return getattr(self.materialize(), name)
+
+        values[name] = value
+        return value
+
+    def __setattr__(self, name, value):
+        raise AttributeError("调查员代理是只读的")
+
+    def __repr__(self):
+        return f"InvestigatorProxy({self.record_id}, {self.name!r})"
+
+    def get_skill(self, skill_name):
+        """获取技能值"""
+        return self.skills.get(skill_name, 0)
+
+    def to_dict(self):
+        """解码完整的调查员数据字典"""
+        return self._block.record(self._row)
+
+    def materialize(self):
+        """解码为完整的Investigator对象（结果会被缓存）"""
+        if self._investigator is None:
+            object.__setattr__(self, "_investigator", Investigator.from_dict(self.to_dict()))
+        return self._investigator
+
+class MappedInvestigatorStore:
+    """内存映射的只读调查员库"""
+
+    def __init__(self, file_path):
+        """映射归档文件
+
+        参数:
+            file_path (str): 列式归档文件路径
+        """
+        archive = InvestigatorArchive(file_path)
+        if not archive.block_entries:
+            raise ValueError(f"归档中没有调查员: {file_path}")
+
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        self.blocks = [
+            ArchiveBlock(description, view[body_offset:body_offset + body_size], start_id)
+            for start_id, description, body_offset, body_size in archive.block_entries
+        ]
+        self._starts = [block.start_id for block in self.blocks]
+        self._count = len(archive)
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """关闭映射
+
+        仍有列视图被引用时映射无法立即关闭，会在视图释放后由垃圾回收关闭。
+        """
+        self.blocks = []
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def __getitem__(self, record_id):
+        """按编号取得调查员代理"""
+        if record_id < 0:
+            record_id += self._count
+        if not 0 <= record_id < self._count:
+            raise IndexError(f"记录编号超出范围: {record_id}")
+        block = self.blocks[bisect_right(self._starts, record_id) - 1]
+        return InvestigatorProxy(block, record_id - block.start_id)
+
+    def __iter__(self):
+        for block in self.blocks:
+            for row in range(block.count):
+                yield InvestigatorProxy(block, row)
+
+    def proxies(self, record_ids):
+        """按编号依次取得调查员代理"""
+        for record_id in record_ids:
+            yield self[int(record_id)]
+
+    def _values(self, kind, name):
+        """把各数据块的同名列拼接为一列（只有一个数据块时为零拷贝视图）"""
+        columns = []
+        for block in self.blocks:
+            if kind == "skill":
+                column = block.skill_column(name)
+            elif kind == "attribute":
+                column = block.attribute_column(name)
+            else:
+                column = block.int_column(name)
+            if column is None:
+                column = np.full(block.count, MISSING, dtype="<i2") if np is not None else [MISSING] * block.count
+            columns.append(column)
+
+        if np is not None:
+            return columns[0] if len(columns) == 1 else np.concatenate(columns)
+        return [value for column in columns for value in column]
+
+    def skill_values(self, skill_name):
+        """全部调查员的技能值（缺失为MISSING）"""
+        return self._values("skill", skill_name)
+
+    def attribute_values(self, attr_name):
+        """全部调查员的属性值（缺失为MISSING）"""
+        return self._values("attribute", attr_name)
+
+    def field_values(self, field):
+        """全部调查员的整数字段值（如"san"、"hp"）"""
+        return self._values("int", field)
+
+    def filter(self, skills=None, attributes=None, fields=None):
+        """按数值范围筛选调查员
+
+        每个条件为 名称: (最小值, 最大值)，两端都包含在内，None表示不限；
+        缺少该技能或属性的调查员不满足条件。
+
+        参数:
+            skills (dict): 技能条件，如 {"图书馆使用": (60, None)}
+            attributes (dict): 属性条件，如 {"教育": (70, None)}
+            fields (dict): 整数字段条件，如 {"san": (None, 40)}
+
+        返回:
+            满足全部条件的记录编号（有NumPy时为数组，否则为列表）
+        """
+        conditions = (
+            [("skill", name, bounds) for name, bounds in (skills or {}).items()]
+            + [("attribute", name, bounds) for name, bounds in (attributes or {}).items()]
+            + [("int", name, bounds) for name, bounds in (fields or {}).items()]
+        )
+
+        if np is not None:
+            mask = np.ones(self._count, dtype=bool)
+            for kind, name, (minimum, maximum) in conditions:
+                values = self._values(kind, name)
+                if kind != "int":
+                    mask &= values != MISSING
+                if minimum is not None:
+                    mask &= values >= minimum
+                if maximum is not None:
+                    mask &= values <= maximum
+            return np.flatnonzero(mask)
+
+        matched = range(self._count)
+        for kind, name, (minimum, maximum) in conditions:
+            values = self._values(kind, name)
+            matched = [
+                record_id for record_id in matched
+                if (kind == "int" or values[record_id] != MISSING)
+                and (minimum is None or values[record_id] >= minimum)
+                and (maximum is None or values[record_id] <= maximum)
+            ]
+        return list(matched)
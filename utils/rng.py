@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+随机数源模块
+
+提供可注入、可设定种子的随机数源RandomSource，供骰子、生成器、技能检定等模块使用：
+- 兼容random.Random的接口（randint、choice、sample、random等），可直接替代random模块，
+  python属性为底层的random.Random对象
+- numpy()返回由同一种子派生的NumPy Generator，用于向量化计算
+- child(index)/spawn(n)派生互相独立的子随机流，用于并行工作进程
+- 由(种子, 路径)唯一确定，任何生成结果都可以只凭种子和序号复现
+- 不同用途的子流使用不同的命名空间（如单个调查员与批量生成的行），同一序号也不会得到相同的随机流
+"""
+
+import random
+import secrets
+import hashlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖
+    np = None
+
+# 子流命名空间：for_index()派生的单个调查员随机流，以及批量生成中每一行的随机流
+INVESTIGATOR_NAMESPACE = "investigator"
+BATCH_ROW_NAMESPACE = "batch-row"
+
+def _numpy_key(part):
+    """路径中的一项转换为SeedSequence可用的非负整数（命名空间字符串经SHA-256处理，跨进程稳定）"""
+    if isinstance(part, str):
+        return int.from_bytes(hashlib.sha256(part.encode("utf-8")).digest()[:8], "little")
+    return part
+
+class RandomSource:
+    """可设定种子、可派生子流的随机数源"""
+
+    def __init__(self, seed=None, path=()):
+        """
+        初始化随机数源
+
+        参数:
+            seed (int): 种子，为None时随机生成一个（可通过seed属性取回以便复现）
+            path (tuple): 子流路径，由child()派生时使用
+        """
+        if seed is None:
+            seed = secrets.randbits(64)
+        self.seed = seed
+        self.path = tuple(path)
+        self.python = random.Random(self._stream_key())
+        self._numpy = None
+        self._spawned = 0
+
+        # 直接绑定常用方法，避免每次调用多一层转发
+        self.random = self.python.random
+        self.randint = self.python.randint
+        self.randrange = self.python.randrange
+        self.choice = self.python.choice
+        self.choices = self.python.choices
+        self.sample = self.python.sample
+        self.shuffle = self.python.shuffle
+        self.uniform = self.python.uniform
+        self.expovariate = self.python.expovariate
+        self.gammavariate = self.python.gammavariate
+        self.getrandbits = self.python.getrandbits
+
+    @classmethod
+    def for_index(cls, seed, index):
+        """
+        获取第index个对象（如第index名调查员）专用的随机流
+
+        参数:
+            seed (int): 主种子
+            index (int): 序号
+
+        返回:
+            RandomSource: 只由(seed, index)决定的随机数源，路径为("investigator", index)
+        """
+        return cls(seed, (INVESTIGATOR_NAMESPACE, index))
+
+    def _stream_key(self):
+        """由种子和路径得到Python随机流的种子（字符串种子经SHA-512处理，跨进程稳定）"""
+        return ":".join(str(part) for part in (self.seed,) + self.path)
+
+    def child(self, index, namespace=None):
+        """
+        派生指定序号的子随机流
+
+        参数:
+            index (int): 子流序号
+            namespace (str): 子流命名空间（可选），不同命名空间中相同序号的子流互相独立
+
+        返回:
+            RandomSource: 与本随机流及其它子流互相独立的随机数源
+        """
+        if namespace is None:
+            return RandomSource(self.seed, self.path + (index,))
+        return RandomSource(self.seed, self.path + (namespace, index))
+
+    def spawn(self, n):
+        """
+        依次派生n个新的子随机流（序号接续上一次spawn）
+
+        参数:
+            n (int): 子流数量
+
+        返回:
+            list: RandomSource列表
+        """
+        children = [self.child(self._spawned + i) for i in range(n)]
+        self._spawned += n
+        return children
+
+    def numpy(self):
+        """
+        获取由同一种子和路径派生的NumPy随机数生成器
+
+        返回:
+            numpy.random.Generator: 向量化随机数生成器
+        """
+        if np is None:
+            raise ImportError("向量化随机数需要安装NumPy")
+        if self._numpy is None:
+            sequence = np.random.SeedSequence(self.seed, spawn_key=tuple(_numpy_key(part) for part in self.path))
+            self._numpy = np.random.default_rng(sequence)
+        return self._numpy
+
+    def __repr__(self):
+        return f"RandomSource(seed={self.seed}, path={self.path})"
+
+def resolve_rng(rng=None):
+    """
+    将可选的随机数源参数转换为可用对象
+
+    参数:
+        rng: RandomSource、random.Random、整数种子或None
+
+    返回:
+        具有random.Random接口的对象；None时返回全局random模块
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, int):
+        return RandomSource(rng)
+    return rng